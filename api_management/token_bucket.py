@@ -4,6 +4,9 @@ Smart Quota Management: Token Bucket Algorithm
 Prioritizes symbols by Volume > Open Interest.
 Stays within 120 calls/min and 15k calls/day.
 Focuses resources on first and last hours of market.
+
+Daily usage comes from the shared UW quota store (src/uw/uw_quota.py) when available, so this
+bucket, uw_http_get and the flow daemon agree on one count; the bucket itself only paces calls.
 """
 
 import time
@@ -55,6 +58,19 @@ class TokenBucket:
                 "last_update": datetime.now(timezone.utc).isoformat()
             }, f, indent=2)
     
+    def _sync_shared_daily(self) -> bool:
+        """Mirror today's call count from the shared UW quota store (True when it is in use)."""
+        try:
+            from src.uw.uw_quota import get_uw_quota_store
+
+            store = get_uw_quota_store()
+            if store is None:
+                return False
+            self.daily_calls = int(store.usage().get("calls_today", 0) or 0)
+            return True
+        except Exception:
+            return False
+
     def _reset_daily_if_needed(self):
         """Reset daily counter if new day"""
         now = datetime.now(timezone.utc)
@@ -81,6 +97,7 @@ class TokenBucket:
         """Check if we can make an API call"""
         with self.lock:
             self._reset_daily_if_needed()
+            self._sync_shared_daily()
             self._refill_tokens()
             
             # Check daily limit
@@ -99,8 +116,10 @@ class TokenBucket:
             self._refill_tokens()
             if self.tokens >= 1.0:
                 self.tokens -= 1.0
-                self.daily_calls += 1
-                self._save_state()
+                # The shared store counts the call where it is made (uw_http_get / uw_record_call).
+                if not self._sync_shared_daily():
+                    self.daily_calls += 1
+                    self._save_state()
                 return True
             return False
     
@@ -108,6 +127,7 @@ class TokenBucket:
         """Get time to wait before next call is allowed"""
         with self.lock:
             self._reset_daily_if_needed()
+            self._sync_shared_daily()
             self._refill_tokens()
             
             if self.daily_calls >= self.daily_limit:
@@ -129,6 +149,7 @@ class TokenBucket:
         """Get current token bucket status"""
         with self.lock:
             self._reset_daily_if_needed()
+            self._sync_shared_daily()
             self._refill_tokens()
             
             return {
@@ -27,7 +27,8 @@ Signal → Trade Decision → Learn → Review → Update → Trade
 - Trade: Apply learnings to next cycle
 
 Features:
-- Tracks last processed record IDs to avoid duplicates
+- Resumes each log from a byte-offset checkpoint (state["log_cursors"]); falls back to
+  last processed record IDs when the checkpoint no longer validates
 - Multi-timeframe learning (short/medium/long)
 - Processes all historical data on first run
 - Continuous learning after each trade
@@ -42,6 +43,7 @@ from collections import defaultdict
 
 # Import existing learning components
 from adaptive_signal_optimizer import get_optimizer, SIGNAL_COMPONENTS, EXIT_COMPONENTS
+from src.infrastructure.jsonl_cursor import open_jsonl_cursor
 
 LOG_DIR = Path("logs")
 DATA_DIR = Path("data")
@@ -125,7 +127,10 @@ def process_attribution_log(state: Dict, process_all_historical: bool = False) -
     processed_ids: Set[str] = set()
     seen_last_id = False  # Track if we've seen the last processed record
     
-    with open(attr_log, 'r', encoding='utf-8') as f:
+    cursor = open_jsonl_cursor(state, "attribution", attr_log, process_all_historical)
+    if cursor.resumed:
+        last_id = None  # checkpoint already sits past the last processed record
+    with cursor as f:
         for line in f:
             if not line.strip():
                 continue
@@ -306,7 +311,10 @@ def process_exit_log(state: Dict, process_all_historical: bool = False) -> int:
     processed_ids: Set[str] = set()
     seen_last_id = False
     
-    with open(exit_log, 'r', encoding='utf-8') as f:
+    cursor = open_jsonl_cursor(state, "exit", exit_log, process_all_historical)
+    if cursor.resumed:
+        last_id = None  # checkpoint already sits past the last processed record
+    with cursor as f:
         for line in f:
             if not line.strip():
                 continue
@@ -430,7 +438,10 @@ def process_signal_log(state: Dict, process_all_historical: bool = False) -> int
     # This is a placeholder for future signal pattern learning
     # For now, we just track that we've seen them
     
-    with open(signal_log, 'r', encoding='utf-8') as f:
+    cursor = open_jsonl_cursor(state, "signal", signal_log, process_all_historical)
+    if cursor.resumed:
+        last_id = None  # checkpoint already sits past the last processed record
+    with cursor as f:
         for line in f:
             if not line.strip():
                 continue
@@ -560,7 +571,10 @@ def process_order_log(state: Dict, process_all_historical: bool = False) -> int:
     # This is a placeholder for future execution learning
     # For now, we just track that we've seen them
     
-    with open(order_log, 'r', encoding='utf-8') as f:
+    cursor = open_jsonl_cursor(state, "order", order_log, process_all_historical)
+    if cursor.resumed:
+        last_id = None  # checkpoint already sits past the last processed record
+    with cursor as f:
         for line in f:
             if not line.strip():
                 continue
@@ -663,7 +677,10 @@ def process_blocked_trades(state: Dict, process_all_historical: bool = False) ->
     processed_ids: Set[str] = set()
     seen_last_id = False
     
-    with open(blocked_log, 'r', encoding='utf-8') as f:
+    cursor = open_jsonl_cursor(state, "blocked_trade", blocked_log, process_all_historical)
+    if cursor.resumed:
+        last_id = None  # checkpoint already sits past the last processed record
+    with cursor as f:
         for line in f:
             if not line.strip():
                 continue
@@ -775,7 +792,10 @@ def process_gate_events(state: Dict, process_all_historical: bool = False) -> in
     processed_ids: Set[str] = set()
     seen_last_id = False
     
-    with open(gate_log, 'r', encoding='utf-8') as f:
+    cursor = open_jsonl_cursor(state, "gate", gate_log, process_all_historical)
+    if cursor.resumed:
+        last_id = None  # checkpoint already sits past the last processed record
+    with cursor as f:
         for line in f:
             if not line.strip():
                 continue
@@ -868,7 +888,10 @@ def process_uw_attribution_blocked(state: Dict, process_all_historical: bool = F
     processed_ids: Set[str] = set()
     seen_last_id = False
     
-    with open(uw_attr_log, 'r', encoding='utf-8') as f:
+    cursor = open_jsonl_cursor(state, "uw_blocked", uw_attr_log, process_all_historical)
+    if cursor.resumed:
+        last_id = None  # checkpoint already sits past the last processed record
+    with cursor as f:
         for line in f:
             if not line.strip():
                 continue
@@ -118,6 +118,7 @@ class CacheFiles:
     
     UW_FLOW_CACHE = Directories.DATA / "uw_flow_cache.json"
     UW_FLOW_CACHE_LOG = Directories.DATA / "uw_flow_cache.log.jsonl"
+    UW_FLOW_CACHE_SHARDS = Directories.DATA / "uw_flow_cache_shards"
     UW_EXPANDED_INTEL = Directories.DATA / "uw_expanded_intel.json"
     UW_RATE_LIMITER_STATE = Directories.DATA / "uw_rate_limiter_state.json"
     UW_API_QUOTA = Directories.DATA / "uw_api_quota.jsonl"
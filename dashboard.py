@@ -178,9 +178,33 @@ _alpaca_api = None
 _registry_loaded = False
 
 # Short-lived memoization for hot dashboard reads (bounded polling load).
+# Single-flight / stale-while-revalidate / LRU via src/dashboard/ttl_cache.py; the plain dict
+# below is the DASH_TTL_CACHE=0 fallback.
 _DASH_TTL_SEC = 5.0
 _dash_ttl_store: dict[str, tuple[float, object]] = {}
+_dash_ttl_cache = None
+_dash_ttl_cache_lock = threading.Lock()
+
+
+def _dash_ttl_cache_instance():
+    global _dash_ttl_cache
+    try:
+        from src.dashboard.ttl_cache import DashTtlCache, dash_ttl_cache_enabled
+        if not dash_ttl_cache_enabled():
+            return None
+    except Exception:
+        return None
+    if _dash_ttl_cache is None:
+        with _dash_ttl_cache_lock:
+            if _dash_ttl_cache is None:
+                _dash_ttl_cache = DashTtlCache()
+    return _dash_ttl_cache
+
+
 def _dash_cache_get(key: str, builder, *, ttl_sec: Optional[float] = None):
+    cache = _dash_ttl_cache_instance()
+    if cache is not None:
+        return cache.get(key, builder, ttl_sec=ttl_sec)
     now = time.monotonic()
     ent = _dash_ttl_store.get(key)
     ttl = _DASH_TTL_SEC if ttl_sec is None else float(ttl_sec)
@@ -191,6 +215,76 @@ def _dash_cache_get(key: str, builder, *, ttl_sec: Optional[float] = None):
     return val
 
 
+# Panels served from in-memory read models tailed off the logs (src/dashboard/read_models.py).
+_dash_read_models = None
+_dash_read_models_lock = threading.Lock()
+
+
+def _dashboard_read_models():
+    """Process-wide read-model materializer (started on first use); None when disabled."""
+    global _dash_read_models
+    try:
+        from src.dashboard.read_models import read_models_enabled
+        if not read_models_enabled():
+            return None
+    except Exception:
+        return None
+    if _dash_read_models is None:
+        with _dash_read_models_lock:
+            if _dash_read_models is None:
+                try:
+                    _dash_read_models = _build_dashboard_read_models()
+                    _dash_read_models.start()
+                except Exception as e:
+                    print(f"[Dashboard] Read models unavailable, scanning logs per request: {e}", flush=True)
+                    return None
+    return _dash_read_models
+
+
+def _build_dashboard_read_models():
+    from src.dashboard.read_models import (
+        ClosedTradesModel,
+        ReadModelMaterializer,
+        RollingPnlModel,
+        SignalFlowModel,
+    )
+    from config.registry import CacheFiles, LogFiles
+
+    root = _DASHBOARD_ROOT
+    attr_path, exit_attr_path = _closed_trades_log_paths()
+    m = ReadModelMaterializer()
+    m.register(
+        SignalFlowModel(
+            uw_logs=[
+                (root / CacheFiles.UW_ATTRIBUTION).resolve(),
+                (root / "logs" / "uw_flow.jsonl").resolve(),
+                (root / "data" / "uw_flow_cache.log.jsonl").resolve(),
+            ],
+            gate_logs=[
+                (root / "logs" / "gate.jsonl").resolve(),
+                attr_path,
+                (root / "logs" / "composite_attribution.jsonl").resolve(),
+            ],
+            order_logs=[
+                attr_path,
+                (root / LogFiles.ORDERS).resolve(),
+                (root / "data" / "live_orders.jsonl").resolve(),
+            ],
+            attribution_log=attr_path,
+        )
+    )
+    m.register(
+        ClosedTradesModel(
+            attribution_log=attr_path,
+            exit_attribution_log=exit_attr_path,
+            attribution_row=_closed_trade_row_from_attribution,
+            exit_attribution_row=_closed_trade_row_from_exit_attribution,
+        )
+    )
+    m.register(RollingPnlModel((root / "reports" / "state" / "rolling_pnl_5d.jsonl").resolve()))
+    return m
+
+
 def _dash_parse_limit(default: int = 50, cap: int = 500) -> int:
     try:
         raw = request.args.get("limit", default=default, type=int)  # type: ignore[union-attr]
@@ -2620,38 +2714,45 @@ def api_pnl_reconcile():
 
         try:
             from config.registry import LogFiles
+            from src.infrastructure.jsonl_time_index import iter_jsonl_window
             attr_path = LogFiles.ATTRIBUTION
+            try:
+                # ts is matched by its date prefix, so allow a day either side for UTC offsets.
+                day_since = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() - 86400.0
+                day_until = day_since + 3 * 86400.0
+            except ValueError:
+                day_since = day_until = None
             if attr_path.exists():
-                with attr_path.open("r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        try:
-                            rec = json.loads(line)
-                        except Exception:
-                            continue
-                        ts = rec.get("ts")
-                        if not ts or not str(ts).startswith(date_str):
-                            continue
-                        pnl_usd_logged = float(rec.get("pnl_usd", 0.0) or 0.0)
-                        closed_pnl_sum_logged += pnl_usd_logged
-                        counted += 1
-
-                        ctx = rec.get("context") if isinstance(rec.get("context"), dict) else {}
-                        entry_ts = ctx.get("entry_ts")
-                        if entry_ts and str(entry_ts).startswith(date_str):
-                            entered_today_closed_today_sum += pnl_usd_logged
-
-                        # Recompute P&L from context if possible (prefers position_side if present)
-                        position_side = ctx.get("position_side") or _normalize_position_side(ctx.get("side"))
-                        entry_price = ctx.get("entry_price")
-                        exit_price = ctx.get("exit_price")
-                        qty = ctx.get("qty")
-                        pnl_usd_re = _compute_trade_pnl(entry_price, exit_price, qty, str(position_side).lower())
-                        closed_pnl_sum_recomputed += pnl_usd_re
-                        if abs(pnl_usd_re - pnl_usd_logged) > 0.05:
-                            recompute_mismatch_count += 1
+                # Time index seeks to the requested day instead of parsing the whole log.
+                for line in iter_jsonl_window(attr_path, day_since, day_until):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except Exception:
+                        continue
+                    ts = rec.get("ts")
+                    if not ts or not str(ts).startswith(date_str):
+                        continue
+                    pnl_usd_logged = float(rec.get("pnl_usd", 0.0) or 0.0)
+                    closed_pnl_sum_logged += pnl_usd_logged
+                    counted += 1
+
+                    ctx = rec.get("context") if isinstance(rec.get("context"), dict) else {}
+                    entry_ts = ctx.get("entry_ts")
+                    if entry_ts and str(entry_ts).startswith(date_str):
+                        entered_today_closed_today_sum += pnl_usd_logged
+
+                    # Recompute P&L from context if possible (prefers position_side if present)
+                    position_side = ctx.get("position_side") or _normalize_position_side(ctx.get("side"))
+                    entry_price = ctx.get("entry_price")
+                    exit_price = ctx.get("exit_price")
+                    qty = ctx.get("qty")
+                    pnl_usd_re = _compute_trade_pnl(entry_price, exit_price, qty, str(position_side).lower())
+                    closed_pnl_sum_recomputed += pnl_usd_re
+                    if abs(pnl_usd_re - pnl_usd_logged) > 0.05:
+                        recompute_mismatch_count += 1
         except Exception:
             pass
 
@@ -2746,93 +2847,145 @@ def _strict_alpaca_chain_badge(trade_id: str | None, gate: dict | None, gate_err
     return "UNKNOWN"
 
 
-def _load_stock_closed_trades(max_days=90, max_attribution_lines=10000, max_telemetry_lines=500):
+def _closed_trade_row_from_attribution(rec: dict):
+    """``((symbol, ts[:16]), row)`` for a closed-trade attribution record, else None."""
+    if rec.get("type") != "attribution":
+        return None
+    trade_id = rec.get("trade_id", "")
+    if trade_id and str(trade_id).startswith("open_"):
+        return None
+    symbol = str(rec.get("symbol", "")).upper()
+    if not symbol or "TEST" in symbol:
+        return None
+    context = rec.get("context") or {}
+    if not isinstance(context, dict):
+        context = {}
+    pnl_usd = float(rec.get("pnl_usd", 0) or 0)
+    close_reason = context.get("close_reason") or rec.get("close_reason") or ""
+    if pnl_usd == 0 and not (close_reason and close_reason not in ("unknown", "N/A", "")):
+        return None
+    ts_str = rec.get("ts") or rec.get("timestamp") or ""
+    if not ts_str:
+        return None
+    strategy_id = rec.get("strategy_id") or "equity"
+    er = _dashboard_pick_entry_reason(context)
+    fee = _dashboard_fee_usd_from_rec(rec, context)
+    row = {
+        "strategy_id": strategy_id,
+        "symbol": symbol,
+        "timestamp": ts_str,
+        "pnl_usd": round(pnl_usd, 2),
+        "close_reason": close_reason,
+        "trade_id": str(rec.get("trade_id") or ""),
+        "entry_timestamp": context.get("entry_ts") or context.get("entry_timestamp") or "",
+        "exit_timestamp": ts_str,
+        "entry_reason": er if er else None,
+        "entry_reason_display": er if er else "INCOMPLETE",
+        "fees_usd": fee,
+        "fees_display": (f"${fee:.2f}" if fee is not None else "INCOMPLETE"),
+        "data_sources": ["logs/attribution.jsonl"],
+        "option_phase": context.get("phase"),
+        "option_type": context.get("option_type"),
+        "strike": context.get("strike"),
+        "expiry": context.get("expiry"),
+        "dte": context.get("dte"),
+        "delta_at_entry": context.get("delta_at_entry"),
+        "premium": context.get("premium"),
+        "assigned": context.get("assigned"),
+        "called_away": context.get("called_away"),
+    }
+    return (symbol, str(ts_str)[:16]), row
+
+
+def _closed_trade_row_from_exit_attribution(rec: dict):
+    """``((symbol, ts[:16]), row)`` for a v2 exit-attribution record, else None."""
+    symbol = str(rec.get("symbol", "")).upper()
+    if not symbol or "TEST" in symbol:
+        return None
+    ts_str = rec.get("timestamp") or rec.get("exit_timestamp") or ""
+    if not ts_str:
+        return None
+    pnl = rec.get("pnl")
+    pnl_usd = float(pnl) if pnl is not None else None
+    er2 = _dashboard_pick_entry_reason(rec if isinstance(rec, dict) else {})
+    fee2 = _dashboard_fee_usd_from_rec(rec, None)
+    tid_e = str(rec.get("trade_id") or "")
+    row = {
+        "strategy_id": "equity",
+        "symbol": symbol,
+        "timestamp": ts_str,
+        "pnl_usd": round(pnl_usd, 2) if pnl_usd is not None else None,
+        "close_reason": rec.get("exit_reason") or "",
+        "trade_id": tid_e,
+        "entry_timestamp": rec.get("entry_timestamp") or "",
+        "exit_timestamp": ts_str,
+        "entry_reason": er2 if er2 else None,
+        "entry_reason_display": er2 if er2 else "INCOMPLETE",
+        "fees_usd": fee2,
+        "fees_display": (f"${fee2:.2f}" if fee2 is not None else "INCOMPLETE"),
+        "data_sources": ["logs/exit_attribution.jsonl"],
+        "option_phase": None,
+        "option_type": None,
+        "strike": None,
+        "expiry": None,
+        "dte": None,
+        "delta_at_entry": None,
+        "premium": None,
+        "assigned": None,
+        "called_away": None,
+    }
+    return (symbol, str(ts_str)[:16]), row
+
+
+def _load_stock_closed_trades(max_days=90):
     """
     Load closed trades from attribution.jsonl and exit_attribution.jsonl (equity-focused).
     Omits legacy options-strategy rows (strategy_id filtered). option_phase and option metadata
     are populated from attribution context when present.
+    Served from the ``closed_trades`` read model (materialized over its own ``max_days``, 90 by
+    default; shorter windows are a prefix of its newest-first rows) unless
+    ``DASHBOARD_READ_MODELS=0`` or ``max_days`` is wider than the model; otherwise both logs are
+    read from the time-index offset of the cutoff day.
     """
     from pathlib import Path
     from datetime import datetime, timezone, timedelta
-    try:
-        from config.registry import LogFiles
-        attr_path = (_DASHBOARD_ROOT / LogFiles.ATTRIBUTION).resolve()
-        exit_attr_path = (_DASHBOARD_ROOT / LogFiles.EXIT_ATTRIBUTION).resolve()
-    except ImportError:
-        attr_path = (_DASHBOARD_ROOT / "logs" / "attribution.jsonl").resolve()
-        exit_attr_path = (_DASHBOARD_ROOT / "logs" / "exit_attribution.jsonl").resolve()
+    from src.infrastructure.jsonl_time_index import iter_jsonl_window
     cutoff = (datetime.now(timezone.utc) - timedelta(days=max_days)).isoformat()[:10]
+    rm = _dashboard_read_models()
+    model = rm.model("closed_trades") if rm is not None else None
+    if model is not None and max_days <= model.max_days:
+        try:
+            rows = rm.view("closed_trades")
+            if max_days < model.max_days:
+                rows = [r for r in rows if str(r.get("timestamp") or "")[:10] >= cutoff]
+            return rows
+        except Exception:
+            pass
+    attr_path, exit_attr_path = _closed_trades_log_paths()
+    since = datetime.fromisoformat(cutoff).replace(tzinfo=timezone.utc).timestamp()
     out = []
     seen_keys = set()  # (symbol, ts_precision) for deduplication
     # 1) Attribution: closed trades (strategy_id and options context from engine when present)
     if attr_path.exists():
-        line_count = 0
-        with attr_path.open("r", encoding="utf-8", errors="replace") as f:
-            for line in f:
-                line_count += 1
-                if line_count > max_attribution_lines:
-                    break
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    rec = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if rec.get("type") != "attribution":
-                    continue
-                trade_id = rec.get("trade_id", "")
-                if trade_id and str(trade_id).startswith("open_"):
-                    continue
-                symbol = str(rec.get("symbol", "")).upper()
-                if not symbol or "TEST" in symbol:
-                    continue
-                context = rec.get("context") or {}
-                if not isinstance(context, dict):
-                    context = {}
-                pnl_usd = float(rec.get("pnl_usd", 0) or 0)
-                close_reason = context.get("close_reason") or rec.get("close_reason") or ""
-                if pnl_usd == 0 and not (close_reason and close_reason not in ("unknown", "N/A", "")):
-                    continue
-                ts_str = rec.get("ts") or rec.get("timestamp") or ""
-                if not ts_str or str(ts_str)[:10] < cutoff:
-                    continue
-                strategy_id = rec.get("strategy_id") or "equity"
-                er = _dashboard_pick_entry_reason(context)
-                fee = _dashboard_fee_usd_from_rec(rec, context)
-                row = {
-                    "strategy_id": strategy_id,
-                    "symbol": symbol,
-                    "timestamp": ts_str,
-                    "pnl_usd": round(pnl_usd, 2),
-                    "close_reason": close_reason,
-                    "trade_id": str(rec.get("trade_id") or ""),
-                    "entry_timestamp": context.get("entry_ts") or context.get("entry_timestamp") or "",
-                    "exit_timestamp": ts_str,
-                    "entry_reason": er if er else None,
-                    "entry_reason_display": er if er else "INCOMPLETE",
-                    "fees_usd": fee,
-                    "fees_display": (f"${fee:.2f}" if fee is not None else "INCOMPLETE"),
-                    "data_sources": ["logs/attribution.jsonl"],
-                    "option_phase": context.get("phase"),
-                    "option_type": context.get("option_type"),
-                    "strike": context.get("strike"),
-                    "expiry": context.get("expiry"),
-                    "dte": context.get("dte"),
-                    "delta_at_entry": context.get("delta_at_entry"),
-                    "premium": context.get("premium"),
-                    "assigned": context.get("assigned"),
-                    "called_away": context.get("called_away"),
-                }
-                key = (symbol, str(ts_str)[:16])
-                if key not in seen_keys:
-                    seen_keys.add(key)
-                    out.append(row)
+        for line in iter_jsonl_window(attr_path, since):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            got = _closed_trade_row_from_attribution(rec)
+            if got is None or str(got[1]["timestamp"])[:10] < cutoff:
+                continue
+            key, row = got
+            if key not in seen_keys:
+                seen_keys.add(key)
+                out.append(row)
     # 2) Exit attribution (v2 equity exits): supplementary source per MEMORY_BANK 7.12
     if exit_attr_path.exists():
         try:
-            lines = exit_attr_path.read_text(encoding="utf-8", errors="replace").splitlines()[-3000:]
-            for line in lines:
+            for line in iter_jsonl_window(exit_attr_path, since):
                 line = line.strip()
                 if not line:
                     continue
@@ -2840,54 +2993,35 @@ def _load_stock_closed_trades(max_days=90, max_attribution_lines=10000, max_tele
                     rec = json.loads(line)
                 except json.JSONDecodeError:
                     continue
-                symbol = str(rec.get("symbol", "")).upper()
-                if not symbol or "TEST" in symbol:
+                got = _closed_trade_row_from_exit_attribution(rec)
+                if got is None or str(got[1]["timestamp"])[:10] < cutoff:
                     continue
-                ts_str = rec.get("timestamp") or rec.get("exit_timestamp") or ""
-                if not ts_str or str(ts_str)[:10] < cutoff:
-                    continue
-                pnl = rec.get("pnl")
-                pnl_usd = float(pnl) if pnl is not None else None
-                key = (symbol, str(ts_str)[:16])
+                key, row = got
                 if key in seen_keys:
                     continue
                 seen_keys.add(key)
-                er2 = _dashboard_pick_entry_reason(rec if isinstance(rec, dict) else {})
-                fee2 = _dashboard_fee_usd_from_rec(rec, None)
-                tid_e = str(rec.get("trade_id") or "")
-                row = {
-                    "strategy_id": "equity",
-                    "symbol": symbol,
-                    "timestamp": ts_str,
-                    "pnl_usd": round(pnl_usd, 2) if pnl_usd is not None else None,
-                    "close_reason": rec.get("exit_reason") or "",
-                    "trade_id": tid_e,
-                    "entry_timestamp": rec.get("entry_timestamp") or "",
-                    "exit_timestamp": ts_str,
-                    "entry_reason": er2 if er2 else None,
-                    "entry_reason_display": er2 if er2 else "INCOMPLETE",
-                    "fees_usd": fee2,
-                    "fees_display": (f"${fee2:.2f}" if fee2 is not None else "INCOMPLETE"),
-                    "data_sources": ["logs/exit_attribution.jsonl"],
-                    "option_phase": None,
-                    "option_type": None,
-                    "strike": None,
-                    "expiry": None,
-                    "dte": None,
-                    "delta_at_entry": None,
-                    "premium": None,
-                    "assigned": None,
-                    "called_away": None,
-                }
                 out.append(row)
         except Exception:
             pass
-    _ = max_telemetry_lines  # legacy signature; telemetry merge removed
     out = [r for r in out if (r.get("strategy_id") or "equity").lower() == "equity"]
     out.sort(key=lambda x: (x.get("timestamp") or ""), reverse=True)
     return out[:500]
 
 
+def _closed_trades_log_paths():
+    try:
+        from config.registry import LogFiles
+        return (
+            (_DASHBOARD_ROOT / LogFiles.ATTRIBUTION).resolve(),
+            (_DASHBOARD_ROOT / LogFiles.EXIT_ATTRIBUTION).resolve(),
+        )
+    except ImportError:
+        return (
+            (_DASHBOARD_ROOT / "logs" / "attribution.jsonl").resolve(),
+            (_DASHBOARD_ROOT / "logs" / "exit_attribution.jsonl").resolve(),
+        )
+
+
 def _stockbot_closed_trades_bundle():
     """
     Full closed-trades payload (cached); per-request ?limit= slices without re-reading logs.
@@ -3553,6 +3687,11 @@ def _calculate_signal_funnel():
     from datetime import datetime, timezone, timedelta
     
     try:
+        rm = _dashboard_read_models()
+        if rm is not None:
+            c = rm.view("signal_flow")
+            return _signal_funnel_payload(c["alerts"], c["parsed"], c["scored_above_3"], c["orders_sent"])
+
         from config.registry import LogFiles, CacheFiles
         
         alerts_count = 0
@@ -3666,27 +3805,7 @@ def _calculate_signal_funnel():
             if orders_sent > 0:
                 break
         
-        # Calculate conversion rates
-        parsed_rate = (parsed_count / alerts_count * 100) if alerts_count > 0 else 0
-        scored_rate = (scored_above_3 / alerts_count * 100) if alerts_count > 0 else 0
-        order_rate = (orders_sent / alerts_count * 100) if alerts_count > 0 else 0
-        overall_conversion = order_rate  # Overall: alerts -> orders
-        
-        return {
-            "alerts": alerts_count,
-            "parsed": parsed_count,
-            "scored_above_3": scored_above_3,
-            "scored_above_threshold": scored_above_3,  # Frontend expects this name
-            "orders_sent": orders_sent,
-            "parsed_rate": round(parsed_rate, 2),
-            "parsed_rate_pct": round(parsed_rate, 2),  # Frontend expects _pct suffix
-            "scored_rate": round(scored_rate, 2),
-            "scored_rate_pct": round(scored_rate, 2),  # Frontend expects _pct suffix
-            "order_rate": round(order_rate, 2),
-            "order_rate_pct": round(order_rate, 2),  # Frontend expects _pct suffix
-            "overall_conversion_pct": round(overall_conversion, 2),  # Frontend expects this
-            "conversion_healthy": order_rate >= 2.0  # Healthy if > 2% conversion
-        }
+        return _signal_funnel_payload(alerts_count, parsed_count, scored_above_3, orders_sent)
     except Exception as e:
         return {
             "alerts": 0,
@@ -3696,6 +3815,31 @@ def _calculate_signal_funnel():
             "error": str(e)
         }
 
+
+def _signal_funnel_payload(alerts_count, parsed_count, scored_above_3, orders_sent):
+    # Calculate conversion rates
+    parsed_rate = (parsed_count / alerts_count * 100) if alerts_count > 0 else 0
+    scored_rate = (scored_above_3 / alerts_count * 100) if alerts_count > 0 else 0
+    order_rate = (orders_sent / alerts_count * 100) if alerts_count > 0 else 0
+    overall_conversion = order_rate  # Overall: alerts -> orders
+    
+    return {
+        "alerts": alerts_count,
+        "parsed": parsed_count,
+        "scored_above_3": scored_above_3,
+        "scored_above_threshold": scored_above_3,  # Frontend expects this name
+        "orders_sent": orders_sent,
+        "parsed_rate": round(parsed_rate, 2),
+        "parsed_rate_pct": round(parsed_rate, 2),  # Frontend expects _pct suffix
+        "scored_rate": round(scored_rate, 2),
+        "scored_rate_pct": round(scored_rate, 2),  # Frontend expects _pct suffix
+        "order_rate": round(order_rate, 2),
+        "order_rate_pct": round(order_rate, 2),  # Frontend expects _pct suffix
+        "overall_conversion_pct": round(overall_conversion, 2),  # Frontend expects this
+        "conversion_healthy": order_rate >= 2.0  # Healthy if > 2% conversion
+    }
+
+
 def _calculate_stagnation_watchdog():
     """Calculate Stagnation Watchdog: > 50 alerts but 0 trades = STAGNATION status"""
     from pathlib import Path
@@ -3711,10 +3855,14 @@ def _calculate_stagnation_watchdog():
         
         # Check last 30 minutes (matching dashboard display)
         cutoff = datetime.now(timezone.utc) - timedelta(minutes=30)
+        rm = _dashboard_read_models()
+        if rm is not None:
+            c = rm.view("signal_flow")
+            alerts_received, trades_executed = c["alerts"], c["trades_executed"]
         
         # Count alerts from multiple UW log sources
         from config.registry import CacheFiles
-        uw_logs = [
+        uw_logs = [] if rm is not None else [
             CacheFiles.UW_ATTRIBUTION if hasattr(CacheFiles, 'UW_ATTRIBUTION') else CacheFiles.UW_ATTRIBUTION,
             Path("logs/uw_flow.jsonl"),
             CacheFiles.UW_FLOW_CACHE_LOG if hasattr(CacheFiles, 'UW_FLOW_CACHE_LOG') else Path("data/uw_flow_cache.log.jsonl")
@@ -3748,7 +3896,7 @@ def _calculate_stagnation_watchdog():
                     pass
         
         # Count trades (from attribution - only closed trades count as executed)
-        attribution_logs = [
+        attribution_logs = [] if rm is not None else [
             LogFiles.ATTRIBUTION
         ]
         
@@ -4362,6 +4510,12 @@ def api_executive_summary():
 
 
 def _rolling_pnl_5d_build():
+    rm = _dashboard_read_models()
+    if rm is not None:
+        try:
+            return rm.view("rolling_pnl_5d")
+        except Exception:
+            pass
     path = (_DASHBOARD_ROOT / "reports" / "state" / "rolling_pnl_5d.jsonl").resolve()
     if not path.exists():
         return {
@@ -4495,6 +4649,10 @@ def api_metrics():
     """Light aggregated metrics for dashboard polling (TTL-cached)."""
     try:
         payload = _dash_cache_get("metrics_bundle_v1", _metrics_payload)
+        cache = _dash_ttl_cache_instance()
+        if cache is not None:
+            payload = dict(payload)
+            payload["dash_cache"] = cache.stats()
         return jsonify(payload), 200
     except Exception as e:
         return jsonify({"error": str(e), "timestamp_utc": datetime.now(timezone.utc).isoformat()}), 500
@@ -941,33 +941,102 @@ def _json_sanitize_for_append(obj: Any) -> Any:
         return None
 
 
+def _run_jsonl_rotation_limits() -> Tuple[int, int]:
+    _mb = int(os.environ.get("RUN_JSONL_ROTATE_MAX_BYTES", str(500 * 1024 * 1024)) or 0)
+    _bc = int(os.environ.get("RUN_JSONL_ROTATE_BACKUP_COUNT", "30") or 0)
+    return _mb, _bc
+
+
+def _jsonl_stream_policy(path: str):
+    """
+    Per-stream policy for the buffered JSONL writer (src/infrastructure/jsonl_writer.py).
+    Durable (inline + fsync): JSONL_DURABLE_STREAMS (default orders,attribution); drop-on-full:
+    JSONL_DROP_STREAMS (default none, i.e. backpressure); everything else is async.
+    """
+    from src.infrastructure.jsonl_writer import StreamPolicy
+
+    name = "attribution" if path == str(ATTRIBUTION_LOG_PATH) else Path(path).stem
+    durable = {s.strip() for s in os.environ.get("JSONL_DURABLE_STREAMS", "orders,attribution").split(",") if s.strip()}
+    drop = {s.strip() for s in os.environ.get("JSONL_DROP_STREAMS", "").split(",") if s.strip()}
+    pol = StreamPolicy(mode="durable" if name in durable else "async", overflow="drop" if name in drop else "block")
+    if name == "run":
+        try:
+            _mb, _bc = _run_jsonl_rotation_limits()
+            pol.rotate_max_bytes = _mb
+            pol.rotate = lambda p: _rotate_jsonl_file(p, _mb, _bc)
+        except Exception:
+            pass
+    return pol
+
+
+_JSONL_WRITER = None  # JsonlWriter, or False when JSONL_ASYNC_WRITER=0 / unavailable
+_GET_STRATEGY_ID = None  # strategies.context.get_strategy_id, or False when not importable
+
+
+def _jsonl_writer():
+    global _JSONL_WRITER
+    if _JSONL_WRITER is None:
+        try:
+            from src.infrastructure.jsonl_writer import get_jsonl_writer, jsonl_writer_enabled
+            _JSONL_WRITER = get_jsonl_writer(_jsonl_stream_policy) if jsonl_writer_enabled() else False
+        except Exception:
+            _JSONL_WRITER = False
+    return _JSONL_WRITER or None
+
+
+def flush_jsonl_logs(timeout: float = 5.0) -> None:
+    """
+    Drain buffered jsonl_write records. Called from handle_exit and by the in-process log
+    readers (_read_jsonl, _today_attribution, count_incidents_today, /dashboard/attribution)
+    so they see records still sitting in the async queues.
+    """
+    try:
+        w = _jsonl_writer()
+        if w is not None:
+            w.flush(timeout)
+    except Exception:
+        pass
+
+
 def jsonl_write(name, record):
+    global _GET_STRATEGY_ID
     # CRITICAL: Use standardized path for attribution log
     if name == "attribution":
         path = str(ATTRIBUTION_LOG_PATH)
     else:
         path = os.path.join(LOG_DIR, f"{name}.jsonl")
+    writer = _jsonl_writer()
     # Retention: large run.jsonl rotations (SRE: strict gate / ML continuity on droplet).
-    if name == "run":
+    # The buffered writer rotates from its own size tracking (see _jsonl_stream_policy).
+    if name == "run" and writer is None:
         try:
-            _mb = int(os.environ.get("RUN_JSONL_ROTATE_MAX_BYTES", str(500 * 1024 * 1024)) or 0)
-            _bc = int(os.environ.get("RUN_JSONL_ROTATE_BACKUP_COUNT", "30") or 0)
+            _mb, _bc = _run_jsonl_rotation_limits()
             _rotate_jsonl_file(path, _mb, _bc)
         except Exception:
             pass
     # Multi-strategy: inject strategy_id from context when available
-    try:
-        from strategies.context import get_strategy_id
-        sid = get_strategy_id()
+    if _GET_STRATEGY_ID is None:
+        try:
+            from strategies.context import get_strategy_id
+            _GET_STRATEGY_ID = get_strategy_id
+        except ImportError:
+            _GET_STRATEGY_ID = False
+    if _GET_STRATEGY_ID:
+        sid = _GET_STRATEGY_ID()
         if sid and "strategy_id" not in record:
             record = {**record, "strategy_id": sid}
-    except ImportError:
-        pass
     _safe = _json_sanitize_for_append(record)
     if not isinstance(_safe, dict):
         _safe = {"_sanitize_fallback": True, "value": str(_safe)}
+    line = json.dumps({"ts": now_iso(), **_safe})
+    if writer is not None:
+        try:
+            writer.write_line(path, line)
+            return
+        except Exception:
+            pass
     with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps({"ts": now_iso(), **_safe}) + "\n")
+        f.write(line + "\n")
 
 
 def _tail_resolve_entry_order_id_from_orders_jsonl(
@@ -1527,6 +1596,7 @@ def count_incidents_today() -> int:
     path = os.path.join(LOG_DIR, "alert_error.jsonl")
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     count = 0
+    flush_jsonl_logs(timeout=1.0)
     if os.path.exists(path):
         try:
             with open(path, "r", encoding="utf-8") as f:
@@ -1795,6 +1865,7 @@ def maybe_run_eod_flatten_book(engine) -> None:
         except Exception:
             pass
         return
+    to_flatten = []
     for p in positions:
         sym = str(getattr(p, "symbol", "") or "").strip().upper()
         if not sym:
@@ -1807,10 +1878,22 @@ def maybe_run_eod_flatten_book(engine) -> None:
             continue
         try:
             log_event("eod_flatten", "closing_position", symbol=sym, reason="eod_flatten_3555_et", qty=qty)
-            ex.close_position_with_retries(sym, max_attempts=3, close_reason_tag="eod_flatten_et")
-        except Exception as e:
+        except Exception:
+            pass
+        to_flatten.append(sym)
+    if not to_flatten:
+        return
+    # Submit all flattens concurrently (bounded pool); each symbol keeps its own retry sequence.
+    from src.exit.parallel_exit_executor import run_per_symbol
+
+    results = run_per_symbol(
+        to_flatten,
+        lambda s: ex.close_position_with_retries(s, max_attempts=3, close_reason_tag="eod_flatten_et"),
+    )
+    for sym, res in results.items():
+        if isinstance(res, BaseException):
             try:
-                log_event("eod_flatten", "close_failed", symbol=sym, error=str(e))
+                log_event("eod_flatten", "close_failed", symbol=sym, error=str(res))
             except Exception:
                 pass
 
@@ -5557,29 +5640,17 @@ def compute_atr(api, symbol: str, lookback: int):
         if not all(col in bars.columns for col in ['high', 'low', 'close']):
             return 0.0
         
-        high = bars['high'].values
-        low = bars['low'].values
-        close = bars['close'].values
+        high = bars['high'].to_numpy(dtype=float)
+        low = bars['low'].to_numpy(dtype=float)
+        close = bars['close'].to_numpy(dtype=float)
         
         # BULLETPROOF: Validate arrays have data
         if len(high) < 2 or len(low) < 2 or len(close) < 2:
             return 0.0
         
-        tr_list = []
-        for i in range(1, len(bars)):
-            try:
-                h_l = high[i] - low[i]
-                h_c = abs(high[i] - close[i-1])
-                l_c = abs(low[i] - close[i-1])
-                tr = max(h_l, h_c, l_c)
-                # BULLETPROOF: Validate TR is not NaN/infinity
-                if not (math.isnan(tr) or math.isinf(tr)):
-                    tr_list.append(tr)
-            except (IndexError, ValueError, TypeError):
-                continue  # Skip invalid index
-        
-        # BULLETPROOF: Validate before division
-        atr = (sum(tr_list) / len(tr_list)) if tr_list and len(tr_list) > 0 else 0.0
+        # Mean of finite true ranges (NaN/inf bars skipped; 0.0 when none remain)
+        from src.core.indicators import simple_atr
+        atr = float(simple_atr(high, low, close))
         # Clamp to reasonable range (prevent NaN/infinity)
         atr = max(0.0, min(1000.0, atr))
         _atr_cache[cache_key] = (now, atr)
@@ -6209,8 +6280,21 @@ class AlpacaExecutor:
             pass
 
     def check_order_filled(self, order_id: str, max_wait_sec: float = 2.0) -> tuple:
+        # Event-driven first: wait on the trade_updates order book; one REST check confirms a timeout.
+        poll_window = max_wait_sec
+        try:
+            from src.alpaca.trade_updates import get_live_order_book
+
+            _book = get_live_order_book()
+        except Exception:
+            _book = None
+        if _book is not None:
+            _res = _book.wait_fill(str(order_id), max_wait_sec)
+            if _res is not None:
+                return _res
+            poll_window = 0.0
         start = time.time()
-        while (time.time() - start) < max_wait_sec:
+        while True:
             try:
                 order = self.api.get_order(order_id)
                 status = getattr(order, "status", "")
@@ -6234,9 +6318,72 @@ class AlpacaExecutor:
                     )
                 except Exception:
                     pass
+            if (time.time() - start) >= poll_window:
+                break
             time.sleep(0.2)
         return False, 0, 0.0
 
+    def _confirm_position_flat(self, symbol: str, order_id=None, *, context: str = "exit") -> bool:
+        """
+        True when the trade_updates stream confirms ``symbol`` is flat within
+        ORDER_STATE_FLAT_TIMEOUT_SEC (default 14s, the old polling budget). False when the stream
+        is not connected or timed out — callers then run their list_positions verification.
+        """
+        try:
+            from src.alpaca.trade_updates import get_live_order_book
+
+            book = get_live_order_book()
+            if book is None:
+                return False
+            timeout = float(get_env("ORDER_STATE_FLAT_TIMEOUT_SEC", 14.0, float))
+            t0 = time.time()
+            ok = book.wait_flat(symbol, timeout, order_id=str(order_id) if order_id else None)
+            log_event(
+                context,
+                "close_position_verified" if ok else "close_position_stream_unconfirmed",
+                symbol=symbol,
+                via="trade_updates",
+                wait_sec=round(time.time() - t0, 3),
+            )
+            return bool(ok)
+        except Exception:
+            return False
+
+    def _confirm_close_or_plan_rest(self, symbol: str, order_id=None, *, context: str = "exit") -> Tuple[bool, int]:
+        """
+        ``(position_closed, rest_checks)`` for the close verification blocks:
+        stream-confirmed flat -> ``(True, 0)``; stream connected but timed out -> ``(False, 1)``
+        (one list_positions check, no settle sleep, so the worst case is not doubled);
+        no stream -> 2s settle sleep then ``(False, 5)`` (legacy 5x3s poll).
+        """
+        if self._confirm_position_flat(symbol, order_id, context=context):
+            return True, 0
+        try:
+            from src.alpaca.trade_updates import get_live_order_book
+
+            if get_live_order_book() is not None:
+                return False, 1
+        except Exception:
+            pass
+        time.sleep(2.0)  # Wait for order to process
+        return False, 5
+
+    def _stream_fill_fields(self, order_id) -> Tuple[int, float]:
+        """``(filled_qty, filled_avg_price)`` for ``order_id`` from the trade_updates book, ``(0, 0.0)`` if unknown."""
+        if not order_id:
+            return 0, 0.0
+        try:
+            from src.alpaca.trade_updates import get_live_order_book
+
+            book = get_live_order_book()
+            st = book.order(str(order_id)) if book is not None else None
+            res = st.fill_result() if st is not None else None
+            if res and res[0]:
+                return int(res[1] or 0), float(res[2] or 0.0)
+        except Exception:
+            pass
+        return 0, 0.0
+
     def _alpaca_order_fees_and_slippage_bps(self, order_id: str, filled_avg_price: float) -> Tuple[float, Optional[float]]:
         """Best-effort commission/regulatory fees and limit-vs-fill slippage (bps) for ML exit rows."""
         api = getattr(self, "api", None)
@@ -7137,15 +7284,21 @@ class AlpacaExecutor:
 
         ofi_roll_60 = 0.0
         ofi_roll_300 = 0.0
+        _stream_ind = None
         try:
             from src.alpaca.stream_manager import get_stream_manager
 
             _md_m = get_stream_manager()
-            _ot = getattr(_md_m, "ofi_tracker", None) if _md_m is not None else None
-            if _ot is not None:
-                _sym_u = str(symbol or "").upper().strip()
-                if _sym_u:
-                    ofi_roll_60, ofi_roll_300 = _ot.rolling_sums(_sym_u)
+            _sym_u = str(symbol or "").upper().strip()
+            if _md_m is not None and _sym_u:
+                # O(1) rolling bar indicators + OFI sums; bare OFI when the bar stream is stale.
+                _stream_ind = _md_m.indicator_snapshot(
+                    _sym_u, max_age_sec=get_env("ALPACA_STREAM_BAR_MAX_AGE_SEC", 60.0, float)
+                )
+                if _stream_ind is not None:
+                    ofi_roll_60, ofi_roll_300 = _stream_ind.ofi_60s, _stream_ind.ofi_300s
+                elif getattr(_md_m, "ofi_tracker", None) is not None:
+                    ofi_roll_60, ofi_roll_300 = _md_m.ofi_tracker.rolling_sums(_sym_u)
         except Exception:
             pass
 
@@ -7187,6 +7340,16 @@ class AlpacaExecutor:
             _snap_pending["shadow_vamp_limit_price"] = float(_shadow_vlp)
         if _shadow_vm is not None and math.isfinite(float(_shadow_vm)):
             _snap_pending["shadow_vamp_mid"] = float(_shadow_vm)
+        if _stream_ind is not None:
+            _snap_pending.update(
+                {
+                    "ofi_l1_roll_10s_sum": float(_stream_ind.ofi_10s),
+                    "stream_atr": _stream_ind.atr,
+                    "stream_ema": float(_stream_ind.ema),
+                    "stream_vwap_dev": _stream_ind.vwap_dev,
+                    "stream_realized_vol": _stream_ind.realized_vol,
+                }
+            )
         self._pending_entry_snapshot = _snap_pending
 
         # Paper-only A/B execution promo (PASSIVE_THEN_CROSS vs baseline); gated by env + universe. Never arms for live.
@@ -8255,9 +8418,11 @@ class AlpacaExecutor:
                         exit_fill_qty = int(fq or 0)
                         exit_fill_price = float(fp or 0.0)
                 
-                # CRITICAL: Verify position was actually closed
-                time.sleep(2.0)  # Wait for order to process
-                for verify_attempt in range(5):
+                # CRITICAL: Verify position was actually closed (trade_updates first, REST polling fallback)
+                position_closed, rest_checks = self._confirm_close_or_plan_rest(symbol, exit_order_id, context="displacement")
+                if position_closed and (exit_fill_qty <= 0 or exit_fill_price <= 0):
+                    exit_fill_qty, exit_fill_price = self._stream_fill_fields(exit_order_id)
+                for verify_attempt in range(rest_checks):
                     try:
                         positions = self.api.list_positions()
                         v_positions = [p for p in positions if getattr(p, "symbol", "") == symbol]
@@ -8265,11 +8430,11 @@ class AlpacaExecutor:
                             position_closed = True
                             log_event("displacement", "close_position_verified", symbol=symbol, verify_attempt=verify_attempt+1)
                             break
-                        elif verify_attempt < 4:
+                        elif verify_attempt < rest_checks - 1:
                             time.sleep(3.0)
                             log_event("displacement", "close_position_still_open", symbol=symbol, verify_attempt=verify_attempt+1)
                     except Exception as verify_err:
-                        if verify_attempt < 4:
+                        if verify_attempt < rest_checks - 1:
                             time.sleep(2.0)
                         else:
                             # Can't verify, assume closed (fail open)
@@ -8773,6 +8938,48 @@ class AlpacaExecutor:
         except Exception:
             return 0.0
 
+    def _exit_market_snapshots(self, symbols) -> dict:
+        """Batched quotes/trades/1Min bars for one evaluate_exits cycle (see src.exit.exit_market_snapshot)."""
+        try:
+            from src.exit.exit_market_snapshot import build_exit_snapshots, exit_market_snapshot_enabled
+
+            symbols = list(symbols or [])
+            if not symbols or not exit_market_snapshot_enabled():
+                return {}
+            # Enough bars for both the offense and the dynamic ATR trail.
+            bar_limit = 0
+            for lim_key, per_key, defaults in (
+                ("OFFENSE_ATR_BAR_LIMIT", "OFFENSE_ATR_PERIOD", (80, 14)),
+                ("DYNAMIC_ATR_BAR_LIMIT", "DYNAMIC_ATR_PERIOD", (80, 14)),
+            ):
+                try:
+                    lim = int(os.environ.get(lim_key, str(defaults[0])))
+                except ValueError:
+                    lim = defaults[0]
+                try:
+                    per = int(os.environ.get(per_key, str(defaults[1])))
+                except ValueError:
+                    per = defaults[1]
+                bar_limit = max(bar_limit, lim, per + 5)
+            price_cache = None
+            try:
+                from src.alpaca.stream_manager import get_stream_manager
+
+                mgr = get_stream_manager()
+                price_cache = getattr(mgr, "price_cache", None) if mgr is not None else None
+            except Exception:
+                price_cache = None
+            return build_exit_snapshots(
+                self.api,
+                symbols,
+                bar_limit=bar_limit,
+                price_cache=price_cache,
+                on_error=lambda kind, e: log_event("exit", "market_snapshot_batch_error", kind=kind, error=str(e)),
+            )
+        except Exception as e:
+            log_event("exit", "market_snapshot_error", error=str(e))
+            return {}
+
     def reload_positions_from_metadata(self):
         """Reload position tracking from metadata file (for health check auto-fix).
 
@@ -9202,6 +9409,22 @@ class AlpacaExecutor:
                         log_event("exit", "position_eval_setup_error", symbol=symbol, error=str(e))
                         continue
         
+        # One batched market-data pass for every equity position this cycle (stream cache first);
+        # per-symbol REST calls below are only fallbacks for what the snapshot could not cover.
+        exit_snapshots = self._exit_market_snapshots(
+            [s for s in positions_to_evaluate if not _equity_exit_skip_option_leg(s, positions_index.get(s))]
+        )
+
+        def _exit_price(sym):
+            snap = exit_snapshots.get(str(sym).upper())
+            px = snap.price if snap is not None else 0.0
+            return px if px > 0 else self.get_quote_price(sym)
+
+        def _exit_bars(sym, limit):
+            snap = exit_snapshots.get(str(sym).upper())
+            bars = snap.bars(limit) if snap is not None else None
+            return bars if bars is not None else fetch_bars_safe(self.api, sym, "1Min", limit=limit)
+
         # Now evaluate all positions
         for symbol, pos_data in positions_to_evaluate.items():
             # Hard firewall: equity exit stack must not run on OCC options (wheel-only lifecycle).
@@ -9236,9 +9459,9 @@ class AlpacaExecutor:
                     pos = positions_index[symbol]
                     current_price = float(getattr(pos, "current_price", 0))
                     if current_price <= 0:
-                        current_price = self.get_quote_price(symbol)
+                        current_price = _exit_price(symbol)
                 else:
-                    current_price = self.get_quote_price(symbol)
+                    current_price = _exit_price(symbol)
                 
                 if current_price <= 0:
                     # FIX: Use entry price as fallback for after-hours exit evaluation
@@ -9365,7 +9588,7 @@ class AlpacaExecutor:
                         except ValueError:
                             _oa_bar_lim = 80
                         _oa_bar_lim = max(_oa_bar_lim, _oa_period + 5)
-                        _bars_oa = fetch_bars_safe(self.api, symbol, "1Min", limit=_oa_bar_lim)
+                        _bars_oa = _exit_bars(symbol, _oa_bar_lim)
                         _df_oa = getattr(_bars_oa, "df", None) if _bars_oa is not None else None
                         _sym_meta_oa = all_metadata.get(symbol, {})
                         if not isinstance(_sym_meta_oa, dict):
@@ -9389,9 +9612,9 @@ class AlpacaExecutor:
                         )
 
                         if _df_oa is not None and len(_df_oa) >= _oa_period + 1:
-                            _h_oa = [float(x) for x in _df_oa["high"].tolist()]
-                            _l_oa = [float(x) for x in _df_oa["low"].tolist()]
-                            _c_oa = [float(x) for x in _df_oa["close"].tolist()]
+                            _h_oa = _df_oa["high"].to_numpy(dtype=float)
+                            _l_oa = _df_oa["low"].to_numpy(dtype=float)
+                            _c_oa = _df_oa["close"].to_numpy(dtype=float)
                             _atr_now_oa = wilders_atr_last(_h_oa, _l_oa, _c_oa, period=_oa_period)
                             _entry_atr = _oa_state.get("entry_atr")
                             try:
@@ -9521,7 +9744,7 @@ class AlpacaExecutor:
                         except ValueError:
                             _atr_bar_lim = 80
                         _atr_bar_lim = max(_atr_bar_lim, _atr_period + 5)
-                        _bars_atr = fetch_bars_safe(self.api, symbol, "1Min", limit=_atr_bar_lim)
+                        _bars_atr = _exit_bars(symbol, _atr_bar_lim)
                         _df_atr = getattr(_bars_atr, "df", None) if _bars_atr is not None else None
                         if _df_atr is not None and len(_df_atr) >= _atr_period + 1:
                             from src.exit.dynamic_trailing_stops import (
@@ -9532,9 +9755,9 @@ class AlpacaExecutor:
                                 wilders_atr_last,
                             )
 
-                            _h_atr = [float(x) for x in _df_atr["high"].tolist()]
-                            _l_atr = [float(x) for x in _df_atr["low"].tolist()]
-                            _c_atr = [float(x) for x in _df_atr["close"].tolist()]
+                            _h_atr = _df_atr["high"].to_numpy(dtype=float)
+                            _l_atr = _df_atr["low"].to_numpy(dtype=float)
+                            _c_atr = _df_atr["close"].to_numpy(dtype=float)
                             _atr_now = wilders_atr_last(_h_atr, _l_atr, _c_atr, period=_atr_period)
                             _sym_meta_early = all_metadata.get(symbol, {})
                             if not isinstance(_sym_meta_early, dict):
@@ -10531,6 +10754,9 @@ class AlpacaExecutor:
             except:
                 pass
         
+        # Phase 1 (in to_close order): resolve entry info + decision price and write the
+        # EXIT_DECISION snapshot before any close order is placed.
+        prepared = {}
         for symbol in to_close:
             try:
                 # Profitability push: telemetry for exit_reason distribution (no "unknown")
@@ -10622,122 +10848,32 @@ class AlpacaExecutor:
                     )
                 except Exception:
                     pass
-                # BULLETPROOF: Safe position close with error handling and verification
-                position_closed = False
-                close_attempts = 0
-                max_close_attempts = 3
-                exit_order_id = None
-                exit_fill_qty = 0
-                exit_fill_price = 0.0
-                
-                while not position_closed and close_attempts < max_close_attempts:
-                    close_attempts += 1
-                    try:
-                        # Attempt to close position
-                        # Contract: closes should succeed even if qty is reserved by open orders.
-                        close_order = self.close_position_api_once(symbol)
-                        if close_order is None:
-                            raise RuntimeError("close_position_api_once returned None")
-                        exit_order_id = getattr(close_order, "id", None)
-                        log_event("exit", "close_position_api_called", symbol=symbol, attempt=close_attempts, exit_order_id=str(exit_order_id) if exit_order_id else None)
-                        
-                        # Fill-sourcing contract: wait for executed fill fields from Alpaca.
-                        try:
-                            max_wait = float(get_env("ATTRIBUTION_EXIT_FILL_WAIT_SEC", 20.0, float))
-                        except Exception:
-                            max_wait = 20.0
-                        if exit_order_id:
-                            filled, fq, fp = self.check_order_filled(str(exit_order_id), max_wait_sec=max_wait)
-                            if filled:
-                                exit_fill_qty = int(fq or 0)
-                                exit_fill_price = float(fp or 0.0)
-                            else:
-                                log_event(
-                                    "exit",
-                                    "close_order_pending_fill",
-                                    symbol=symbol,
-                                    exit_order_id=str(exit_order_id),
-                                    note="Close order submitted but fill fields not yet available; will not attribute until filled.",
-                                )
-                        
-                        # CRITICAL: Verify position was actually closed by polling Alpaca
-                        # Wait a moment for order to process
-                        time.sleep(2.0)
-                        
-                        # Verify position is closed
-                        verify_attempts = 0
-                        max_verify_attempts = 5
-                        while verify_attempts < max_verify_attempts:
-                            verify_attempts += 1
-                            try:
-                                positions = self.api.list_positions()
-                                v_positions = [p for p in positions if getattr(p, "symbol", "") == symbol]
-                                
-                                if not v_positions:
-                                    # Position is closed - verification successful
-                                    position_closed = True
-                                    print(f"DEBUG EXITS: Successfully closed and verified {symbol} (attempt {close_attempts}, verify {verify_attempts})", flush=True)
-                                    log_event("exit", "close_position_verified", symbol=symbol, 
-                                            close_attempt=close_attempts, verify_attempt=verify_attempts)
-                                    # If we verified closure but missed fill fields, retry briefly (fill fields may lag).
-                                    if (exit_fill_price <= 0 or exit_fill_qty <= 0) and exit_order_id:
-                                        try:
-                                            filled2, fq2, fp2 = self.check_order_filled(str(exit_order_id), max_wait_sec=5.0)
-                                            if filled2:
-                                                exit_fill_qty = int(fq2 or 0)
-                                                exit_fill_price = float(fp2 or 0.0)
-                                        except Exception:
-                                            pass
-                                    break
-                                else:
-                                    # Position still exists - wait and retry verification
-                                    if verify_attempts < max_verify_attempts:
-                                        log_event("exit", "close_position_still_open", symbol=symbol, 
-                                                close_attempt=close_attempts, verify_attempt=verify_attempts,
-                                                qty=v_positions[0].qty if v_positions else 0)
-                                        time.sleep(3.0)  # Wait 3 seconds before next verification
-                                    else:
-                                        # Max verification attempts reached, position still open
-                                        log_event("exit", "close_position_verification_failed", symbol=symbol,
-                                                close_attempt=close_attempts, verify_attempt=verify_attempts,
-                                                qty=v_positions[0].qty if v_positions else 0,
-                                                error="Position still exists after max verification attempts")
-                                        print(f"WARNING EXITS: {symbol} still open after {max_verify_attempts} verification attempts", flush=True)
-                            except Exception as verify_err:
-                                log_event("exit", "close_position_verify_error", symbol=symbol, 
-                                        error=str(verify_err), verify_attempt=verify_attempts)
-                                if verify_attempts < max_verify_attempts:
-                                    time.sleep(2.0)
-                                else:
-                                    # Can't verify, but API call succeeded - assume closed (fail open)
-                                    log_event("exit", "close_position_verify_failed_assume_closed", symbol=symbol,
-                                            error=str(verify_err))
-                                    position_closed = True  # Assume closed if we can't verify
-                                    break
-                        
-                        if position_closed:
-                            break  # Successfully closed and verified
-                            
-                    except Exception as close_err:
-                        # Contract: Exit failure handlers MUST NOT throw secondary exceptions.
-                        # Use a local alias so future edits can't break retry sleeps via shadowing `time`.
-                        import time as _time
-                        log_event("exit", "close_position_failed", symbol=symbol, error=str(close_err), attempt=close_attempts)
-                        print(f"ERROR EXITS: Failed to close {symbol} (attempt {close_attempts}/{max_close_attempts}): {close_err}", flush=True)
-                        
-                        if close_attempts < max_close_attempts:
-                            # Retry after delay
-                            wait_time = 2.0 * close_attempts  # Exponential backoff: 2s, 4s
-                            log_event("exit", "close_position_retry", symbol=symbol, attempt=close_attempts, wait_sec=wait_time)
-                            _time.sleep(wait_time)
-                        else:
-                            # All attempts failed
-                            log_event("exit", "close_position_all_attempts_failed", symbol=symbol, 
-                                    attempts=max_close_attempts, error=str(close_err))
-                            print(f"ERROR EXITS: All {max_close_attempts} attempts to close {symbol} failed", flush=True)
-                            # Continue to next position - don't remove from tracking so it can be retried next cycle
-                            continue  # Skip to next position, keep this one in tracking
-                
+                prepared[symbol] = (info, entry_price, holding_period_min, decision_exit_price)
+            except Exception as e:
+                log_order({"action": "close_position_failed", "symbol": symbol, "error": str(e)})
+                print(f"ERROR EXITS: Exception closing {symbol}: {e}", flush=True)
+                try:
+                    traceback.print_exc()
+                except Exception:
+                    pass
+                # DO NOT remove from tracking on exception - allow retry next cycle
+                log_event("exit", "close_position_exception_keep_tracking", symbol=symbol, error=str(e))
+
+        # Phase 2: submit every close up front and confirm them concurrently (bounded pool, one
+        # task per symbol so each symbol keeps its own retry/verify sequence).
+        close_results = {}
+        if prepared:
+            from src.exit.parallel_exit_executor import run_per_symbol
+            close_results = run_per_symbol(list(prepared), self._close_position_confirmed)
+
+        # Phase 3 (in to_close order): attribution, telemetry and tracking cleanup.
+        for symbol, (info, entry_price, holding_period_min, decision_exit_price) in prepared.items():
+            try:
+                _close_res = close_results.get(symbol)
+                if isinstance(_close_res, BaseException):
+                    raise _close_res
+                position_closed, close_attempts, exit_order_id, exit_fill_qty, exit_fill_price = _close_res
+
                 if not position_closed:
                     # Position could not be closed after all attempts
                     log_event("exit", "close_position_not_verified", symbol=symbol, attempts=close_attempts)
@@ -10972,6 +11108,133 @@ class AlpacaExecutor:
                 # DO NOT remove from tracking on exception - allow retry next cycle
                 log_event("exit", "close_position_exception_keep_tracking", symbol=symbol, error=str(e))
     
+    def _close_position_confirmed(self, symbol: str):
+        """
+        Close ``symbol`` and confirm it is flat: up to 3 close attempts (2s/4s backoff), fill wait,
+        trade_updates flat confirmation, then ``list_positions`` verification as the fallback.
+
+        Returns ``(position_closed, close_attempts, exit_order_id, exit_fill_qty, exit_fill_price)``.
+        Runs on the exit pool (``src.exit.parallel_exit_executor``), one call per symbol.
+        """
+        # BULLETPROOF: Safe position close with error handling and verification
+        position_closed = False
+        close_attempts = 0
+        max_close_attempts = 3
+        exit_order_id = None
+        exit_fill_qty = 0
+        exit_fill_price = 0.0
+
+        while not position_closed and close_attempts < max_close_attempts:
+            close_attempts += 1
+            try:
+                # Attempt to close position
+                # Contract: closes should succeed even if qty is reserved by open orders.
+                close_order = self.close_position_api_once(symbol)
+                if close_order is None:
+                    raise RuntimeError("close_position_api_once returned None")
+                exit_order_id = getattr(close_order, "id", None)
+                log_event("exit", "close_position_api_called", symbol=symbol, attempt=close_attempts, exit_order_id=str(exit_order_id) if exit_order_id else None)
+
+                # Fill-sourcing contract: wait for executed fill fields from Alpaca.
+                try:
+                    max_wait = float(get_env("ATTRIBUTION_EXIT_FILL_WAIT_SEC", 20.0, float))
+                except Exception:
+                    max_wait = 20.0
+                if exit_order_id:
+                    filled, fq, fp = self.check_order_filled(str(exit_order_id), max_wait_sec=max_wait)
+                    if filled:
+                        exit_fill_qty = int(fq or 0)
+                        exit_fill_price = float(fp or 0.0)
+                    else:
+                        log_event(
+                            "exit",
+                            "close_order_pending_fill",
+                            symbol=symbol,
+                            exit_order_id=str(exit_order_id),
+                            note="Close order submitted but fill fields not yet available; will not attribute until filled.",
+                        )
+
+                # CRITICAL: Verify position was actually closed (trade_updates first, else poll Alpaca)
+                position_closed, max_verify_attempts = self._confirm_close_or_plan_rest(symbol, exit_order_id, context="exit")
+                if position_closed and (exit_fill_price <= 0 or exit_fill_qty <= 0):
+                    # Stream-confirmed close skips the REST loop (and its fill retry): take fill fields from the book.
+                    exit_fill_qty, exit_fill_price = self._stream_fill_fields(exit_order_id)
+
+                # Verify position is closed
+                verify_attempts = 0
+                while verify_attempts < max_verify_attempts:
+                    verify_attempts += 1
+                    try:
+                        positions = self.api.list_positions()
+                        v_positions = [p for p in positions if getattr(p, "symbol", "") == symbol]
+
+                        if not v_positions:
+                            # Position is closed - verification successful
+                            position_closed = True
+                            print(f"DEBUG EXITS: Successfully closed and verified {symbol} (attempt {close_attempts}, verify {verify_attempts})", flush=True)
+                            log_event("exit", "close_position_verified", symbol=symbol, 
+                                    close_attempt=close_attempts, verify_attempt=verify_attempts)
+                            # If we verified closure but missed fill fields, retry briefly (fill fields may lag).
+                            if (exit_fill_price <= 0 or exit_fill_qty <= 0) and exit_order_id:
+                                try:
+                                    filled2, fq2, fp2 = self.check_order_filled(str(exit_order_id), max_wait_sec=5.0)
+                                    if filled2:
+                                        exit_fill_qty = int(fq2 or 0)
+                                        exit_fill_price = float(fp2 or 0.0)
+                                except Exception:
+                                    pass
+                            break
+                        else:
+                            # Position still exists - wait and retry verification
+                            if verify_attempts < max_verify_attempts:
+                                log_event("exit", "close_position_still_open", symbol=symbol, 
+                                        close_attempt=close_attempts, verify_attempt=verify_attempts,
+                                        qty=v_positions[0].qty if v_positions else 0)
+                                time.sleep(3.0)  # Wait 3 seconds before next verification
+                            else:
+                                # Max verification attempts reached, position still open
+                                log_event("exit", "close_position_verification_failed", symbol=symbol,
+                                        close_attempt=close_attempts, verify_attempt=verify_attempts,
+                                        qty=v_positions[0].qty if v_positions else 0,
+                                        error="Position still exists after max verification attempts")
+                                print(f"WARNING EXITS: {symbol} still open after {max_verify_attempts} verification attempts", flush=True)
+                    except Exception as verify_err:
+                        log_event("exit", "close_position_verify_error", symbol=symbol, 
+                                error=str(verify_err), verify_attempt=verify_attempts)
+                        if verify_attempts < max_verify_attempts:
+                            time.sleep(2.0)
+                        else:
+                            # Can't verify, but API call succeeded - assume closed (fail open)
+                            log_event("exit", "close_position_verify_failed_assume_closed", symbol=symbol,
+                                    error=str(verify_err))
+                            position_closed = True  # Assume closed if we can't verify
+                            break
+
+                if position_closed:
+                    break  # Successfully closed and verified
+
+            except Exception as close_err:
+                # Contract: Exit failure handlers MUST NOT throw secondary exceptions.
+                # Use a local alias so future edits can't break retry sleeps via shadowing `time`.
+                import time as _time
+                log_event("exit", "close_position_failed", symbol=symbol, error=str(close_err), attempt=close_attempts)
+                print(f"ERROR EXITS: Failed to close {symbol} (attempt {close_attempts}/{max_close_attempts}): {close_err}", flush=True)
+
+                if close_attempts < max_close_attempts:
+                    # Retry after delay
+                    wait_time = 2.0 * close_attempts  # Exponential backoff: 2s, 4s
+                    log_event("exit", "close_position_retry", symbol=symbol, attempt=close_attempts, wait_sec=wait_time)
+                    _time.sleep(wait_time)
+                else:
+                    # All attempts failed
+                    log_event("exit", "close_position_all_attempts_failed", symbol=symbol, 
+                            attempts=max_close_attempts, error=str(close_err))
+                    print(f"ERROR EXITS: All {max_close_attempts} attempts to close {symbol} failed", flush=True)
+                    # Retries exhausted - caller keeps the position in tracking so it can be retried next cycle
+                    continue
+
+        return position_closed, close_attempts, exit_order_id, exit_fill_qty, exit_fill_price
+
     def _remove_position_metadata(self, symbol: str):
         """Remove closed position from metadata file with atomic write."""
         metadata_path = StateFiles.POSITION_METADATA
@@ -11063,6 +11326,18 @@ class StrategyEngine:
             except Exception as e:
                 log_event("alpaca_stream", "init_failed", error=str(e))
 
+        # Order-state service: trade_updates stream for event-driven fill / close confirmation.
+        try:
+            from src.alpaca.trade_updates import ensure_order_state_service
+
+            ensure_order_state_service(
+                Config.ALPACA_KEY or "",
+                Config.ALPACA_SECRET or "",
+                (Config.ALPACA_BASE_URL or "").strip(),
+            )
+        except Exception as e:
+            log_event("order_state", "init_failed", error=str(e))
+
     def score_cluster(self, cluster: dict, confirm_score: float, gex: dict, market_regime: str = "mixed") -> float:
         safe_cluster = normalize_cluster(cluster)
         base_score = min(safe_cluster["count"], 10) * Config.FLOW_COUNT_W
@@ -11409,6 +11684,7 @@ class StrategyEngine:
                                      alerts_30m=stagnation.get("alerts_30m", 0),
                                      orders_30m=stagnation.get("orders_30m", 0),
                                      regime=market_regime)
+                            invalidate_engine("warm_reload")
                     elif detector.trigger_soft_reset():
                         log_event("logic_stagnation", "soft_reset_triggered", 
                                  reason=stagnation.get("reason"),
@@ -11994,12 +12270,14 @@ class StrategyEngine:
                         position_closed = False
                         try:
                             # Contract: closes should succeed even if qty is reserved by open orders.
-                            self.executor.close_position_with_retries(symbol, max_attempts=3, close_reason_tag="position_flip_close")
+                            _flip_order = self.executor.close_position_with_retries(symbol, max_attempts=3, close_reason_tag="position_flip_close")
                             log_event("position_flip", "close_position_api_called", symbol=symbol)
                             
-                            # CRITICAL: Verify position was actually closed
-                            time.sleep(2.0)  # Wait for order to process
-                            for verify_attempt in range(5):
+                            # CRITICAL: Verify position was actually closed (trade_updates first, REST polling fallback)
+                            position_closed, rest_checks = self.executor._confirm_close_or_plan_rest(
+                                symbol, getattr(_flip_order, "id", None), context="position_flip"
+                            )
+                            for verify_attempt in range(rest_checks):
                                 try:
                                     positions = self.executor.api.list_positions()
                                     v_positions = [p for p in positions if getattr(p, "symbol", "") == symbol]
@@ -12007,11 +12285,11 @@ class StrategyEngine:
                                         position_closed = True
                                         log_event("position_flip", "close_position_verified", symbol=symbol, verify_attempt=verify_attempt+1)
                                         break
-                                    elif verify_attempt < 4:
+                                    elif verify_attempt < rest_checks - 1:
                                         time.sleep(3.0)
                                         log_event("position_flip", "close_position_still_open", symbol=symbol, verify_attempt=verify_attempt+1)
                                 except Exception as verify_err:
-                                    if verify_attempt < 4:
+                                    if verify_attempt < rest_checks - 1:
                                         time.sleep(2.0)
                                     else:
                                         # Can't verify, assume closed (fail open)
@@ -14851,13 +15129,66 @@ def generate_eod_report(date_str=None):
 # =========================
 # UW CACHE INTEGRATION (Transitional composite scoring)
 # =========================
+def _uw_cache_shard_store():
+    """Sharded UW cache store when ``UW_CACHE_SHARDED=1`` and the daemon has written a manifest."""
+    try:
+        from src.uw.uw_cache_store import get_shard_store, uw_cache_sharded_enabled
+
+        if not uw_cache_sharded_enabled():
+            return None
+        store = get_shard_store()
+        return store if store.exists() else None
+    except Exception as e:
+        log_event("uw_cache", "uw_cache_shards_unavailable", error=str(e), error_type=type(e).__name__)
+        return None
+
+
+def write_uw_cache_rows(uw_cache: dict, tickers=None, fields=None) -> None:
+    """Persist in-memory edits to UW cache rows.
+
+    Sharded mode merges only ``fields`` of the named tickers into their shards (so concurrent
+    daemon writes to other keys survive); otherwise the monolith is rewritten as before.
+    """
+    store = _uw_cache_shard_store()
+    if store is None:
+        atomic_write_json(CacheFiles.UW_FLOW_CACHE, uw_cache)
+        return
+    names = list(tickers) if tickers is not None else [k for k in uw_cache.keys() if not str(k).startswith("_")]
+    for t in names:
+        row = uw_cache.get(t)
+        if not isinstance(row, dict):
+            continue
+        # market_tide is materialized from the global section on read; keep shards lean.
+        keys = [k for k in (fields if fields is not None else row.keys()) if k in row and k != "market_tide"]
+        if keys:
+            store.merge_ticker(t, {k: row[k] for k in keys})
+
+
 @global_failure_wrapper("uw_cache")
-def read_uw_cache():
+def read_uw_cache(since_generation=None):
     """Read UW cache populated by daemon.
 
     Contract: read_uw_cache() MUST NOT raise ImportError in production.
     If UW cache is missing/corrupt/unreadable, it MUST return {} and log a clear event.
+
+    With ``UW_CACHE_SHARDED=1`` the per-ticker shards are read instead of the monolith;
+    ``since_generation`` (from a previous ``_metadata.generation``) limits the result to
+    tickers the daemon changed since then.
     """
+    store = _uw_cache_shard_store()
+    if store is not None:
+        try:
+            if since_generation is not None:
+                _gen, cache = store.load_changed(int(since_generation))
+            else:
+                cache = store.load_all()
+            if not any(not str(k).startswith("_") for k in cache.keys()) and since_generation is None:
+                log_event("uw_cache", "uw_cache_empty", uw_cache_path=str(store.root))
+            return cache
+        except Exception as e:
+            log_event("uw_cache", "uw_cache_shards_read_failed", error=str(e), error_type=type(e).__name__,
+                      fallback="monolith")
+
     # BULLETPROOF: Safe cache read with corruption handling and self-healing
     cache_file = CacheFiles.UW_FLOW_CACHE
     if not cache_file.exists():
@@ -14952,6 +15283,107 @@ def audit_seg(name, phase, extra=None):
     with gov_log.open("a") as f:
         f.write(json.dumps(event) + "\n")
 
+# =========================
+# PERSISTENT ENGINE SESSION
+# =========================
+# StrategyEngine / UWClient / wheel executor live across worker cycles (see
+# src/engine/engine_session.py). Rebuilt on weight/profile/theme/strategies file changes,
+# invalidate_engine(), a failed cycle, a failed per-cycle reconcile, or PERSISTENT_ENGINE_MAX_AGE_SEC.
+# The reused AlpacaExecutor still reconciles positions once per cycle. PERSISTENT_ENGINE=0 disables.
+_ENGINE_SESSIONS: Dict[str, Any] = {}
+_ENGINE_SESSIONS_LOCK = threading.Lock()
+
+
+def _engine_config_signature():
+    from src.engine.engine_session import file_signature
+
+    return file_signature([
+        WEIGHTS_PATH,
+        Config.PROFILE_PATH,
+        Config.THEME_MAP_PATH,
+        Path("config") / "strategies.yaml",
+    ])
+
+
+def _build_strategy_engine():
+    engine = StrategyEngine()
+    # AlpacaExecutor.__init__ just reconciled; don't repeat it on this cycle's next get().
+    engine.executor._cycle_reconcile_mono = time.monotonic()
+    return engine
+
+
+def _reconcile_engine_for_cycle(engine):
+    """Per-cycle broker reconcile on the reused executor (positions opened/closed outside the bot).
+
+    run_once() and the worker both acquire the engine each cycle; the second acquire within
+    half a RUN_INTERVAL_SEC is skipped. A failed reconcile rebuilds every session next cycle.
+    """
+    executor = getattr(engine, "executor", None)
+    if executor is None or not hasattr(executor, "_safe_reconcile"):
+        return
+    now = time.monotonic()
+    last = getattr(executor, "_cycle_reconcile_mono", None)
+    if last is not None and (now - last) < max(1.0, Config.RUN_INTERVAL_SEC * 0.5):
+        return
+    executor._cycle_reconcile_mono = now
+    if not executor._safe_reconcile():
+        invalidate_engine("reconcile_failed")
+
+
+def _refresh_engine_for_cycle(engine):
+    """Per-cycle state a freshly built StrategyEngine would have picked up."""
+    engine.uw_flow_cache = telemetry.get_uw_flow_cache()
+    _reconcile_engine_for_cycle(engine)
+
+
+def _build_wheel_executor():
+    # Single v2 REST client: shared with AlpacaExecutor so wheel uses guarded submit + telemetry.
+    api = tradeapi.REST(Config.ALPACA_KEY, Config.ALPACA_SECRET, Config.ALPACA_BASE_URL, api_version="v2")
+    return AlpacaExecutor(defer_reconcile=True, external_api=api)
+
+
+def _engine_session(name: str):
+    with _ENGINE_SESSIONS_LOCK:
+        sess = _ENGINE_SESSIONS.get(name)
+        if sess is not None:
+            return sess
+        from src.engine.engine_session import EngineSession
+
+        def _on_event(event, kw):
+            log_event("engine_session", event, **kw)
+
+        if name == "strategy_engine":
+            sess = EngineSession(_build_strategy_engine, name=name, signature=_engine_config_signature,
+                                 on_reuse=_refresh_engine_for_cycle, on_event=_on_event)
+        elif name == "wheel_executor":
+            sess = EngineSession(_build_wheel_executor, name=name, signature=_engine_config_signature,
+                                 on_event=_on_event)
+        elif name == "uw_client":
+            sess = EngineSession(UWClient, name=name, on_event=_on_event)
+        else:
+            raise KeyError(name)
+        _ENGINE_SESSIONS[name] = sess
+        return sess
+
+
+def get_strategy_engine():
+    """Long-lived StrategyEngine shared by run_once() and the worker's evaluate_exits()."""
+    return _engine_session("strategy_engine").get()
+
+
+def get_uw_client():
+    return _engine_session("uw_client").get()
+
+
+def invalidate_engine(reason: str = "manual") -> None:
+    """Invalidation hook (config / weight changes): every session rebuilds on its next use."""
+    for name in ("strategy_engine", "wheel_executor", "uw_client"):
+        try:
+            _engine_session(name).invalidate(reason)
+        except Exception:
+            pass
+
+
 # =========================
 # MULTI-STRATEGY ORCHESTRATION
 # =========================
@@ -14995,13 +15427,16 @@ def run_all_strategies():
                 combined_metrics.update(metrics)
         except Exception as e:
             log_event("strategies", "equity_run_failed", error=str(e))
+            try:
+                _engine_session("strategy_engine").rebuild_on_error(e)
+            except Exception:
+                pass
     if wheel_enabled:
         try:
             from src.wheel_manager import run_wheel
 
-            # Single v2 REST client: shared with AlpacaExecutor so wheel uses guarded submit + telemetry.
-            api = tradeapi.REST(Config.ALPACA_KEY, Config.ALPACA_SECRET, Config.ALPACA_BASE_URL, api_version="v2")
-            executor = AlpacaExecutor(defer_reconcile=True, external_api=api)
+            executor = _engine_session("wheel_executor").get()
+            api = executor.api
             if strategy_context:
                 with strategy_context("wheel"):
                     wm = run_wheel(api, wheel_cfg, order_executor=executor)
@@ -15016,6 +15451,10 @@ def run_all_strategies():
                 combined_metrics["wheel_result"] = wm
         except Exception as e:
             log_event("strategies", "wheel_run_failed", error=str(e))
+            try:
+                _engine_session("wheel_executor").rebuild_on_error(e)
+            except Exception:
+                pass
             _errs = combined_metrics.setdefault("errors_this_cycle", [])
             if isinstance(_errs, list):
                 _errs.append(f"wheel:{e}")
@@ -15157,8 +15596,8 @@ def run_once():
         except:
             pass
         
-        uw = UWClient()
-        engine = StrategyEngine()
+        uw = get_uw_client()
+        engine = get_strategy_engine()
         degraded_mode = False  # Reduce-only when broker is unreachable
 
         # STRUCTURAL UPGRADE (additive): Market context snapshot (premarket/overnight + vol term proxy).
@@ -15219,7 +15658,23 @@ def run_once():
         ovl_map = {}
         
         audit_seg("run_once", "cache_read")
-        uw_cache = read_uw_cache()
+        # Long-lived view: only tickers the daemon changed are re-parsed / re-normalized / re-enriched.
+        uw_cache_view = None
+        try:
+            from src.uw.uw_cache_view import get_uw_cache_view
+            uw_cache_view = get_uw_cache_view()
+        except Exception as e:
+            log_event("uw_cache", "uw_cache_view_unavailable", error=str(e), error_type=type(e).__name__)
+        if uw_cache_view is not None:
+            try:
+                uw_cache = uw_cache_view.refresh(read_uw_cache)
+                log_event("uw_cache", "uw_cache_view_refresh", **uw_cache_view.last_stats)
+            except Exception as e:
+                log_event("uw_cache", "uw_cache_view_refresh_failed", error=str(e), error_type=type(e).__name__)
+                uw_cache_view = None
+                uw_cache = read_uw_cache()
+        else:
+            uw_cache = read_uw_cache()
         uw_cache_path = str(CacheFiles.UW_FLOW_CACHE)
         
         # SIGNAL FUNNEL TRACKER: Count incoming UW alerts (symbols in cache = alerts received)
@@ -15416,9 +15871,20 @@ def run_once():
                         print(f"DEBUG: Found {len(flow_trades_raw)} raw trades for {ticker}", flush=True)
                     
                     # Normalize raw API trades to match main.py's expected format
-                    uw_client = UWClient()
+                    uw_client = uw
                     normalized_count = 0
                     filtered_count = 0
+                    if uw_cache_view is not None:
+                        # Memoized per ticker version; base_filter stays per-cycle (expiry window moves).
+                        _norm_trades, _norm_failed = uw_cache_view.normalized_flow_trades(ticker, uw_client._normalize_flow_trade)
+                        if _norm_failed:
+                            print(f"DEBUG: Failed to normalize {_norm_failed} trades for {ticker}", flush=True)
+                        for normalized_trade in _norm_trades:
+                            normalized_count += 1
+                            if base_filter(normalized_trade):
+                                all_trades.append(dict(normalized_trade))
+                                filtered_count += 1
+                        flow_trades_raw = ()
                     for raw_trade in flow_trades_raw:
                         try:
                             # Normalize using same logic as UWClient.get_option_flow
@@ -15502,7 +15968,7 @@ def run_once():
                             # Extract flow trades from stale cache
                             flow_trades_raw = cache_data.get("flow_trades", [])
                             if flow_trades_raw:
-                                uw_client = UWClient()
+                                uw_client = uw
                                 for raw_trade in flow_trades_raw:
                                     try:
                                         normalized_trade = uw_client._normalize_flow_trade(raw_trade)
@@ -15577,8 +16043,9 @@ def run_once():
                 _stale = sum(1 for t in _tickers if (_now_ts - (uw_cache.get(t) or {}).get("_last_update", 0)) > 3600)
                 if _tickers and _stale >= max(3, len(_tickers) // 2):
                     for _t in _tickers:
-                        uw_cache[_t]["_last_update"] = _now_ts
-                    atomic_write_json(CacheFiles.UW_FLOW_CACHE, uw_cache)
+                        # Replace rows, never mutate: they are shared with the long-lived UWCacheView.
+                        uw_cache[_t] = {**uw_cache[_t], "_last_update": _now_ts}
+                    write_uw_cache_rows(uw_cache, _tickers, fields=["_last_update"])
                     print(f"DEBUG: Touched stale cache (_last_update) for {len(_tickers)} tickers so freshness=1.0 this cycle (stale_count={_stale})", flush=True)
                     log_event("uw_cache", "stale_touch_for_freshness", touched=len(_tickers), stale_count=_stale)
             except Exception as _e:
@@ -15611,56 +16078,39 @@ def run_once():
                 _LAST_SCORES_PATH = None
             last_scores_dirty = False
             
-            for ticker in all_symbols_to_process:
-                # Skip metadata keys
-                if ticker.startswith("_"):
-                    continue
-                
+            # Parallel compute phase: enrichment, core-feature fill, composite v2 and the alpha-signature
+            # capture are independent per ticker and run on a bounded pool. Everything order-dependent
+            # (telemetry, trackers, counters, gate) runs below in the deterministic (sorted) merge.
+            from src.engine.composite_scoring_stage import StageTimings, run_scoring_stage, scoring_stage_workers
+            _stage_timings = StageTimings()
+            _stage_workers = scoring_stage_workers()
+            _alpha_api = engine.executor.api if hasattr(engine, 'executor') and hasattr(engine.executor, 'api') else None
+
+            def _score_ticker(ticker):
+                res = {"skip": None, "enrich_error": None, "composite": None, "alpha_signature": None, "alpha_error": None}
                 # ROOT CAUSE FIX: Add error handling to prevent KeyError crashes
                 # If ticker is not in cache or cache data is invalid, skip it gracefully
                 try:
                     # Check if ticker exists in cache before processing
                     if ticker not in uw_cache:
-                        print(f"DEBUG: Skipping {ticker} - not in UW cache", flush=True)
-                        continue
-                    
+                        res["skip"] = "not in UW cache"
+                        return res
                     cache_data = uw_cache.get(ticker)
                     if not cache_data or not isinstance(cache_data, dict):
-                        print(f"DEBUG: Skipping {ticker} - invalid cache data", flush=True)
-                        continue
-                    
+                        res["skip"] = "invalid cache data"
+                        return res
                     # V3: Enrichment → Composite V3 FULL INTELLIGENCE → Gate
-                    enriched = uw_enrich.enrich_signal(ticker, uw_cache, market_regime)
-                except KeyError as ke:
-                    print(f"DEBUG: KeyError processing {ticker}: {ke} - skipping", flush=True)
-                    log_event("composite_scoring", "keyerror_skipped", symbol=ticker, error=str(ke))
-                    continue
+                    with _stage_timings.step("enrich"):
+                        if uw_cache_view is not None:
+                            enriched = uw_cache_view.enriched(ticker, market_regime, uw_enrich.enrich_signal)
+                        else:
+                            enriched = uw_enrich.enrich_signal(ticker, uw_cache, market_regime)
                 except Exception as e:
-                    print(f"DEBUG: Exception processing {ticker}: {e} - skipping", flush=True)
-                    log_event("composite_scoring", "exception_skipped", symbol=ticker, error=str(e), error_type=type(e).__name__)
-                    continue
+                    res["enrich_error"] = e
+                    return res
+                res["enriched"] = enriched
 
-                # Observability: record composite version once per cycle.
-                try:
-                    if symbols_processed == 0:
-                        from config.registry import COMPOSITE_WEIGHTS_V2
-                        log_system_event(
-                            subsystem="scoring",
-                            event_type="composite_version_used",
-                            severity="INFO",
-                            details={
-                                "composite_version": "v2",
-                                "v2_weights_version": str((COMPOSITE_WEIGHTS_V2 or {}).get("version", "")) if isinstance(COMPOSITE_WEIGHTS_V2, dict) else "",
-                            },
-                        )
-                except Exception:
-                    pass
-                
-                # Institutional Remediation Phase 3:
-                # Do NOT floor freshness here; freshness is computed in uw_enrichment_v2 and should be allowed
-                # to decay toward 0.0 so the score floor blocks stale/ghost signals.
-                current_freshness = enriched.get("freshness", 1.0)
-                
+                _t_core = time.perf_counter()
                 # CRITICAL FIX: Get symbol_data from cache before using it (MUST be outside freshness check)
                 symbol_data = uw_cache.get(ticker, {})
                 
@@ -15679,7 +16129,7 @@ def run_once():
                         computed_skew = enricher.compute_iv_term_skew(ticker, symbol_data)
                         enriched["iv_term_skew"] = computed_skew
                         if ticker in uw_cache:
-                            uw_cache[ticker]["iv_term_skew"] = computed_skew
+                            uw_cache[ticker] = {**uw_cache[ticker], "iv_term_skew": computed_skew}
                             cache_updated = True
                         missing_core_features.append("iv_term_skew")
                     
@@ -15692,7 +16142,7 @@ def run_once():
                         computed_slope = enricher.compute_smile_slope(ticker, symbol_data)
                         enriched["smile_slope"] = computed_slope
                         if ticker in uw_cache:
-                            uw_cache[ticker]["smile_slope"] = computed_slope
+                            uw_cache[ticker] = {**uw_cache[ticker], "smile_slope": computed_slope}
                             cache_updated = True
                         missing_core_features.append("smile_slope")
                     
@@ -15705,11 +16155,6 @@ def run_once():
                     if enriched.get("event_alignment") is None:
                         enriched["event_alignment"] = 0.0  # Neutral default
                         missing_core_features.append("event_alignment_defaulted")
-                    
-                    # Log missing core features for telemetry
-                    if missing_core_features:
-                        log_event("scoring_pipeline", "core_features_defaulted", 
-                                 symbol=ticker, missing_features=missing_core_features)
                 
                 # Ensure insider exists (with default structure)
                 if not enriched.get("insider") or not isinstance(enriched.get("insider"), dict):
@@ -15722,25 +16167,19 @@ def run_once():
                     }
                     enriched["insider"] = symbol_data.get("insider", default_insider) if isinstance(symbol_data, dict) else default_insider
                     if ticker in uw_cache and not uw_cache[ticker].get("insider"):
-                        uw_cache[ticker]["insider"] = enriched["insider"]
+                        uw_cache[ticker] = {**uw_cache[ticker], "insider": enriched["insider"]}
                         cache_updated = True
-                
-                # Persist cache updates if any were made
-                if cache_updated:
-                    try:
-                        atomic_write_json(CacheFiles.UW_FLOW_CACHE, uw_cache)
-                    except Exception as e:
-                        log_event("cache_update", "error", error=str(e))
-                
+                _stage_timings.add("core_features", time.perf_counter() - _t_core)
+                res["symbol_data"] = symbol_data
+                res["missing_core_features"] = missing_core_features
+                res["cache_updated"] = cache_updated
+
                 # Use v2-only composite scoring with all expanded intelligence (congress, shorts, institutional, etc.)
                 # NOTE: market_regime is computed later, use "mixed" as default for now
-                symbols_processed += 1
-                print(f"DEBUG: Computing composite score for {ticker} (symbol {symbols_processed}/{len(all_symbols_to_process)})", flush=True)
-                composite = uw_v2.compute_composite_score_v2(ticker, enriched, "mixed")
+                with _stage_timings.step("composite_v2"):
+                    composite = uw_v2.compute_composite_score_v2(ticker, enriched, "mixed")
                 if composite is None:
-                    print(f"DEBUG: Composite scoring returned None for {ticker} - skipping", flush=True)
-                    log_event("scoring_flow", "composite_none", symbol=ticker)
-                    continue  # skip invalid data safely
+                    return res
 
                 # STRUCTURAL UPGRADE (log-only): pass through vol/beta features for observability/learning.
                 # This does NOT affect score computation (composite already computed).
@@ -15754,6 +16193,88 @@ def run_once():
                     composite["features_for_learning"] = f
                 except Exception:
                     pass
+                res["composite"] = composite
+
+                # Alpha signature (RVOL/RSI/PCR) hits Alpaca; prefetch it here for the booster step.
+                # Uses the in-memory cache (same rows the old per-ticker re-read of uw_flow_cache.json saw).
+                if _alpha_api is not None:
+                    try:
+                        from alpha_signature_capture import capture_alpha_signature
+                        with _stage_timings.step("alpha_signature"):
+                            res["alpha_signature"] = capture_alpha_signature(_alpha_api, ticker, uw_cache)
+                    except ImportError:
+                        pass  # Alpha signature capture not available
+                    except Exception as e:
+                        res["alpha_error"] = e
+                return res
+
+            _stage_results = run_scoring_stage(
+                [t for t in all_symbols_to_process if not str(t).startswith("_")],
+                _score_ticker,
+                workers=_stage_workers,
+                timings=_stage_timings,
+            )
+            _t_merge = time.perf_counter()
+
+            for ticker, _res in _stage_results:
+                if isinstance(_res, Exception):
+                    raise _res
+                if _res.get("skip"):
+                    print(f"DEBUG: Skipping {ticker} - {_res['skip']}", flush=True)
+                    continue
+                _enrich_err = _res.get("enrich_error")
+                if isinstance(_enrich_err, KeyError):
+                    print(f"DEBUG: KeyError processing {ticker}: {_enrich_err} - skipping", flush=True)
+                    log_event("composite_scoring", "keyerror_skipped", symbol=ticker, error=str(_enrich_err))
+                    continue
+                if _enrich_err is not None:
+                    print(f"DEBUG: Exception processing {ticker}: {_enrich_err} - skipping", flush=True)
+                    log_event("composite_scoring", "exception_skipped", symbol=ticker, error=str(_enrich_err), error_type=type(_enrich_err).__name__)
+                    continue
+                enriched = _res["enriched"]
+
+                # Observability: record composite version once per cycle.
+                try:
+                    if symbols_processed == 0:
+                        from config.registry import COMPOSITE_WEIGHTS_V2
+                        log_system_event(
+                            subsystem="scoring",
+                            event_type="composite_version_used",
+                            severity="INFO",
+                            details={
+                                "composite_version": "v2",
+                                "v2_weights_version": str((COMPOSITE_WEIGHTS_V2 or {}).get("version", "")) if isinstance(COMPOSITE_WEIGHTS_V2, dict) else "",
+                            },
+                        )
+                except Exception:
+                    pass
+                
+                # Institutional Remediation Phase 3:
+                # Do NOT floor freshness here; freshness is computed in uw_enrichment_v2 and should be allowed
+                # to decay toward 0.0 so the score floor blocks stale/ghost signals.
+                current_freshness = enriched.get("freshness", 1.0)
+                symbol_data = _res["symbol_data"]
+                missing_core_features = _res["missing_core_features"]
+
+                # Log missing core features for telemetry
+                if isinstance(symbol_data, dict) and missing_core_features:
+                    log_event("scoring_pipeline", "core_features_defaulted", 
+                             symbol=ticker, missing_features=missing_core_features)
+                
+                # Persist cache updates if any were made
+                if _res["cache_updated"]:
+                    try:
+                        write_uw_cache_rows(uw_cache, [ticker], fields=["iv_term_skew", "smile_slope", "insider"])
+                    except Exception as e:
+                        log_event("cache_update", "error", error=str(e))
+                
+                symbols_processed += 1
+                print(f"DEBUG: Computing composite score for {ticker} (symbol {symbols_processed}/{len(all_symbols_to_process)})", flush=True)
+                composite = _res["composite"]
+                if composite is None:
+                    print(f"DEBUG: Composite scoring returned None for {ticker} - skipping", flush=True)
+                    log_event("scoring_flow", "composite_none", symbol=ticker)
+                    continue  # skip invalid data safely
                 
                 score = composite.get("score", 0.0)
                 print(f"DEBUG: {ticker} composite_score={score:.3f}", flush=True)
@@ -15788,6 +16309,7 @@ def run_once():
                 # V3: Log all expanded features for learning (congress, shorts, institutional, etc.)
                 log_v3_features(ticker, composite)
                 
+                _t_step = time.perf_counter()
                 # V2.1 EXECUTION: Cross-asset confirmation (when promoted)
                 if should_run_direct_v2():
                     try:
@@ -15857,16 +16379,19 @@ def run_once():
                 except Exception as e:
                     print(f"DEBUG: Persistence check failed for {ticker}: {e}", flush=True)
                 
+                _stage_timings.add("cross_asset_tide_persistence", time.perf_counter() - _t_step)
+                _t_step = time.perf_counter()
+
                 # EOW FORENSIC OPTIMIZATION: Alpha Signature Boosters
                 # Leverage 'Hidden Factors' discovered in virtual winners from audit
                 alpha_boost_total = 0.0
                 alpha_boosters_applied = []
                 try:
-                    # Capture alpha signature for boosters
-                    if hasattr(engine, 'executor') and hasattr(engine.executor, 'api'):
-                        from alpha_signature_capture import capture_alpha_signature
-                        uw_cache_for_alpha = read_json(CacheFiles.UW_FLOW_CACHE, default={})
-                        alpha_signature = capture_alpha_signature(engine.executor.api, ticker, uw_cache_for_alpha)
+                    # Alpha signature was captured in the parallel compute phase.
+                    if _res.get("alpha_error") is not None:
+                        raise _res["alpha_error"]
+                    alpha_signature = _res.get("alpha_signature")
+                    if isinstance(alpha_signature, dict):
                         
                         # 1. RVOL > 3.0 → Score += 0.4
                         rvol = alpha_signature.get("rvol")
@@ -15952,9 +16477,12 @@ def run_once():
                 except Exception as e:
                     log_event("score_telemetry", "error", symbol=ticker, error=str(e))
                 
+                _stage_timings.add("alpha_boost_telemetry", time.perf_counter() - _t_step)
+
                 # Use V2 should_enter (hierarchical thresholds) with V3.0 exhaustion check
                 # Pass api for exhaustion filter (EMA/ATR check)
-                gate_result = uw_v2.should_enter_v2(composite, ticker, mode="base", api=engine.executor.api if hasattr(engine, 'executor') and hasattr(engine.executor, 'api') else None)
+                with _stage_timings.step("gate"):
+                    gate_result = uw_v2.should_enter_v2(composite, ticker, mode="base", api=engine.executor.api if hasattr(engine, 'executor') and hasattr(engine.executor, 'api') else None)
 
                 # Shadow A/B removed (v2-only engine).
                 
@@ -16189,10 +16717,10 @@ def run_once():
                             sector_tide_active = sector_tide_info.get("count", 0) >= 3
                             sector_tide_count = sector_tide_info.get("count", 0)
                         
-                        # Capture alpha signature (RVOL, RSI, Put/Call Ratio)
-                        alpha_signature = {}
+                        # Capture alpha signature (RVOL, RSI, Put/Call Ratio); reuse this cycle's prefetch.
+                        alpha_signature = _res.get("alpha_signature") if isinstance(_res.get("alpha_signature"), dict) else {}
                         try:
-                            if hasattr(engine, 'executor') and hasattr(engine.executor, 'api'):
+                            if not alpha_signature and hasattr(engine, 'executor') and hasattr(engine.executor, 'api'):
                                 alpha_signature = capture_alpha_signature(engine.executor.api, ticker, uw_cache)
                         except Exception as e:
                             print(f"DEBUG: Failed to capture alpha signature for {ticker}: {e}", flush=True)
@@ -16253,6 +16781,14 @@ def run_once():
                     except Exception as e:
                         print(f"DEBUG: Failed to log rejected signal to history: {e}", flush=True)
             
+            _stage_timings.add("merge_wall", time.perf_counter() - _t_merge)
+            try:
+                log_event("scoring_flow", "composite_stage_timing",
+                          workers=_stage_workers, symbols=len(_stage_results),
+                          steps=_stage_timings.summary())
+            except Exception:
+                pass
+
             # Persist counter-signal state (best-effort; never blocks trading).
             try:
                 if last_scores_dirty and _LAST_SCORES_PATH is not None:
@@ -16291,6 +16827,7 @@ def run_once():
             fix_result = auto_heal_on_alert("composite_score_floor_breach")
             if fix_result and fix_result.get("overall_success"):
                 fixes_applied_list.extend(fix_result.get("fixes_succeeded", []))
+                invalidate_engine("auto_heal_config_reload")
         
         print(f"DEBUG: Building confirm_map for {len(clusters)} clusters", flush=True)
         confirm_map = {}
@@ -16617,20 +17154,13 @@ def run_once():
         optimizations_applied_list = []
         
         # Collect cycle metrics for optimization engine
-        exec_quality_data = []
-        exec_log_path = CacheFiles.EXECUTION_QUALITY
-        if exec_log_path.exists():
-            with exec_log_path.open("r") as f:
-                for line in f:
-                    try:
-                        exec_quality_data.append(json.loads(line))
-                    except:
-                        pass
-        
-        # Calculate recent execution quality averages
-        recent_exec = exec_quality_data[-20:] if exec_quality_data else []
-        slippage_avg = sum(e.get("slippage_bps", 0) for e in recent_exec) / len(recent_exec) / 10000 if recent_exec else 1.0
-        latency_avg = sum(e.get("latency_ms", 500) for e in recent_exec) / len(recent_exec) if recent_exec else 500
+        # Recent execution quality averages (last 20 rows): rolling window, no full-file scan.
+        try:
+            from src.telemetry.execution_quality_window import get_execution_quality_window
+            slippage_avg, latency_avg = get_execution_quality_window(CacheFiles.EXECUTION_QUALITY).averages()
+        except Exception as e:
+            log_event("run_once", "execution_quality_window_failed", error=str(e))
+            slippage_avg, latency_avg = 1.0, 500
         
         cycle_metrics = {
             "scores_avg": avg_score,
@@ -17023,12 +17553,13 @@ class Watchdog:
                         pass
                     
                     # CRITICAL FIX: Create engine BEFORE run_once() so we can call evaluate_exits() even if run_once() hangs
+                    # Long-lived: the same instance is reused by run_once() and across cycles.
                     worker_engine = None
                     try:
-                        worker_engine = StrategyEngine()
+                        worker_engine = get_strategy_engine()
                         try:
                             with open("logs/worker_debug.log", "a") as f:
-                                f.write(f"[{datetime.now(timezone.utc).isoformat()}] Created worker_engine for evaluate_exits()\n")
+                                f.write(f"[{datetime.now(timezone.utc).isoformat()}] Acquired worker_engine for evaluate_exits()\n")
                                 f.flush()
                         except:
                             pass
@@ -17122,6 +17653,12 @@ class Watchdog:
                         except:
                             pass
                         
+                        # Safe fallback: next cycle starts from a freshly built engine.
+                        try:
+                            _engine_session("strategy_engine").rebuild_on_error(run_err)
+                        except Exception:
+                            pass
+
                         metrics = {"clusters": 0, "orders": 0, "error": str(run_err)}
                         metrics["engine_status"] = "degraded"
                         metrics["errors_this_cycle"] = [f"{type(run_err).__name__}: {str(run_err)}"]
@@ -17693,6 +18230,7 @@ def restart():
 # =========================
 def _read_jsonl(path, limit=2000):
     rows = []
+    flush_jsonl_logs(timeout=1.0)
     if not os.path.exists(path):
         return rows
     with open(path, "r", encoding="utf-8") as f:
@@ -17714,6 +18252,7 @@ def _today_ymd():
 
 def _today_attribution():
     path = os.path.join(LOG_DIR, "attribution.jsonl")
+    flush_jsonl_logs(timeout=1.0)
     if not os.path.exists(path):
         return []
     out = []
@@ -18074,6 +18613,7 @@ def dashboard_attribution():
     """Return attribution summary by ticker"""
     path = os.path.join(LOG_DIR, "attribution.jsonl")
     summary = {}
+    flush_jsonl_logs(timeout=1.0)
     if os.path.exists(path):
         try:
             with open(path, "r", encoding="utf-8") as f:
@@ -18242,6 +18782,7 @@ def handle_exit(signum, frame):
     try:
         watchdog.stop()
     finally:
+        flush_jsonl_logs()
         sys.exit(0)
 
 # CRITICAL FIX: Only register signals when script is run directly (not when imported)
@@ -432,7 +432,11 @@ def log_execution_quality(
         "latency_ms": round(latency_ms, 1) if latency_ms else 0.0
     }
     
-    append_jsonl("data/execution_quality.jsonl", metrics)
+    try:
+        from src.telemetry.execution_quality_window import get_execution_quality_window
+        get_execution_quality_window("data/execution_quality.jsonl").append(metrics)
+    except Exception:
+        append_jsonl("data/execution_quality.jsonl", metrics)
     
     # Alert on poor execution
     if slippage_bps > 50:  # >0.5% slippage
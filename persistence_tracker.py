@@ -28,10 +28,11 @@ class PersistenceTracker:
     def _load_from_history(self):
         """Load recent signal history to initialize appearance windows."""
         try:
-            # Get last 50 signals (same as signal_history limit)
+            # Newest-first tail read of the signal history ring (bounded, no full scan)
             signals = get_signal_history(limit=50)
             current_time = time.time()
             window_sec = WINDOW_MINUTES * 60
+            recent: List[tuple] = []
             
             for signal in signals:
                 symbol = signal.get("symbol", "")
@@ -53,7 +54,11 @@ class PersistenceTracker:
                 
                 # Only keep events within window
                 if current_time - timestamp < window_sec:
-                    self.appearance_windows[symbol].append(timestamp)
+                    recent.append((timestamp, symbol))
+            
+            # Windows are popped from the left, so seed them oldest first
+            for timestamp, symbol in sorted(recent):
+                self.appearance_windows[symbol].append(timestamp)
             
             # Clean old events
             self._clean_old_events()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark ``CompactOFITracker`` against the tick-deque ``OFITracker``.
+
+Feeds the same synthetic NBBO stream (random-walk quotes, ``--rate`` quotes/sec/symbol for
+``--seconds``) into both trackers and reports ingest rate, traced memory after ingest, and the
+cost of one ``rolling_sums`` pass over every symbol. Also checks the two agree on the 300s sum.
+
+    python3 scripts/performance/bench_ofi_tracker.py --symbols 300 --seconds 300 --rate 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+if str(REPO) not in sys.path:
+    sys.path.insert(0, str(REPO))
+
+from src.market_intelligence.ofi_tracker import CompactOFITracker, OFITracker  # noqa: E402
+
+
+def _quotes(n_symbols: int, seconds: int, rate: int, seed: int):
+    rng = np.random.default_rng(seed)
+    n = seconds * rate
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    bid = 100 + np.cumsum(rng.choice([-0.01, 0.0, 0.01], size=(n, n_symbols)), axis=0)
+    spread = rng.choice([0.01, 0.02], size=(n, n_symbols))
+    bsz = rng.integers(1, 50, size=(n, n_symbols)) * 100.0
+    asz = rng.integers(1, 50, size=(n, n_symbols)) * 100.0
+    t = np.arange(n) / float(rate)
+    return symbols, t, bid, bid + spread, bsz, asz
+
+
+def _run(tracker, symbols, t, bid, ask, bsz, asz, now: float) -> dict:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for k in range(len(t)):
+        tk = now - t[-1] + t[k]
+        for j, sym in enumerate(symbols):
+            tracker.on_quote(sym, bid[k, j], bsz[k, j], ask[k, j], asz[k, j], mono_t=tk)
+    ingest = time.perf_counter() - t0
+    mem, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    sums = [tracker.rolling_sums(sym) for sym in symbols]
+    snap = time.perf_counter() - t0
+    ticks = len(t) * len(symbols)
+    return {
+        "ticks": ticks,
+        "ingest_sec": round(ingest, 3),
+        "ingest_ticks_per_sec": round(ticks / ingest) if ingest else None,
+        "traced_mb": round(mem / 1e6, 2),
+        "rolling_sums_all_symbols_ms": round(snap * 1e3, 3),
+        "_sum300": [s[1] for s in sums],
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--symbols", type=int, default=300)
+    ap.add_argument("--seconds", type=int, default=300)
+    ap.add_argument("--rate", type=int, default=10, help="quotes per second per symbol")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    data = _quotes(args.symbols, args.seconds, args.rate, args.seed)
+    now = time.monotonic()
+    out = {
+        "legacy": _run(OFITracker(), *data, now=now),
+        "compact": _run(CompactOFITracker(), *data, now=now),
+    }
+    a = np.array(out["legacy"].pop("_sum300"))
+    b = np.array(out["compact"].pop("_sum300"))
+    out["max_abs_diff_300s"] = float(np.max(np.abs(a - b))) if len(a) else 0.0
+    out["params"] = vars(args)
+    print(json.dumps(out, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
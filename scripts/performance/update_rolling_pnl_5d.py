@@ -34,6 +34,18 @@ REPORTS_AUDIT = REPO / "reports" / "audit"
 WINDOW_DAYS = 5
 SEC_PER_DAY = 86400
 
+try:
+    from src.infrastructure.jsonl_time_index import iter_jsonl_window
+except Exception:  # pragma: no cover - standalone copy of the script
+    iter_jsonl_window = None
+
+
+def _window_lines(path: Path, since_epoch: float):
+    """Lines of ``path`` from the time-index offset for ``since_epoch`` (whole file without the index)."""
+    if iter_jsonl_window is not None:
+        return iter_jsonl_window(path, since_epoch)
+    return path.read_text(encoding="utf-8", errors="replace").splitlines()
+
 
 def _parse_ts(s: str | None) -> datetime | None:
     if not s:
@@ -61,7 +73,7 @@ def _load_unified_exits_5d() -> list[dict]:
     # 1) Exit attribution (v2)
     if EXIT_ATTR_PATH.exists():
         try:
-            for line in EXIT_ATTR_PATH.read_text(encoding="utf-8", errors="replace").splitlines()[-5000:]:
+            for line in _window_lines(EXIT_ATTR_PATH, cutoff_ts):
                 line = line.strip()
                 if not line:
                     continue
@@ -98,45 +110,44 @@ def _load_unified_exits_5d() -> list[dict]:
     # 2) Attribution (fallback)
     if ATTR_PATH.exists():
         try:
-            with ATTR_PATH.open("r", encoding="utf-8", errors="replace") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        rec = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-                    if rec.get("type") != "attribution":
-                        continue
-                    if str(rec.get("trade_id", "")).startswith("open_"):
-                        continue
-                    symbol = str(rec.get("symbol", "")).upper()
-                    if not symbol or "TEST" in symbol:
-                        continue
-                    ts_str = rec.get("ts") or rec.get("timestamp") or ""
-                    ts = _parse_ts(ts_str)
-                    if ts is None or ts.timestamp() < cutoff_ts:
-                        continue
-                    pnl_usd = float(rec.get("pnl_usd", 0) or 0)
-                    context = rec.get("context") or {}
-                    close_reason = context.get("close_reason") or rec.get("close_reason") or ""
-                    if pnl_usd == 0 and not (close_reason and close_reason not in ("unknown", "N/A", "")):
-                        continue
-                    key = (symbol, (ts_str or "")[:19])
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    _tid2 = str(rec.get("trade_id") or rec.get("trade_key") or "").strip()
-                    rows.append(
-                        {
-                            "ts": ts,
-                            "ts_str": ts_str,
-                            "pnl_usd": pnl_usd,
-                            "source": "attribution",
-                            "trade_id": _tid2 or None,
-                        }
-                    )
+            for line in _window_lines(ATTR_PATH, cutoff_ts):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if rec.get("type") != "attribution":
+                    continue
+                if str(rec.get("trade_id", "")).startswith("open_"):
+                    continue
+                symbol = str(rec.get("symbol", "")).upper()
+                if not symbol or "TEST" in symbol:
+                    continue
+                ts_str = rec.get("ts") or rec.get("timestamp") or ""
+                ts = _parse_ts(ts_str)
+                if ts is None or ts.timestamp() < cutoff_ts:
+                    continue
+                pnl_usd = float(rec.get("pnl_usd", 0) or 0)
+                context = rec.get("context") or {}
+                close_reason = context.get("close_reason") or rec.get("close_reason") or ""
+                if pnl_usd == 0 and not (close_reason and close_reason not in ("unknown", "N/A", "")):
+                    continue
+                key = (symbol, (ts_str or "")[:19])
+                if key in seen:
+                    continue
+                seen.add(key)
+                _tid2 = str(rec.get("trade_id") or rec.get("trade_key") or "").strip()
+                rows.append(
+                    {
+                        "ts": ts,
+                        "ts_str": ts_str,
+                        "pnl_usd": pnl_usd,
+                        "source": "attribution",
+                        "trade_id": _tid2 or None,
+                    }
+                )
         except Exception:
             pass
 
@@ -2,16 +2,47 @@
 """
 Signal History Storage Module
 Maintains a high-speed buffer of the last 50 signal processing events for dashboard rendering.
+
+The buffer is a two-segment ring: appends go to ``state/signal_history.jsonl`` (plain JSONL, so
+``tail``/audit scripts keep working) and once it holds ``MAX_SIGNALS`` lines it is renamed to
+``signal_history.jsonl.1`` and a fresh head segment starts. Appends never read the file back
+(the head's line count is kept in memory, recounted only if the file is replaced underneath
+us), and ``get_signal_history(limit)`` reads the newest records backwards from the end of the
+head segment, falling through to ``.1`` only when it needs more — O(limit), not O(file).
 """
 
 import json
 import math
+import os
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 SIGNAL_HISTORY_FILE = Path("state/signal_history.jsonl")
 MAX_SIGNALS = 50  # Keep last 50 signals
+_TAIL_BLOCK = 8192
+
+_lock = threading.Lock()
+_head_state: Dict[str, Any] = {"path": None, "ino": None, "size": None, "lines": 0}
+
+
+def _previous_segment(path: Path) -> Path:
+    return path.with_name(path.name + ".1")
+
+
+def _head_line_count(path: Path) -> int:
+    """Lines in the head segment; recounted from disk only if someone else changed the file."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _head_state.update(path=path, ino=None, size=None, lines=0)
+        return 0
+    if (_head_state["path"], _head_state["ino"], _head_state["size"]) != (path, st.st_ino, st.st_size):
+        with path.open("rb") as f:
+            lines = sum(1 for _ in f)
+        _head_state.update(path=path, ino=st.st_ino, size=st.st_size, lines=lines)
+    return _head_state["lines"]
 
 def append_signal_history(signal_data: Dict[str, Any]):
     """
@@ -38,19 +69,17 @@ def append_signal_history(signal_data: Dict[str, Any]):
         if "timestamp" not in signal_data:
             signal_data["timestamp"] = datetime.now(timezone.utc).isoformat()
         safe = _sanitize_for_json(signal_data)
-        with SIGNAL_HISTORY_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(safe, allow_nan=False) + "\n")
-            f.flush()
-        if SIGNAL_HISTORY_FILE.exists():
-            try:
-                with SIGNAL_HISTORY_FILE.open("r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                if len(lines) > MAX_SIGNALS:
-                    tmp = SIGNAL_HISTORY_FILE.with_suffix(".jsonl.tmp")
-                    tmp.write_text("".join(lines[-MAX_SIGNALS:]), encoding="utf-8")
-                    tmp.replace(SIGNAL_HISTORY_FILE)
-            except Exception:
-                pass
+        line = json.dumps(safe, allow_nan=False) + "\n"
+        path = SIGNAL_HISTORY_FILE
+        with _lock:
+            if _head_line_count(path) >= MAX_SIGNALS:
+                os.replace(path, _previous_segment(path))
+                _head_state.update(ino=None, size=None, lines=0)
+            with path.open("a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                st = os.fstat(f.fileno())
+            _head_state.update(path=path, ino=st.st_ino, size=st.st_size, lines=_head_state["lines"] + 1)
     except Exception:
         pass
 
@@ -67,27 +96,53 @@ def _sanitize_for_json(obj: Any) -> Any:
         return [_sanitize_for_json(x) for x in obj]
     return obj
 
+def _tail_lines(path: Path, n: int) -> List[bytes]:
+    """Last ``n`` non-empty lines of ``path``, newest first, reading backwards in blocks."""
+    out: List[bytes] = []
+    if n <= 0:
+        return out
+    try:
+        with path.open("rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            partial = b""
+            while pos > 0 and len(out) < n:
+                step = min(_TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step) + partial
+                parts = chunk.split(b"\n")
+                partial = parts[0]
+                for raw in reversed(parts[1:]):
+                    if raw.strip():
+                        out.append(raw)
+                        if len(out) >= n:
+                            return out
+            if partial.strip() and len(out) < n:
+                out.append(partial)
+    except FileNotFoundError:
+        pass
+    return out
+
+
 def _read_signal_history(limit: int) -> Tuple[List[Dict[str, Any]], int, str]:
-    """Read up to limit signals; return (signals, malformed_line_count, last_malformed_ts)."""
-    if not SIGNAL_HISTORY_FILE.exists():
-        return [], 0, ""
-    signals = []
+    """Read up to limit signals (newest first); return (signals, malformed_line_count, last_malformed_ts)."""
+    limit = max(0, min(int(limit), MAX_SIGNALS))
+    signals: List[Dict[str, Any]] = []
     malformed = 0
     last_malformed_ts = ""
     try:
-        with SIGNAL_HISTORY_FILE.open("r", encoding="utf-8", errors="replace") as f:
-            for line in f:
-                if not line.strip():
-                    continue
+        for segment in (SIGNAL_HISTORY_FILE, _previous_segment(SIGNAL_HISTORY_FILE)):
+            if len(signals) >= limit:
+                break
+            for raw in _tail_lines(segment, limit - len(signals)):
                 try:
-                    obj = json.loads(line)
-                    signals.append(_sanitize_for_json(obj))
+                    signals.append(_sanitize_for_json(json.loads(raw.decode("utf-8", errors="replace"))))
                 except json.JSONDecodeError:
                     malformed += 1
                     last_malformed_ts = datetime.now(timezone.utc).isoformat()
-        return list(reversed(signals[-limit:])), malformed, last_malformed_ts
+        return signals, malformed, last_malformed_ts
     except Exception:
-        return [], malformed, last_malformed_ts
+        return signals, malformed, last_malformed_ts
 
 
 def get_signal_history(limit: int = MAX_SIGNALS) -> List[Dict[str, Any]]:
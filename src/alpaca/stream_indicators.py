@@ -0,0 +1,201 @@
+"""
+Array-backed minute-bar ring with rolling indicators, one per symbol in ``PriceCache``.
+
+``PriceCache`` used to keep a deque of ``_BarRow`` dataclasses and rebuild a DataFrame (plus any
+indicator) on every read. ``SymbolBarRing`` stores bars column-wise in preallocated NumPy arrays
+and updates indicator state as each bar arrives, so a read is O(1):
+
+- **ATR** / **EMA**: one-row ``src.core.indicators.StreamingIndicators`` (Wilder ATR, ``period``
+  default 14; EMA of closes, ``ema_span`` default 20) since the first streamed bar, so the ring
+  and the batch helpers share one implementation of the recursions.
+- **VWAP deviation**: ``close / session_vwap - 1`` where the session VWAP is the volume-weighted
+  bar VWAP since the current US/Eastern session started: the regular open
+  (``ALPACA_STREAM_VWAP_SESSION_START``, default ``09:30`` ET), with pre-open bars of the same
+  ET day forming their own pre-market session.
+- **Realized vol**: sample stdev of 1-minute log returns over the last ``rv_window`` bars
+  (default 30, not annualized), from running prefix sums.
+
+``AlpacaStreamManager.indicator_snapshot`` adds the 10s/60s/300s L1 OFI sums; ``submit_entry``
+records the snapshot on the entry telemetry (``logs/entry_snapshots.jsonl``).
+
+Every row stores the state *after* that bar, so Alpaca ``updatedBars`` corrections (same
+timestamp as the last bar) are re-applied from the previous row instead of double-counting.
+Env knobs: ``ALPACA_STREAM_ATR_PERIOD``, ``ALPACA_STREAM_EMA_SPAN``, ``ALPACA_STREAM_RV_WINDOW``,
+``ALPACA_STREAM_VWAP_SESSION_START``.
+"""
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.core.indicators import StreamingIndicators
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume", "vwap")
+_STATE_COLUMNS = ("atr", "tr_sum", "ema", "cum_pv", "cum_v", "cum_r", "cum_r2")
+_ET = ZoneInfo("America/New_York")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _session_start_minutes() -> int:
+    raw = str(os.environ.get("ALPACA_STREAM_VWAP_SESSION_START", "09:30")).strip()
+    try:
+        hh, mm = raw.split(":", 1)
+        return max(0, min(24 * 60, int(hh) * 60 + int(mm)))
+    except (TypeError, ValueError):
+        return 9 * 60 + 30
+
+
+def session_key(ts_ns: int, start_minutes: int) -> int:
+    """VWAP session id for a bar: ET calendar day, split into pre-open and from-open halves."""
+    et = datetime.fromtimestamp(int(ts_ns) / 1e9, tz=timezone.utc).astimezone(_ET)
+    return et.toordinal() * 2 + (1 if et.hour * 60 + et.minute >= start_minutes else 0)
+
+
+@dataclass(frozen=True)
+class IndicatorSnapshot:
+    """Rolling indicators for one symbol as of its latest streamed bar."""
+
+    symbol: str
+    ts_ns: int
+    close: float
+    bars: int
+    atr: Optional[float]
+    ema: float
+    vwap: Optional[float]
+    vwap_dev: Optional[float]
+    realized_vol: Optional[float]
+    received_monotonic: float
+    # L1 OFI rolling sums; filled in by ``AlpacaStreamManager.indicator_snapshot`` from its ofi_tracker.
+    ofi_10s: float = 0.0
+    ofi_60s: float = 0.0
+    ofi_300s: float = 0.0
+
+
+class SymbolBarRing:
+    """Fixed-capacity column ring of minute bars plus per-row indicator state (not thread-safe)."""
+
+    def __init__(
+        self,
+        capacity: int,
+        *,
+        atr_period: Optional[int] = None,
+        ema_span: Optional[int] = None,
+        rv_window: Optional[int] = None,
+    ) -> None:
+        self.capacity = max(2, int(capacity))
+        self.atr_period = max(1, int(atr_period or _env_int("ALPACA_STREAM_ATR_PERIOD", 14)))
+        self.ema_span = max(1, int(ema_span or _env_int("ALPACA_STREAM_EMA_SPAN", 20)))
+        self.rv_window = max(2, min(self.capacity - 1, int(rv_window or _env_int("ALPACA_STREAM_RV_WINDOW", 30))))
+        self.session_start_minutes = _session_start_minutes()
+        self._ind = StreamingIndicators(1, period=self.atr_period, ema_span=self.ema_span)
+        self.count = 0  # bars ever appended (logical index of the next bar)
+        self.ts = np.zeros(self.capacity, dtype=np.int64)
+        self.session = np.zeros(self.capacity, dtype=np.int64)
+        self.trade_count = np.zeros(self.capacity, dtype=np.int64)
+        self.tr_n = np.zeros(self.capacity, dtype=np.int64)
+        self.cols: Dict[str, np.ndarray] = {
+            name: np.zeros(self.capacity, dtype=float) for name in BAR_COLUMNS + _STATE_COLUMNS
+        }
+        self.last_rx_monotonic = 0.0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def _slot(self, logical: int) -> int:
+        return logical % self.capacity
+
+    def append(self, ts_ns: int, o: float, h: float, l: float, c: float, v: float, vw: float, n: int, rx: float) -> None:
+        """Add a bar, or replace the last one when ``ts_ns`` repeats (``updatedBars``)."""
+        if self.count and int(self.ts[self._slot(self.count - 1)]) == int(ts_ns):
+            i = self.count - 1
+        else:
+            i = self.count
+            self.count += 1
+        s = self._slot(i)
+        cols = self.cols
+        self.ts[s] = ts_ns
+        self.trade_count[s] = n
+        cols["open"][s], cols["high"][s], cols["low"][s], cols["close"][s] = o, h, l, c
+        cols["volume"][s], cols["vwap"][s] = v, vw
+        self.session[s] = session_key(ts_ns, self.session_start_minutes)
+        self.last_rx_monotonic = rx
+
+        # Replay ATR/EMA from the previous row's checkpoint (a correction must not double-count).
+        q = self._slot(i - 1) if i else None
+        ind = self._ind
+        if q is None:
+            ind.set_row_state(0, None)
+        else:
+            ind.set_row_state(0, (float(cols["close"][q]), float(cols["tr_sum"][q]), int(self.tr_n[q]),
+                                  float(cols["atr"][q]), float(cols["ema"][q])))
+        ind.update((h,), (l,), (c,))
+        _, cols["tr_sum"][s], self.tr_n[s], cols["atr"][s], cols["ema"][s] = ind.row_state(0)
+
+        px = vw if vw > 0 else c
+        if q is None:
+            cols["cum_pv"][s], cols["cum_v"][s] = px * v, v
+            cols["cum_r"][s] = cols["cum_r2"][s] = 0.0
+            return
+
+        prev_c = float(cols["close"][q])
+        if int(self.session[s]) == int(self.session[q]):
+            cols["cum_pv"][s] = cols["cum_pv"][q] + px * v
+            cols["cum_v"][s] = cols["cum_v"][q] + v
+        else:
+            cols["cum_pv"][s], cols["cum_v"][s] = px * v, v
+        r = math.log(c / prev_c) if c > 0 and prev_c > 0 else 0.0
+        cols["cum_r"][s] = cols["cum_r"][q] + r
+        cols["cum_r2"][s] = cols["cum_r2"][q] + r * r
+
+    def tail(self, limit: int) -> Optional[Dict[str, np.ndarray]]:
+        """Last ``limit`` bars oldest-first as array copies (``ts`` is int64 ns), or None if short."""
+        lim = int(limit)
+        if lim < 1 or lim > len(self):
+            return None
+        idx = np.arange(self.count - lim, self.count) % self.capacity
+        out = {name: self.cols[name][idx] for name in BAR_COLUMNS}
+        out["ts"] = self.ts[idx]
+        out["trade_count"] = self.trade_count[idx]
+        return out
+
+    def snapshot(self, symbol: str) -> Optional[IndicatorSnapshot]:
+        if not self.count:
+            return None
+        i = self.count - 1
+        s = self._slot(i)
+        cols = self.cols
+        c = float(cols["close"][s])
+        atr = float(cols["atr"][s])
+        vol = float(cols["cum_v"][s])
+        vwap = float(cols["cum_pv"][s]) / vol if vol > 0 else None
+        w = self.rv_window
+        rv = None
+        if i >= w:
+            q = self._slot(i - w)
+            s1 = float(cols["cum_r"][s] - cols["cum_r"][q])
+            s2 = float(cols["cum_r2"][s] - cols["cum_r2"][q])
+            rv = math.sqrt(max(0.0, (s2 - s1 * s1 / w) / (w - 1)))
+        return IndicatorSnapshot(
+            symbol=symbol,
+            ts_ns=int(self.ts[s]),
+            close=c,
+            bars=len(self),
+            atr=None if math.isnan(atr) else atr,
+            ema=float(cols["ema"][s]),
+            vwap=vwap,
+            vwap_dev=(c / vwap - 1.0) if vwap else None,
+            realized_vol=rv,
+            received_monotonic=self.last_rx_monotonic,
+        )
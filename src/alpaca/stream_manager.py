@@ -16,6 +16,7 @@ On WebSocket auth errors 402/409 (and similar subscription errors), fail over fr
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import inspect
 import json
 import logging
@@ -23,11 +24,10 @@ import os
 import threading
 import time
 import uuid
-from collections import deque
-from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Deque, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
+import numpy as np
 import pandas as pd
 
 try:
@@ -35,7 +35,8 @@ try:
 except ImportError:  # pragma: no cover
     websockets = None  # type: ignore
 
-from src.market_intelligence.ofi_tracker import OFITracker
+from src.alpaca.stream_indicators import IndicatorSnapshot, SymbolBarRing
+from src.market_intelligence.ofi_tracker import make_ofi_tracker
 
 from src.alpaca.stream_feed import (
     FEED_IEX,
@@ -160,31 +161,17 @@ def _reset_stream_manager_for_tests() -> None:
         _symbol_providers.clear()
 
 
-@dataclass
-class _BarRow:
-    """One completed minute bar (SIP)."""
-
-    ts: pd.Timestamp
-    open: float
-    high: float
-    low: float
-    close: float
-    volume: float
-    vwap: float
-    trade_count: int
-    received_monotonic: float
-
-
 class PriceCache:
     """
-    Thread-safe store: latest OHLCV minute bars per symbol (ring buffer per symbol).
-    Also tracks last trade (T) price when trade stream is enabled.
+    Thread-safe store: latest OHLCV minute bars per symbol (array ring buffer per symbol, with
+    rolling ATR / EMA / VWAP deviation / realized vol updated on arrival — see
+    ``src.alpaca.stream_indicators``). Also tracks last trade (T) price when trade stream is enabled.
     """
 
     def __init__(self, maxlen_per_symbol: int = 400) -> None:
         self._lock = threading.RLock()
         self._maxlen = max(32, int(maxlen_per_symbol))
-        self._bars: Dict[str, Deque[_BarRow]] = {}
+        self._bars: Dict[str, SymbolBarRing] = {}
         self._last_bar_rx_mono: Dict[str, float] = {}
         self._last_trade: Dict[str, tuple[float, float]] = {}  # mono, price
 
@@ -212,26 +199,13 @@ class PriceCache:
                 ts = ts.tz_convert("UTC")
         except Exception:
             return
-        row = _BarRow(
-            ts=ts,
-            open=float(o),
-            high=float(h),
-            low=float(l),
-            close=float(c),
-            volume=float(v),
-            vwap=float(vw),
-            trade_count=int(n),
-            received_monotonic=time.monotonic(),
-        )
+        rx = time.monotonic()
         with self._lock:
-            if sym not in self._bars:
-                self._bars[sym] = deque(maxlen=self._maxlen)
-            dq = self._bars[sym]
-            if dq and dq[-1].ts == ts:
-                dq[-1] = row
-            else:
-                dq.append(row)
-            self._last_bar_rx_mono[sym] = time.monotonic()
+            ring = self._bars.get(sym)
+            if ring is None:
+                ring = self._bars[sym] = SymbolBarRing(self._maxlen)
+            ring.append(int(ts.value), float(o), float(h), float(l), float(c), float(v), float(vw), int(n), rx)
+            self._last_bar_rx_mono[sym] = rx
 
     def record_trade(self, symbol: str, price: float) -> None:
         sym = str(symbol).upper().strip()
@@ -240,6 +214,42 @@ class PriceCache:
         with self._lock:
             self._last_trade[sym] = (time.monotonic(), float(price))
 
+    def get_fresh_trade(self, symbol: str, *, max_age_sec: float = 60.0) -> Optional[float]:
+        """Last trade price if received within max_age_sec, else None."""
+        sym = str(symbol).upper().strip()
+        with self._lock:
+            rec = self._last_trade.get(sym)
+        if rec is None or (time.monotonic() - rec[0]) > float(max_age_sec):
+            return None
+        return rec[1]
+
+    def _fresh_ring(self, sym: str, max_age_sec: Optional[float]) -> Optional[SymbolBarRing]:
+        """Ring for ``sym`` if its last bar was received within max_age_sec (caller holds lock)."""
+        ring = self._bars.get(sym)
+        if ring is None or not ring.count:
+            return None
+        if max_age_sec is not None:
+            last_rx = self._last_bar_rx_mono.get(sym)
+            if last_rx is None or (time.monotonic() - last_rx) > float(max_age_sec):
+                return None
+        return ring
+
+    def get_fresh_bar_arrays(
+        self,
+        symbol: str,
+        limit: int,
+        *,
+        max_age_sec: float = 60.0,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Last `limit` 1Min bars as NumPy array copies (oldest first; ``ts`` in int64 ns UTC) under
+        the same freshness rule as ``get_fresh_bars_df``, without building a DataFrame.
+        """
+        sym = str(symbol).upper().strip()
+        with self._lock:
+            ring = self._fresh_ring(sym, max_age_sec)
+            return ring.tail(max(1, int(limit))) if ring is not None else None
+
     def get_fresh_bars_df(
         self,
         symbol: str,
@@ -252,30 +262,31 @@ class PriceCache:
         - we have at least `limit` bars, and
         - the most recent bar was received within max_age_sec (wall via monotonic delta).
         """
+        arrs = self.get_fresh_bar_arrays(symbol, limit, max_age_sec=max_age_sec)
+        if arrs is None:
+            return None
+        idx = pd.DatetimeIndex(arrs["ts"]).tz_localize("UTC")
+        return pd.DataFrame({k: arrs[k] for k in ("open", "high", "low", "close", "volume")}, index=idx)
+
+    def indicator_snapshot(self, symbol: str, *, max_age_sec: Optional[float] = None) -> Optional[IndicatorSnapshot]:
+        """O(1) rolling-indicator snapshot for ``symbol`` (None if unknown or stale)."""
         sym = str(symbol).upper().strip()
-        lim = max(1, int(limit))
         with self._lock:
-            dq = self._bars.get(sym)
-            if not dq or len(dq) < lim:
-                return None
-            last_rx = self._last_bar_rx_mono.get(sym)
-            if last_rx is None:
-                return None
-            if (time.monotonic() - last_rx) > float(max_age_sec):
-                return None
-            rows = list(dq)[-lim:]
-        idx = pd.DatetimeIndex([r.ts for r in rows], tz="UTC")
-        df = pd.DataFrame(
-            {
-                "open": [r.open for r in rows],
-                "high": [r.high for r in rows],
-                "low": [r.low for r in rows],
-                "close": [r.close for r in rows],
-                "volume": [r.volume for r in rows],
-            },
-            index=idx,
-        )
-        return df
+            ring = self._fresh_ring(sym, max_age_sec)
+            return ring.snapshot(sym) if ring is not None else None
+
+    def indicator_snapshots(
+        self, symbols: Iterable[str], *, max_age_sec: Optional[float] = None
+    ) -> Dict[str, IndicatorSnapshot]:
+        """Snapshots for every known, fresh symbol in ``symbols`` under one lock acquisition."""
+        out: Dict[str, IndicatorSnapshot] = {}
+        with self._lock:
+            for s in symbols:
+                sym = str(s).upper().strip()
+                ring = self._fresh_ring(sym, max_age_sec)
+                if ring is not None:
+                    out[sym] = ring.snapshot(sym)
+        return out
 
 
 class AlpacaStreamManager:
@@ -359,7 +370,7 @@ class AlpacaStreamManager:
                 paper=self._paper,
             )
         self.price_cache = PriceCache(maxlen_per_symbol=bar_maxlen)
-        self.ofi_tracker = OFITracker()
+        self.ofi_tracker = make_ofi_tracker()
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._last_auth_ok = threading.Event()
@@ -369,6 +380,30 @@ class AlpacaStreamManager:
     def stream_url(self) -> str:
         return self._url
 
+    def _with_ofi(self, snap: IndicatorSnapshot) -> IndicatorSnapshot:
+        try:
+            sums = self.ofi_tracker.window_sums(snap.symbol)
+        except Exception:
+            return snap
+        return dataclasses.replace(
+            snap,
+            ofi_10s=float(sums.get(10, 0.0)),
+            ofi_60s=float(sums.get(60, 0.0)),
+            ofi_300s=float(sums.get(300, 0.0)),
+        )
+
+    def indicator_snapshot(self, symbol: str, *, max_age_sec: Optional[float] = None) -> Optional[IndicatorSnapshot]:
+        """Bar indicators from ``price_cache`` plus 10s/60s/300s L1 OFI sums from ``ofi_tracker``."""
+        snap = self.price_cache.indicator_snapshot(symbol, max_age_sec=max_age_sec)
+        return self._with_ofi(snap) if snap is not None else None
+
+    def indicator_snapshots(
+        self, symbols: Iterable[str], *, max_age_sec: Optional[float] = None
+    ) -> Dict[str, IndicatorSnapshot]:
+        """``indicator_snapshot`` for every known, fresh symbol in ``symbols``."""
+        snaps = self.price_cache.indicator_snapshots(symbols, max_age_sec=max_age_sec)
+        return {sym: self._with_ofi(snap) for sym, snap in snaps.items()}
+
     @property
     def stream_feed(self) -> str:
         return self._feed_name
@@ -0,0 +1,328 @@
+"""
+Order-state service fed by Alpaca's ``trade_updates`` stream.
+
+Exit paths confirmed fills and closes by sleep-polling: ``check_order_filled`` looped on
+``get_order`` every 0.2s, and every close-verification block slept 2s then polled
+``list_positions`` up to five times, 3s apart — 10+ seconds of a blocked trading thread per close.
+
+``OrderStateBook`` keeps an in-memory order and position book updated from ``trade_updates``
+events and hands out ``concurrent.futures.Future`` confirmations:
+
+- ``fill_future(order_id)`` → ``(filled, filled_qty, filled_avg_price)``, same tuple as
+  ``check_order_filled``; resolves on a fill (or partial fill with fill fields populated) or
+  ``(False, 0, 0.0)`` on cancel / expire / reject.
+- ``flat_future(symbol)`` → True once a fill event reports ``position_qty == 0``.
+
+``TradeUpdatesStream`` is the websocket consumer (background asyncio thread, reconnect with
+backoff). Any other source — tests, a replay, a broker stand-in — can drive the book by calling
+``OrderStateBook.on_trade_update`` with the same event dicts. Callers wait with timeouts and keep
+their REST polling as the fallback when the stream is not connected.
+
+Kill switch: ``ORDER_STATE_STREAM=0`` (no stream is started; ``get_order_state_service()`` is None).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover
+    websockets = None  # type: ignore
+
+log = logging.getLogger(__name__)
+
+FillResult = Tuple[bool, int, float]
+TERMINAL_FAIL_STATUSES = ("canceled", "expired", "rejected")
+_MAX_BACKOFF_SEC = 60.0
+_INITIAL_BACKOFF_SEC = 1.0
+
+
+def order_state_stream_enabled() -> bool:
+    return str(os.environ.get("ORDER_STATE_STREAM", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _num(x: Any, cast=float, default=0):
+    try:
+        return cast(float(x)) if x not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class OrderState:
+    order_id: str
+    symbol: str
+    status: str = ""
+    side: str = ""
+    filled_qty: int = 0
+    filled_avg_price: float = 0.0
+    event: str = ""
+    updated_mono: float = 0.0
+
+    def fill_result(self) -> Optional[FillResult]:
+        """Terminal result for ``fill_future`` or None while still working."""
+        if self.status in ("filled", "partially_filled") and self.filled_qty > 0 and self.filled_avg_price > 0:
+            return True, self.filled_qty, self.filled_avg_price
+        if self.status in TERMINAL_FAIL_STATUSES:
+            return False, 0, 0.0
+        return None
+
+
+class OrderStateBook:
+    """Thread-safe order / position book with future-based confirmations (see module docstring)."""
+
+    def __init__(self, max_orders: int = 5000) -> None:
+        self._lock = threading.RLock()
+        self._max_orders = max(100, int(max_orders))
+        self._orders: "OrderedDict[str, OrderState]" = OrderedDict()
+        self._positions: Dict[str, float] = {}
+        self._fill_waiters: Dict[str, List[Future]] = {}
+        self._flat_waiters: Dict[str, List[Future]] = {}
+        self.events = 0
+
+    # ---- ingest -------------------------------------------------------------------------
+    def on_trade_update(self, data: Dict[str, Any]) -> Optional[OrderState]:
+        """Apply one ``trade_updates`` payload (``{"event", "order": {...}, "position_qty"}``)."""
+        if not isinstance(data, dict):
+            return None
+        order = data.get("order") if isinstance(data.get("order"), dict) else {}
+        oid = str(order.get("id") or "").strip()
+        sym = str(order.get("symbol") or "").upper().strip()
+        if not oid:
+            return None
+        event = str(data.get("event") or "")
+        resolve_fill: List[Tuple[Future, FillResult]] = []
+        resolve_flat: List[Future] = []
+        with self._lock:
+            self.events += 1
+            st = self._orders.get(oid) or OrderState(order_id=oid, symbol=sym)
+            st.symbol = sym or st.symbol
+            st.status = str(order.get("status") or event or st.status)
+            st.side = str(order.get("side") or st.side)
+            st.filled_qty = _num(order.get("filled_qty"), int, st.filled_qty)
+            st.filled_avg_price = _num(order.get("filled_avg_price"), float, st.filled_avg_price)
+            st.event = event
+            st.updated_mono = time.monotonic()
+            self._orders[oid] = st
+            self._orders.move_to_end(oid)
+            while len(self._orders) > self._max_orders:
+                self._orders.popitem(last=False)
+
+            result = st.fill_result()
+            if result is not None:
+                resolve_fill = [(f, result) for f in self._fill_waiters.pop(oid, [])]
+            if event in ("fill", "partial_fill") and data.get("position_qty") is not None and st.symbol:
+                qty = _num(data.get("position_qty"), float, 0.0)
+                self._positions[st.symbol] = qty
+                if qty == 0:
+                    resolve_flat = self._flat_waiters.pop(st.symbol, [])
+        for fut, res in resolve_fill:
+            if not fut.done():
+                fut.set_result(res)
+        for fut in resolve_flat:
+            if not fut.done():
+                fut.set_result(True)
+        return st
+
+    # ---- queries ------------------------------------------------------------------------
+    def order(self, order_id: str) -> Optional[OrderState]:
+        with self._lock:
+            return self._orders.get(str(order_id))
+
+    def position_qty(self, symbol: str) -> Optional[float]:
+        """Last ``position_qty`` reported by a fill for ``symbol`` (None if never seen)."""
+        with self._lock:
+            return self._positions.get(str(symbol).upper().strip())
+
+    def fill_future(self, order_id: str) -> Future:
+        fut: Future = Future()
+        oid = str(order_id)
+        with self._lock:
+            st = self._orders.get(oid)
+            result = st.fill_result() if st is not None else None
+            if result is None:
+                self._fill_waiters.setdefault(oid, []).append(fut)
+        if result is not None:
+            fut.set_result(result)
+        return fut
+
+    def flat_future(self, symbol: str, *, order_id: Optional[str] = None) -> Future:
+        """
+        Resolves True when a fill leaves ``symbol`` flat. With ``order_id``, an already-filled
+        order whose fill reported a flat position resolves immediately.
+        """
+        fut: Future = Future()
+        sym = str(symbol).upper().strip()
+        with self._lock:
+            st = self._orders.get(str(order_id)) if order_id else None
+            already = st is not None and st.status == "filled" and self._positions.get(sym) == 0
+            if not already:
+                self._flat_waiters.setdefault(sym, []).append(fut)
+        if already:
+            fut.set_result(True)
+        return fut
+
+    def _discard(self, table: Dict[str, List[Future]], key: str, fut: Future) -> None:
+        with self._lock:
+            waiters = table.get(key)
+            if waiters and fut in waiters:
+                waiters.remove(fut)
+                if not waiters:
+                    table.pop(key, None)
+
+    def wait_fill(self, order_id: str, timeout: float) -> Optional[FillResult]:
+        """Fill tuple, or None on timeout (caller falls back to REST)."""
+        fut = self.fill_future(order_id)
+        try:
+            return fut.result(timeout=max(0.0, float(timeout)))
+        except FutureTimeout:
+            self._discard(self._fill_waiters, str(order_id), fut)
+            return None
+
+    def wait_flat(self, symbol: str, timeout: float, *, order_id: Optional[str] = None) -> bool:
+        """True once ``symbol`` is confirmed flat, False on timeout."""
+        fut = self.flat_future(symbol, order_id=order_id)
+        try:
+            return bool(fut.result(timeout=max(0.0, float(timeout))))
+        except FutureTimeout:
+            self._discard(self._flat_waiters, str(symbol).upper().strip(), fut)
+            return False
+
+
+def trading_stream_url(trading_base_url: str) -> str:
+    """``https://paper-api.alpaca.markets`` → ``wss://paper-api.alpaca.markets/stream``."""
+    explicit = (os.environ.get("ALPACA_TRADING_STREAM_URL") or "").strip()
+    if explicit:
+        return explicit
+    base = (trading_base_url or "https://paper-api.alpaca.markets").strip().rstrip("/")
+    if base.endswith("/v2"):
+        base = base[:-3]
+    return base.replace("https://", "wss://", 1).replace("http://", "ws://", 1) + "/stream"
+
+
+class TradeUpdatesStream:
+    """Background ``trade_updates`` websocket feeding an ``OrderStateBook``."""
+
+    def __init__(self, api_key: str, api_secret: str, trading_base_url: str, book: Optional[OrderStateBook] = None) -> None:
+        if websockets is None:
+            raise RuntimeError("websockets package required; pip install websockets")
+        self._key = (api_key or "").strip()
+        self._secret = (api_secret or "").strip()
+        self.url = trading_stream_url(trading_base_url)
+        self.book = book or OrderStateBook()
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self) -> None:
+        if not self._key or not self._secret:
+            log.warning("TradeUpdatesStream: missing API key/secret; not starting")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._thread_main, name="alpaca-trade-updates", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+
+    def _thread_main(self) -> None:
+        try:
+            asyncio.run(self._run_loop())
+        except Exception as ex:  # pragma: no cover
+            log.exception("TradeUpdatesStream asyncio thread crashed: %s", ex)
+            self.last_error = str(ex)
+
+    async def _run_loop(self) -> None:
+        backoff = _INITIAL_BACKOFF_SEC
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self.url, ping_interval=20, ping_timeout=20, close_timeout=5) as ws:
+                    await ws.send(json.dumps({"action": "auth", "key": self._key, "secret": self._secret}))
+                    auth = self._decode(await ws.recv())
+                    status = ((auth or {}).get("data") or {}).get("status")
+                    if status != "authorized":
+                        raise RuntimeError(f"trade_updates auth failed: {auth!r}"[:300])
+                    await ws.send(json.dumps({"action": "listen", "data": {"streams": ["trade_updates"]}}))
+                    self._connected.set()
+                    backoff = _INITIAL_BACKOFF_SEC
+                    while not self._stop.is_set():
+                        try:
+                            raw = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                        except asyncio.TimeoutError:
+                            continue
+                        self.dispatch(raw)
+            except asyncio.CancelledError:  # pragma: no cover
+                break
+            except Exception as ex:
+                self.last_error = str(ex)
+                log.warning("Alpaca trade_updates stream disconnected: %s (reconnect in %.1fs)", ex, backoff)
+            finally:
+                self._connected.clear()
+            if not self._stop.is_set():
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2.0, _MAX_BACKOFF_SEC)
+
+    @staticmethod
+    def _decode(raw: Any) -> Optional[Dict[str, Any]]:
+        try:
+            if isinstance(raw, (bytes, bytearray)):
+                raw = raw.decode("utf-8")
+            msg = json.loads(raw)
+            return msg if isinstance(msg, dict) else None
+        except Exception:
+            return None
+
+    def dispatch(self, raw: Any) -> None:
+        msg = self._decode(raw)
+        if msg and msg.get("stream") == "trade_updates":
+            try:
+                self.book.on_trade_update(msg.get("data") or {})
+            except Exception as ex:  # pragma: no cover - defensive
+                log.warning("trade_updates dispatch failed: %s", ex)
+
+
+_SERVICE: Optional[TradeUpdatesStream] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def ensure_order_state_service(api_key: str, api_secret: str, trading_base_url: str) -> Optional[TradeUpdatesStream]:
+    """Start the process-wide ``trade_updates`` consumer once (None when disabled/unavailable)."""
+    global _SERVICE
+    if not order_state_stream_enabled() or websockets is None:
+        return None
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = TradeUpdatesStream(api_key, api_secret, trading_base_url)
+            _SERVICE.start()
+        return _SERVICE
+
+
+def get_order_state_service() -> Optional[TradeUpdatesStream]:
+    with _SERVICE_LOCK:
+        return _SERVICE
+
+
+def get_live_order_book() -> Optional[OrderStateBook]:
+    """The order book when the stream is connected (so waits can be trusted), else None."""
+    svc = get_order_state_service()
+    if svc is None or not svc.connected:
+        return None
+    return svc.book
@@ -0,0 +1,182 @@
+"""
+Vectorized price indicators on NumPy arrays (one row per symbol, oldest bar first).
+
+``compute_atr``, ``wilders_atr_last`` and the offense / dynamic ATR trails in ``evaluate_exits``
+each converted DataFrame columns to Python lists and looped bar by bar. The helpers here take
+``(n,)`` or ``(symbols, n)`` arrays and reduce along the last axis:
+
+- ``true_range`` / ``simple_atr``: TR per bar and the mean of the finite TRs (``compute_atr``).
+- ``wilder_atr``: Wilder (RMA) ATR at the last bar, seeded with the SMA of the first ``period``
+  TRs; the recursion is evaluated as one weighted dot product instead of a Python loop.
+- ``ema_last``: EMA at the last bar, seeded with the first value of the window.
+- ``highest_since`` / ``lowest_since``: favorable extreme from a per-row start index.
+
+``StreamingIndicators`` keeps the same quantities for many symbols and updates them with one
+new bar per symbol in O(symbols), for live bar streams. ``row_state`` / ``set_row_state`` let a
+caller checkpoint one row's recursion state and replay from it (``SymbolBarRing`` does this per
+bar so Alpaca ``updatedBars`` corrections are re-applied instead of double-counted).
+"""
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def _arr(x: ArrayLike) -> np.ndarray:
+    return np.asarray(x, dtype=float)
+
+
+def _tr(h: np.ndarray, l: np.ndarray, prev: np.ndarray) -> np.ndarray:
+    h_l = h - l
+    gaps = np.fmax(np.abs(h - prev), np.abs(l - prev))
+    return np.where(np.isnan(gaps), h_l, np.maximum(h_l, gaps))
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """
+    True range of bars ``1..n-1`` (one fewer than the input along the last axis).
+
+    ``max(H-L, |H-C_prev|, |L-C_prev|)``; a missing previous close falls back to ``H-L`` and a
+    missing high or low yields NaN.
+    """
+    h, l, c = _arr(high), _arr(low), _arr(close)
+    return _tr(h[..., 1:], l[..., 1:], c[..., :-1])
+
+
+def simple_atr(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> Union[float, np.ndarray]:
+    """Mean of the finite true ranges (0.0 when there are none)."""
+    tr = true_range(high, low, close)
+    ok = np.isfinite(tr)
+    count = ok.sum(axis=-1)
+    total = np.where(ok, tr, 0.0).sum(axis=-1)
+    out = np.divide(total, count, out=np.zeros_like(total, dtype=float), where=count > 0)
+    return float(out) if out.ndim == 0 else out
+
+
+def _decay_weights(k: int, alpha: float) -> np.ndarray:
+    """Weights of the last ``k`` inputs of ``x_t = alpha * in_t + (1 - alpha) * x_{t-1}``."""
+    return alpha * (1.0 - alpha) ** np.arange(k - 1, -1, -1, dtype=float)
+
+
+def wilder_atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> Union[float, np.ndarray]:
+    """
+    Wilder ATR at the final bar; needs at least ``period + 1`` bars.
+
+    Rows containing non-finite values produce NaN (use ``wilders_atr_last`` for the raising,
+    single-symbol variant).
+    """
+    p = int(period)
+    tr = true_range(high, low, close)
+    if p < 1 or tr.shape[-1] < p:
+        raise ValueError("need at least period+1 bars for Wilder ATR")
+    alpha = 1.0 / p
+    rest = tr[..., p:]
+    k = rest.shape[-1]
+    atr = tr[..., :p].mean(axis=-1) * (1.0 - alpha) ** k + rest @ _decay_weights(k, alpha)
+    return float(atr) if np.ndim(atr) == 0 else atr
+
+
+def ema_last(values: ArrayLike, span: int) -> Union[float, np.ndarray]:
+    """EMA (``alpha = 2 / (span + 1)``) at the last element, seeded with the first element."""
+    v = _arr(values)
+    n = v.shape[-1]
+    if n == 0:
+        raise ValueError("ema_last needs at least one value")
+    alpha = 2.0 / (int(span) + 1)
+    out = v[..., 0] * (1.0 - alpha) ** (n - 1) + v[..., 1:] @ _decay_weights(n - 1, alpha)
+    return float(out) if np.ndim(out) == 0 else out
+
+
+def _masked_since(values: ArrayLike, start: Union[int, ArrayLike], fill: float) -> np.ndarray:
+    v = _arr(values)
+    idx = np.arange(v.shape[-1])
+    starts = np.asarray(start)
+    if v.ndim > 1 and starts.ndim == 1:
+        starts = starts[:, None]
+    return np.where(idx >= starts, np.where(np.isnan(v), fill, v), fill)
+
+
+def highest_since(high: ArrayLike, start: Union[int, ArrayLike] = 0) -> Union[float, np.ndarray]:
+    """Highest high from bar index ``start`` (scalar or one per row) to the end; NaN if none."""
+    out = _masked_since(high, start, -np.inf).max(axis=-1)
+    out = np.where(np.isneginf(out), np.nan, out)
+    return float(out) if out.ndim == 0 else out
+
+
+def lowest_since(low: ArrayLike, start: Union[int, ArrayLike] = 0) -> Union[float, np.ndarray]:
+    """Lowest low from bar index ``start`` (scalar or one per row) to the end; NaN if none."""
+    out = _masked_since(low, start, np.inf).min(axis=-1)
+    out = np.where(np.isposinf(out), np.nan, out)
+    return float(out) if out.ndim == 0 else out
+
+
+class StreamingIndicators:
+    """
+    Incremental Wilder ATR, EMA of closes and since-entry extremes for ``n_symbols`` series.
+
+    ``update(high, low, close)`` takes one bar per symbol (NaN = no new bar for that symbol).
+    ``atr`` stays NaN until ``period`` true ranges have been seen, after which it matches
+    ``wilder_atr`` over the same bars; ``ema`` matches ``ema_last``.
+    """
+
+    def __init__(self, n_symbols: int, *, period: int = 14, ema_span: int = 20) -> None:
+        m = int(n_symbols)
+        self.period = int(period)
+        self.ema_span = int(ema_span)
+        self.prev_close = np.full(m, np.nan)
+        self.tr_sum = np.zeros(m)
+        self.tr_count = np.zeros(m, dtype=np.int64)
+        self.atr = np.full(m, np.nan)
+        self.ema = np.full(m, np.nan)
+        self.highest = np.full(m, np.nan)
+        self.lowest = np.full(m, np.nan)
+
+    def update(self, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+        h, l, c = _arr(high), _arr(low), _arr(close)
+        live = np.isfinite(h) & np.isfinite(l) & np.isfinite(c)
+
+        has_prev = live & np.isfinite(self.prev_close)
+        tr = _tr(h, l, self.prev_close)
+        p = self.period
+        seeding = has_prev & (self.tr_count < p)
+        self.tr_sum = np.where(seeding, self.tr_sum + tr, self.tr_sum)
+        self.tr_count = np.where(has_prev, self.tr_count + 1, self.tr_count)
+        seeded_now = seeding & (self.tr_count == p)
+        rolling = has_prev & (self.tr_count > p)
+        self.atr = np.where(seeded_now, self.tr_sum / p, self.atr)
+        self.atr = np.where(rolling, (self.atr * (p - 1) + tr) / p, self.atr)
+
+        alpha = 2.0 / (self.ema_span + 1)
+        self.ema = np.where(live, np.where(np.isnan(self.ema), c, alpha * c + (1 - alpha) * self.ema), self.ema)
+        self.highest = np.where(live, np.fmax(self.highest, h), self.highest)
+        self.lowest = np.where(live, np.fmin(self.lowest, l), self.lowest)
+        self.prev_close = np.where(live, c, self.prev_close)
+        return self.atr
+
+    def reset_extremes(self, mask: Optional[ArrayLike] = None) -> None:
+        """Restart highest/lowest tracking (e.g. on a new entry) for ``mask`` rows (default all)."""
+        sel = np.ones(self.highest.shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        self.highest = np.where(sel, np.nan, self.highest)
+        self.lowest = np.where(sel, np.nan, self.lowest)
+
+    def row_state(self, i: int) -> Tuple[float, float, int, float, float]:
+        """``(prev_close, tr_sum, tr_count, atr, ema)`` for row ``i`` (extremes are not included)."""
+        return (
+            float(self.prev_close[i]),
+            float(self.tr_sum[i]),
+            int(self.tr_count[i]),
+            float(self.atr[i]),
+            float(self.ema[i]),
+        )
+
+    def set_row_state(self, i: int, state: Optional[Tuple[float, float, int, float, float]] = None) -> None:
+        """Restore row ``i`` from ``row_state`` output, or reset it to "no bars seen" when ``state`` is None."""
+        prev_close, tr_sum, tr_count, atr, ema = state if state is not None else (np.nan, 0.0, 0, np.nan, np.nan)
+        self.prev_close[i] = prev_close
+        self.tr_sum[i] = tr_sum
+        self.tr_count[i] = tr_count
+        self.atr[i] = atr
+        self.ema[i] = ema
@@ -0,0 +1,400 @@
+"""
+Materialized dashboard read models, updated incrementally from the JSONL logs.
+
+Dashboard panels rebuilt their payloads from raw logs on each request, behind only the 5s
+``_dash_cache_get`` TTL. Examples: closed trades (``attribution.jsonl`` + ``exit_attribution.jsonl``),
+the signal funnel, the stagnation watchdog (which read every UW log and ``attribution.jsonl`` in
+full) and the rolling 5-day PnL. Request cost grew with log size.
+
+Each ``ReadModel`` here keeps one panel's aggregates in memory:
+
+- **Tailing**: every source log is read through ``JsonlCursor`` with an in-memory checkpoint, so a
+  refresh costs one ``stat`` plus the bytes appended since the last refresh, and rotations
+  through ``.1`` … ``.N`` backups are followed. Windowed models start their first read at the
+  ``JsonlTimeIndex`` offset for the window start rather than byte 0.
+- **Reset**: if a source is truncated or rewritten (the cursor cannot resume), the model clears
+  its state and re-reads all of its sources.
+- **Serving**: ``ReadModelMaterializer`` refreshes every model on a background thread every
+  ``DASHBOARD_READ_MODEL_INTERVAL_SEC`` (default 2). ``view()`` also refreshes a stale model
+  inline, so the payload is current even without the thread.
+
+Kill switch: ``DASHBOARD_READ_MODELS=0`` (dashboard uses its per-request log scans). With
+``LEARNING_LOG_CURSOR=0`` the cursors never resume, so every refresh is a full rebuild.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.infrastructure.jsonl_cursor import JsonlCursor
+from src.infrastructure.jsonl_time_index import get_jsonl_time_index, jsonl_time_index_enabled, record_epoch
+
+SIGNAL_WINDOW_SEC = 30 * 60
+CLOSED_TRADES_MAX_DAYS = 90
+CLOSED_TRADES_LIMIT = 500
+ROLLING_PNL_MAX_POINTS = 900
+
+RowFn = Callable[[Dict[str, Any]], Optional[Tuple[Tuple[str, str], Dict[str, Any]]]]
+
+
+def read_models_enabled() -> bool:
+    return str(os.environ.get("DASHBOARD_READ_MODELS", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _refresh_interval() -> float:
+    try:
+        return max(0.1, float(os.environ.get("DASHBOARD_READ_MODEL_INTERVAL_SEC", "2")))
+    except (TypeError, ValueError):
+        return 2.0
+
+
+class TailedJsonl:
+    """Records appended to one JSONL file since the previous ``read_new``.
+
+    With ``since`` (a callable returning an epoch), the first read starts at the time-index
+    offset for that epoch instead of byte 0; records before it may still be returned.
+    """
+
+    def __init__(self, path: Path, since: Optional[Callable[[], float]] = None) -> None:
+        self.path = Path(path)
+        self._since = since
+        self._checkpoint: Optional[Dict[str, Any]] = None
+
+    def rewind(self) -> None:
+        self._checkpoint = None
+
+    def read_new(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """``(records, reset)``; ``reset`` means earlier records are gone (truncated / rewritten)."""
+        had_checkpoint = self._checkpoint is not None
+        if not had_checkpoint and self._since is not None and jsonl_time_index_enabled():
+            idx = get_jsonl_time_index(self.path)
+            offset = idx.offset_for(self._since())
+            if offset > 0:
+                self._checkpoint = idx.checkpoint_at(offset)
+        cursor = JsonlCursor(self.path, self._checkpoint)
+        records: List[Dict[str, Any]] = []
+        for line in cursor:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except (json.JSONDecodeError, ValueError):
+                continue
+            if isinstance(rec, dict):
+                records.append(rec)
+        # A missing file yields no position; start over from byte 0 when it reappears.
+        self._checkpoint = cursor.checkpoint() if (cursor.resumed or cursor.lines_read) else None
+        return records, had_checkpoint and not cursor.resumed
+
+
+class TimeWindow:
+    """Timestamped entries kept for ``window_sec``; counts are evaluated at read time."""
+
+    def __init__(self, window_sec: float) -> None:
+        self.window_sec = float(window_sec)
+        self._items: Deque[Tuple[float, bool]] = deque()
+
+    def add(self, ts: float, flag: bool = False) -> None:
+        self._items.append((float(ts), bool(flag)))
+
+    def counts(self, now: float) -> Tuple[int, int]:
+        """``(entries, flagged entries)`` with ``ts >= now - window_sec``."""
+        cutoff = now - self.window_sec
+        items = self._items
+        while items and items[0][0] < cutoff:
+            items.popleft()
+        n = flagged = 0
+        for ts, flag in items:
+            if ts >= cutoff:
+                n += 1
+                flagged += flag
+        return n, flagged
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+class ReadModel:
+    """Base panel model: subclasses implement ``reset``, ``apply`` and ``view``."""
+
+    name = "read_model"
+
+    def __init__(self, sources: Dict[str, Path], *, window_sec: Optional[float] = None) -> None:
+        since = (lambda: time.time() - window_sec) if window_sec else None
+        self._tails = {key: TailedJsonl(path, since) for key, path in sources.items()}
+        self._lock = threading.RLock()
+        self.refreshed_mono = 0.0
+        self.version = 0
+        self.records_applied = 0
+        self.resets = 0
+        self.reset()
+
+    def reset(self) -> None:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def apply(self, source: str, rec: Dict[str, Any]) -> None:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def view(self, now: Optional[float] = None) -> Any:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def refresh(self) -> int:
+        """Apply newly appended records; full rebuild when a source was truncated/rewritten."""
+        with self._lock:
+            batches = [(key, tail.read_new()) for key, tail in self._tails.items()]
+            if any(reset for _key, (_recs, reset) in batches):
+                self.resets += 1
+                self.reset()
+                for tail in self._tails.values():
+                    tail.rewind()
+                batches = [(key, (tail.read_new()[0], False)) for key, tail in self._tails.items()]
+            n = 0
+            for key, (recs, _reset) in batches:
+                for rec in recs:
+                    try:
+                        self.apply(key, rec)
+                    except Exception:
+                        continue
+                    n += 1
+            if n:
+                self.version += 1
+                self.records_applied += n
+            self.refreshed_mono = time.monotonic()
+            return n
+
+    def current(self, *, max_age_sec: float, now: Optional[float] = None) -> Any:
+        with self._lock:
+            if time.monotonic() - self.refreshed_mono >= max_age_sec:
+                self.refresh()
+            return self.view(now)
+
+
+class SignalFlowModel(ReadModel):
+    """Signal funnel and stagnation-watchdog counters over the last 30 minutes."""
+
+    name = "signal_flow"
+
+    def __init__(
+        self,
+        *,
+        uw_logs: Sequence[Path],
+        gate_logs: Sequence[Path],
+        order_logs: Sequence[Path],
+        attribution_log: Path,
+        window_sec: float = SIGNAL_WINDOW_SEC,
+    ) -> None:
+        self.window_sec = float(window_sec)
+        self._roles: Dict[str, List[Tuple[str, int]]] = {}
+        sources: Dict[str, Path] = {}
+
+        def add(role: str, paths: Iterable[Path]) -> None:
+            for i, p in enumerate(paths):
+                key = str(Path(p))
+                sources[key] = Path(p)
+                self._roles.setdefault(key, []).append((role, i))
+
+        add("uw", uw_logs)
+        add("gate", gate_logs)
+        add("orders", order_logs)
+        add("trades", [attribution_log])
+        self._n_orders = len(order_logs)
+        super().__init__(sources, window_sec=self.window_sec)
+
+    def reset(self) -> None:
+        self.alerts = TimeWindow(self.window_sec)
+        self.parsed = TimeWindow(self.window_sec)  # flag: score >= 3.0
+        self.orders = [TimeWindow(self.window_sec) for _ in range(self._n_orders)]
+        self.trades = TimeWindow(self.window_sec)
+
+    def apply(self, source: str, rec: Dict[str, Any]) -> None:
+        for role, idx in self._roles.get(source, ()):
+            if role == "orders":
+                action = rec.get("action", "") or rec.get("event", "") or rec.get("type", "")
+                if not ("submit" in str(action).lower() or "entry" in str(action).lower() or rec.get("type") == "order"):
+                    continue
+            elif role == "trades":
+                trade_id = rec.get("trade_id", "")
+                if trade_id and str(trade_id).startswith("open_"):
+                    continue
+                ctx = rec.get("context") if isinstance(rec.get("context"), dict) else {}
+                if not (rec.get("type") == "attribution" and (rec.get("pnl_usd") or ctx.get("close_reason"))):
+                    continue
+            ts = record_epoch(rec)
+            if ts is None:
+                continue
+            if role == "uw":
+                self.alerts.add(ts)
+            elif role == "gate":
+                score = rec.get("signal_score") or rec.get("score") or rec.get("entry_score") or 0.0
+                try:
+                    high = float(score) >= 3.0
+                except (TypeError, ValueError):
+                    high = False
+                self.parsed.add(ts, high)
+            elif role == "orders":
+                self.orders[idx].add(ts)
+            else:
+                self.trades.add(ts)
+
+    def view(self, now: Optional[float] = None) -> Dict[str, int]:
+        t = time.time() if now is None else float(now)
+        alerts, _ = self.alerts.counts(t)
+        parsed, scored = self.parsed.counts(t)
+        orders = 0
+        for w in self.orders:  # first order log with activity wins, as in the scan
+            orders = w.counts(t)[0]
+            if orders > 0:
+                break
+        return {
+            "alerts": alerts,
+            "parsed": parsed,
+            "scored_above_3": scored,
+            "orders_sent": orders,
+            "trades_executed": self.trades.counts(t)[0],
+        }
+
+
+class ClosedTradesModel(ReadModel):
+    """Closed-trade rows from attribution (preferred) and exit attribution, deduped by minute."""
+
+    name = "closed_trades"
+
+    def __init__(
+        self,
+        *,
+        attribution_log: Path,
+        exit_attribution_log: Path,
+        attribution_row: RowFn,
+        exit_attribution_row: RowFn,
+        max_days: int = CLOSED_TRADES_MAX_DAYS,
+        limit: int = CLOSED_TRADES_LIMIT,
+    ) -> None:
+        self._row_fns = {"attribution": attribution_row, "exit_attribution": exit_attribution_row}
+        self.max_days = int(max_days)
+        self.limit = int(limit)
+        self._view_key: Optional[Tuple[int, str]] = None
+        self._view_rows: List[Dict[str, Any]] = []
+        super().__init__(
+            {"attribution": Path(attribution_log), "exit_attribution": Path(exit_attribution_log)},
+            window_sec=self.max_days * 86400,
+        )
+
+    def reset(self) -> None:
+        self.rows: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {"attribution": {}, "exit_attribution": {}}
+        self._view_key = None
+
+    def apply(self, source: str, rec: Dict[str, Any]) -> None:
+        got = self._row_fns[source](rec)
+        if got is None:
+            return
+        key, row = got
+        self.rows[source].setdefault(key, row)
+
+    def view(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        t = time.time() if now is None else float(now)
+        cutoff = (datetime.fromtimestamp(t, tz=timezone.utc) - timedelta(days=self.max_days)).isoformat()[:10]
+        if self._view_key != (self.version, cutoff):
+            for rows in self.rows.values():
+                for key in [k for k, r in rows.items() if str(r.get("timestamp") or "")[:10] < cutoff]:
+                    del rows[key]
+            attr = self.rows["attribution"]
+            merged = list(attr.values()) + [r for k, r in self.rows["exit_attribution"].items() if k not in attr]
+            merged = [r for r in merged if (r.get("strategy_id") or "equity").lower() == "equity"]
+            merged.sort(key=lambda r: (r.get("timestamp") or ""), reverse=True)
+            self._view_rows = merged[: self.limit]
+            self._view_key = (self.version, cutoff)
+        return [dict(r) for r in self._view_rows]
+
+
+class RollingPnlModel(ReadModel):
+    """Last ``max_points`` rows of ``rolling_pnl_5d.jsonl`` plus the total row count."""
+
+    name = "rolling_pnl_5d"
+
+    def __init__(self, path: Path, *, max_points: int = ROLLING_PNL_MAX_POINTS) -> None:
+        self.max_points = int(max_points)
+        super().__init__({"rolling": Path(path)})
+
+    def reset(self) -> None:
+        self.points: Deque[Any] = deque(maxlen=self.max_points)
+        self.total = 0
+
+    def apply(self, source: str, rec: Dict[str, Any]) -> None:
+        self.points.append(rec)
+        self.total += 1
+
+    def view(self, now: Optional[float] = None) -> Dict[str, Any]:
+        points = list(self.points)
+        shadow_value = [p.get("equity_shadow") for p in points if p.get("equity_shadow") is not None]
+        if not shadow_value and points:
+            shadow_value = [p.get("equity") for p in points]
+        return {
+            "points": points,
+            "points_total_before_cap": self.total,
+            "window": "5d",
+            "source": "unified_exits",
+            "shadow_value": shadow_value,
+            "rolling_pnl_points_cap": self.max_points,
+        }
+
+
+class ReadModelMaterializer:
+    """Registry of read models refreshed by one background thread."""
+
+    def __init__(self, interval_sec: Optional[float] = None) -> None:
+        self.interval_sec = float(interval_sec) if interval_sec is not None else _refresh_interval()
+        self._models: Dict[str, ReadModel] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, model: ReadModel) -> ReadModel:
+        with self._lock:
+            self._models[model.name] = model
+        return model
+
+    def model(self, name: str) -> Optional[ReadModel]:
+        return self._models.get(name)
+
+    def view(self, name: str, *, now: Optional[float] = None) -> Any:
+        """Current payload for ``name`` (refreshed inline when older than the interval)."""
+        m = self._models[name]
+        return m.current(max_age_sec=self.interval_sec, now=now)
+
+    def refresh_all(self) -> None:
+        for m in list(self._models.values()):
+            try:
+                m.refresh()
+            except Exception:
+                continue
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dashboard-read-models", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh_all()
+            self._stop.wait(self.interval_sec)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"version": m.version, "records_applied": m.records_applied, "resets": m.resets}
+            for name, m in list(self._models.items())
+        }
@@ -0,0 +1,203 @@
+"""
+Bounded, stampede-safe TTL cache for dashboard payload builders (``_dash_cache_get``).
+
+``_dash_ttl_store`` was an unbounded dict with no locking. When an entry expired, every
+concurrent Flask request ran the expensive builder at the same moment, so a busy Command Center
+tab multiplied log scans and broker calls exactly when logs were biggest. ``DashTtlCache`` adds:
+
+- **Single flight**: per key, only one caller runs the builder. Concurrent callers wait for that
+  result rather than starting their own build.
+- **Stale-while-revalidate**: an entry expired by less than ``DASH_CACHE_STALE_SEC`` (default
+  60) is served as-is while one background thread rebuilds it. If the rebuild fails, the stale
+  value stays in place until the stale window ends.
+- **Bound**: at most ``DASH_CACHE_MAX_ENTRIES`` (default 256) keys, evicted least recently used.
+- **Per-endpoint TTL**: ``DASH_CACHE_TTL_OVERRIDES="positions_bundle_v1=10,sre_health_v2=30"``
+  overrides the TTL passed by the call site. The default TTL is ``DASH_CACHE_TTL_SEC`` (5).
+- **Counters**: hits, stale hits, misses, coalesced waits, refreshes, errors and builder latency
+  per key. ``stats()`` reports them under ``dash_cache`` on ``/metrics``.
+
+Kill switch: ``DASH_TTL_CACHE=0`` (plain dict memo, no locking / eviction / stale serving).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_TTL_SEC = 5.0
+DEFAULT_STALE_SEC = 60.0
+DEFAULT_MAX_ENTRIES = 256
+
+
+def dash_ttl_cache_enabled() -> bool:
+    return str(os.environ.get("DASH_TTL_CACHE", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_num(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_ttl_overrides(raw: Optional[str]) -> Dict[str, float]:
+    """``"key=sec,key2=sec"`` → ``{key: sec}`` (malformed items are ignored)."""
+    out: Dict[str, float] = {}
+    for item in str(raw or "").split(","):
+        key, sep, val = item.partition("=")
+        if not sep or not key.strip():
+            continue
+        try:
+            out[key.strip()] = float(val)
+        except ValueError:
+            continue
+    return out
+
+
+class _KeyStats:
+    __slots__ = ("hits", "stale_hits", "misses", "coalesced", "refreshes", "errors", "builds", "build_ms_total", "build_ms_max", "build_ms_last")
+
+    def __init__(self) -> None:
+        self.hits = self.stale_hits = self.misses = self.coalesced = 0
+        self.refreshes = self.errors = self.builds = 0
+        self.build_ms_total = self.build_ms_max = self.build_ms_last = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "builds": self.builds,
+            "build_ms_avg": round(self.build_ms_total / self.builds, 2) if self.builds else None,
+            "build_ms_max": round(self.build_ms_max, 2),
+            "build_ms_last": round(self.build_ms_last, 2),
+        }
+
+
+class DashTtlCache:
+    """Thread-safe LRU of ``key -> (built_at_monotonic, value)`` (see module docstring)."""
+
+    def __init__(
+        self,
+        *,
+        default_ttl_sec: Optional[float] = None,
+        stale_sec: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ttl_overrides: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.default_ttl_sec = float(default_ttl_sec if default_ttl_sec is not None else _env_num("DASH_CACHE_TTL_SEC", DEFAULT_TTL_SEC))
+        self.stale_sec = float(stale_sec if stale_sec is not None else _env_num("DASH_CACHE_STALE_SEC", DEFAULT_STALE_SEC))
+        self.max_entries = max(1, int(max_entries if max_entries is not None else _env_num("DASH_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
+        self.ttl_overrides = dict(ttl_overrides) if ttl_overrides is not None else parse_ttl_overrides(os.environ.get("DASH_CACHE_TTL_OVERRIDES"))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._stats: Dict[str, _KeyStats] = {}
+        self.evictions = 0
+
+    def ttl_for(self, key: str, ttl_sec: Optional[float] = None) -> float:
+        if key in self.ttl_overrides:
+            return self.ttl_overrides[key]
+        return self.default_ttl_sec if ttl_sec is None else float(ttl_sec)
+
+    def _key_stats(self, key: str) -> _KeyStats:
+        st = self._stats.get(key)
+        if st is None:
+            st = self._stats[key] = _KeyStats()
+        return st
+
+    def get(self, key: str, builder: Callable[[], Any], *, ttl_sec: Optional[float] = None) -> Any:
+        """Cached value for ``key``; builds (once across threads) when missing or too stale."""
+        ttl = self.ttl_for(key, ttl_sec)
+        with self._lock:
+            st = self._key_stats(key)
+            ent = self._entries.get(key)
+            if ent is not None:
+                age = self._clock() - ent[0]
+                if age < ttl:
+                    self._entries.move_to_end(key)
+                    st.hits += 1
+                    return ent[1]
+                if age < ttl + self.stale_sec:
+                    self._entries.move_to_end(key)
+                    st.stale_hits += 1
+                    if key not in self._inflight:
+                        self._inflight[key] = Future()
+                        st.refreshes += 1
+                        threading.Thread(
+                            target=self._build, args=(key, builder, True), name="dash-cache-refresh", daemon=True
+                        ).start()
+                    return ent[1]
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+                st.misses += 1
+            else:
+                st.coalesced += 1
+        if not leader:
+            return fut.result()
+        return self._build(key, builder, False)
+
+    def _build(self, key: str, builder: Callable[[], Any], background: bool) -> Any:
+        with self._lock:
+            fut = self._inflight[key]
+        t0 = time.perf_counter()
+        try:
+            val = builder()
+        except BaseException as e:
+            with self._lock:
+                self._key_stats(key).errors += 1
+                self._inflight.pop(key, None)
+            fut.set_exception(e)
+            if background:
+                return None  # stale value stays until its window ends
+            raise
+        ms = (time.perf_counter() - t0) * 1000.0
+        with self._lock:
+            st = self._key_stats(key)
+            st.builds += 1
+            st.build_ms_total += ms
+            st.build_ms_last = ms
+            st.build_ms_max = max(st.build_ms_max, ms)
+            self._entries[key] = (self._clock(), val)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                old, _ = self._entries.popitem(last=False)
+                self._stats.pop(old, None)
+                self.evictions += 1
+            self._inflight.pop(key, None)
+        fut.set_result(val)
+        return val
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = {k: s.as_dict() for k, s in self._stats.items()}
+            out: Dict[str, Any] = {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "inflight": len(self._inflight),
+                "default_ttl_sec": self.default_ttl_sec,
+                "stale_sec": self.stale_sec,
+                "keys": keys,
+            }
+        hits = sum(k["hits"] + k["stale_hits"] for k in keys.values())
+        lookups = hits + sum(k["misses"] + k["coalesced"] for k in keys.values())
+        out["hit_rate"] = round(hits / lookups, 4) if lookups else None
+        return out
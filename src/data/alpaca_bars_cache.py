@@ -1,17 +1,34 @@
 """
 Disk cache for Alpaca bars keyed by symbol + date + resolution.
 Used by the 2000-trade pipeline to avoid rate limits and ensure reproducibility.
+
+Bars are served from the columnar month files in ``src.data.columnar_bars`` when pyarrow is
+available; legacy per-day JSON files are migrated on first read. ``BARS_CACHE_COLUMNAR=0``
+falls back to JSON only; ``BARS_CACHE_WRITE_JSON=0`` stops writing the per-day JSON copies.
+Range queries over a symbol set: ``load_bar_arrays`` (NumPy) / ``load_bars_df`` (pandas).
 """
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import Any, List, Optional
 
+from src.data import columnar_bars
+from src.data.columnar_bars import load_bar_arrays, load_bars_df  # noqa: F401  (range-query API)
+
 REPO = Path(__file__).resolve().parents[2]
 DEFAULT_CACHE_DIR = REPO / "data" / "bars_cache"
 
 
+def _env_on(name: str) -> bool:
+    return str(os.environ.get(name, "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def columnar_enabled() -> bool:
+    return columnar_bars.available() and _env_on("BARS_CACHE_COLUMNAR")
+
+
 def cache_path(
     symbol: str,
     date_str: str,
@@ -32,6 +49,18 @@ def get_cached_bars(
 ) -> Optional[List[dict]]:
     """Return list of bar dicts if cached, else None. Bars have t, o, h, l, c, v."""
     path = cache_path(symbol, date_str, resolution, cache_dir)
+    if columnar_enabled():
+        root = Path(cache_dir or DEFAULT_CACHE_DIR)
+        try:
+            table = columnar_bars.read_day(root, symbol, date_str, resolution)
+            if table is None and path.exists():
+                _, days = columnar_bars.read_month(columnar_bars.month_path(root, symbol, date_str[:7], resolution))
+                columnar_bars.ingest_json_month(root, symbol, date_str[:7], resolution, days)
+                table = columnar_bars.read_day(root, symbol, date_str, resolution)
+            if table is not None:
+                return columnar_bars.table_to_bars(table)
+        except Exception:
+            pass
     if not path.exists():
         return None
     try:
@@ -50,6 +79,11 @@ def set_cached_bars(
     cache_dir: Optional[Path] = None,
 ) -> None:
     """Write bars to cache. Creates parent dirs."""
+    stored = False
+    if columnar_enabled():
+        stored = columnar_bars.write_day(Path(cache_dir or DEFAULT_CACHE_DIR), symbol, date_str, resolution, bars)
+    if stored and not _env_on("BARS_CACHE_WRITE_JSON"):
+        return
     path = cache_path(symbol, date_str, resolution, cache_dir)
     path.parent.mkdir(parents=True, exist_ok=True)
     try:
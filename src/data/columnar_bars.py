@@ -0,0 +1,338 @@
+"""
+Columnar (Arrow IPC) store behind ``src.data.alpaca_bars_cache``.
+
+Every replay and pipeline run used to ``json.loads`` one ``SYMBOL/YYYY-MM-DD_res.json`` list of
+dicts per symbol-day. Bars now also live in uncompressed Arrow IPC files, one per
+symbol × month × resolution::
+
+    <cache_dir>/_columnar/<resolution>/<SYMBOL>/<YYYY-MM>.arrow
+
+- **Reads** are memory-mapped: ``read_range`` slices the sorted ``t`` column with a binary search
+  and returns a zero-copy ``pyarrow.Table``; ``load_bar_arrays`` / ``load_bars_df`` hand those
+  buffers to NumPy / pandas for a symbol set × time window.
+- **Coverage** is tracked per file (schema metadata ``days``) so a fetched-but-empty day
+  (holiday, halted symbol) is distinguishable from a day never fetched.
+- **Migration** is transparent: a JSON day file that is read (or found while serving a range
+  query) is ingested into its month file; ``migrate_json_cache`` converts a whole cache dir.
+
+Requires ``pyarrow`` (requirements.txt); without it ``available()`` is False and the JSON cache
+keeps working unchanged.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - pyarrow is in requirements.txt
+    pa = None  # type: ignore[assignment]
+    PYARROW_AVAILABLE = False
+
+COLUMNAR_DIRNAME = "_columnar"
+PRICE_COLUMNS = ("o", "h", "l", "c", "v", "vw", "n")
+_write_lock = threading.Lock()
+
+
+def available() -> bool:
+    return PYARROW_AVAILABLE
+
+
+def _safe_res(resolution: str) -> str:
+    return resolution.replace("/", "_").strip() or "1m"
+
+
+def month_path(cache_dir: Path, symbol: str, month: str, resolution: str) -> Path:
+    return Path(cache_dir) / COLUMNAR_DIRNAME / _safe_res(resolution) / symbol.upper().strip() / f"{month}.arrow"
+
+
+def _epoch(t: Any) -> Optional[int]:
+    if t is None:
+        return None
+    try:
+        if isinstance(t, (int, float)):
+            return int(t / 1000) if t > 1e11 else int(t)
+        dt = datetime.fromisoformat(str(t).replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+    except Exception:
+        return None
+
+
+def _day_bounds(date_str: str) -> Tuple[int, int]:
+    d = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    start = int(d.timestamp())
+    return start, start + 86400
+
+
+def _schema() -> "pa.Schema":
+    fields = [pa.field("t", pa.timestamp("s", tz="UTC"))]
+    fields += [pa.field(c, pa.float64()) for c in PRICE_COLUMNS]
+    return pa.schema(fields)
+
+
+def bars_to_table(bars: Sequence[Dict[str, Any]]) -> "pa.Table":
+    """List of ``{t, o, h, l, c, v, ...}`` dicts -> sorted Arrow table (rows without ``t`` dropped)."""
+    rows = []
+    for b in bars or []:
+        if not isinstance(b, dict):
+            continue
+        ts = _epoch(b.get("t"))
+        if ts is not None:
+            rows.append((ts, b))
+    rows.sort(key=lambda r: r[0])
+    cols: Dict[str, Any] = {"t": pa.array([r[0] for r in rows], type=pa.timestamp("s", tz="UTC"))}
+    for c in PRICE_COLUMNS:
+        vals = []
+        for _, b in rows:
+            v = b.get(c)
+            try:
+                vals.append(float(v) if v is not None else None)
+            except (TypeError, ValueError):
+                vals.append(None)
+        cols[c] = pa.array(vals, type=pa.float64())
+    return pa.Table.from_pydict(cols, schema=_schema())
+
+
+def table_to_bars(table: "pa.Table") -> List[Dict[str, Any]]:
+    """Arrow table -> legacy list of bar dicts (``t`` as ISO ``Z`` string, null columns omitted)."""
+    out: List[Dict[str, Any]] = []
+    if table is None or table.num_rows == 0:
+        return out
+    t = _t_seconds(table)
+    cols = {c: table.column(c).to_pylist() for c in PRICE_COLUMNS}
+    for i in range(table.num_rows):
+        bar: Dict[str, Any] = {"t": datetime.fromtimestamp(int(t[i]), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")}
+        for c in PRICE_COLUMNS:
+            v = cols[c][i]
+            if v is not None:
+                bar[c] = int(v) if c == "n" else v
+        out.append(bar)
+    return out
+
+
+def _t_seconds(table: "pa.Table") -> np.ndarray:
+    col = table.column("t")
+    if col.num_chunks != 1:
+        col = col.combine_chunks()
+    else:
+        col = col.chunk(0)
+    return col.cast(pa.int64()).to_numpy(zero_copy_only=False)
+
+
+def read_month(path: Path) -> Tuple[Optional["pa.Table"], List[str]]:
+    """Memory-map one month file; returns (table, covered_days)."""
+    if not PYARROW_AVAILABLE or not path.exists():
+        return None, []
+    try:
+        with pa.memory_map(str(path), "r") as src:
+            table = pa.ipc.open_file(src).read_all()
+    except Exception:
+        return None, []
+    meta = table.schema.metadata or {}
+    try:
+        days = json.loads(meta.get(b"days", b"[]").decode())
+    except Exception:
+        days = []
+    return table, [str(d) for d in days]
+
+
+def _write_month(path: Path, table: "pa.Table", days: Iterable[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = table.replace_schema_metadata({b"days": json.dumps(sorted(set(days))).encode()})
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def _merge_days(cache_dir: Path, symbol: str, resolution: str, month: str, per_day: Dict[str, Sequence[Dict[str, Any]]]) -> None:
+    path = month_path(cache_dir, symbol, month, resolution)
+    with _write_lock:
+        existing, days = read_month(path)
+        parts = []
+        if existing is not None and existing.num_rows:
+            t = _t_seconds(existing)
+            keep = np.ones(len(t), dtype=bool)
+            for date_str in per_day:
+                lo, hi = _day_bounds(date_str)
+                keep &= ~((t >= lo) & (t < hi))
+            parts.append(existing.filter(pa.array(keep)).cast(_schema()).replace_schema_metadata(None))
+        for date_str, bars in per_day.items():
+            parts.append(bars_to_table(bars))
+        table = pa.concat_tables(parts) if parts else bars_to_table([])
+        if table.num_rows:
+            order = np.argsort(_t_seconds(table), kind="stable")
+            table = table.take(pa.array(order))
+        _write_month(path, table, list(days) + list(per_day))
+
+
+def write_day(cache_dir: Path, symbol: str, date_str: str, resolution: str, bars: Sequence[Dict[str, Any]]) -> bool:
+    """Upsert one symbol-day into its month file. Returns False when pyarrow is unavailable or on error."""
+    if not PYARROW_AVAILABLE:
+        return False
+    try:
+        _merge_days(Path(cache_dir), symbol, resolution, date_str[:7], {date_str: bars})
+        return True
+    except Exception:
+        return False
+
+
+def read_day(cache_dir: Path, symbol: str, date_str: str, resolution: str) -> Optional["pa.Table"]:
+    """Zero-copy slice of one covered day, or None if that day was never stored."""
+    table, days = read_month(month_path(Path(cache_dir), symbol, date_str[:7], resolution))
+    if table is None or date_str not in days:
+        return None
+    lo, hi = _day_bounds(date_str)
+    return _slice(table, lo, hi)
+
+
+def _slice(table: "pa.Table", lo: int, hi: int) -> "pa.Table":
+    t = _t_seconds(table)
+    i = int(np.searchsorted(t, lo, side="left"))
+    j = int(np.searchsorted(t, hi, side="left"))
+    return table.slice(i, max(0, j - i))
+
+
+def _months(start: datetime, end: datetime) -> List[str]:
+    out = []
+    cur = datetime(start.year, start.month, 1)
+    while cur <= datetime(end.year, end.month, 1):
+        out.append(cur.strftime("%Y-%m"))
+        cur = (cur + timedelta(days=32)).replace(day=1)
+    return out
+
+
+def ingest_json_month(cache_dir: Path, symbol: str, month: str, resolution: str, covered: Iterable[str]) -> bool:
+    """Fold not-yet-migrated JSON day files for this month into the columnar file."""
+    sym_dir = Path(cache_dir) / symbol.upper().strip()
+    suffix = f"_{_safe_res(resolution)}.json"
+    covered = set(covered)
+    pending: Dict[str, Any] = {}
+    for p in sym_dir.glob(f"{month}-*{suffix}"):
+        date_str = p.name[: -len(suffix)]
+        if date_str in covered:
+            continue
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+            pending[date_str] = data if isinstance(data, list) else data.get("bars", [])
+        except Exception:
+            continue
+    if not pending:
+        return False
+    _merge_days(Path(cache_dir), symbol, resolution, month, pending)
+    return True
+
+
+def read_range(
+    cache_dir: Path,
+    symbol: str,
+    start: datetime,
+    end: datetime,
+    resolution: str = "1Min",
+    *,
+    migrate: bool = True,
+) -> Optional["pa.Table"]:
+    """Bars with ``start <= t <= end`` for one symbol as a (zero-copy where possible) Arrow table."""
+    if not PYARROW_AVAILABLE:
+        return None
+    start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+    lo, hi = int(start.timestamp()), int(end.timestamp()) + 1
+    parts = []
+    for month in _months(start.astimezone(timezone.utc), end.astimezone(timezone.utc)):
+        path = month_path(Path(cache_dir), symbol, month, resolution)
+        table, days = read_month(path)
+        if migrate and ingest_json_month(Path(cache_dir), symbol, month, resolution, days):
+            table, days = read_month(path)
+        if table is not None and table.num_rows:
+            parts.append(_slice(table, lo, hi))
+    parts = [p for p in parts if p.num_rows]
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else pa.concat_tables(parts)
+
+
+def load_bar_arrays(
+    symbols: Iterable[str],
+    start: datetime,
+    end: datetime,
+    resolution: str = "1Min",
+    cache_dir: Optional[Path] = None,
+    columns: Sequence[str] = ("o", "h", "l", "c", "v"),
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """``{symbol: {"t": int64 epoch seconds, col: float64, ...}}`` for a symbol set × window."""
+    from src.data.alpaca_bars_cache import DEFAULT_CACHE_DIR
+
+    root = Path(cache_dir or DEFAULT_CACHE_DIR)
+    out: Dict[str, Dict[str, np.ndarray]] = {}
+    for sym in symbols:
+        table = read_range(root, sym, start, end, resolution)
+        if table is None:
+            continue
+        arrays = {"t": _t_seconds(table)}
+        for c in columns:
+            col = table.column(c)
+            arrays[c] = col.to_numpy() if col.null_count == 0 else col.fill_null(np.nan).to_numpy()
+        out[sym.upper().strip()] = arrays
+    return out
+
+
+def load_bars_df(
+    symbols: Iterable[str],
+    start: datetime,
+    end: datetime,
+    resolution: str = "1Min",
+    cache_dir: Optional[Path] = None,
+):
+    """Long-format pandas frame (``symbol`` column, UTC ``t`` index) for a symbol set × window."""
+    import pandas as pd
+    from src.data.alpaca_bars_cache import DEFAULT_CACHE_DIR
+
+    root = Path(cache_dir or DEFAULT_CACHE_DIR)
+    frames = []
+    for sym in symbols:
+        table = read_range(root, sym, start, end, resolution)
+        if table is None:
+            continue
+        df = table.to_pandas(self_destruct=False)
+        df.insert(0, "symbol", sym.upper().strip())
+        frames.append(df.set_index("t"))
+    if not frames:
+        return pd.DataFrame(columns=["symbol", *PRICE_COLUMNS])
+    return pd.concat(frames)
+
+
+def migrate_json_cache(cache_dir: Path, resolution: Optional[str] = None) -> Dict[str, int]:
+    """Convert every JSON day file under ``cache_dir`` (optionally one resolution) to month files."""
+    stats = {"symbols": 0, "months": 0}
+    if not PYARROW_AVAILABLE:
+        return stats
+    root = Path(cache_dir)
+    for sym_dir in sorted(p for p in root.iterdir() if p.is_dir() and p.name != COLUMNAR_DIRNAME):
+        groups: Dict[Tuple[str, str], None] = {}
+        for p in sym_dir.glob("*.json"):
+            stem = p.stem
+            if len(stem) < 12 or stem[10] != "_":
+                continue
+            res = stem[11:]
+            if resolution is None or res == _safe_res(resolution):
+                groups[(stem[:7], res)] = None
+        if not groups:
+            continue
+        stats["symbols"] += 1
+        for month, res in sorted(groups):
+            _, days = read_month(month_path(root, sym_dir.name, month, res))
+            if ingest_json_month(root, sym_dir.name, month, res, days):
+                stats["months"] += 1
+    return stats
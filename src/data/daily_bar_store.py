@@ -0,0 +1,249 @@
+"""
+Shared daily-close store for per-symbol risk features and wheel RSI gates.
+
+``update_symbol_risk_features`` used to issue one ``api.get_bars(symbol, "1Day")`` per symbol
+(all of ``Config.TICKERS`` plus SPY, in sequence) and ``rsi_from_alpaca_daily`` another per CSP
+candidate. ``DailyBarStore`` keeps the last ``MAX_CLOSES`` daily closes per symbol instead:
+
+- **Multi-symbol fetch**: missing/stale symbols are fetched with Alpaca's multi-symbol bars
+  endpoint in chunks of ``DAILY_BAR_CHUNK`` (default 100) symbols.
+- **Incremental**: closes persist to ``state/daily_bar_store.json``; after startup a symbol is
+  only re-fetched from its last stored date (today's partial bar is overwritten), at most every
+  ``DAILY_BAR_REFRESH_SEC`` (default 900s).
+- **Matrix view**: ``close_matrix`` returns the closes right-aligned in one NumPy array so
+  callers can compute returns/vol/beta for every symbol in a single vectorized pass.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MAX_CLOSES = 60
+COLD_LOOKBACK_DAYS = 120
+DEFAULT_CHUNK = 100
+DEFAULT_REFRESH_SEC = 900.0
+
+logger = logging.getLogger(__name__)
+
+
+def _env_num(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _default_path() -> Path:
+    try:
+        from config.registry import Directories
+
+        return Directories.STATE / "daily_bar_store.json"
+    except Exception:
+        return Path("state/daily_bar_store.json")
+
+
+def _norm(symbol: Any) -> str:
+    return str(symbol or "").upper().strip()
+
+
+def _day_key(ts: Any) -> str:
+    dt = ts.to_pydatetime() if hasattr(ts, "to_pydatetime") else ts
+    if isinstance(dt, datetime):
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc)
+        return dt.strftime("%Y-%m-%d")
+    return str(dt)[:10]
+
+
+def _ts_iso(ts: Any) -> Optional[str]:
+    """Bar timestamp as UTC ISO (naive timestamps are taken as UTC)."""
+    dt = ts.to_pydatetime() if hasattr(ts, "to_pydatetime") else ts
+    if not isinstance(dt, datetime):
+        return None
+    dt = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+    return dt.isoformat()
+
+
+Bar = Tuple[str, float, Optional[str]]  # (day, close, bar timestamp ISO)
+
+
+class DailyBarStore:
+    """Thread-safe per-symbol daily closes with chunked multi-symbol refresh (see module docstring)."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        max_closes: int = MAX_CLOSES,
+        chunk_size: Optional[int] = None,
+        refresh_sec: Optional[float] = None,
+        clock=time.time,
+    ) -> None:
+        self.path = Path(path) if path is not None else _default_path()
+        self.max_closes = max(2, int(max_closes))
+        self.chunk_size = max(1, int(chunk_size if chunk_size is not None else _env_num("DAILY_BAR_CHUNK", DEFAULT_CHUNK)))
+        self.refresh_sec = float(refresh_sec if refresh_sec is not None else _env_num("DAILY_BAR_REFRESH_SEC", DEFAULT_REFRESH_SEC))
+        self._clock = clock
+        self._lock = threading.RLock()
+        # symbol -> {"days": [...], "closes": [...], "fetched_at": epoch, "last_ts": ISO of newest bar}
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            from config.registry import read_json
+
+            data = read_json(self.path, default={})
+        except Exception:
+            data = {}
+        syms = data.get("symbols") if isinstance(data, dict) else None
+        if not isinstance(syms, dict):
+            return
+        for sym, row in syms.items():
+            if isinstance(row, dict) and isinstance(row.get("days"), list) and isinstance(row.get("closes"), list):
+                self._rows[_norm(sym)] = {
+                    "days": [str(d) for d in row["days"]][-self.max_closes:],
+                    "closes": [float(c) for c in row["closes"]][-self.max_closes:],
+                    "fetched_at": float(row.get("fetched_at") or 0.0),
+                    "last_ts": row.get("last_ts") if isinstance(row.get("last_ts"), str) else None,
+                }
+
+    def _save(self) -> None:
+        try:
+            from config.registry import atomic_write_json
+
+            with self._lock:
+                data = {
+                    "_meta": {"ts": datetime.now(timezone.utc).isoformat(), "count": len(self._rows)},
+                    "symbols": {s: dict(r) for s, r in self._rows.items()},
+                }
+            atomic_write_json(self.path, data)
+        except Exception:
+            pass
+
+    def _merge(self, symbol: str, bars: List[Bar], fetched_at: float) -> None:
+        row = self._rows.setdefault(symbol, {"days": [], "closes": [], "fetched_at": 0.0, "last_ts": None})
+        merged = dict(zip(row["days"], row["closes"]))
+        stamps: Dict[str, Optional[str]] = {}
+        for day, close, ts in bars:
+            if close > 0:
+                merged[day] = close
+                stamps[day] = ts
+        days = sorted(merged)[-self.max_closes:]
+        row["days"] = days
+        row["closes"] = [merged[d] for d in days]
+        row["fetched_at"] = fetched_at
+        if days and days[-1] in stamps:
+            row["last_ts"] = stamps[days[-1]]
+
+    @staticmethod
+    def _bars(index: Any, closes: List[Any]) -> List[Bar]:
+        return [(_day_key(ts), float(c), _ts_iso(ts)) for ts, c in zip(index, closes) if c is not None]
+
+    def _fetch_chunk(self, api, symbols: List[str], start: datetime, end: datetime) -> Dict[str, List[Bar]]:
+        self.requests += 1
+        resp = api.get_bars(symbols, "1Day", start=start.isoformat(), end=end.isoformat())
+        df = getattr(resp, "df", None)
+        out: Dict[str, List[Bar]] = {s: [] for s in symbols}
+        if df is None or len(df) == 0:
+            return out
+        col = "close" if "close" in df.columns else "c"
+        if "symbol" in df.columns:
+            for sym, part in df.groupby("symbol", sort=False):
+                key = _norm(sym)
+                if key in out:
+                    out[key] = self._bars(part.index, part[col].tolist())
+        elif len(symbols) == 1:
+            out[symbols[0]] = self._bars(df.index, df[col].tolist())
+        return out
+
+    def ensure(self, api, symbols: Iterable[str], *, force: bool = False) -> int:
+        """Refresh symbols not fetched within ``refresh_sec``; returns the number of requests made."""
+        now = self._clock()
+        wanted = []
+        for s in symbols:
+            key = _norm(s)
+            if key and key not in wanted:
+                wanted.append(key)
+        with self._lock:
+            due = [s for s in wanted if force or now - self._rows.get(s, {}).get("fetched_at", 0.0) >= self.refresh_sec]
+            cold = [s for s in due if not self._rows.get(s, {}).get("days")]
+            warm = [s for s in due if s not in cold]
+            warm_from = min((self._rows[s]["days"][-1] for s in warm), default=None)
+        if api is None or not due:
+            return 0
+
+        end = datetime.now(timezone.utc)
+        groups = []
+        if cold:
+            groups.append((cold, end - timedelta(days=COLD_LOOKBACK_DAYS)))
+        if warm:
+            start = datetime.strptime(warm_from, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            groups.append((warm, start))
+        made = 0
+        for group, start in groups:
+            for i in range(0, len(group), self.chunk_size):
+                chunk = group[i:i + self.chunk_size]
+                try:
+                    fetched = self._fetch_chunk(api, chunk, start, end)
+                except Exception as e:
+                    logger.warning("daily bar fetch failed for %d symbols (%s...): %s", len(chunk), ",".join(chunk[:5]), e)
+                    continue
+                made += 1
+                with self._lock:
+                    for sym, bars in fetched.items():
+                        self._merge(sym, bars, now)
+        if made:
+            self._save()
+        return made
+
+    def closes(self, symbol: str, limit: Optional[int] = None) -> List[float]:
+        with self._lock:
+            row = self._rows.get(_norm(symbol))
+            vals = list(row["closes"]) if row else []
+        return vals[-int(limit):] if limit else vals
+
+    def last_day(self, symbol: str) -> Optional[str]:
+        with self._lock:
+            row = self._rows.get(_norm(symbol))
+            return row["days"][-1] if row and row["days"] else None
+
+    def last_bar_ts(self, symbol: str) -> Optional[str]:
+        """Timestamp (UTC ISO) of the newest stored bar as the API reported it."""
+        with self._lock:
+            row = self._rows.get(_norm(symbol))
+            return row.get("last_ts") if row and row["days"] else None
+
+    def close_matrix(self, symbols: List[str], width: int) -> np.ndarray:
+        """``(len(symbols), width)`` closes, right-aligned per symbol, NaN-padded on the left."""
+        width = max(1, int(width))
+        out = np.full((len(symbols), width), np.nan, dtype=float)
+        with self._lock:
+            for i, sym in enumerate(symbols):
+                row = self._rows.get(_norm(sym))
+                if row and row["closes"]:
+                    vals = row["closes"][-width:]
+                    out[i, width - len(vals):] = vals
+        return out
+
+
+_STORE: Optional[DailyBarStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_daily_bar_store() -> DailyBarStore:
+    """Process-wide store backed by ``state/daily_bar_store.json``."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = DailyBarStore()
+    return _STORE
@@ -0,0 +1,117 @@
+"""
+Composite scoring stage: bounded worker-pool fan-out with a deterministic merge.
+
+``main.run_once`` used to score the universe one ticker at a time; with a large cache the
+loop dominated cycle time (enrichment, ``compute_composite_score_v2`` and the Alpaca-backed
+alpha-signature capture are all per-ticker and independent). The stage splits that work:
+
+- **compute** (parallel): ``fn(ticker)`` runs on a ``ThreadPoolExecutor`` and must be free of
+  order-dependent side effects; it returns a result record and records sub-step timings
+  through the shared ``StageTimings``.
+- **merge** (sequential, caller-side): results are yielded in sorted ticker order so
+  counters, trackers (sector tide / persistence) and telemetry see a stable order every cycle.
+
+Workers: ``COMPOSITE_SCORING_WORKERS`` (default 8; ``0``/``1`` runs inline, same code path).
+Kill switch: ``COMPOSITE_SCORING_PARALLEL=0``.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 32
+
+
+def scoring_stage_workers() -> int:
+    """Configured worker count (1 means sequential)."""
+    if str(os.environ.get("COMPOSITE_SCORING_PARALLEL", "1")).strip().lower() in ("0", "false", "no", "off"):
+        return 1
+    try:
+        n = int(os.environ.get("COMPOSITE_SCORING_WORKERS", str(DEFAULT_WORKERS)))
+    except (TypeError, ValueError):
+        n = DEFAULT_WORKERS
+    return max(1, min(MAX_WORKERS, n))
+
+
+class StageTimings:
+    """Thread-safe accumulator of wall-clock seconds per sub-step."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._total: Dict[str, float] = {}
+        self._count: Dict[str, int] = {}
+        self._max: Dict[str, float] = {}
+
+    def add(self, step: str, seconds: float) -> None:
+        with self._lock:
+            self._total[step] = self._total.get(step, 0.0) + seconds
+            self._count[step] = self._count.get(step, 0) + 1
+            if seconds > self._max.get(step, 0.0):
+                self._max[step] = seconds
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """``{step: {total_ms, count, avg_ms, max_ms}}``."""
+        with self._lock:
+            out: Dict[str, Dict[str, float]] = {}
+            for k, tot in self._total.items():
+                n = self._count.get(k, 0)
+                out[k] = {
+                    "total_ms": round(tot * 1000.0, 2),
+                    "count": n,
+                    "avg_ms": round((tot / n) * 1000.0, 3) if n else 0.0,
+                    "max_ms": round(self._max.get(k, 0.0) * 1000.0, 2),
+                }
+            return out
+
+
+def run_scoring_stage(
+    tickers: Iterable[str],
+    fn: Callable[[str], Any],
+    *,
+    workers: int = 1,
+    timings: StageTimings = None,
+) -> List[Tuple[str, Any]]:
+    """
+    Run ``fn`` for every ticker and return ``[(ticker, result), ...]`` sorted by ticker.
+
+    An exception raised by ``fn`` is returned in place of its result so the caller can log it
+    during the merge like the sequential loop did. The first ticker is always computed inline
+    so lazily-initialised module singletons (weights, optimizers) are warmed before fan-out.
+    """
+    ordered = sorted(set(t for t in tickers if t))
+    timings = timings if timings is not None else StageTimings()
+
+    def _call(t: str) -> Any:
+        try:
+            return fn(t)
+        except Exception as e:  # surfaced to the merge phase
+            return e
+
+    t0 = time.perf_counter()
+    results: Dict[str, Any] = {}
+    if ordered:
+        results[ordered[0]] = _call(ordered[0])
+    rest = ordered[1:]
+    n = max(1, min(int(workers or 1), len(rest) or 1))
+    if n <= 1:
+        for t in rest:
+            results[t] = _call(t)
+    else:
+        with ThreadPoolExecutor(max_workers=n, thread_name_prefix="composite-score") as pool:
+            for t, r in zip(rest, pool.map(_call, rest)):
+                results[t] = r
+    timings.add("compute_wall", time.perf_counter() - t0)
+    return [(t, results[t]) for t in ordered]
@@ -0,0 +1,176 @@
+"""
+Long-lived engine session for the worker loop.
+
+``Watchdog._worker_loop`` and ``main.run_once`` used to construct a fresh ``StrategyEngine``
+(and with it an ``AlpacaExecutor``, REST session, Live Whale model, weight/profile/theme tables,
+state-manager reconcile) on every cycle, and ``run_all_strategies`` did the same for the wheel
+REST client. ``EngineSession`` keeps one instance alive across cycles and rebuilds it only when:
+
+- the **signature** changes (``signature()`` returns e.g. mtimes of the weight / profile files);
+- someone calls ``invalidate(reason)`` (config reload, weight update, manual hook);
+- the previous cycle failed (``rebuild_on_error(err)``), so a half-broken engine is never reused;
+- it is older than ``max_age_sec`` (``0`` = no age limit).
+
+``on_reuse(instance)`` runs before a cached instance is handed out so cheap per-cycle state
+(e.g. the UW flow cache snapshot) stays as fresh as it was with per-cycle construction.
+
+Kill switch: ``PERSISTENT_ENGINE=0`` builds a new instance on every ``get()`` (legacy behaviour).
+Max age: ``PERSISTENT_ENGINE_MAX_AGE_SEC`` (default 21600).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+DEFAULT_MAX_AGE_SEC = 6 * 3600.0
+
+EventHook = Callable[[str, Dict[str, Any]], None]
+
+
+def persistent_engine_enabled() -> bool:
+    return str(os.environ.get("PERSISTENT_ENGINE", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def persistent_engine_max_age_sec() -> float:
+    try:
+        return max(0.0, float(os.environ.get("PERSISTENT_ENGINE_MAX_AGE_SEC", str(DEFAULT_MAX_AGE_SEC))))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_AGE_SEC
+
+
+def file_signature(paths: Iterable[Any]) -> Tuple[Tuple[str, Optional[Tuple[int, int]]], ...]:
+    """``((path, (mtime_ns, size) | None), ...)`` — changes whenever any file is written or removed."""
+    out = []
+    for p in paths:
+        if not p:
+            continue
+        try:
+            st = Path(p).stat()
+            sig: Optional[Tuple[int, int]] = (int(st.st_mtime_ns), int(st.st_size))
+        except OSError:
+            sig = None
+        out.append((str(p), sig))
+    return tuple(out)
+
+
+class EngineSession:
+    """Thread-safe get-or-build holder for one long-lived object."""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        *,
+        name: str = "engine",
+        signature: Optional[Callable[[], Hashable]] = None,
+        on_reuse: Optional[Callable[[Any], None]] = None,
+        on_event: Optional[EventHook] = None,
+        max_age_sec: Optional[float] = None,
+        enabled: Optional[Callable[[], bool]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._factory = factory
+        self._signature = signature
+        self._on_reuse = on_reuse
+        self._on_event = on_event
+        self._max_age_sec = max_age_sec
+        self._enabled = enabled or persistent_engine_enabled
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._instance: Any = None
+        self._built_at = 0.0
+        self._sig: Hashable = None
+        self._pending_reason: Optional[str] = None
+        self.builds = 0
+        self.reuses = 0
+
+    def _emit(self, event: str, **kw: Any) -> None:
+        if self._on_event is None:
+            return
+        try:
+            self._on_event(event, {"session": self.name, **kw})
+        except Exception:
+            pass
+
+    def _current_signature(self) -> Hashable:
+        if self._signature is None:
+            return None
+        try:
+            return self._signature()
+        except Exception:
+            return None
+
+    def _max_age(self) -> float:
+        return persistent_engine_max_age_sec() if self._max_age_sec is None else float(self._max_age_sec)
+
+    def _rebuild_reason(self, sig: Hashable) -> Optional[str]:
+        if self._instance is None:
+            return "cold_start"
+        if self._pending_reason:
+            return self._pending_reason
+        if sig != self._sig:
+            return "signature_changed"
+        max_age = self._max_age()
+        if max_age > 0 and (self._clock() - self._built_at) >= max_age:
+            return "max_age"
+        return None
+
+    def get(self) -> Any:
+        """Return the cached instance, rebuilding it first if stale. Factory errors propagate."""
+        if not self._enabled():
+            self.builds += 1
+            return self._factory()
+        with self._lock:
+            sig = self._current_signature()
+            reason = self._rebuild_reason(sig)
+            if reason is None:
+                try:
+                    if self._on_reuse is not None:
+                        self._on_reuse(self._instance)
+                except Exception as e:
+                    reason = f"refresh_failed:{type(e).__name__}"
+                else:
+                    self.reuses += 1
+                    return self._instance
+            t0 = time.perf_counter()
+            self._instance = None
+            instance = self._factory()
+            self._instance = instance
+            self._built_at = self._clock()
+            self._sig = sig
+            self._pending_reason = None
+            self.builds += 1
+            self._emit("engine_rebuilt", reason=reason, build_ms=round((time.perf_counter() - t0) * 1000.0, 1),
+                       builds=self.builds, reuses=self.reuses)
+            return instance
+
+    def peek(self) -> Any:
+        """The cached instance (or ``None``) without building or refreshing."""
+        with self._lock:
+            return self._instance
+
+    def invalidate(self, reason: str = "invalidated") -> None:
+        """Force a rebuild on the next ``get()`` (the current instance stays usable until then)."""
+        with self._lock:
+            if self._instance is not None and not self._pending_reason:
+                self._pending_reason = str(reason or "invalidated")
+                self._emit("engine_invalidated", reason=self._pending_reason)
+
+    def rebuild_on_error(self, error: BaseException) -> None:
+        """Drop the instance after a failed cycle so the next cycle starts from a clean build."""
+        self.invalidate(f"error:{type(error).__name__}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            age = (self._clock() - self._built_at) if self._instance is not None else None
+            return {
+                "session": self.name,
+                "alive": self._instance is not None,
+                "age_sec": round(age, 1) if age is not None else None,
+                "builds": self.builds,
+                "reuses": self.reuses,
+                "pending_invalidation": self._pending_reason,
+            }
@@ -9,7 +9,11 @@ Used for long exits: stop only ratchets **up**. Initial anchor:
 from __future__ import annotations
 
 import math
-from typing import List, Optional, Sequence
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.core.indicators import wilder_atr
 
 
 def _finite(x: float) -> bool:
@@ -20,10 +24,6 @@ def _finite(x: float) -> bool:
         return False
 
 
-def _true_range(high: float, low: float, close_prev: float) -> float:
-    return max(high - low, abs(high - close_prev), abs(low - close_prev))
-
-
 def wilders_atr_last(
     highs: Sequence[float],
     lows: Sequence[float],
@@ -39,17 +39,15 @@ def wilders_atr_last(
     n = len(closes)
     if p < 1 or n < p + 1:
         raise ValueError("need at least period+1 bars for Wilder ATR")
-    trs: List[float] = []
-    for i in range(1, n):
-        if not (_finite(highs[i]) and _finite(lows[i]) and _finite(closes[i - 1])):
-            raise ValueError("non-finite OHLC in ATR window")
-        trs.append(_true_range(float(highs[i]), float(lows[i]), float(closes[i - 1])))
-    if len(trs) < p:
-        raise ValueError("insufficient true ranges")
-    atr = sum(trs[:p]) / float(p)
-    for j in range(p, len(trs)):
-        atr = (atr * float(p - 1) + trs[j]) / float(p)
-    return float(atr)
+    try:
+        h = np.asarray(highs, dtype=float)
+        l = np.asarray(lows, dtype=float)
+        c = np.asarray(closes, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("non-finite OHLC in ATR window")
+    if not (np.isfinite(h[1:n]).all() and np.isfinite(l[1:n]).all() and np.isfinite(c[: n - 1]).all()):
+        raise ValueError("non-finite OHLC in ATR window")
+    return float(wilder_atr(h[:n], l[:n], c, period=p))
 
 
 def calculate_atr_trailing_stop(
@@ -0,0 +1,204 @@
+"""
+Per-cycle market snapshot for ``AlpacaExecutor.evaluate_exits``.
+
+Exit evaluation used to call ``get_quote_price`` and, for the offense and dynamic ATR trails,
+``fetch_bars_safe`` separately for every open position — several blocking REST round-trips per
+position per cycle. ``build_exit_snapshots`` gathers everything once at the top of the cycle:
+
+- **Stream first**: fresh minute bars / last trade from ``AlpacaStreamManager.price_cache``
+  (``ALPACA_STREAM_BAR_MAX_AGE_SEC``, default 60s) need no REST call at all.
+- **One request per data type** for the rest: ``get_latest_trades``, ``get_latest_quotes`` and
+  a multi-symbol ``get_bars`` (time-bounded so every symbol gets ``bar_limit`` bars).
+- **Immutable hand-off**: each position gets a frozen ``MarketSnapshot``; ``bars(limit)``
+  returns a ``fetch_bars_safe``-shaped object (``.df``) or None when the bars are short or
+  stale (``BAR_STALE_MAX_AGE_MINUTES``), in which case callers fall back to the old fetch.
+
+Kill switch: ``EXIT_MARKET_SNAPSHOT=0`` restores per-position fetches.
+"""
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - pandas ships with the bot
+    pd = None  # type: ignore[assignment]
+
+
+def exit_market_snapshot_enabled() -> bool:
+    return str(os.environ.get("EXIT_MARKET_SNAPSHOT", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Read-only market view of one symbol for a single exit cycle."""
+
+    symbol: str
+    last_trade: float = 0.0
+    bid: float = 0.0
+    ask: float = 0.0
+    bars_df: Any = None  # 1Min OHLCV, oldest first (do not mutate; use bars())
+    bars_source: str = ""
+    taken_at: float = 0.0
+
+    @property
+    def price(self) -> float:
+        """Last trade, else NBBO mid, else 0.0."""
+        if self.last_trade > 0:
+            return self.last_trade
+        if self.bid > 0 and self.ask >= self.bid:
+            return (self.bid + self.ask) / 2.0
+        return 0.0
+
+    def bars(self, limit: int, *, max_age_minutes: Optional[float] = None) -> Optional[SimpleNamespace]:
+        """Last ``limit`` bars as ``SimpleNamespace(df=...)`` (a copy), or None if short/stale."""
+        df = self.bars_df
+        if df is None or len(df) < int(limit):
+            return None
+        if max_age_minutes is None:
+            max_age_minutes = _env_float("BAR_STALE_MAX_AGE_MINUTES", 5.0)
+        try:
+            last = df.index[-1]
+            last_dt = last.to_pydatetime() if hasattr(last, "to_pydatetime") else last
+            if getattr(last_dt, "tzinfo", None) is None:
+                last_dt = last_dt.replace(tzinfo=timezone.utc)
+            if (datetime.now(timezone.utc) - last_dt).total_seconds() / 60.0 > max_age_minutes:
+                return None
+        except Exception:
+            return None
+        return SimpleNamespace(df=df.iloc[-int(limit):].copy())
+
+
+def _price_of(obj: Any, *names: str) -> float:
+    for n in names:
+        try:
+            v = float(getattr(obj, n, 0.0) or 0.0)
+        except (TypeError, ValueError):
+            v = 0.0
+        if v > 0:
+            return v
+    return 0.0
+
+
+def _split_bars(df: Any, symbols: Iterable[str], limit: int) -> Dict[str, Any]:
+    """Split a multi-symbol ``get_bars`` frame (``symbol`` column) into per-symbol tails."""
+    out: Dict[str, Any] = {}
+    if df is None or len(df) == 0:
+        return out
+    wanted = set(symbols)
+    if "symbol" not in df.columns:
+        if len(wanted) == 1:
+            out[next(iter(wanted))] = df.sort_index().iloc[-limit:]
+        return out
+    for sym, part in df.groupby("symbol", sort=False):
+        if sym in wanted:
+            out[sym] = part.drop(columns=["symbol"]).sort_index().iloc[-limit:]
+    return out
+
+
+def build_exit_snapshots(
+    api: Any,
+    symbols: Iterable[str],
+    *,
+    bar_limit: int = 80,
+    price_cache: Any = None,
+    stream_max_age_sec: Optional[float] = None,
+    on_error: Optional[Any] = None,
+) -> Dict[str, MarketSnapshot]:
+    """
+    Snapshot every symbol with at most one REST call per data type (see module docstring).
+
+    Failures of a batch call are reported through ``on_error(kind, exc)`` and leave the
+    affected fields empty; callers keep their per-symbol fallbacks.
+    """
+    syms: List[str] = []
+    for s in symbols:
+        u = str(s or "").upper().strip()
+        if u and u not in syms:
+            syms.append(u)
+    if not syms:
+        return {}
+    bar_limit = max(1, int(bar_limit))
+    if stream_max_age_sec is None:
+        stream_max_age_sec = _env_float("ALPACA_STREAM_BAR_MAX_AGE_SEC", 60.0)
+
+    def _report(kind: str, exc: BaseException) -> None:
+        if on_error is not None:
+            try:
+                on_error(kind, exc)
+            except Exception:
+                pass
+
+    trades: Dict[str, float] = {}
+    bars: Dict[str, Any] = {}
+    sources: Dict[str, str] = {}
+    if price_cache is not None:
+        for sym in syms:
+            try:
+                df = price_cache.get_fresh_bars_df(sym, bar_limit, max_age_sec=stream_max_age_sec)
+                if df is not None and len(df) > 0:
+                    bars[sym] = df
+                    sources[sym] = "stream"
+                px = price_cache.get_fresh_trade(sym, max_age_sec=stream_max_age_sec)
+                if px:
+                    trades[sym] = float(px)
+            except Exception as e:
+                _report("stream", e)
+
+    need_trades = [s for s in syms if s not in trades]
+    if need_trades:
+        try:
+            latest = api.get_latest_trades(need_trades) or {}
+            for sym, t in dict(latest).items():
+                px = _price_of(t, "price", "p")
+                if px > 0:
+                    trades[str(sym).upper()] = px
+        except Exception as e:
+            _report("trades", e)
+
+    quotes: Dict[str, tuple] = {}
+    try:
+        latest_q = api.get_latest_quotes(syms) or {}
+        for sym, q in dict(latest_q).items():
+            quotes[str(sym).upper()] = (_price_of(q, "bid_price", "bp"), _price_of(q, "ask_price", "ap"))
+    except Exception as e:
+        _report("quotes", e)
+
+    need_bars = [s for s in syms if s not in bars]
+    if need_bars:
+        try:
+            # Time-bounded window instead of ``limit`` (which caps the total across symbols).
+            start = datetime.now(timezone.utc) - timedelta(minutes=bar_limit * 3 + 30)
+            resp = api.get_bars(need_bars, "1Min", start=start.isoformat())
+            for sym, df in _split_bars(getattr(resp, "df", None), need_bars, bar_limit).items():
+                bars[sym] = df
+                sources[sym] = "rest"
+        except Exception as e:
+            _report("bars", e)
+
+    now = time.time()
+    out: Dict[str, MarketSnapshot] = {}
+    for sym in syms:
+        bid, ask = quotes.get(sym, (0.0, 0.0))
+        out[sym] = MarketSnapshot(
+            symbol=sym,
+            last_trade=trades.get(sym, 0.0),
+            bid=bid,
+            ask=ask,
+            bars_df=bars.get(sym),
+            bars_source=sources.get(sym, ""),
+            taken_at=now,
+        )
+    return out
@@ -0,0 +1,90 @@
+"""
+Bounded concurrent exit submission, one task per symbol.
+
+``evaluate_exits`` and the EOD flatten closed positions strictly one after another: submit, wait
+for the fill, verify flat, then the next symbol. With N positions to close the last one waited
+behind N-1 full close/confirm round trips, each up to the fill wait plus the verify polling.
+
+``run_per_symbol`` runs a per-symbol close function on a bounded ``ThreadPoolExecutor``:
+
+- Every close is submitted up front; confirmations (fill wait, flat check) overlap.
+- Each symbol is a single task, so its own retry / fallback sequence stays ordered. A
+  process-wide per-symbol lock also keeps overlapping callers from interleaving closes of the
+  same symbol.
+- Results come back keyed by symbol in input order (duplicates collapsed), with an exception
+  from a task returned as the value instead of raised, so callers can run attribution and
+  telemetry sequentially in their original order.
+
+Env: ``EXIT_PARALLEL_WORKERS`` (default 8). Kill switch: ``EXIT_PARALLEL=0`` (sequential, in the
+calling thread).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+_DEFAULT_WORKERS = 8
+
+_SYMBOL_LOCKS: Dict[str, threading.Lock] = {}
+_SYMBOL_LOCKS_GUARD = threading.Lock()
+
+
+def exit_parallel_enabled() -> bool:
+    return str(os.environ.get("EXIT_PARALLEL", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def exit_parallel_workers() -> int:
+    """Pool size for concurrent closes (1 when the kill switch is set)."""
+    if not exit_parallel_enabled():
+        return 1
+    try:
+        return max(1, int(os.environ.get("EXIT_PARALLEL_WORKERS", str(_DEFAULT_WORKERS))))
+    except (TypeError, ValueError):
+        return _DEFAULT_WORKERS
+
+
+def symbol_lock(symbol: str) -> threading.Lock:
+    """Process-wide lock serializing close work for one symbol."""
+    key = str(symbol).upper().strip()
+    with _SYMBOL_LOCKS_GUARD:
+        lock = _SYMBOL_LOCKS.get(key)
+        if lock is None:
+            lock = _SYMBOL_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _run_one(fn: Callable[[str], Any], symbol: str) -> Any:
+    try:
+        with symbol_lock(symbol):
+            return fn(symbol)
+    except Exception as e:
+        return e
+
+
+def run_per_symbol(
+    symbols: Iterable[str],
+    fn: Callable[[str], Any],
+    *,
+    max_workers: Optional[int] = None,
+) -> "OrderedDict[str, Any]":
+    """
+    Run ``fn(symbol)`` for every distinct symbol on a bounded pool.
+
+    Returns ``{symbol: result or exception}`` in first-seen input order.
+    """
+    unique = list(OrderedDict.fromkeys(s for s in symbols if s))
+    workers = min(int(max_workers or exit_parallel_workers()), len(unique))
+    out: "OrderedDict[str, Any]" = OrderedDict()
+    if workers <= 1:
+        for sym in unique:
+            out[sym] = _run_one(fn, sym)
+        return out
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="exit-close") as pool:
+        futures = [(sym, pool.submit(_run_one, fn, sym)) for sym in unique]
+        for sym, fut in futures:
+            out[sym] = fut.result()
+    return out
@@ -0,0 +1,152 @@
+"""
+Resumable byte-offset cursor over an append-only, rotated JSONL log.
+
+The learning orchestrator used to re-open every log at byte 0 and ``json.loads`` each line
+until it re-found ``last_*_id``, so every run got slower as the logs grew. ``JsonlCursor``
+checkpoints ``{inode, offset, tail_len, tail_sha1}`` per stream instead:
+
+- **Resume**: if the live file still has the checkpointed inode and the ``tail_len`` bytes
+  just before ``offset`` hash to ``tail_sha1``, reading starts at ``offset``.
+- **Rotation**: if the live file is new, the checkpointed inode is looked up among the
+  ``{name}.1`` … ``{name}.N`` backups written by ``main._rotate_jsonl_file``; the rest of that
+  backup, any newer backups and then the live file are read in order.
+- **Fallback**: truncation, a rewritten tail, or an inode that rotated out of reach leave
+  ``resumed`` False and the live file is read from the start, so the caller's ``last_*_id``
+  scan decides what is new.
+
+Only newline-terminated lines are consumed; a half-written last line is picked up next run.
+The checkpoint is written into the caller's state dict when the ``with`` block exits
+without an exception.
+
+Kill switch: ``LEARNING_LOG_CURSOR=0`` ignores stored checkpoints (always ID scan).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+STATE_KEY = "log_cursors"
+
+
+def jsonl_cursor_enabled() -> bool:
+    return str(os.environ.get("LEARNING_LOG_CURSOR", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _backups(path: Path) -> List[Path]:
+    """Rotated backups newest first (``.1``, ``.2``, …)."""
+    found = []
+    for p in path.parent.glob(path.name + ".*"):
+        suffix = p.name[len(path.name) + 1:]
+        if suffix.isdigit():
+            found.append((int(suffix), p))
+    return [p for _, p in sorted(found)]
+
+
+def _tail_matches(path: Path, checkpoint: Dict[str, Any]) -> bool:
+    offset = int(checkpoint.get("offset") or 0)
+    tail_len = int(checkpoint.get("tail_len") or 0)
+    if tail_len <= 0:
+        return offset == 0
+    if tail_len > offset:
+        return False
+    try:
+        with path.open("rb") as f:
+            f.seek(offset - tail_len)
+            tail = f.read(tail_len)
+    except OSError:
+        return False
+    return hashlib.sha1(tail).hexdigest() == checkpoint.get("tail_sha1")
+
+
+class JsonlCursor:
+    """Iterate the lines appended to ``path`` since ``checkpoint`` (see module docstring)."""
+
+    def __init__(self, path: Path, checkpoint: Optional[Dict[str, Any]] = None, *, full_scan: bool = False) -> None:
+        self.path = Path(path)
+        self._checkpoint = checkpoint
+        plan = None
+        if checkpoint and not full_scan and jsonl_cursor_enabled():
+            plan = self._resume_plan(checkpoint)
+        self.resumed = plan is not None
+        self._plan: List[Tuple[Path, int]] = plan if plan is not None else [(self.path, 0)]
+        self._last: Optional[Tuple[int, int, bytes]] = None
+        self.lines_read = 0
+        self._state: Optional[Dict[str, Any]] = None
+        self._stream = ""
+
+    def _resume_plan(self, checkpoint: Dict[str, Any]) -> Optional[List[Tuple[Path, int]]]:
+        try:
+            inode = int(checkpoint["inode"])
+            offset = int(checkpoint["offset"])
+            live = self.path.stat()
+        except (KeyError, TypeError, ValueError, OSError):
+            return None
+        if live.st_ino == inode:
+            if live.st_size >= offset and _tail_matches(self.path, checkpoint):
+                return [(self.path, offset)]
+            return None
+        backups = _backups(self.path)
+        for idx, backup in enumerate(backups):
+            try:
+                st = backup.stat()
+            except OSError:
+                continue
+            if st.st_ino != inode:
+                continue
+            if st.st_size < offset or not _tail_matches(backup, checkpoint):
+                return None
+            newer = backups[:idx]
+            return [(backup, offset)] + [(p, 0) for p in reversed(newer)] + [(self.path, 0)]
+        return None
+
+    def __iter__(self) -> Iterator[str]:
+        for path, start in self._plan:
+            try:
+                f = path.open("rb")
+            except OSError:
+                continue
+            with f:
+                inode = os.fstat(f.fileno()).st_ino
+                f.seek(start)
+                pos = start
+                if start == 0:
+                    self._last = (inode, 0, b"")
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    pos += len(raw)
+                    self._last = (inode, pos, raw)
+                    self.lines_read += 1
+                    yield raw.decode("utf-8", errors="replace")
+
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Position after the last consumed line (the incoming checkpoint if nothing was read)."""
+        if self._last is None:
+            return self._checkpoint
+        inode, offset, tail = self._last
+        return {
+            "inode": inode,
+            "offset": offset,
+            "tail_len": len(tail),
+            "tail_sha1": hashlib.sha1(tail).hexdigest() if tail else "",
+        }
+
+    def __enter__(self) -> "JsonlCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None and self._state is not None:
+            cp = self.checkpoint()
+            if cp is not None:
+                self._state.setdefault(STATE_KEY, {})[self._stream] = cp
+
+
+def open_jsonl_cursor(state: Dict[str, Any], stream: str, path: Path, full_scan: bool = False) -> JsonlCursor:
+    """Cursor for ``stream`` resuming from ``state[STATE_KEY][stream]``; saves back on clean exit."""
+    checkpoints = state.get(STATE_KEY) if isinstance(state.get(STATE_KEY), dict) else {}
+    cursor = JsonlCursor(path, checkpoints.get(stream), full_scan=full_scan)
+    cursor._state = state
+    cursor._stream = stream
+    return cursor
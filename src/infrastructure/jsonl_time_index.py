@@ -0,0 +1,229 @@
+"""
+Sparse timestamp → byte-offset index over an append-only JSONL log.
+
+Dashboard readers answered "records since day X" by reading from byte 0. For example,
+``_load_stock_closed_trades`` stopped after the first 10,000 lines of ``attribution.jsonl``, so on
+a long-lived host it parsed the oldest records, dropped them against its 90-day cutoff and could
+miss recent trades. ``JsonlTimeIndex`` samples one record per ``JSONL_TIME_INDEX_BLOCK_BYTES``
+(default 256KB) instead:
+
+- **Build**: seek to each block boundary, skip the partial line and parse the timestamp of the
+  next complete record. A 1GB log costs ~4k short reads, not a full parse.
+- **Maintenance**: built lazily on first query and extended on later queries by sampling only the
+  blocks appended since. A new inode or a shrunken file drops the index and rebuilds it.
+- **Queries**: ``offset_for(since)`` bisects the running maximum of the sampled timestamps.
+  ``end_offset_for(until)`` bisects the running minimum taken from the end. Both bounds keep one
+  extra block of slack for records written slightly out of order. Callers still filter each
+  record by timestamp; the index only narrows the bytes read.
+
+``iter_jsonl_window(path, since, until)`` is the shared entry point (closed trades, P&L
+reconcile, rolling PnL). ``checkpoint_at`` seeds a ``JsonlCursor`` at an indexed offset so a
+tailer can start at its window instead of byte 0.
+
+Kill switch: ``JSONL_TIME_INDEX=0`` (window reads scan the whole file).
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+DEFAULT_BLOCK_BYTES = 256 * 1024
+_SAMPLE_MAX_LINES = 8
+_SEED_TAIL_BYTES = 256
+
+
+def jsonl_time_index_enabled() -> bool:
+    return str(os.environ.get("JSONL_TIME_INDEX", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def record_epoch(rec: Dict[str, Any]) -> Optional[float]:
+    """``ts`` / ``timestamp`` / ``_ts`` as epoch seconds (naive ISO strings are UTC), or None."""
+    ts = rec.get("ts") or rec.get("timestamp") or rec.get("_ts")
+    if not ts:
+        return None
+    try:
+        if isinstance(ts, (int, float)):
+            return float(ts)
+        dt = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except Exception:
+        return None
+
+
+def _line_epoch(raw: bytes) -> Optional[float]:
+    try:
+        rec = json.loads(raw)
+    except (json.JSONDecodeError, ValueError):
+        return None
+    return record_epoch(rec) if isinstance(rec, dict) else None
+
+
+class JsonlTimeIndex:
+    """Sampled ``(offset, epoch)`` pairs for one file (see module docstring)."""
+
+    def __init__(self, path: Union[str, Path], *, block_bytes: Optional[int] = None) -> None:
+        self.path = Path(path)
+        if block_bytes is None:
+            try:
+                block_bytes = int(os.environ.get("JSONL_TIME_INDEX_BLOCK_BYTES", str(DEFAULT_BLOCK_BYTES)))
+            except (TypeError, ValueError):
+                block_bytes = DEFAULT_BLOCK_BYTES
+        self.block_bytes = max(4096, int(block_bytes))
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+        self._clear(None)
+
+    def _clear(self, inode: Optional[int]) -> None:
+        self._inode = inode
+        self._size = 0
+        self._next = 0  # next block boundary to sample
+        self._offsets: List[int] = []
+        self._epochs: List[float] = []
+        self._max_prefix: List[float] = []
+        self._min_suffix: Optional[List[float]] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def refresh(self) -> int:
+        """Sample blocks appended since the last call; returns the file size covered."""
+        with self._lock:
+            try:
+                st = self.path.stat()
+            except OSError:
+                self._clear(None)
+                return 0
+            if st.st_ino != self._inode or st.st_size < self._size:
+                had = self._inode is not None
+                self._clear(st.st_ino)
+                self.rebuilds += int(had)
+            if st.st_size == self._size:
+                return self._size
+            try:
+                with self.path.open("rb") as f:
+                    pos = self._next
+                    while pos < st.st_size:
+                        if not self._sample(f, pos, st.st_size):
+                            break  # block ends in a half-written record; retry next refresh
+                        pos += self.block_bytes
+                    self._next = pos
+            except OSError:
+                return self._size
+            self._size = st.st_size
+            self._min_suffix = None
+            return self._size
+
+    def _sample(self, f, pos: int, size: int) -> bool:
+        f.seek(pos)
+        if pos > 0:
+            f.readline()
+        for _ in range(_SAMPLE_MAX_LINES):
+            start = f.tell()
+            if start >= size:
+                return True
+            raw = f.readline()
+            if not raw.endswith(b"\n"):
+                return False
+            ts = _line_epoch(raw)
+            if ts is None:
+                continue
+            if self._offsets and start <= self._offsets[-1]:
+                return True  # one record spans several blocks
+            self._offsets.append(start)
+            self._epochs.append(ts)
+            self._max_prefix.append(max(ts, self._max_prefix[-1]) if self._max_prefix else ts)
+            return True
+        return True
+
+    def offset_for(self, since_epoch: float) -> int:
+        """Byte offset at or before the first record with ``ts >= since_epoch``."""
+        self.refresh()
+        with self._lock:
+            i = bisect.bisect_left(self._max_prefix, float(since_epoch)) - 2
+            return self._offsets[i] if i >= 0 else 0
+
+    def end_offset_for(self, until_epoch: float) -> Optional[int]:
+        """Byte offset after the last record with ``ts <= until_epoch`` (None = end of file)."""
+        self.refresh()
+        with self._lock:
+            if self._min_suffix is None:
+                acc: List[float] = []
+                lo = float("inf")
+                for ts in reversed(self._epochs):
+                    lo = min(lo, ts)
+                    acc.append(lo)
+                self._min_suffix = acc[::-1]
+            j = bisect.bisect_right(self._min_suffix, float(until_epoch)) + 1
+            return self._offsets[j] if j < len(self._offsets) else None
+
+    def checkpoint_at(self, offset: int) -> Optional[Dict[str, Any]]:
+        """``JsonlCursor`` checkpoint that resumes reading at ``offset`` (a line start)."""
+        offset = max(0, int(offset))
+        tail_len = min(offset, _SEED_TAIL_BYTES)
+        try:
+            with self.path.open("rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                f.seek(offset - tail_len)
+                tail = f.read(tail_len)
+        except OSError:
+            return None
+        return {
+            "inode": inode,
+            "offset": offset,
+            "tail_len": len(tail),
+            "tail_sha1": hashlib.sha1(tail).hexdigest() if tail else "",
+        }
+
+
+def iter_jsonl_window(
+    path: Union[str, Path],
+    since_epoch: Optional[float] = None,
+    until_epoch: Optional[float] = None,
+) -> Iterator[str]:
+    """Complete lines of ``path`` that may fall in ``[since_epoch, until_epoch]`` (caller filters)."""
+    p = Path(path)
+    start, end = 0, None
+    if jsonl_time_index_enabled():
+        idx = get_jsonl_time_index(p)
+        if since_epoch is not None:
+            start = idx.offset_for(since_epoch)
+        if until_epoch is not None:
+            end = idx.end_offset_for(until_epoch)
+    try:
+        f = p.open("rb")
+    except OSError:
+        return
+    with f:
+        f.seek(start)
+        pos = start
+        for raw in f:
+            if end is not None and pos >= end:
+                break
+            if not raw.endswith(b"\n"):
+                break
+            pos += len(raw)
+            yield raw.decode("utf-8", errors="replace")
+
+
+_INDEXES: Dict[str, JsonlTimeIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_jsonl_time_index(path: Union[str, Path]) -> JsonlTimeIndex:
+    """Process-wide index for ``path``."""
+    key = os.path.abspath(str(path))
+    idx = _INDEXES.get(key)
+    if idx is None:
+        with _INDEXES_LOCK:
+            idx = _INDEXES.get(key)
+            if idx is None:
+                idx = _INDEXES[key] = JsonlTimeIndex(key)
+    return idx
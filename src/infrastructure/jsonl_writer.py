@@ -0,0 +1,299 @@
+"""
+Buffered JSONL writer: persistent append handles, background flusher, per-stream durability.
+
+``main.jsonl_write`` used to ``open`` / append / ``close`` the target on every record (plus a
+rotation ``stat``), so a cycle paid hundreds of syscalls on the trading thread. ``JsonlWriter``
+keeps one ``O_APPEND`` descriptor per path and applies a per-stream policy:
+
+- ``durable``: written inline and ``fsync``'d before returning (orders, attribution);
+- ``sync``: written inline, no fsync;
+- ``async``: serialized on the caller, queued, and written in batches by a daemon thread.
+
+Each ``os.write`` carries whole lines only, so concurrent appenders (other daemons writing the
+same log) never see torn records. Async queues are bounded (``JSONL_WRITER_QUEUE_MAX``); when
+full the caller either blocks (``block``, default: backpressure) or the record is counted and
+dropped (``drop``). Rotation is size-tracked from the handle (no per-record ``stat``); a file
+renamed or removed from outside is detected at most once per ``REOPEN_CHECK_SEC`` and reopened.
+
+``flush()`` drains queues (and fsyncs durable streams); ``main.flush_jsonl_logs`` calls it from
+``handle_exit`` and before ``main`` reads one of its own logs back. ``close()`` is registered
+with ``atexit``.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+POLICIES = ("durable", "sync", "async")
+OVERFLOW_POLICIES = ("block", "drop")
+DEFAULT_QUEUE_MAX = 10000
+FLUSH_INTERVAL_SEC = 0.2
+REOPEN_CHECK_SEC = 1.0
+MAX_BATCH_LINES = 512
+
+
+@dataclass
+class StreamPolicy:
+    mode: str = "async"
+    overflow: str = "block"
+    rotate_max_bytes: int = 0
+    rotate: Optional[Callable[[str], None]] = None  # called with the handle closed
+
+
+class _Stream:
+    def __init__(self, path: str, policy: StreamPolicy) -> None:
+        self.path = path
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.fd: Optional[int] = None
+        self.ident: Optional[Tuple[int, int]] = None
+        self.size = 0
+        self.checked_at = 0.0
+        self.dirty = False
+
+    def _open(self) -> None:
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        st = os.fstat(self.fd)
+        self.ident = (int(st.st_dev), int(st.st_ino))
+        self.size = int(st.st_size)
+        self.checked_at = time.monotonic()
+
+    def close_fd(self) -> None:
+        if self.fd is not None:
+            try:
+                if self.dirty and self.policy.mode == "durable":
+                    os.fsync(self.fd)
+            except OSError:
+                pass
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+        self.fd = None
+        self.dirty = False
+
+    def _ensure_open(self) -> None:
+        if self.fd is None:
+            self._open()
+            return
+        now = time.monotonic()
+        if now - self.checked_at < REOPEN_CHECK_SEC:
+            return
+        self.checked_at = now
+        try:
+            st = os.stat(self.path)
+            if (int(st.st_dev), int(st.st_ino)) == self.ident:
+                self.size = int(st.st_size)  # pick up appends by other processes
+                return
+        except OSError:
+            pass
+        self.close_fd()
+        self._open()
+
+    def _maybe_rotate(self) -> None:
+        pol = self.policy
+        if pol.rotate is None or pol.rotate_max_bytes <= 0 or self.size < pol.rotate_max_bytes:
+            return
+        self.close_fd()
+        try:
+            pol.rotate(self.path)
+        finally:
+            self._open()
+
+    def write(self, data: bytes) -> None:
+        """Append whole lines (caller holds ``self.lock``)."""
+        self._ensure_open()
+        self._maybe_rotate()
+        view = memoryview(data)
+        while view:
+            n = os.write(self.fd, view)
+            view = view[n:]
+        self.size += len(data)
+        self.dirty = True
+        if self.policy.mode == "durable":
+            os.fsync(self.fd)
+            self.dirty = False
+
+
+class JsonlWriter:
+    """Process-wide JSONL append service (see module docstring)."""
+
+    def __init__(
+        self,
+        policy_for: Callable[[str], StreamPolicy] = lambda _path: StreamPolicy(),
+        *,
+        queue_max: int = DEFAULT_QUEUE_MAX,
+        flush_interval: float = FLUSH_INTERVAL_SEC,
+    ) -> None:
+        self._policy_for = policy_for
+        self._queue_max = max(1, int(queue_max))
+        self._flush_interval = max(0.01, float(flush_interval))
+        self._streams: Dict[str, _Stream] = {}
+        self._queues: Dict[str, "queue.Queue[bytes]"] = {}
+        self._registry_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.dropped: Dict[str, int] = {}
+        self.errors = 0
+
+    def _stream(self, path: str) -> _Stream:
+        s = self._streams.get(path)
+        if s is not None:
+            return s
+        with self._registry_lock:
+            s = self._streams.get(path)
+            if s is None:
+                s = _Stream(path, self._policy_for(path))
+                self._streams[path] = s
+            return s
+
+    def _queue(self, path: str) -> "queue.Queue[bytes]":
+        q = self._queues.get(path)
+        if q is not None:
+            return q
+        with self._registry_lock:
+            q = self._queues.get(path)
+            if q is None:
+                q = queue.Queue(maxsize=self._queue_max)
+                self._queues[path] = q
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+                self._thread.start()
+            return q
+
+    def _write_now(self, stream: _Stream, data: bytes) -> None:
+        with stream.lock:
+            stream.write(data)
+
+    def write_line(self, path: str, line: str) -> None:
+        """Append one serialized record (without trailing newline) to ``path``."""
+        data = (line + "\n").encode("utf-8")
+        stream = self._stream(path)
+        if stream.policy.mode != "async" or self._closed:
+            self._write_now(stream, data)
+            return
+        q = self._queue(path)
+        with self._idle:
+            self._pending += 1
+        try:
+            if stream.policy.overflow == "drop":
+                q.put_nowait(data)
+            else:
+                q.put(data)
+        except queue.Full:
+            self.dropped[path] = self.dropped.get(path, 0) + 1
+            self._done(1)
+            return
+        if q.qsize() >= MAX_BATCH_LINES:
+            self._wake.set()
+
+    def _done(self, n: int) -> None:
+        with self._idle:
+            self._pending -= n
+            if self._pending <= 0:
+                self._pending = 0
+                self._idle.notify_all()
+
+    def _drain_once(self) -> int:
+        total = 0
+        for path, q in list(self._queues.items()):
+            while True:
+                batch: List[bytes] = []
+                try:
+                    while len(batch) < MAX_BATCH_LINES:
+                        batch.append(q.get_nowait())
+                except queue.Empty:
+                    pass
+                if not batch:
+                    break
+                try:
+                    self._write_now(self._stream(path), b"".join(batch))
+                except Exception:
+                    self.errors += 1
+                total += len(batch)
+                self._done(len(batch))
+                if len(batch) < MAX_BATCH_LINES:
+                    break
+        return total
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self._drain_once()
+            if self._closed:
+                self._drain_once()
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every queued record is written; fsync durable streams. True if drained."""
+        self._wake.set()
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._idle:
+            while self._pending > 0:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._idle.wait(min(left, self._flush_interval))
+            drained = self._pending <= 0
+        if not drained and (self._thread is None or not self._thread.is_alive()):
+            self._drain_once()
+            drained = True
+        return drained
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush and close every handle; later writes fall back to inline appends."""
+        self.flush(timeout)
+        self._closed = True
+        self._wake.set()
+        t = self._thread
+        if t is not None and t.is_alive() and t is not threading.current_thread():
+            t.join(timeout)
+        self._drain_once()
+        for s in list(self._streams.values()):
+            with s.lock:
+                s.close_fd()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "streams": len(self._streams),
+            "queued": sum(q.qsize() for q in self._queues.values()),
+            "dropped": dict(self.dropped),
+            "errors": self.errors,
+        }
+
+
+_WRITER: Optional[JsonlWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def jsonl_writer_enabled() -> bool:
+    return str(os.environ.get("JSONL_ASYNC_WRITER", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_jsonl_writer(policy_for: Optional[Callable[[str], StreamPolicy]] = None) -> JsonlWriter:
+    """Process-wide writer; the first caller's ``policy_for`` wins. Flushed at interpreter exit."""
+    global _WRITER
+    if _WRITER is not None:
+        return _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            try:
+                qmax = int(os.environ.get("JSONL_WRITER_QUEUE_MAX", str(DEFAULT_QUEUE_MAX)))
+            except (TypeError, ValueError):
+                qmax = DEFAULT_QUEUE_MAX
+            w = JsonlWriter(policy_for or (lambda _p: StreamPolicy()), queue_max=qmax)
+            atexit.register(w.close)
+            _WRITER = w
+        return _WRITER
@@ -12,7 +12,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -55,15 +55,17 @@ def get_sector(symbol: str) -> str:
     return _heuristic_sector(symbol)
 
 
-def get_sector_multipliers(symbol: str) -> Tuple[str, Dict[str, float]]:
+def get_sector_multipliers(symbol: str, profiles: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, float]]:
     """
     Returns (sector, multipliers) where multipliers keys:
     - flow_weight
     - darkpool_weight
     - earnings_weight
     - short_interest_weight
+
+    Pass ``profiles`` (from ``_load_profiles()``) to avoid re-reading the config per symbol.
     """
-    prof = _load_profiles()
+    prof = profiles if profiles is not None else _load_profiles()
     sector = get_sector(symbol)
     rec = prof.get(sector) if isinstance(prof, dict) else None
     base = prof.get("UNKNOWN") if isinstance(prof, dict) else None
@@ -1,12 +1,14 @@
 """Market microstructure and intelligence helpers (OFI, etc.)."""
 
-from .ofi_tracker import OFITracker, compute_l1_ofi_increment
+from .ofi_tracker import CompactOFITracker, OFITracker, compute_l1_ofi_increment, make_ofi_tracker
 from .regime_watchlist import RegimeWatchlist, get_regime_watchlist, reset_regime_watchlist_for_tests
 from .uw_regime_matrix import UWRegimeMatrix, get_uw_regime_matrix, reset_uw_regime_matrix_for_tests
 
 __all__ = [
+    "CompactOFITracker",
     "OFITracker",
     "compute_l1_ofi_increment",
+    "make_ofi_tracker",
     "RegimeWatchlist",
     "get_regime_watchlist",
     "reset_regime_watchlist_for_tests",
@@ -25,12 +25,15 @@ First quote for a symbol produces increment **0** (no prior reference).
 from __future__ import annotations
 
 import math
+import os
 import threading
 import time
 from collections import deque
 from dataclasses import dataclass
 from typing import Deque, Dict, List, Optional, Tuple
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class _L1Quote:
@@ -170,6 +173,18 @@ class OFITracker:
                     s60 += tick
         return (float(s60), float(s300))
 
+    def window_sums(self, symbol: str, *, now: Optional[float] = None) -> Dict[int, float]:
+        """``{window_sec: OFI sum}`` for ``OFI_WINDOWS_SEC`` (same shape as ``CompactOFITracker``)."""
+        sym = str(symbol or "").upper().strip()
+        now_sec = int(math.floor(time.monotonic() if now is None else now))
+        out = {w: 0.0 for w in OFI_WINDOWS_SEC}
+        with self._lock:
+            for ts, tick in self._hist.get(sym) or ():
+                for w in OFI_WINDOWS_SEC:
+                    if now_sec - w < math.floor(ts) <= now_sec:  # the last ``w`` whole seconds
+                        out[w] += tick
+        return out
+
     def snapshot(self, symbol: str) -> Dict[str, float]:
         """Convenience: last rolling sums plus instantaneous mid/spread if known."""
         sym = str(symbol or "").upper().strip()
@@ -183,3 +198,146 @@ class OFITracker:
                 out["l1_bid_sz"] = q.bid_sz
                 out["l1_ask_sz"] = q.ask_sz
         return out
+
+
+OFI_WINDOWS_SEC: Tuple[int, ...] = (10, 60, 300)
+
+
+class _SymbolOFI:
+    """Last L1 quote plus a per-second cumulative-OFI ring for one symbol."""
+
+    __slots__ = ("bid_px", "bid_sz", "ask_px", "ask_sz", "cum", "first_sec", "last_sec", "total")
+
+    def __init__(self, bid_px: float, bid_sz: float, ask_px: float, ask_sz: float, slots: int) -> None:
+        self.bid_px, self.bid_sz, self.ask_px, self.ask_sz = bid_px, bid_sz, ask_px, ask_sz
+        self.cum = np.zeros(slots, dtype=np.float64)
+        self.first_sec: Optional[int] = None  # no increment recorded yet
+        self.last_sec = 0
+        self.total = 0.0
+
+    def add(self, sec: int, ofi: float) -> None:
+        n = self.cum.shape[0]
+        if self.first_sec is None:
+            self.first_sec = self.last_sec = sec
+        elif sec == self.last_sec + 1:
+            self.cum[sec % n] = self.total
+            self.last_sec = sec
+        elif sec > self.last_sec:
+            # Carry the running total through seconds without ticks.
+            if sec - self.last_sec >= n:
+                self.cum.fill(self.total)
+            else:
+                self.cum[np.arange(self.last_sec + 1, sec + 1) % n] = self.total
+            self.last_sec = sec
+        else:
+            sec = self.last_sec  # late tick: booked in the newest bucket
+        self.total += ofi
+        self.cum[sec % n] = self.total
+
+    def cum_at(self, sec: int) -> float:
+        """Cumulative OFI through the end of second ``sec``."""
+        if self.first_sec is None or sec < self.first_sec:
+            return 0.0
+        if sec >= self.last_sec:
+            return self.total
+        return float(self.cum[sec % self.cum.shape[0]])
+
+    def window_sum(self, now_sec: int, window: int) -> float:
+        now_sec = max(now_sec, self.last_sec)
+        return self.cum_at(now_sec) - self.cum_at(now_sec - int(window))
+
+
+class CompactOFITracker:
+    """
+    Drop-in ``OFITracker`` with O(1) multi-window sums and fixed memory per symbol.
+
+    Instead of a deque of up to ``maxlen_ticks_per_symbol`` ``(mono_t, ofi)`` tuples, each symbol
+    keeps its last quote in a ``__slots__`` record and a NumPy ring of cumulative OFI per
+    monotonic second (301 slots for the default windows, ~2.4 KB). A window sum is the difference of
+    two ring reads, so ``window_sums`` / ``rolling_sums`` / ``snapshot`` no longer iterate ticks.
+
+    Window boundaries have one-second resolution: the 60s window covers the current second and
+    the 59 before it. Ticks older than the newest bucket (out-of-order ``mono_t``) are booked in
+    the newest bucket.
+    """
+
+    def __init__(self, windows_sec: Tuple[int, ...] = OFI_WINDOWS_SEC) -> None:
+        self._lock = threading.RLock()
+        self.windows_sec = tuple(sorted({max(1, int(w)) for w in windows_sec}))
+        self._slots = max(self.windows_sec[-1], 300) + 1  # rolling_sums always needs 300s
+        self._sym: Dict[str, _SymbolOFI] = {}
+
+    def on_quote(
+        self,
+        symbol: str,
+        bid_px: float,
+        bid_sz: float,
+        ask_px: float,
+        ask_sz: float,
+        *,
+        mono_t: Optional[float] = None,
+    ) -> float:
+        """Same contract as ``OFITracker.on_quote``."""
+        sym = str(symbol or "").upper().strip()
+        if not sym:
+            return 0.0
+        t = float(time.monotonic() if mono_t is None else mono_t)
+        bp, bs, ap, a_sz = float(bid_px), float(bid_sz), float(ask_px), float(ask_sz)
+
+        with self._lock:
+            st = self._sym.get(sym)
+            prev = None if st is None else _L1Quote(st.bid_px, st.bid_sz, st.ask_px, st.ask_sz)
+            _e, _f, ofi, ok = compute_l1_ofi_increment(prev, bp, bs, ap, a_sz)
+            if not ok:
+                return 0.0
+            if st is None:
+                self._sym[sym] = _SymbolOFI(bp, bs, ap, a_sz, self._slots)
+                return 0.0
+            st.bid_px, st.bid_sz, st.ask_px, st.ask_sz = bp, bs, ap, a_sz
+            st.add(int(math.floor(t)), ofi)
+            return ofi
+
+    def window_sums(self, symbol: str, *, now: Optional[float] = None) -> Dict[int, float]:
+        """``{window_sec: OFI sum}`` for every configured window."""
+        sym = str(symbol or "").upper().strip()
+        now_sec = int(math.floor(time.monotonic() if now is None else now))
+        with self._lock:
+            st = self._sym.get(sym)
+            if st is None:
+                return {w: 0.0 for w in self.windows_sec}
+            return {w: float(st.window_sum(now_sec, w)) for w in self.windows_sec}
+
+    def rolling_sums(self, symbol: str, *, now: Optional[float] = None) -> Tuple[float, float]:
+        """Return (sum OFI over last 60s, sum over last 300s) for ``symbol``."""
+        sym = str(symbol or "").upper().strip()
+        if not sym:
+            return (0.0, 0.0)
+        now_sec = int(math.floor(time.monotonic() if now is None else now))
+        with self._lock:
+            st = self._sym.get(sym)
+            if st is None:
+                return (0.0, 0.0)
+            return (float(st.window_sum(now_sec, 60)), float(st.window_sum(now_sec, 300)))
+
+    def snapshot(self, symbol: str) -> Dict[str, float]:
+        """``OFITracker.snapshot`` keys plus ``ofi_l1_roll_<w>s_sum`` for every window."""
+        sym = str(symbol or "").upper().strip()
+        now_sec = int(math.floor(time.monotonic()))
+        out: Dict[str, float] = {}
+        with self._lock:
+            st = self._sym.get(sym)
+            for w in sorted(set(self.windows_sec) | {60, 300}):
+                out[f"ofi_l1_roll_{w}s_sum"] = float(st.window_sum(now_sec, w)) if st is not None else 0.0
+            if st is not None:
+                out["l1_bid_px"] = st.bid_px
+                out["l1_ask_px"] = st.ask_px
+                out["l1_bid_sz"] = st.bid_sz
+                out["l1_ask_sz"] = st.ask_sz
+        return out
+
+
+def make_ofi_tracker():
+    """Compact tracker by default; ``OFI_TRACKER_COMPACT=0`` restores the tick-deque tracker."""
+    if str(os.environ.get("OFI_TRACKER_COMPACT", "1")).strip().lower() in ("0", "false", "no", "off"):
+        return OFITracker()
+    return CompactOFITracker()
@@ -424,11 +424,37 @@ def compute_rsi_wilder(closes: List[float], period: int = 14) -> Optional[float]
     return 100.0 - (100.0 / (1.0 + rs))
 
 
-def rsi_from_alpaca_daily(api, underlying: str, period: int = 14) -> Tuple[Optional[float], str]:
-    """RSI(period) from last ~40 daily closes. Returns (rsi, reason)."""
+def prefetch_daily_closes(api, underlyings: List[str]) -> int:
+    """Refresh the shared daily-close store for all CSP candidates in one chunked pass."""
+    syms = [s for s in (normalize_equity_symbol(u) for u in underlyings or []) if s]
+    if not syms or api is None:
+        return 0
+    from src.data.daily_bar_store import get_daily_bar_store
+
+    return get_daily_bar_store().ensure(api, syms)
+
+
+def rsi_from_alpaca_daily(api, underlying: str, period: int = 14, *, refresh: bool = True) -> Tuple[Optional[float], str]:
+    """RSI(period) from last ~40 daily closes. Returns (rsi, reason).
+
+    ``refresh=False`` skips the store refresh when the caller already ran ``prefetch_daily_closes``.
+    """
     sym = normalize_equity_symbol(underlying)
     if not sym or api is None:
         return None, "no_symbol_or_api"
+    try:
+        # Shared daily-close store (incremental, multi-symbol); direct fetch only if it comes up short.
+        from src.data.daily_bar_store import get_daily_bar_store
+
+        store = get_daily_bar_store()
+        if refresh:
+            store.ensure(api, [sym])
+        closes = store.closes(sym, min(period + 30, 60))
+        if len(closes) >= period + 1:
+            rsi = compute_rsi_wilder(closes, period=period)
+            return rsi, "ok" if rsi is not None else "rsi_undef"
+    except Exception:
+        pass
     try:
         bars = api.get_bars(sym, "1Day", limit=min(period + 30, 60))
         closes: List[float] = []
@@ -451,7 +477,7 @@ def rsi_from_alpaca_daily(api, underlying: str, period: int = 14) -> Tuple[Optio
         return None, str(e)[:80]
 
 
-def should_veto_csp_rsi_overbought(api, underlying: str, max_rsi: float = 70.0) -> Tuple[bool, str]:
+def should_veto_csp_rsi_overbought(api, underlying: str, max_rsi: float = 70.0, *, refresh: bool = True) -> Tuple[bool, str]:
     """
     True => skip CSP (overextended / sell into resistance).
 
@@ -459,7 +485,7 @@ def should_veto_csp_rsi_overbought(api, underlying: str, max_rsi: float = 70.0)
     """
     if float(max_rsi or 0) <= 0:
         return False, "disabled"
-    rsi, why = rsi_from_alpaca_daily(api, underlying)
+    rsi, why = rsi_from_alpaca_daily(api, underlying, refresh=refresh)
     if rsi is None:
         return False, f"no_rsi:{why}"
     if rsi > float(max_rsi):
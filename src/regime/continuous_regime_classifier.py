@@ -171,17 +171,17 @@ def get_spy_1m_closes_from_stream_cache(limit: int) -> Optional[List[float]]:
         return None
     lim = max(2, int(limit))
     try:
-        df = mgr.price_cache.get_fresh_bars_df(
+        arrs = mgr.price_cache.get_fresh_bar_arrays(
             "SPY",
             lim,
             max_age_sec=_regime_spy_bar_max_age_sec(),
         )
     except Exception:
         return None
-    if df is None or getattr(df, "empty", True):
+    if not arrs:
         return None
     try:
-        closes = [float(x) for x in df["close"].tolist()]
+        closes = arrs["close"].tolist()
     except Exception:
         return None
     if len(closes) < 2:
@@ -0,0 +1,152 @@
+"""
+Rolling execution-quality window over ``data/execution_quality.jsonl``.
+
+``main.run_once`` used to ``json.loads`` the whole (append-only) log every cycle just to average
+the last 20 rows' ``slippage_bps`` / ``latency_ms``. ``ExecutionQualityWindow`` keeps those rows
+in a bounded deque and tracks the byte offset it has consumed:
+
+- ``append(row)`` (used by ``monitoring_guards.log_execution_quality``) writes the line and
+  feeds the window in one step;
+- ``averages()`` ``stat``s the file and only parses bytes appended since the last look
+  (another process, or an older writer); truncation / rotation / a cold start re-seeds the
+  window from a bounded tail read (``TAIL_BYTES``).
+
+Cycle cost is one ``stat`` plus whatever was appended since the previous cycle.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+
+DEFAULT_WINDOW = 20
+TAIL_BYTES = 256 * 1024
+
+# Values run_once has always used when the log is empty / a row lacks the field.
+EMPTY_SLIPPAGE_AVG = 1.0
+EMPTY_LATENCY_AVG = 500
+ROW_DEFAULT_LATENCY_MS = 500
+
+
+class ExecutionQualityWindow:
+    """Last ``window`` execution-quality rows, kept in sync with the JSONL file by byte offset."""
+
+    def __init__(self, path: Path, window: int = DEFAULT_WINDOW, tail_bytes: int = TAIL_BYTES) -> None:
+        self.path = Path(path)
+        self.tail_bytes = max(1024, int(tail_bytes))
+        self._lock = threading.Lock()
+        self._rows: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(window)))
+        self._ident: Optional[Tuple[int, int]] = None  # (st_dev, st_ino)
+        self._offset = -1  # < 0: never synced
+
+    def _feed_lines(self, data: bytes) -> None:
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(rec, dict):
+                self._rows.append(rec)
+
+    def _reseed(self, f, size: int) -> None:
+        self._rows.clear()
+        start = max(0, size - self.tail_bytes)
+        f.seek(start)
+        data = f.read(size - start)
+        if start > 0:
+            # Drop the (probably partial) first line of the tail.
+            nl = data.find(b"\n")
+            data = data[nl + 1:] if nl >= 0 else b""
+        self._consume(data, start)
+
+    def _consume(self, data: bytes, start: int) -> None:
+        # Only complete lines; a half-written last line is picked up next time.
+        end = data.rfind(b"\n")
+        if end < 0:
+            self._offset = start
+            return
+        self._feed_lines(data[:end + 1])
+        self._offset = start + end + 1
+
+    def _sync(self) -> None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            self._rows.clear()
+            self._ident, self._offset = None, -1
+            return
+        ident = (int(st.st_dev), int(st.st_ino))
+        size = int(st.st_size)
+        if ident == self._ident and size == self._offset:
+            return
+        with self.path.open("rb") as f:
+            if ident != self._ident or self._offset < 0 or size < self._offset or size - self._offset > self.tail_bytes:
+                self._reseed(f, size)
+            else:
+                f.seek(self._offset)
+                self._consume(f.read(size - self._offset), self._offset)
+        self._ident = ident
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Append ``row`` to the log and the window (catching up on foreign appends first)."""
+        line = (json.dumps(row) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                self._sync()
+            except Exception:
+                self._offset = -1
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as f:
+                pos = f.tell()
+                f.write(line)
+            if self._offset == pos:
+                self._rows.append(dict(row))
+                self._offset = pos + len(line)
+                try:
+                    st = os.stat(self.path)
+                    self._ident = (int(st.st_dev), int(st.st_ino))
+                except OSError:
+                    pass
+            # else: someone else appended in between; the next _sync() picks both up in order.
+
+    def recent(self) -> list:
+        with self._lock:
+            try:
+                self._sync()
+            except Exception:
+                pass
+            return list(self._rows)
+
+    def averages(self) -> Tuple[float, float]:
+        """``(slippage_avg, latency_avg)`` exactly as run_once computed them from the last rows."""
+        rows = self.recent()
+        if not rows:
+            return EMPTY_SLIPPAGE_AVG, EMPTY_LATENCY_AVG
+        n = len(rows)
+        slippage_avg = sum(e.get("slippage_bps", 0) for e in rows) / n / 10000
+        latency_avg = sum(e.get("latency_ms", ROW_DEFAULT_LATENCY_MS) for e in rows) / n
+        return slippage_avg, latency_avg
+
+
+_WINDOWS: Dict[str, ExecutionQualityWindow] = {}
+_WINDOWS_LOCK = threading.Lock()
+
+
+def get_execution_quality_window(path: Any = None) -> ExecutionQualityWindow:
+    """Process-wide window for ``path`` (default ``CacheFiles.EXECUTION_QUALITY``)."""
+    if path is None:
+        from config.registry import CacheFiles
+
+        path = CacheFiles.EXECUTION_QUALITY
+    key = os.path.abspath(str(path))
+    with _WINDOWS_LOCK:
+        w = _WINDOWS.get(key)
+        if w is None:
+            w = ExecutionQualityWindow(Path(path))
+            _WINDOWS[key] = w
+        return w
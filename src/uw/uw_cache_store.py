@@ -0,0 +1,376 @@
+"""
+Per-ticker sharded UW flow cache (``data/uw_flow_cache_shards/``).
+
+The monolithic ``data/uw_flow_cache.json`` is read, merged and rewritten in full for every
+ticker × endpoint update, which makes one daemon cycle cost O(tickers²) bytes of JSON work.
+This store keeps one small file per ticker plus a global section and a manifest:
+
+- ``tickers/<SYM>.json`` — the same per-ticker row the monolith holds under ``cache[SYM]``,
+  plus ``_shard_gen`` (the generation of its last write; stripped on read)
+- ``_global.json`` — underscore-prefixed sections (``_market_tide``, ``_top_net_impact``, ...)
+- ``manifest.json`` — ``generation`` counter and the generation at which the global section
+  last changed (constant size; no per-ticker entries)
+
+A ticker write touches its shard and the constant-size manifest only. Readers can load everything
+(``load_all``) or only rows newer than a generation they already hold (``load_changed``); the
+latter stats every shard but re-reads only files whose stat changed since the previous call.
+
+``market_tide`` is stored once in ``_global.json`` and materialized into each row on read,
+so a tide refresh no longer copies the payload into every ticker.
+
+Enabled with ``UW_CACHE_SHARDED=1`` (daemon writes shards; ``main.read_uw_cache`` reads them).
+The daemon still exports the legacy monolith once per cycle for scripts / dashboard readers.
+Override root for tests: ``UW_CACHE_SHARD_DIR``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MANIFEST_NAME = "manifest.json"
+GLOBAL_NAME = "_global.json"
+TICKER_DIR = "tickers"
+SCHEMA_VERSION = 2
+GEN_KEY = "_shard_gen"
+
+_SAFE_SYMBOL = re.compile(r"[^A-Z0-9._-]")
+
+
+def uw_cache_sharded_enabled() -> bool:
+    return str(os.environ.get("UW_CACHE_SHARDED", "0")).strip().lower() in ("1", "true", "yes", "on")
+
+
+def default_shard_root() -> Path:
+    raw = os.environ.get("UW_CACHE_SHARD_DIR", "").strip()
+    if raw:
+        return Path(raw)
+    from config.registry import CacheFiles
+
+    return CacheFiles.UW_FLOW_CACHE_SHARDS
+
+
+def _shard_name(symbol: str) -> str:
+    s = _SAFE_SYMBOL.sub("_", str(symbol or "").strip().upper())
+    return f"{s}.json"
+
+
+def _read_json_file(path: Path, default: Any) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return default
+    except Exception:
+        return default
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":"), default=str), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class _ManifestLock:
+    """Advisory cross-process lock around manifest read-modify-write (best-effort off Linux)."""
+
+    def __init__(self, root: Path) -> None:
+        self._path = root / ".manifest.lock"
+        self._fh = None
+
+    def __enter__(self) -> "_ManifestLock":
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self._path.open("a+")
+            import fcntl  # type: ignore
+
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+        except Exception:
+            pass
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._fh is None:
+            return
+        try:
+            import fcntl  # type: ignore
+
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        except Exception:
+            pass
+        try:
+            self._fh.close()
+        except Exception:
+            pass
+        self._fh = None
+
+
+class UWCacheShardStore:
+    """Sharded UW cache: one JSON file per ticker, a global section and a generation manifest."""
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = Path(root) if root is not None else default_shard_root()
+        self._lock = threading.RLock()
+        # symbol -> ((st_ino, st_mtime_ns, st_size), generation) for load_changed scans.
+        self._gen_cache: Dict[str, Tuple[Tuple[int, int, int], int]] = {}
+
+    # ------------------------------------------------------------------ paths / manifest
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    @property
+    def global_path(self) -> Path:
+        return self.root / GLOBAL_NAME
+
+    def ticker_path(self, symbol: str) -> Path:
+        return self.root / TICKER_DIR / _shard_name(symbol)
+
+    def read_manifest(self) -> Dict[str, Any]:
+        m = _read_json_file(self.manifest_path, {})
+        if not isinstance(m, dict):
+            m = {}
+        m.setdefault("schema", SCHEMA_VERSION)
+        m.setdefault("generation", 0)
+        m.setdefault("global_generation", 0)
+        if not isinstance(m.get("tickers"), dict):
+            m["tickers"] = {}
+        return m
+
+    def generation(self) -> int:
+        try:
+            return int(self.read_manifest().get("generation") or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def _bump(self, write: Callable[[int], None], global_changed: bool = False) -> int:
+        """Advance the generation; ``write(gen)`` lands its files before the manifest advertises ``gen``."""
+        with _ManifestLock(self.root):
+            m = self.read_manifest()
+            gen = int(m.get("generation") or 0) + 1
+            write(gen)
+            m["generation"] = gen
+            m["schema"] = SCHEMA_VERSION
+            m.pop("tickers", None)  # schema 1 kept per-ticker generations here (O(universe) per write)
+            if global_changed:
+                m["global_generation"] = gen
+            m["last_update"] = int(time.time())
+            m["updated_by"] = "uw_cache_store"
+            _write_json_atomic(self.manifest_path, m)
+            return gen
+
+    def _write_shard(self, symbol: str, row: Dict[str, Any], gen: int) -> None:
+        data = dict(row) if isinstance(row, dict) else {}
+        data[GEN_KEY] = gen
+        _write_json_atomic(self.ticker_path(symbol), data)
+
+    # ------------------------------------------------------------------ writes
+    def read_ticker(self, symbol: str) -> Dict[str, Any]:
+        row = _read_json_file(self.ticker_path(symbol), {})
+        if not isinstance(row, dict):
+            return {}
+        row.pop(GEN_KEY, None)
+        return row
+
+    def write_ticker(self, symbol: str, row: Dict[str, Any]) -> int:
+        """Replace one ticker row; O(row) bytes regardless of universe size."""
+        sym = str(symbol or "").strip().upper()
+        if not sym or sym.startswith("_"):
+            raise ValueError(f"invalid ticker for shard write: {symbol!r}")
+        with self._lock:
+            return self._bump(lambda gen: self._write_shard(sym, row, gen))
+
+    def merge_ticker(self, symbol: str, update: Dict[str, Any]) -> Dict[str, Any]:
+        """Shallow-merge ``update`` into the ticker row and persist it; returns the merged row."""
+        with self._lock:
+            row = self.read_ticker(symbol)
+            row.update(update or {})
+            self.write_ticker(symbol, row)
+            return row
+
+    def read_global(self) -> Dict[str, Any]:
+        g = _read_json_file(self.global_path, {})
+        return g if isinstance(g, dict) else {}
+
+    def write_global(self, key: str, value: Any) -> int:
+        """Set one underscore-prefixed global section (e.g. ``_market_tide``)."""
+        k = str(key)
+        if not k.startswith("_"):
+            k = "_" + k
+        with self._lock:
+            g = self.read_global()
+            g[k] = value
+            return self._bump(lambda _gen: _write_json_atomic(self.global_path, g), global_changed=True)
+
+    # ------------------------------------------------------------------ reads
+    def _tide_payload(self, glob: Dict[str, Any]) -> Any:
+        tide = glob.get("_market_tide")
+        if isinstance(tide, dict):
+            return tide.get("data")
+        return None
+
+    def _materialize(self, row: Dict[str, Any], tide: Any) -> Dict[str, Any]:
+        if tide:
+            row["market_tide"] = tide
+        return row
+
+    def _known_symbols(self) -> List[str]:
+        d = self.root / TICKER_DIR
+        try:
+            return sorted(p.stem for p in d.glob("*.json"))
+        except Exception:
+            return []
+
+    def _shard_generations(self, manifest: Dict[str, Any]) -> Dict[str, int]:
+        """``{symbol: generation}`` from each shard's ``_shard_gen``; unchanged files come from cache."""
+        legacy = manifest.get("tickers") or {}
+        out: Dict[str, int] = {}
+        try:
+            entries = list(os.scandir(self.root / TICKER_DIR))
+        except OSError:
+            entries = []
+        with self._lock:
+            for e in entries:
+                if not e.name.endswith(".json"):
+                    continue
+                sym = e.name[: -len(".json")]
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                key = (int(st.st_ino), int(st.st_mtime_ns), int(st.st_size))
+                cached = self._gen_cache.get(sym)
+                if cached is not None and cached[0] == key:
+                    out[sym] = cached[1]
+                    continue
+                raw = _read_json_file(Path(e.path), {})
+                gen = raw.get(GEN_KEY) if isinstance(raw, dict) else None
+                if gen is None:
+                    # Schema-1 shard: generation lived in the manifest.
+                    meta = legacy.get(sym)
+                    gen = meta.get("gen") if isinstance(meta, dict) else meta
+                try:
+                    g = int(gen or 0)
+                except (TypeError, ValueError):
+                    g = 0
+                self._gen_cache[sym] = (key, g)
+                out[sym] = g
+            for sym in [s for s in self._gen_cache if s not in out]:
+                del self._gen_cache[sym]
+        return out
+
+    def _metadata(self, manifest: Dict[str, Any], count: int, **extra: Any) -> Dict[str, Any]:
+        md = {
+            "last_update": int(manifest.get("last_update") or 0),
+            "updated_by": "uw_flow_daemon",
+            "ticker_count": count,
+            "generation": int(manifest.get("generation") or 0),
+            "global_generation": int(manifest.get("global_generation") or 0),
+            "source": "uw_cache_shards",
+        }
+        md.update(extra)
+        return md
+
+    def load_all(self) -> Dict[str, Any]:
+        """Return the full cache in the legacy monolith layout (tickers + ``_`` sections)."""
+        m = self.read_manifest()
+        glob = self.read_global()
+        tide = self._tide_payload(glob)
+        out: Dict[str, Any] = {}
+        for sym in self._known_symbols():
+            row = self.read_ticker(sym)
+            if row:
+                out[sym] = self._materialize(row, tide)
+        n = len(out)
+        out.update(glob)
+        out["_metadata"] = self._metadata(m, n)
+        return out
+
+    def load_changed(self, since_generation: int) -> Tuple[int, Dict[str, Any]]:
+        """
+        Return ``(generation, partial_cache)`` with only tickers written after ``since_generation``.
+
+        Global sections are always included (they are small). ``_metadata.global_changed`` tells the
+        caller that shared payloads such as ``market_tide`` moved and unchanged rows need them re-applied.
+        """
+        m = self.read_manifest()
+        gen = int(m.get("generation") or 0)
+        since = int(since_generation or 0)
+        glob = self.read_global()
+        tide = self._tide_payload(glob)
+        out: Dict[str, Any] = {}
+        for sym, g in sorted(self._shard_generations(m).items()):
+            if g <= since:
+                continue
+            row = self.read_ticker(sym)
+            if row:
+                out[sym] = self._materialize(row, tide)
+        n = len(out)
+        out.update(glob)
+        out["_metadata"] = self._metadata(
+            m,
+            n,
+            since_generation=since,
+            changed_only=True,
+            global_changed=int(m.get("global_generation") or 0) > since,
+        )
+        return gen, out
+
+    # ------------------------------------------------------------------ migration / export
+    def import_monolith(self, cache: Dict[str, Any]) -> int:
+        """Seed shards from a legacy monolith dict (per-ticker ``market_tide`` copies are dropped)."""
+        if not isinstance(cache, dict):
+            return 0
+        with self._lock:
+            rows: Dict[str, Dict[str, Any]] = {}
+            glob = self.read_global()
+            for k, v in cache.items():
+                if not isinstance(k, str):
+                    continue
+                if k.startswith("_"):
+                    if k != "_metadata":
+                        glob[k] = v
+                    continue
+                if not isinstance(v, dict):
+                    continue
+                row = dict(v)
+                row.pop("market_tide", None)
+                rows[k.upper()] = row
+
+            def _write(gen: int) -> None:
+                for sym, row in rows.items():
+                    self._write_shard(sym, row, gen)
+                _write_json_atomic(self.global_path, glob)
+
+            self._bump(_write, global_changed=True)
+            return len(rows)
+
+    def export_monolith(self, path: Path) -> int:
+        """Write the legacy ``uw_flow_cache.json`` layout for readers that have not moved to shards."""
+        cache = self.load_all()
+        md = cache.get("_metadata") or {}
+        from config.registry import atomic_write_json
+
+        atomic_write_json(Path(path), cache)
+        return int(md.get("ticker_count") or 0)
+
+
+_DEFAULT_STORE: Optional[UWCacheShardStore] = None
+_DEFAULT_STORE_LOCK = threading.Lock()
+
+
+def get_shard_store() -> UWCacheShardStore:
+    """Process-wide store for the configured shard root."""
+    global _DEFAULT_STORE
+    root = default_shard_root()
+    with _DEFAULT_STORE_LOCK:
+        if _DEFAULT_STORE is None or Path(_DEFAULT_STORE.root) != Path(root):
+            _DEFAULT_STORE = UWCacheShardStore(root)
+        return _DEFAULT_STORE
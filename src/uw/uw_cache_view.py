@@ -0,0 +1,284 @@
+"""
+Long-lived, change-aware view of the UW flow cache for ``main.run_once``.
+
+Every cycle used to re-parse the whole cache and re-normalize every ticker's ``flow_trades``
+and re-run ``uw_enrichment_v2.enrich_signal`` even for tickers the daemon had not touched.
+``UWCacheView`` keeps the last snapshot in process and only redoes work for rows that changed:
+
+- **Sharded cache** (``UW_CACHE_SHARDED=1``): asks the loader for tickers newer than the last
+  manifest generation and merges them in; a row's version is the generation it was loaded at.
+- **Monolith**: skips the read entirely while ``uw_flow_cache.json`` mtime/size are unchanged.
+  After a re-parse, a row keeps its version when ``_last_update`` is unchanged *and* that stamp is
+  older than the snapshot it was first seen in (same-second daemon writes are treated as changed).
+
+Derived values (normalized flow trades, enriched dicts) are memoized per ``(ticker, version)``.
+Enriched dicts also key on the inputs ``enrich_signal`` reads besides the row (market tide,
+``state/premarket_intel.json``, symbol risk features); ``freshness`` is recomputed on every hit
+because it decays with wall-clock time.
+
+Disable with ``UW_CACHE_INCREMENTAL_VIEW=0``.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Loader = Callable[..., Dict[str, Any]]
+
+_UNSAFE_VERSION = itertools.count(1)
+
+
+def uw_cache_view_enabled() -> bool:
+    return str(os.environ.get("UW_CACHE_INCREMENTAL_VIEW", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _stat_sig(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+        return (int(st.st_mtime_ns), int(st.st_size))
+    except OSError:
+        return None
+
+
+class UWCacheView:
+    """In-process UW cache snapshot with per-ticker memoized normalization / enrichment."""
+
+    def __init__(self, cache_path: Path, extra_inputs: Tuple[Path, ...] = ()) -> None:
+        self.cache_path = Path(cache_path)
+        self.extra_inputs = tuple(Path(p) for p in extra_inputs)
+        self._lock = threading.RLock()
+        self._cache: Dict[str, Any] = {}
+        self._versions: Dict[str, Any] = {}
+        self._file_sig: Optional[Tuple[int, int]] = None
+        self._generation: Optional[int] = None
+        self._tide_version = 0
+        self._flow_memo: Dict[str, Tuple[Any, List[dict], int]] = {}
+        self._enriched_memo: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        self._enricher = None
+        self.last_stats: Dict[str, Any] = {}
+        self.changed: set = set()
+
+    # ------------------------------------------------------------------ snapshot
+    def _is_sharded(self, cache: Dict[str, Any]) -> bool:
+        md = cache.get("_metadata") if isinstance(cache, dict) else None
+        return isinstance(md, dict) and md.get("source") == "uw_cache_shards"
+
+    def refresh(self, loader: Loader) -> Dict[str, Any]:
+        """
+        Return a shallow copy of the current cache, re-reading only what changed.
+
+        Row dicts are shared with the view: callers must treat them as read-only and replace a
+        row (``cache[t] = {**cache[t], k: v}``) rather than mutate it, so the snapshot keeps
+        matching the source files and the incremental diff stays correct.
+
+        ``loader`` is ``main.read_uw_cache``: called with no args for a full read and with
+        ``since_generation=`` for an incremental shard read.
+        """
+        with self._lock:
+            return dict(self._refresh(loader))
+
+    def _refresh(self, loader: Loader) -> Dict[str, Any]:
+        if self._generation is not None:
+            return self._refresh_sharded(loader)
+
+        sig = _stat_sig(self.cache_path)
+        if self._cache and sig is not None and sig == self._file_sig:
+            self.changed = set()
+            self.last_stats = {"mode": "monolith", "reparsed": False, "changed": 0, "tickers": self._ticker_count()}
+            return self._cache
+
+        cache = loader()
+        if not isinstance(cache, dict):
+            cache = {}
+        if self._is_sharded(cache):
+            return self._adopt_sharded_full(cache)
+        return self._adopt_monolith(cache, sig)
+
+    def _ticker_count(self) -> int:
+        return sum(1 for k in self._cache if not str(k).startswith("_"))
+
+    def _adopt_monolith(self, cache: Dict[str, Any], sig: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+        snap_sec = (sig[0] // 1_000_000_000) if sig else None
+        changed = set()
+        versions: Dict[str, Any] = {}
+        for sym, row in cache.items():
+            if str(sym).startswith("_") or not isinstance(row, dict):
+                continue
+            lu = row.get("_last_update")
+            prev = self._versions.get(sym)
+            if prev is not None and prev[0] == "lu" and prev[1] == lu:
+                versions[sym] = prev
+                continue
+            safe = snap_sec is not None and isinstance(lu, (int, float)) and int(lu) < snap_sec
+            versions[sym] = ("lu", lu) if safe else ("unsafe", next(_UNSAFE_VERSION))
+            changed.add(sym)
+        self._prune(versions)
+        # The daemon copies market_tide into rows without touching their _last_update.
+        tide_stamp = (cache.get("_market_tide") or {}).get("last_update") if isinstance(cache.get("_market_tide"), dict) else None
+        prev_tide = (self._cache.get("_market_tide") or {}).get("last_update") if isinstance(self._cache.get("_market_tide"), dict) else None
+        if tide_stamp != prev_tide:
+            self._tide_version += 1
+        self._versions = versions
+        self._cache = cache
+        self._file_sig = sig
+        self._generation = None
+        self.changed = changed
+        self.last_stats = {"mode": "monolith", "reparsed": True, "changed": len(changed), "tickers": len(versions)}
+        return cache
+
+    def _adopt_sharded_full(self, cache: Dict[str, Any]) -> Dict[str, Any]:
+        gen = int((cache.get("_metadata") or {}).get("generation") or 0)
+        versions = {sym: ("gen", gen) for sym, row in cache.items() if not str(sym).startswith("_") and isinstance(row, dict)}
+        self._prune(versions)
+        self.changed = set(versions)
+        self._versions = versions
+        self._cache = cache
+        self._generation = gen
+        self._file_sig = None
+        self._tide_version += 1
+        self.last_stats = {"mode": "shards", "reparsed": True, "changed": len(versions), "tickers": len(versions)}
+        return cache
+
+    def _refresh_sharded(self, loader: Loader) -> Dict[str, Any]:
+        delta = loader(since_generation=self._generation)
+        if not isinstance(delta, dict) or not self._is_sharded(delta):
+            # Shards went away (flag flipped / store missing): fall back to a full read.
+            self._generation = None
+            self._file_sig = None
+            return self._refresh(loader)
+        md = delta.get("_metadata") or {}
+        gen = int(md.get("generation") or 0)
+        changed = set()
+        for key, val in delta.items():
+            if str(key).startswith("_"):
+                self._cache[key] = val
+                continue
+            if isinstance(val, dict):
+                self._cache[key] = val
+                self._versions[key] = ("gen", gen)
+                changed.add(key)
+        if md.get("global_changed"):
+            tide = (self._cache.get("_market_tide") or {}).get("data") if isinstance(self._cache.get("_market_tide"), dict) else None
+            if tide:
+                for sym, row in list(self._cache.items()):
+                    if not str(sym).startswith("_") and isinstance(row, dict):
+                        # Replace, don't mutate: rows are shared with snapshots handed out earlier.
+                        self._cache[sym] = {**row, "market_tide": tide}
+            self._tide_version += 1
+        md_full = dict(md)
+        md_full["ticker_count"] = self._ticker_count()
+        md_full.pop("changed_only", None)
+        self._cache["_metadata"] = md_full
+        self._generation = gen
+        self.changed = changed
+        self.last_stats = {"mode": "shards", "reparsed": bool(changed), "changed": len(changed), "tickers": self._ticker_count()}
+        return self._cache
+
+    def _prune(self, versions: Dict[str, Any]) -> None:
+        for memo in (self._flow_memo, self._enriched_memo):
+            for sym in list(memo.keys()):
+                if sym not in versions:
+                    memo.pop(sym, None)
+
+    def version(self, ticker: str) -> Any:
+        return self._versions.get(ticker)
+
+    # ------------------------------------------------------------------ derived values
+    def normalized_flow_trades(self, ticker: str, normalize: Callable[[dict], dict]) -> Tuple[List[dict], int]:
+        """
+        ``(normalized_trades, failed_count)`` for ``ticker``'s raw ``flow_trades``.
+
+        Filters that depend on the clock (``base_filter`` expiry window) must still be applied by
+        the caller each cycle; only the pure per-trade normalization is memoized.
+        """
+        with self._lock:
+            ver = self._versions.get(ticker)
+            hit = self._flow_memo.get(ticker)
+            if ver is not None and hit is not None and hit[0] == ver:
+                return hit[1], hit[2]
+            row = self._cache.get(ticker)
+            raw = (row.get("flow_trades") or []) if isinstance(row, dict) else []
+        out: List[dict] = []
+        failed = 0
+        for t in raw:
+            try:
+                out.append(normalize(t))
+            except Exception:
+                failed += 1
+        with self._lock:
+            if ver is not None and self._versions.get(ticker) == ver:
+                self._flow_memo[ticker] = (ver, out, failed)
+        return out, failed
+
+    def _inputs_token(self, market_regime: str) -> Tuple[Any, ...]:
+        return (market_regime, self._tide_version) + tuple(_stat_sig(p) for p in self.extra_inputs)
+
+    def enriched(
+        self,
+        ticker: str,
+        market_regime: str,
+        enrich: Callable[[str, Dict[str, Any], str], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Memoized ``enrich(ticker, cache, market_regime)``; returns a fresh top-level dict per call."""
+        with self._lock:
+            ver = self._versions.get(ticker)
+            key = (ver, self._inputs_token(market_regime))
+            hit = self._enriched_memo.get(ticker)
+            if ver is not None and hit is not None and hit[0] == key:
+                out = dict(hit[1])
+                row = self._cache.get(ticker)
+                if "freshness" in out and isinstance(row, dict):
+                    out["freshness"] = self._freshness(row)
+                return out
+            cache = self._cache
+        out = enrich(ticker, cache, market_regime) or {}
+        with self._lock:
+            if ver is not None and self._versions.get(ticker) == ver and isinstance(out, dict):
+                self._enriched_memo[ticker] = (key, dict(out))
+        return out
+
+    def _freshness(self, row: Dict[str, Any]) -> float:
+        if self._enricher is None:
+            from uw_enrichment_v2 import UWEnricher
+
+            self._enricher = UWEnricher()
+        return self._enricher.compute_freshness(row)
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        """Drop memoized values (one ticker, or everything including the snapshot)."""
+        with self._lock:
+            if ticker is None:
+                self._cache = {}
+                self._versions = {}
+                self._file_sig = None
+                self._generation = None
+                self._flow_memo.clear()
+                self._enriched_memo.clear()
+                return
+            self._versions[ticker] = ("unsafe", next(_UNSAFE_VERSION))
+            self._flow_memo.pop(ticker, None)
+            self._enriched_memo.pop(ticker, None)
+
+
+_VIEW: Optional[UWCacheView] = None
+_VIEW_LOCK = threading.Lock()
+
+
+def get_uw_cache_view() -> Optional[UWCacheView]:
+    """Process-wide view (``None`` when ``UW_CACHE_INCREMENTAL_VIEW=0``)."""
+    global _VIEW
+    if not uw_cache_view_enabled():
+        return None
+    with _VIEW_LOCK:
+        if _VIEW is None:
+            from config.registry import CacheFiles, StateFiles
+
+            extra = [Path("state/premarket_intel.json")]
+            srf = getattr(StateFiles, "SYMBOL_RISK_FEATURES", None)
+            if srf is not None:
+                extra.append(Path(srf))
+            _VIEW = UWCacheView(CacheFiles.UW_FLOW_CACHE, tuple(extra))
+        return _VIEW
@@ -9,16 +9,19 @@ Non-negotiable goals:
 - Regression-safe: supports UW_MOCK=1 for deterministic offline runs.
 
 State:
-- Daily/minute usage tracked in: state/uw_usage_state.json
-- Response cache stored in: state/uw_cache/
+- Daily/minute usage tracked in: state/uw_quota.sqlite3 (src/uw/uw_quota.py), shared across
+  processes; state/uw_usage_state.json is a periodic mirror (UW_QUOTA_SQLITE=0: the JSON is the store)
+- Response cache stored in: state/uw_cache/ behind a process LRU (src/uw/uw_response_cache.py)
 """
 
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
 import os
 import inspect
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -29,6 +32,8 @@ import requests
 from config.registry import APIConfig, CacheFiles
 from utils.state_io import read_json_self_heal
 
+from src.uw.uw_quota import get_uw_quota_store
+from src.uw.uw_response_cache import get_uw_response_cache, two_tier_enabled
 from src.uw.uw_spec_loader import is_valid_uw_path
 
 try:
@@ -40,6 +45,8 @@ except Exception:  # pragma: no cover
 
 UW_USAGE_STATE_PATH = Path("state/uw_usage_state.json")
 UW_CACHE_DIR = Path("state/uw_cache")
+# Serializes the usage-state read-modify-write when callers poll from several threads.
+_USAGE_LOCK = threading.Lock()
 
 # Data integrity: append-only log for any UW API failure (no numeric quality from failed calls)
 def _uw_api_errors_path() -> Path:
@@ -202,19 +209,62 @@ def _cache_path(key: str) -> Path:
     return UW_CACHE_DIR / f"{key}.json"
 
 
-def _read_cache(key: str) -> Optional[Dict[str, Any]]:
+def _read_cache(key: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """(record, tier): memory/disk tiers when enabled, else the legacy per-lookup file read."""
+    if two_tier_enabled():
+        return get_uw_response_cache(UW_CACHE_DIR).get(key)
     p = _cache_path(key)
     data = read_json_self_heal(p, default=None, heal=False, mkdir=True)
     if not isinstance(data, dict):
-        return None
-    return data
+        return None, ""
+    return data, "disk"
 
 
 def _write_cache(key: str, record: Dict[str, Any]) -> None:
+    if two_tier_enabled():
+        get_uw_response_cache(UW_CACHE_DIR).put(key, record)
+        return
     p = _cache_path(key)
     _atomic_write_json(p, record)
 
 
+def uw_response_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/coalescing counters of the process response cache ({} when disabled)."""
+    if not two_tier_enabled():
+        return {}
+    return get_uw_response_cache(UW_CACHE_DIR).stats()
+
+
+def _cached_response(
+    endpoint: str, key: str, policy: UwCachePolicy, now: float
+) -> Optional[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+    rec, tier = _read_cache(key)
+    if not isinstance(rec, dict):
+        return None
+    try:
+        exp = float(rec.get("expires_at", 0.0) or 0.0)
+        if exp > now and isinstance(rec.get("data"), dict):
+            try:
+                log_system_event(
+                    subsystem="uw",
+                    event_type="uw_call",
+                    severity="INFO",
+                    details={
+                        "endpoint": str(endpoint),
+                        "cache_hit": True,
+                        "cache_tier": tier,
+                        "ttl_seconds": int(policy.ttl_seconds),
+                        "endpoint_name": policy.endpoint_name,
+                    },
+                )
+            except Exception:
+                pass
+            return 200, rec["data"], {"_cache": "hit"}
+    except Exception:
+        pass
+    return None
+
+
 def _load_usage_state() -> Dict[str, Any]:
     default = {
         "date": _today_utc(),
@@ -239,6 +289,83 @@ def _save_usage_state(state: Dict[str, Any]) -> None:
     _atomic_write_json(UW_USAGE_STATE_PATH, state)
 
 
+def _usage_state() -> Dict[str, Any]:
+    """Current usage (``date``, ``calls_today``, ``by_endpoint``, ``minute_window``) from the quota store."""
+    store = get_uw_quota_store()
+    if store is not None:
+        try:
+            return store.usage()
+        except Exception:
+            pass
+    return _load_usage_state()
+
+
+def uw_usage_snapshot() -> Dict[str, Any]:
+    """Public read of today's UW usage counters (same schema as ``state/uw_usage_state.json``)."""
+    return _usage_state()
+
+
+def uw_record_call(endpoint_name: str = "") -> None:
+    """Count a UW call made outside ``uw_http_get`` (e.g. daemon endpoint probes). Never raises."""
+    now = time.time()
+    store = get_uw_quota_store()
+    if store is not None:
+        try:
+            store.record(endpoint_name, now=now)
+            return
+        except Exception:
+            pass
+    _json_record_usage(endpoint_name, now)
+
+
+def _json_quota_gate(
+    endpoint: str, params: Optional[Dict[str, Any]], policy: "UwCachePolicy", now: float, per_min: int, daily_cap: int
+) -> Optional[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+    """Legacy JSON cap check (``UW_QUOTA_SQLITE=0``); a blocked response tuple or None."""
+    st = _load_usage_state()
+    _prune_minute_window(st, now=now, window_sec=60)
+    minute_calls = len(st.get("minute_window", []) or [])
+    calls_today = int(st.get("calls_today", 0) or 0)
+
+    if calls_today >= daily_cap:
+        return 429, _blocked("daily_cap", endpoint=endpoint, params=params), {}
+    if minute_calls >= per_min:
+        # conservative wait estimate
+        w = st.get("minute_window", []) or []
+        wait_s = None
+        try:
+            oldest = float(w[0]) if w else None
+            wait_s = max(0.0, 60.0 - (now - oldest)) if oldest else None
+        except Exception:
+            wait_s = None
+        return 429, _blocked("per_minute_cap", endpoint=endpoint, params=params, wait_s=wait_s), {}
+
+    # Per-endpoint cap
+    if policy.max_calls_per_day and policy.endpoint_name:
+        by = st.get("by_endpoint", {}) if isinstance(st.get("by_endpoint"), dict) else {}
+        n = int((by.get(policy.endpoint_name) or 0))
+        if n >= int(policy.max_calls_per_day):
+            return 429, _blocked("endpoint_cap", endpoint=endpoint, params=params), {}
+    return None
+
+
+def _json_record_usage(endpoint_name: str, now: float) -> None:
+    """Legacy JSON read-modify-write of the usage counters. Never raises."""
+    try:
+        with _USAGE_LOCK:
+            st = _load_usage_state()
+            _prune_minute_window(st, now=now, window_sec=60)
+            st["minute_window"] = (st.get("minute_window", []) or []) + [now]
+            st["calls_today"] = int(st.get("calls_today", 0) or 0) + 1
+            if endpoint_name:
+                by = st.get("by_endpoint", {}) if isinstance(st.get("by_endpoint"), dict) else {}
+                by[endpoint_name] = int(by.get(endpoint_name, 0) or 0) + 1
+                st["by_endpoint"] = by
+            _save_usage_state(st)
+    except Exception:
+        pass
+
+
 def _prune_minute_window(state: Dict[str, Any], *, now: float, window_sec: int = 60) -> None:
     try:
         w = state.get("minute_window", [])
@@ -263,7 +390,7 @@ def _limits() -> Tuple[int, int, float]:
 def uw_daily_usage_ratio() -> Optional[float]:
     """``calls_today / (UW_DAILY_LIMIT * UW_SAFETY_BUFFER)`` from local usage state, or ``None``."""
     try:
-        st = _load_usage_state()
+        st = _usage_state()
         _, per_day, buf = _limits()
         cap = max(1, int(float(per_day) * float(buf)))
         return int(st.get("calls_today", 0) or 0) / float(cap)
@@ -395,56 +522,67 @@ def uw_http_get(
 
     # Cache lookup (skip when mock mode enforces limits — cache would bypass quota checks)
     key = _cache_key(endpoint, params, policy)
-    if policy.ttl_seconds > 0 and not (mock_mode and mock_enforce_limits):
-        rec = _read_cache(key)
-        if isinstance(rec, dict):
-            try:
-                exp = float(rec.get("expires_at", 0.0) or 0.0)
-                if exp > now and isinstance(rec.get("data"), dict):
-                    try:
-                        log_system_event(
-                            subsystem="uw",
-                            event_type="uw_call",
-                            severity="INFO",
-                            details={
-                                "endpoint": str(endpoint),
-                                "cache_hit": True,
-                                "ttl_seconds": int(policy.ttl_seconds),
-                                "endpoint_name": policy.endpoint_name,
-                            },
-                        )
-                    except Exception:
-                        pass
-                    return 200, rec["data"], {"_cache": "hit"}
-            except Exception:
-                pass
+    use_cache = policy.ttl_seconds > 0 and not (mock_mode and mock_enforce_limits)
+    if use_cache:
+        hit = _cached_response(endpoint, key, policy, now)
+        if hit is not None:
+            return hit
+
+    def _fetch() -> Tuple[int, Dict[str, Any], Dict[str, Any]]:
+        return _uw_http_get_uncached(
+            endpoint, params, policy, key, url=url, headers=headers, timeout_s=timeout_s, now=now,
+            mock_mode=mock_mode, mock_enforce_limits=mock_enforce_limits,
+        )
 
-    # Load/validate usage state
-    st = _load_usage_state()
-    _prune_minute_window(st, now=now, window_sec=60)
-    minute_calls = len(st.get("minute_window", []) or [])
-    calls_today = int(st.get("calls_today", 0) or 0)
+    if not (use_cache and two_tier_enabled()):
+        return _fetch()
+    # Coalesce identical in-flight requests; the leader re-checks the cache in case a previous
+    # leader populated it between our lookup and taking the slot.
+    # Every caller gets its own copy, so the leader's caller cannot mutate what followers copy.
+    res, _leader = get_uw_response_cache(UW_CACHE_DIR).single_flight(
+        key, lambda: _cached_response(endpoint, key, policy, time.time()) or _fetch(), clone=copy.deepcopy
+    )
+    return res
+
+
+def _uw_http_get_uncached(
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    policy: UwCachePolicy,
+    key: str,
+    *,
+    url: str,
+    headers: Dict[str, Any],
+    timeout_s: float,
+    now: float,
+    mock_mode: bool,
+    mock_enforce_limits: bool,
+) -> Tuple[int, Dict[str, Any], Dict[str, Any]]:
+    """Quota gate, request and cache write for ``uw_http_get`` after a cache miss."""
+    per_min, per_day, buf = _limits()
 
+    # Quota gate: check caps and count the call in one transaction shared by every process.
     daily_cap = int(per_day * float(buf))
-    if calls_today >= daily_cap:
-        return 429, _blocked("daily_cap", endpoint=endpoint, params=params), {}
-    if minute_calls >= per_min:
-        # conservative wait estimate
-        w = st.get("minute_window", []) or []
-        wait_s = None
+    store = get_uw_quota_store()
+    if store is not None:
         try:
-            oldest = float(w[0]) if w else None
-            wait_s = max(0.0, 60.0 - (now - oldest)) if oldest else None
+            ok, reason, wait_s = store.try_acquire(
+                policy.endpoint_name,
+                now=now,
+                per_min=per_min,
+                daily_cap=daily_cap,
+                endpoint_cap=int(policy.max_calls_per_day or 0),
+            )
         except Exception:
-            wait_s = None
-        return 429, _blocked("per_minute_cap", endpoint=endpoint, params=params, wait_s=wait_s), {}
-
-    # Per-endpoint cap
-    if policy.max_calls_per_day and policy.endpoint_name:
-        by = st.get("by_endpoint", {}) if isinstance(st.get("by_endpoint"), dict) else {}
-        n = int((by.get(policy.endpoint_name) or 0))
-        if n >= int(policy.max_calls_per_day):
-            return 429, _blocked("endpoint_cap", endpoint=endpoint, params=params), {}
+            store = None  # unavailable (e.g. locked past timeout): fall back to the JSON gate
+        else:
+            if not ok:
+                return 429, _blocked(reason, endpoint=endpoint, params=params, wait_s=wait_s), {}
+            store.write_usage_mirror(UW_USAGE_STATE_PATH, now=now)
+    if store is None:
+        blocked = _json_quota_gate(endpoint, params, policy, now, per_min, daily_cap)
+        if blocked is not None:
+            return blocked
 
     # QUOTA TRACKING (existing contract): log every UW call (append-only)
     try:
@@ -511,18 +649,9 @@ def uw_http_get(
         return status, data, resp_headers
     finally:
         # Record usage on attempted call (even non-200) to keep budget honest.
-        try:
-            st = _load_usage_state()
-            _prune_minute_window(st, now=now, window_sec=60)
-            st["minute_window"] = (st.get("minute_window", []) or []) + [now]
-            st["calls_today"] = int(st.get("calls_today", 0) or 0) + 1
-            if policy.endpoint_name:
-                by = st.get("by_endpoint", {}) if isinstance(st.get("by_endpoint"), dict) else {}
-                by[policy.endpoint_name] = int(by.get(policy.endpoint_name, 0) or 0) + 1
-                st["by_endpoint"] = by
-            _save_usage_state(st)
-        except Exception:
-            pass
+        # (The quota store already counted it in try_acquire.)
+        if store is None:
+            _json_record_usage(policy.endpoint_name, now)
 
     dt_ms = int((time.time() - t0) * 1000)
     error_type = _uw_api_error_type(status, data, endpoint)
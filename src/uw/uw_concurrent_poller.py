@@ -0,0 +1,195 @@
+"""
+Rate-limited concurrent ticker polling for ``uw_flow_daemon``.
+
+``UWFlowDaemon.run`` used to call ``_poll_ticker`` for one ticker at a time with
+``UW_DAEMON_INTER_TICKER_SLEEP_SEC`` between them, so a full-universe sweep took minutes even
+when most endpoints were not due. ``ConcurrentTickerPoller`` fans the sweep out over a bounded
+thread pool while a shared ``TokenBucket`` (installed on the daemon's ``UWClient``) spaces the
+actual HTTP calls to the UW per-minute quota:
+
+- **Priority**: Sniper-tier tickers are submitted before Radar-tier (then everything else);
+  order within a tier is preserved.
+- **Quota**: the bucket refills at ``(UW_RATE_LIMIT_PER_MIN - burst) / 60`` tokens/s with a
+  ``UW_POLL_BURST`` (default 10) capacity, so any 60s window stays under the minute cap that
+  ``src.uw.uw_client.uw_http_get`` enforces. ``UW_POLL_RATE_PER_MIN`` overrides the rate.
+- **Cadence**: ``SmartPoller`` still decides which endpoints are due; the poller only changes
+  how many tickers are in flight (``UW_DAEMON_POLL_WORKERS``, default 8).
+- **Stop**: ``stop()`` is checked before each submission (shutdown, 429, quota breaker).
+
+Kill switch: ``UW_DAEMON_CONCURRENT_POLL=0`` restores the sequential loop.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 32
+DEFAULT_BURST = 10
+TIER_PRIORITY = {"sniper": 0, "radar": 1}
+
+
+def uw_concurrent_poll_enabled() -> bool:
+    return str(os.environ.get("UW_DAEMON_CONCURRENT_POLL", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def uw_poll_workers() -> int:
+    try:
+        n = int(os.environ.get("UW_DAEMON_POLL_WORKERS", str(DEFAULT_WORKERS)))
+    except (TypeError, ValueError):
+        n = DEFAULT_WORKERS
+    return max(1, min(MAX_WORKERS, n))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is available."""
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        capacity: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = max(1e-6, float(rate_per_sec))
+        self.capacity = max(1.0, float(capacity))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._last = clock()
+        self.waited_sec = 0.0
+        self.granted = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.granted += 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, sleeping as needed. Returns False only if ``timeout`` elapses first."""
+        deadline = None if timeout is None else self._clock() + max(0.0, timeout)
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self.granted += 1
+                    return True
+                wait_s = (1.0 - self._tokens) / self.rate
+            if deadline is not None:
+                left = deadline - self._clock()
+                if left <= 0:
+                    return False
+                wait_s = min(wait_s, left)
+            self.waited_sec += wait_s
+            self._sleep(wait_s)
+
+
+def uw_quota_bucket() -> TokenBucket:
+    """Bucket matched to ``UW_RATE_LIMIT_PER_MIN`` (the ``uw_http_get`` minute gate)."""
+    try:
+        per_min = int(os.environ.get("UW_POLL_RATE_PER_MIN") or os.environ.get("UW_RATE_LIMIT_PER_MIN", "120") or 120)
+    except (TypeError, ValueError):
+        per_min = 120
+    per_min = max(1, per_min)
+    try:
+        burst = int(os.environ.get("UW_POLL_BURST", str(DEFAULT_BURST)) or DEFAULT_BURST)
+    except (TypeError, ValueError):
+        burst = DEFAULT_BURST
+    burst = max(1, min(burst, per_min))
+    return TokenBucket(max(1, per_min - burst) / 60.0, burst)
+
+
+def prioritize_tickers(tickers: Iterable[str], tier_of: Mapping[str, str]) -> List[str]:
+    """Sniper first, then Radar, then untiered; stable within each tier, duplicates dropped."""
+    seen = set()
+    ordered = []
+    for i, t in enumerate(tickers):
+        if not t or t in seen:
+            continue
+        seen.add(t)
+        ordered.append((TIER_PRIORITY.get(str(tier_of.get(t, "")), len(TIER_PRIORITY)), i, t))
+    ordered.sort()
+    return [t for _, _, t in ordered]
+
+
+class ConcurrentTickerPoller:
+    """Runs ``poll_fn(ticker)`` for a sweep over a bounded pool (see module docstring)."""
+
+    def __init__(
+        self,
+        poll_fn: Callable[[str], Any],
+        *,
+        workers: int = DEFAULT_WORKERS,
+        tier_of: Optional[Mapping[str, str]] = None,
+        stop: Callable[[], bool] = lambda: False,
+        on_error: Optional[Callable[[str, BaseException], None]] = None,
+    ) -> None:
+        self._poll_fn = poll_fn
+        self.workers = max(1, int(workers))
+        self._tier_of = tier_of if tier_of is not None else {}
+        self._stop = stop
+        self._on_error = on_error
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="uw-poll")
+        return self._pool
+
+    def _call(self, ticker: str) -> None:
+        try:
+            self._poll_fn(ticker)
+        except Exception as e:
+            if self._on_error is not None:
+                try:
+                    self._on_error(ticker, e)
+                except Exception:
+                    pass
+
+    def sweep(self, tickers: Iterable[str]) -> Dict[str, Any]:
+        """Poll every ticker once (priority order); returns ``{polled, skipped, elapsed_sec}``."""
+        order = prioritize_tickers(tickers, self._tier_of)
+        t0 = time.monotonic()
+        pool = self._executor()
+        in_flight = set()
+        polled = 0
+        idx = 0
+        # Keep at most ``workers`` tasks queued so priority order is honoured and a stop
+        # (429 / quota breaker / shutdown) takes effect without draining a long backlog.
+        while idx < len(order):
+            if self._stop():
+                break
+            if len(in_flight) >= self.workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                polled += len(done)
+                continue
+            in_flight.add(pool.submit(self._call, order[idx]))
+            idx += 1
+        if in_flight:
+            done, _ = wait(in_flight)
+            polled += len(done)
+        return {
+            "polled": polled,
+            "skipped": len(order) - idx,
+            "elapsed_sec": round(time.monotonic() - t0, 3),
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
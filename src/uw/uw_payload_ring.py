@@ -0,0 +1,243 @@
+"""
+In-memory ring of recent raw UW payloads (diagnostics for ``uw_flow_daemon``).
+
+``UWClient._get`` used to append every successful payload to ``logs/uw_raw_payloads.jsonl``,
+read the whole file back and rewrite its last 5 lines — three file operations and a large
+JSON dump per API call. ``PayloadRing`` keeps the last ``UW_RAW_PAYLOAD_RING_SIZE`` (default 5)
+payloads per endpoint template (``/api/darkpool/{ticker}``) in memory instead:
+
+- **Dump**: ``SIGUSR1`` to the daemon requests a dump of ``state/uw_raw_payloads_snapshot.json``;
+  the handler only sets a flag and the poll loop writes the file via ``dump_if_requested`` /
+  ``sleep_servicing_dumps`` (the handler must never take ``PayloadRing._lock``, which ``record``
+  may be holding on the interrupted main thread). The CLI ``python -m src.uw.uw_payload_ring``
+  sends the signal (pid from ``state/uw_flow_daemon.lock``) and prints the snapshot.
+- **Sampled capture** (optional): ``UW_RAW_PAYLOAD_SAMPLE_RATE`` (0..1, default 0) appends that
+  fraction of payloads to ``logs/uw_raw_payloads.jsonl``, rotated to ``.1`` past
+  ``UW_RAW_PAYLOAD_MAX_BYTES`` (default 20MB).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+DEFAULT_RING_SIZE = 5
+MAX_ENDPOINTS = 128
+SNAPSHOT_PATH = Path("state/uw_raw_payloads_snapshot.json")
+CAPTURE_PATH = Path("logs/uw_raw_payloads.jsonl")
+DAEMON_LOCK_PATH = Path("state/uw_flow_daemon.lock")
+DEFAULT_CAPTURE_MAX_BYTES = 20 * 1024 * 1024
+
+_TICKER_SEG = re.compile(r"^[A-Z][A-Z0-9.\-]{0,9}$")
+
+
+def endpoint_key(url: str) -> str:
+    """URL -> endpoint template, with ticker-like path segments collapsed to ``{ticker}``."""
+    try:
+        path = urlparse(url).path if "://" in url else url.split("?", 1)[0]
+    except Exception:
+        path = str(url)
+    segs = [s for s in path.split("/") if s]
+    out = []
+    for i, s in enumerate(segs):
+        # "/api/<group>/..." prefixes are never tickers.
+        out.append("{ticker}" if i >= 2 and _TICKER_SEG.match(s) else s)
+    return "/" + "/".join(out)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class PayloadRing:
+    """Thread-safe last-N payloads per endpoint, plus optional sampled JSONL capture."""
+
+    def __init__(
+        self,
+        per_endpoint: int = DEFAULT_RING_SIZE,
+        *,
+        sample_rate: float = 0.0,
+        capture_path: Path = CAPTURE_PATH,
+        capture_max_bytes: int = DEFAULT_CAPTURE_MAX_BYTES,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.per_endpoint = max(1, int(per_endpoint))
+        self.sample_rate = max(0.0, min(1.0, float(sample_rate)))
+        self.capture_path = Path(capture_path)
+        self.capture_max_bytes = max(0, int(capture_max_bytes))
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._rings: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self.recorded = 0
+        self.captured = 0
+
+    def record(self, url: str, status: int, payload: Any) -> None:
+        """O(1) append of the payload reference; no serialization unless sampled."""
+        entry = {"ts": int(time.time()), "url": url, "status": status, "payload": payload}
+        key = endpoint_key(url)
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = deque(maxlen=self.per_endpoint)
+                self._rings[key] = ring
+                while len(self._rings) > MAX_ENDPOINTS:
+                    self._rings.popitem(last=False)
+            else:
+                self._rings.move_to_end(key)
+            ring.append(entry)
+            self.recorded += 1
+        if self.sample_rate > 0 and self._rng() < self.sample_rate:
+            self._capture(entry)
+
+    def _capture(self, entry: Dict[str, Any]) -> None:
+        try:
+            line = json.dumps({**entry, "dt": datetime.now(timezone.utc).isoformat()}, default=str) + "\n"
+            with self._lock:
+                self.capture_path.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    if self.capture_max_bytes and self.capture_path.stat().st_size >= self.capture_max_bytes:
+                        self.capture_path.replace(self.capture_path.with_name(self.capture_path.name + ".1"))
+                except OSError:
+                    pass
+                with self.capture_path.open("a", encoding="utf-8") as f:
+                    f.write(line)
+                self.captured += 1
+        except Exception:
+            pass
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            return {k: list(v) for k, v in self._rings.items()}
+
+    def dump(self, path: Path = SNAPSHOT_PATH) -> Path:
+        """Write the snapshot atomically and return its path."""
+        path = Path(path)
+        data = {
+            "dumped_at": datetime.now(timezone.utc).isoformat(),
+            "pid": os.getpid(),
+            "recorded": self.recorded,
+            "endpoints": self.snapshot(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+        tmp.replace(path)
+        return path
+
+
+_RING: Optional[PayloadRing] = None
+_RING_LOCK = threading.Lock()
+
+
+def get_payload_ring() -> PayloadRing:
+    """Process-wide ring configured from the environment."""
+    global _RING
+    if _RING is None:
+        with _RING_LOCK:
+            if _RING is None:
+                _RING = PayloadRing(
+                    int(_env_float("UW_RAW_PAYLOAD_RING_SIZE", DEFAULT_RING_SIZE)),
+                    sample_rate=_env_float("UW_RAW_PAYLOAD_SAMPLE_RATE", 0.0),
+                    capture_max_bytes=int(_env_float("UW_RAW_PAYLOAD_MAX_BYTES", DEFAULT_CAPTURE_MAX_BYTES)),
+                )
+    return _RING
+
+
+_dump_path: Optional[Path] = None
+
+
+def install_dump_signal(path: Path = SNAPSHOT_PATH) -> bool:
+    """Request a ring dump on ``SIGUSR1`` (main thread only; returns False where unsupported).
+
+    The handler only records the request; ``dump_if_requested`` performs it outside signal context.
+    """
+    sig = getattr(signal, "SIGUSR1", None)
+    if sig is None:
+        return False
+
+    def _handler(_signum, _frame):
+        global _dump_path
+        _dump_path = Path(path)
+
+    try:
+        signal.signal(sig, _handler)
+        return True
+    except (ValueError, OSError):
+        return False
+
+
+def dump_if_requested() -> Optional[Path]:
+    """Write the snapshot if ``SIGUSR1`` arrived since the last call; safe from any thread."""
+    global _dump_path
+    path, _dump_path = _dump_path, None
+    if path is None:
+        return None
+    try:
+        return get_payload_ring().dump(path)
+    except Exception:
+        return None
+
+
+def sleep_servicing_dumps(seconds: float, step: float = 1.0) -> None:
+    """``time.sleep`` in ``step`` slices so a pending dump is written within ~``step`` seconds."""
+    deadline = time.monotonic() + max(0.0, float(seconds))
+    while True:
+        dump_if_requested()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(step, remaining))
+
+
+def _daemon_pid(lock_path: Path = DAEMON_LOCK_PATH) -> Optional[int]:
+    try:
+        lines = [ln for ln in lock_path.read_text().splitlines() if ln.startswith("pid=")]
+        return int(lines[-1].split()[0].split("=", 1)[1]) if lines else None
+    except Exception:
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Dump the uw_flow_daemon in-memory raw payload ring.")
+    ap.add_argument("--pid", type=int, default=None, help="daemon pid (default: from state/uw_flow_daemon.lock)")
+    ap.add_argument("--endpoint", default=None, help="only print endpoints containing this substring")
+    ap.add_argument("--timeout", type=float, default=5.0)
+    args = ap.parse_args(argv)
+
+    pid = args.pid or _daemon_pid()
+    if not pid:
+        print("uw_flow_daemon pid not found", file=sys.stderr)
+        return 2
+    before = SNAPSHOT_PATH.stat().st_mtime_ns if SNAPSHOT_PATH.exists() else 0
+    os.kill(pid, signal.SIGUSR1)
+    deadline = time.time() + args.timeout
+    while time.time() < deadline:
+        if SNAPSHOT_PATH.exists() and SNAPSHOT_PATH.stat().st_mtime_ns != before:
+            break
+        time.sleep(0.1)
+    else:
+        print(f"no snapshot from pid {pid} within {args.timeout}s", file=sys.stderr)
+        return 1
+    data = json.loads(SNAPSHOT_PATH.read_text(encoding="utf-8"))
+    if args.endpoint:
+        data["endpoints"] = {k: v for k, v in data.get("endpoints", {}).items() if args.endpoint in k}
+    print(json.dumps(data, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
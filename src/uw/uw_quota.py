@@ -0,0 +1,225 @@
+"""
+Shared UW REST quota accounting in SQLite (WAL), for the daemon, the trading loop and scripts.
+
+``uw_http_get`` used to read ``state/uw_usage_state.json``, check the caps, then re-read and
+atomically rewrite the whole file (with a ``minute_window`` list of up to 1000 timestamps) after
+every call. Two processes could both pass the check, and the last writer won the count.
+
+``UwQuotaStore`` keeps the counters in ``state/uw_quota.sqlite3``:
+
+- ``uw_daily(day, endpoint, n)``: per-UTC-day totals (``endpoint=''`` is the overall count).
+- ``uw_recent(ts)``: call timestamps for the sliding 60s window (older rows are deleted
+  in the same transaction).
+
+``try_acquire`` checks the daily, per-minute and per-endpoint caps and records the call in one
+``BEGIN IMMEDIATE`` transaction, so concurrent processes can never overshoot a cap together.
+``usage`` is the single daily-cap view behind ``uw_daily_usage_ratio``.
+``write_usage_mirror`` keeps the legacy JSON file (read by health checks and scripts),
+written at most every ``UW_QUOTA_MIRROR_SEC`` (default 30) instead of on every call.
+When the database is first created, today's counts are seeded from that JSON file so a
+rollout mid-day does not hand the processes a fresh daily budget.
+
+Env: ``UW_QUOTA_DB`` (path). Kill switch: ``UW_QUOTA_SQLITE=0`` (legacy JSON read-modify-write).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+DEFAULT_DB_PATH = Path("state/uw_quota.sqlite3")
+LEGACY_USAGE_PATH = Path("state/uw_usage_state.json")
+KEEP_DAYS = 14
+_WINDOW_SEC = 60.0
+
+
+def quota_sqlite_enabled() -> bool:
+    return str(os.environ.get("UW_QUOTA_SQLITE", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _day(ts: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+class UwQuotaStore:
+    """Cross-process UW call counters (one SQLite connection per thread)."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH, *, seed_from: Union[str, Path, None] = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._mirror_lock = threading.Lock()
+        self._last_mirror = 0.0
+        with self._tx() as con:
+            created = con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'uw_daily'").fetchone() is None
+            con.execute("CREATE TABLE IF NOT EXISTS uw_daily (day TEXT NOT NULL, endpoint TEXT NOT NULL, n INTEGER NOT NULL, PRIMARY KEY (day, endpoint)) WITHOUT ROWID")
+            con.execute("CREATE TABLE IF NOT EXISTS uw_recent (ts REAL NOT NULL)")
+            con.execute("CREATE INDEX IF NOT EXISTS uw_recent_ts ON uw_recent (ts)")
+            con.execute("DELETE FROM uw_daily WHERE day < ?", (_day(time.time() - KEEP_DAYS * 86400),))
+            if created and seed_from is not None:
+                self._seed_from_json(con, Path(seed_from), time.time())
+
+    @staticmethod
+    def _seed_from_json(con: sqlite3.Connection, path: Path, now: float) -> None:
+        """Carry today's ``calls_today`` / ``by_endpoint`` / ``minute_window`` over from the legacy JSON."""
+        try:
+            st = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(st, dict) or str(st.get("date")) != _day(now):
+            return
+        rows = [("", st.get("calls_today"))]
+        if isinstance(st.get("by_endpoint"), dict):
+            rows += [(str(ep), n) for ep, n in st["by_endpoint"].items() if ep]
+        for ep, n in rows:
+            try:
+                n = int(n or 0)
+            except (TypeError, ValueError):
+                continue
+            if n > 0:
+                con.execute("INSERT OR REPLACE INTO uw_daily (day, endpoint, n) VALUES (?, ?, ?)", (_day(now), ep, n))
+        window = st.get("minute_window") if isinstance(st.get("minute_window"), list) else []
+        recent = [(float(ts),) for ts in window if isinstance(ts, (int, float)) and now - _WINDOW_SEC <= float(ts) <= now]
+        con.executemany("INSERT INTO uw_recent (ts) VALUES (?)", recent)
+
+    def _conn(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        return con
+
+    class _Tx:
+        def __init__(self, con: sqlite3.Connection) -> None:
+            self.con = con
+
+        def __enter__(self) -> sqlite3.Connection:
+            self.con.execute("BEGIN IMMEDIATE")
+            return self.con
+
+        def __exit__(self, exc_type, exc, tb) -> None:
+            self.con.execute("ROLLBACK" if exc_type else "COMMIT")
+
+    def _tx(self) -> "UwQuotaStore._Tx":
+        return UwQuotaStore._Tx(self._conn())
+
+    @staticmethod
+    def _bump(con: sqlite3.Connection, day: str, endpoint_name: str, now: float, n: int) -> None:
+        for ep in ("", endpoint_name) if endpoint_name else ("",):
+            con.execute(
+                "INSERT INTO uw_daily (day, endpoint, n) VALUES (?, ?, ?) "
+                "ON CONFLICT (day, endpoint) DO UPDATE SET n = n + excluded.n",
+                (day, ep, n),
+            )
+        con.executemany("INSERT INTO uw_recent (ts) VALUES (?)", [(now,)] * n)
+
+    @staticmethod
+    def _count(con: sqlite3.Connection, day: str, endpoint: str) -> int:
+        row = con.execute("SELECT n FROM uw_daily WHERE day = ? AND endpoint = ?", (day, endpoint)).fetchone()
+        return int(row[0]) if row else 0
+
+    def try_acquire(
+        self,
+        endpoint_name: str = "",
+        *,
+        now: Optional[float] = None,
+        per_min: int,
+        daily_cap: int,
+        endpoint_cap: int = 0,
+    ) -> Tuple[bool, str, Optional[float]]:
+        """
+        Check caps and record one call atomically.
+
+        Returns ``(True, "", None)`` or ``(False, reason, wait_s)`` with reason ``daily_cap`` /
+        ``per_minute_cap`` / ``endpoint_cap`` (same order and wording as the JSON gate).
+        """
+        t = time.time() if now is None else float(now)
+        day = _day(t)
+        with self._tx() as con:
+            con.execute("DELETE FROM uw_recent WHERE ts < ?", (t - _WINDOW_SEC,))
+            if self._count(con, day, "") >= int(daily_cap):
+                return False, "daily_cap", None
+            n_min, oldest = con.execute("SELECT COUNT(*), MIN(ts) FROM uw_recent").fetchone()
+            if int(n_min) >= int(per_min):
+                wait_s = max(0.0, _WINDOW_SEC - (t - float(oldest))) if oldest else None
+                return False, "per_minute_cap", wait_s
+            if endpoint_cap and endpoint_name and self._count(con, day, endpoint_name) >= int(endpoint_cap):
+                return False, "endpoint_cap", None
+            self._bump(con, day, endpoint_name, t, 1)
+        return True, "", None
+
+    def record(self, endpoint_name: str = "", *, now: Optional[float] = None, n: int = 1) -> None:
+        """Count calls made outside ``try_acquire`` (e.g. endpoint probes)."""
+        t = time.time() if now is None else float(now)
+        with self._tx() as con:
+            self._bump(con, _day(t), endpoint_name, t, max(1, int(n)))
+
+    def usage(self, *, now: Optional[float] = None) -> Dict[str, Any]:
+        """``{date, calls_today, by_endpoint, minute_window}`` (legacy usage-state schema)."""
+        t = time.time() if now is None else float(now)
+        day = _day(t)
+        con = self._conn()
+        rows = con.execute("SELECT endpoint, n FROM uw_daily WHERE day = ?", (day,)).fetchall()
+        window = [r[0] for r in con.execute("SELECT ts FROM uw_recent WHERE ts >= ? ORDER BY ts", (t - _WINDOW_SEC,))]
+        totals = {str(ep): int(n) for ep, n in rows}
+        return {
+            "date": day,
+            "calls_today": totals.pop("", 0),
+            "by_endpoint": totals,
+            "minute_window": window,
+        }
+
+    def write_usage_mirror(self, path: Union[str, Path], *, now: Optional[float] = None, min_interval_sec: Optional[float] = None) -> bool:
+        """Rewrite the legacy JSON view when ``min_interval_sec`` has passed (True if written)."""
+        t = time.time() if now is None else float(now)
+        if min_interval_sec is None:
+            try:
+                min_interval_sec = float(os.environ.get("UW_QUOTA_MIRROR_SEC", "30"))
+            except (TypeError, ValueError):
+                min_interval_sec = 30.0
+        with self._mirror_lock:
+            if t - self._last_mirror < float(min_interval_sec):
+                return False
+            self._last_mirror = t
+        try:
+            p = Path(path)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(p.suffix + f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self.usage(now=t), indent=2, sort_keys=True), encoding="utf-8")
+            tmp.replace(p)
+            return True
+        except Exception:
+            return False
+
+
+_STORES: Dict[str, UwQuotaStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_uw_quota_store(path: Union[str, Path, None] = None) -> Optional[UwQuotaStore]:
+    """
+    Process-wide store for ``path`` (default ``UW_QUOTA_DB``); None when disabled or unavailable.
+
+    A newly created database is seeded from ``state/uw_usage_state.json``.
+    """
+    if not quota_sqlite_enabled():
+        return None
+    raw = path or os.environ.get("UW_QUOTA_DB") or DEFAULT_DB_PATH
+    key = os.path.abspath(str(raw))
+    store = _STORES.get(key)
+    if store is None:
+        with _STORES_LOCK:
+            store = _STORES.get(key)
+            if store is None:
+                try:
+                    store = UwQuotaStore(key, seed_from=LEGACY_USAGE_PATH)
+                except Exception:
+                    return None
+                _STORES[key] = store
+    return store
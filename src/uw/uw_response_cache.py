@@ -0,0 +1,289 @@
+"""
+Two-tier response cache for ``uw_http_get`` (process LRU in front of ``state/uw_cache/``).
+
+``uw_http_get`` used to keep one JSON file per cache key and read it through
+``read_json_self_heal`` on every lookup. Nothing removed expired files, so the directory grew
+without bound. Concurrent callers asking for the same key each paid for a separate UW call.
+``UwResponseCache`` adds:
+
+- **Memory tier**: an LRU of encoded records (JSON text, so callers never share mutable state),
+  bounded by ``UW_CACHE_MEM_MAX_BYTES`` (default 16MB) and ``UW_CACHE_MEM_MAX_ENTRIES``
+  (default 4096). Disk hits are promoted into it.
+- **Request coalescing**: ``single_flight(key, fn)`` runs ``fn`` once per key at a time.
+  Concurrent callers wait for the leader and get its result (each caller, the leader included,
+  gets its own ``clone`` of it when one is passed).
+- **Disk GC**: each file's mtime is set to its ``expires_at``, so expiry is a ``stat`` rather than
+  a read. ``gc_disk`` deletes files expired for more than ``UW_CACHE_DISK_STALE_SEC`` (default
+  600). It then deletes the earliest-expiring files until the directory is under
+  ``UW_CACHE_DISK_MAX_BYTES`` (default 256MB). It runs in the background at most every
+  ``UW_CACHE_GC_INTERVAL_SEC`` (default 300; 0 = only explicit ``gc_disk``), triggered by writes.
+
+Kill switch: ``UW_CACHE_TWO_TIER=0`` (disk-only lookups, no coalescing, no GC).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+DEFAULT_MEM_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_MEM_MAX_ENTRIES = 4096
+DEFAULT_DISK_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_DISK_STALE_SEC = 600.0
+DEFAULT_GC_INTERVAL_SEC = 300.0
+
+
+def two_tier_enabled() -> bool:
+    return str(os.environ.get("UW_CACHE_TWO_TIER", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_num(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class UwResponseCache:
+    """Thread-safe memory LRU + disk cache of ``{"expires_at", "data", ...}`` records."""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        *,
+        mem_max_bytes: Optional[int] = None,
+        mem_max_entries: Optional[int] = None,
+        disk_max_bytes: Optional[int] = None,
+        disk_stale_sec: Optional[float] = None,
+        gc_interval_sec: Optional[float] = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.mem_max_bytes = int(mem_max_bytes if mem_max_bytes is not None else _env_num("UW_CACHE_MEM_MAX_BYTES", DEFAULT_MEM_MAX_BYTES))
+        self.mem_max_entries = int(mem_max_entries if mem_max_entries is not None else _env_num("UW_CACHE_MEM_MAX_ENTRIES", DEFAULT_MEM_MAX_ENTRIES))
+        self.disk_max_bytes = int(disk_max_bytes if disk_max_bytes is not None else _env_num("UW_CACHE_DISK_MAX_BYTES", DEFAULT_DISK_MAX_BYTES))
+        self.disk_stale_sec = float(disk_stale_sec if disk_stale_sec is not None else _env_num("UW_CACHE_DISK_STALE_SEC", DEFAULT_DISK_STALE_SEC))
+        self.gc_interval_sec = float(gc_interval_sec if gc_interval_sec is not None else _env_num("UW_CACHE_GC_INTERVAL_SEC", DEFAULT_GC_INTERVAL_SEC))
+        self._lock = threading.Lock()
+        # key -> (expires_at, encoded record)
+        self._mem: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._mem_bytes = 0
+        self._inflight: Dict[str, Future] = {}
+        self._gc_lock = threading.Lock()
+        self._last_gc = 0.0
+        self.counters: Dict[str, int] = {
+            "mem_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "mem_evictions": 0,
+            "disk_deleted": 0,
+        }
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    # ---- memory tier ----------------------------------------------------------------------
+    def _mem_put(self, key: str, expires_at: float, text: str) -> None:
+        size = len(text)
+        with self._lock:
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self._mem_bytes -= len(old[1])
+            if size > self.mem_max_bytes:
+                return
+            self._mem[key] = (expires_at, text)
+            self._mem_bytes += size
+            while self._mem and (self._mem_bytes > self.mem_max_bytes or len(self._mem) > self.mem_max_entries):
+                _k, (_exp, t) = self._mem.popitem(last=False)
+                self._mem_bytes -= len(t)
+                self.counters["mem_evictions"] += 1
+
+    def _mem_get(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is None:
+                return None
+            if hit[0] <= now:
+                del self._mem[key]
+                self._mem_bytes -= len(hit[1])
+                return None
+            self._mem.move_to_end(key)
+            self.counters["mem_hits"] += 1
+            return hit[1]
+
+    # ---- lookups / writes -----------------------------------------------------------------
+    def get(self, key: str, *, now: Optional[float] = None) -> Tuple[Optional[Dict[str, Any]], str]:
+        """``(fresh record, tier)`` with tier ``"memory"`` / ``"disk"``, or ``(None, "")``."""
+        t = time.time() if now is None else float(now)
+        text = self._mem_get(key, t)
+        if text is not None:
+            try:
+                return json.loads(text), "memory"
+            except Exception:
+                pass
+        try:
+            text = self.path(key).read_text(encoding="utf-8")
+            rec = json.loads(text)
+            exp = float(rec.get("expires_at", 0.0) or 0.0) if isinstance(rec, dict) else 0.0
+        except Exception:
+            rec, exp = None, 0.0
+        if not isinstance(rec, dict) or exp <= t:
+            with self._lock:
+                self.counters["misses"] += 1
+            return None, ""
+        self._mem_put(key, exp, text)
+        with self._lock:
+            self.counters["disk_hits"] += 1
+        return rec, "disk"
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """Write ``record`` to both tiers (disk file mtime = ``expires_at``)."""
+        text = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+        exp = float(record.get("expires_at", 0.0) or 0.0)
+        self._mem_put(key, exp, text)
+        p = self.path(key)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(p.suffix + f".{threading.get_ident()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(p)
+            if exp > 0:
+                os.utime(p, (time.time(), exp))
+        except Exception:
+            pass
+        self.maybe_gc()
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+
+    # ---- coalescing -----------------------------------------------------------------------
+    def single_flight(
+        self, key: str, fn: Callable[[], Any], *, clone: Optional[Callable[[Any], Any]] = None
+    ) -> Tuple[Any, bool]:
+        """
+        ``(result, leader)``: only the leader runs ``fn``; concurrent callers share its result.
+
+        With ``clone``, the shared result is never handed out: every caller, the leader included,
+        gets ``clone(result)``, so no caller can mutate it while another is still copying.
+        """
+        share = clone or (lambda r: r)
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+            else:
+                self.counters["coalesced"] += 1
+        if not leader:
+            return share(fut.result()), False
+        try:
+            res = fn()
+            fut.set_result(res)
+            return share(res), True
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    # ---- disk GC --------------------------------------------------------------------------
+    def maybe_gc(self, *, now: Optional[float] = None) -> bool:
+        """Start a background ``gc_disk`` when the interval has elapsed (True if started)."""
+        if self.gc_interval_sec <= 0:
+            return False
+        t = time.time() if now is None else float(now)
+        with self._lock:
+            if t - self._last_gc < self.gc_interval_sec:
+                return False
+            self._last_gc = t
+        threading.Thread(target=self.gc_disk, kwargs={"blocking": False}, name="uw-cache-gc", daemon=True).start()
+        return True
+
+    def gc_disk(self, *, now: Optional[float] = None, blocking: bool = True) -> Dict[str, int]:
+        """Delete stale files, then the earliest-expiring ones until under ``disk_max_bytes``."""
+        t = time.time() if now is None else float(now)
+        out = {"scanned": 0, "deleted": 0, "bytes": 0}
+        if not self._gc_lock.acquire(blocking=blocking):
+            return out
+        try:
+            live = []
+            try:
+                entries = list(os.scandir(self.cache_dir))
+            except OSError:
+                return out
+            for e in entries:
+                if not e.name.endswith((".json", ".tmp")) or not e.is_file():
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                out["scanned"] += 1
+                if st.st_mtime < t - self.disk_stale_sec:
+                    # Expired records, and temp files left by an interrupted write.
+                    if self._unlink(e.path):
+                        out["deleted"] += 1
+                elif e.name.endswith(".json"):
+                    live.append((st.st_mtime, st.st_size, e.path))
+            total = sum(size for _m, size, _p in live)
+            if total > self.disk_max_bytes:
+                for _m, size, path in sorted(live):
+                    if total <= self.disk_max_bytes:
+                        break
+                    if self._unlink(path):
+                        out["deleted"] += 1
+                        total -= size
+            out["bytes"] = int(total)
+            with self._lock:
+                self.counters["disk_deleted"] += out["deleted"]
+            return out
+        finally:
+            self._gc_lock.release()
+
+    @staticmethod
+    def _unlink(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self.counters)
+            out["mem_entries"] = len(self._mem)
+            out["mem_bytes"] = self._mem_bytes
+            out["inflight"] = len(self._inflight)
+        lookups = out["mem_hits"] + out["disk_hits"] + out["misses"]
+        out["hit_rate"] = round((out["mem_hits"] + out["disk_hits"]) / lookups, 4) if lookups else None
+        return out
+
+
+_CACHE: Optional[UwResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_uw_response_cache(cache_dir: Union[str, Path]) -> UwResponseCache:
+    """Process-wide cache for ``cache_dir`` (recreated if the directory changes)."""
+    global _CACHE
+    c = _CACHE
+    if c is None or c.cache_dir != Path(cache_dir):
+        with _CACHE_LOCK:
+            if _CACHE is None or _CACHE.cache_dir != Path(cache_dir):
+                _CACHE = UwResponseCache(cache_dir)
+            c = _CACHE
+    return c
+
+
+def reset_uw_response_cache() -> None:
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
@@ -1069,6 +1069,15 @@ def _run_csp_phase(
     exp_lte = (today + timedelta(days=dte_max)).strftime("%Y-%m-%d")
     total_wheel_positions = sum(len(v) if isinstance(v, list) else 1 for v in open_csps.values())
     per_symbol_count = {}
+    rsi_prefetched = False
+    if max_rsi_csp > 0 and tickers:
+        try:
+            from src.options_engine import prefetch_daily_closes
+
+            prefetch_daily_closes(api, list(tickers))
+            rsi_prefetched = True
+        except Exception as e:
+            log.warning("Wheel RSI daily-close prefetch failed: %s", e)
     for rank, t in enumerate(tickers):
         uw_score = None
         if rank < len(selected_meta) and isinstance(selected_meta[rank], dict):
@@ -1110,7 +1119,7 @@ def _run_csp_phase(
             try:
                 from src.options_engine import should_veto_csp_rsi_overbought
 
-                rsi_veto, rsi_detail = should_veto_csp_rsi_overbought(api, t, max_rsi_csp)
+                rsi_veto, rsi_detail = should_veto_csp_rsi_overbought(api, t, max_rsi_csp, refresh=not rsi_prefetched)
                 if rsi_veto:
                     _wheel_system_event("wheel_csp_skipped", symbol=t, reason="rsi_overbought", rsi_detail=rsi_detail)
                     _emit_candidate_evaluated("skip", "rsi_overbought", rsi_detail=rsi_detail)
@@ -13,14 +13,19 @@ Constraints:
 - Best-effort, never blocks trading
 - Wrapped with global_failure_wrapper("data")
 - Logs failures + staleness to logs/system_events.jsonl
+
+Daily closes come from the shared ``src.data.daily_bar_store`` (chunked multi-symbol fetch,
+incremental after startup); vol/beta for every symbol are computed in one NumPy pass.
 """
 
 from __future__ import annotations
 
 import math
 import time
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 try:
     from utils.system_events import global_failure_wrapper, log_system_event
@@ -57,90 +62,50 @@ def _safe_float(x: Any, default: float = 0.0) -> float:
         return default
 
 
-def _std(xs: List[float]) -> float:
-    if not xs:
-        return 0.0
-    m = sum(xs) / len(xs)
-    var = sum((x - m) ** 2 for x in xs) / max(1, (len(xs) - 1))
-    return math.sqrt(max(0.0, var))
-
-
-def _cov(x: List[float], y: List[float]) -> float:
-    n = min(len(x), len(y))
-    if n < 2:
-        return 0.0
-    mx = sum(x[:n]) / n
-    my = sum(y[:n]) / n
-    return sum((x[i] - mx) * (y[i] - my) for i in range(n)) / (n - 1)
-
-
-def _var(x: List[float]) -> float:
-    return _std(x) ** 2
-
-
-def _pct_returns_from_closes(closes: List[float]) -> List[float]:
-    rets: List[float] = []
-    for i in range(1, len(closes)):
-        a = _safe_float(closes[i - 1], 0.0)
-        b = _safe_float(closes[i], 0.0)
-        if a <= 0 or b <= 0:
-            continue
-        rets.append((b - a) / a)
-    return rets
-
-
-def _get_daily_closes(api, symbol: str, *, limit: int = 40) -> Tuple[List[float], Optional[str]]:
-    """
-    Best-effort daily close series. Returns (closes, last_bar_ts_iso).
+def _vectorized_risk_features(
+    closes: np.ndarray, bench_row: int, *, min_returns_20d: int
+) -> Dict[str, np.ndarray]:
     """
-    try:
-        # IMPORTANT: Some Alpaca environments return only the most recent bar when
-        # `start/end` are omitted. We explicitly request a lookback window.
-        end = datetime.now(timezone.utc)
-        start = end - timedelta(days=120)
-        bars = api.get_bars(
-            symbol,
-            "1Day",
-            start=start.isoformat(),
-            end=end.isoformat(),
-            limit=int(limit),
-        )
-        df = getattr(bars, "df", None)
-        if df is None or df.empty:
-            return [], None
-        closes = []
-        for _, row in df.iterrows():
-            closes.append(_safe_float(row.get("close"), 0.0))
-        # Timestamp of last bar
-        ts_iso = None
-        try:
-            idx = df.index[-1]
-            ts = idx.to_pydatetime()
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            ts_iso = ts.isoformat()
-        except Exception:
-            ts_iso = None
-        return closes, ts_iso
-    except Exception:
-        return [], None
-
+    Vol/beta for every row of a right-aligned close matrix at once.
 
-def _annualized_realized_vol(returns: List[float]) -> float:
-    # Daily returns std * sqrt(252)
-    return _std(returns) * math.sqrt(252.0)
-
-
-def _beta(asset_rets: List[float], bench_rets: List[float]) -> float:
-    n = min(len(asset_rets), len(bench_rets))
-    if n < 5:
-        return 0.0
-    x = bench_rets[-n:]
-    y = asset_rets[-n:]
-    v = _var(x)
-    if v <= 0:
-        return 0.0
-    return _cov(x, y) / v
+    Invalid close pairs are dropped (returns are right-justified); vols are annualized
+    (``std * sqrt(252)``) and need a full 5/20-return window; beta uses the tail-aligned last
+    ``min(n_asset, n_bench, 20)`` returns and needs >= 5 of them.
+    """
+    prev, cur = closes[:, :-1], closes[:, 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets = cur / prev - 1.0
+    rets[~((prev > 0) & (cur > 0))] = np.nan
+    order = np.argsort(~np.isnan(rets), axis=1, kind="stable")
+    rets = np.take_along_axis(rets, order, axis=1)
+    valid = ~np.isnan(rets)
+    counts = valid.sum(axis=1)
+
+    def _vol(k: int) -> np.ndarray:
+        if rets.shape[1] < k:
+            return np.zeros(len(rets))
+        w = np.nan_to_num(rets[:, -k:])
+        std = np.std(w, axis=1, ddof=1) if k > 1 else np.zeros(len(rets))
+        return np.where(counts >= k, std * math.sqrt(252.0), 0.0)
+
+    y = rets[:, -20:]
+    x = np.broadcast_to(y[bench_row], y.shape)
+    mask = ~np.isnan(y) & ~np.isnan(x)
+    n = mask.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    xs, ys = np.where(mask, x, 0.0), np.where(mask, y, 0.0)
+    mx = (xs.sum(axis=1) / safe_n)[:, None]
+    my = (ys.sum(axis=1) / safe_n)[:, None]
+    dx = np.where(mask, x - mx, 0.0)
+    dy = np.where(mask, y - my, 0.0)
+    denom = np.maximum(n - 1, 1)
+    var = (dx * dx).sum(axis=1) / denom
+    cov = (dx * dy).sum(axis=1) / denom
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = np.where((n >= 5) & (var > 0), cov / var, 0.0)
+    enough = (counts >= min_returns_20d) & (counts[bench_row] >= min_returns_20d)
+    beta = np.where(enough, beta, 0.0)
+    return {"vol_5d": _vol(5), "vol_20d": _vol(20), "beta": beta, "n_returns": counts}
 
 
 def read_symbol_risk_features(default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -210,29 +175,29 @@ def update_symbol_risk_features(
     if isinstance(cache, dict) and _cache_fresh(cache, max_age_hours=refresh_hours):
         return cache
 
-    bench_closes, bench_ts = _get_daily_closes(api, benchmark, limit=45)
-    bench_rets = _pct_returns_from_closes(bench_closes)
+    bench = str(benchmark).upper().strip()
+    from src.data.daily_bar_store import get_daily_bar_store
+
+    store = get_daily_bar_store()
+    rows = [bench] + [s for s in symbols_norm if s != bench]
+    store.ensure(api, rows)
+
+    _bar_ts = store.last_bar_ts
 
-    out: Dict[str, Any] = {"_meta": {"ts": _now_iso(), "benchmark": benchmark, "benchmark_last_bar_ts": bench_ts}, "symbols": {}}
+    out: Dict[str, Any] = {"_meta": {"ts": _now_iso(), "benchmark": benchmark, "benchmark_last_bar_ts": _bar_ts(bench)}, "symbols": {}}
     ok = 0
     failed: List[str] = []
 
+    feats = _vectorized_risk_features(store.close_matrix(rows, 45), 0, min_returns_20d=min_returns_20d)
+    index = {s: i for i, s in enumerate(rows)}
     for sym in symbols_norm:
         try:
-            closes, last_ts = _get_daily_closes(api, sym, limit=45)
-            rets = _pct_returns_from_closes(closes)
-            # Rolling vols
-            vol_5d = _annualized_realized_vol(rets[-5:]) if len(rets) >= 5 else 0.0
-            vol_20d = _annualized_realized_vol(rets[-20:]) if len(rets) >= 20 else 0.0
-            b = _beta(rets[-20:], bench_rets[-20:])
-            # Guard: if insufficient returns, keep beta at 0.
-            if len(rets) < min_returns_20d or len(bench_rets) < min_returns_20d:
-                b = 0.0
+            i = index[sym]
             out["symbols"][sym] = {
-                "realized_vol_5d": round(_safe_float(vol_5d), 6),
-                "realized_vol_20d": round(_safe_float(vol_20d), 6),
-                "beta_vs_spy": round(_safe_float(b), 6),
-                "last_bar_ts": last_ts,
+                "realized_vol_5d": round(_safe_float(feats["vol_5d"][i]), 6),
+                "realized_vol_20d": round(_safe_float(feats["vol_20d"][i]), 6),
+                "beta_vs_spy": round(_safe_float(feats["beta"][i]), 6),
+                "last_bar_ts": _bar_ts(sym),
             }
             ok += 1
         except Exception:
@@ -76,10 +76,15 @@ def try_append_entry_snapshot(
             rec["passive_uw_harvest"] = ph
         # Pillar 1 — microstructure alpha (telemetry-only; no execution gates).
         for _k in (
+            "ofi_l1_roll_10s_sum",
             "ofi_l1_roll_60s_sum",
             "ofi_l1_roll_300s_sum",
             "shadow_vamp_limit_price",
             "shadow_vamp_mid",
+            "stream_atr",
+            "stream_ema",
+            "stream_vwap_dev",
+            "stream_realized_vol",
         ):
             if _k in pending:
                 try:
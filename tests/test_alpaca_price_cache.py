@@ -1,6 +1,7 @@
 """Unit tests for SIP bar ring buffer (no live WebSocket)."""
 from __future__ import annotations
 
+import dataclasses
 import time
 
 import pytest
@@ -46,3 +47,103 @@ def test_price_cache_stale_when_no_recent_rx():
     with c._lock:
         c._last_bar_rx_mono["ZZ"] = time.monotonic() - 999.0
     assert c.get_fresh_bars_df("ZZ", 1, max_age_sec=60.0) is None
+
+
+def _stream_bars(c, sym, closes, start="2026-04-07T15:00:00Z", vol_base=1000):
+    import pandas as pd
+
+    t0 = pd.Timestamp(start)
+    for i, px in enumerate(closes):
+        c.record_minute_bar(
+            sym,
+            o=px,
+            h=px * 1.002,
+            l=px * 0.998,
+            c=px,
+            v=vol_base + i,
+            vw=px,
+            n=5,
+            t_iso=(t0 + pd.Timedelta(minutes=i)).isoformat(),
+        )
+
+
+def test_indicator_snapshot_matches_batch_indicators():
+    import numpy as np
+
+    from src.core import indicators as ind
+
+    rng = np.random.default_rng(7)
+    closes = list(100 * np.cumprod(1 + rng.normal(0, 0.002, 60)))
+    c = PriceCache(maxlen_per_symbol=40)  # ring wraps: indicators must still cover every bar
+    _stream_bars(c, "IND", closes)
+
+    snap = c.indicator_snapshot("IND")
+    h = np.array(closes) * 1.002
+    l = np.array(closes) * 0.998
+    assert snap.bars == 40
+    assert snap.atr == pytest.approx(ind.wilder_atr(h, l, np.array(closes), 14), rel=1e-9)
+    assert snap.ema == pytest.approx(ind.ema_last(closes, 20), rel=1e-9)
+    rets = np.diff(np.log(closes))[-30:]
+    assert snap.realized_vol == pytest.approx(float(np.std(rets, ddof=1)), rel=1e-6)
+    vols = 1000 + np.arange(60)
+    vwap = float(np.dot(closes, vols) / vols.sum())
+    assert snap.vwap == pytest.approx(vwap) and snap.vwap_dev == pytest.approx(closes[-1] / vwap - 1)
+
+    arrs = c.get_fresh_bar_arrays("IND", 5, max_age_sec=60.0)
+    assert list(arrs["close"]) == pytest.approx(closes[-5:])
+    assert c.get_fresh_bar_arrays("IND", 41, max_age_sec=60.0) is None
+
+
+def test_updated_bar_replaces_state_and_session_vwap_resets():
+    c = PriceCache()
+    _stream_bars(c, "UPD", [10.0] * 20 + [11.0])
+    before = c.indicator_snapshot("UPD")
+    # updatedBars for the last minute: a revision, then the original values again.
+    _stream_bars(c, "UPD", [12.0], start="2026-04-07T15:20:00Z", vol_base=1020)
+    assert c.indicator_snapshot("UPD").close == 12.0
+    _stream_bars(c, "UPD", [11.0], start="2026-04-07T15:20:00Z", vol_base=1020)
+    again = c.indicator_snapshot("UPD")
+    assert dataclasses.replace(again, received_monotonic=0.0) == dataclasses.replace(before, received_monotonic=0.0)
+    assert c.get_fresh_bars_df("UPD", 22, max_age_sec=60.0) is None
+
+    _stream_bars(c, "UPD", [20.0], start="2026-04-08T14:30:00Z")
+    snap = c.indicator_snapshot("UPD")
+    assert snap.vwap == pytest.approx(20.0) and snap.vwap_dev == pytest.approx(0.0)
+    assert c.indicator_snapshot("NONE") is None
+    assert c.indicator_snapshots(["UPD", "NONE"]).keys() == {"UPD"}
+    with c._lock:
+        c._last_bar_rx_mono["UPD"] = time.monotonic() - 999.0
+    assert c.indicator_snapshot("UPD", max_age_sec=60.0) is None
+    assert c.indicator_snapshots(["UPD"], max_age_sec=60.0) == {}
+
+
+def test_manager_snapshot_adds_ofi_window_sums():
+    from src.alpaca.stream_manager import AlpacaStreamManager
+    from src.market_intelligence.ofi_tracker import CompactOFITracker
+
+    mgr = AlpacaStreamManager.__new__(AlpacaStreamManager)  # no websocket session needed
+    mgr.price_cache, mgr.ofi_tracker = PriceCache(), CompactOFITracker()
+    _stream_bars(mgr.price_cache, "OFI", [10.0, 10.5])
+    now = time.monotonic()
+    mgr.ofi_tracker.on_quote("OFI", 10.0, 100, 10.01, 100, mono_t=now - 100)
+    mgr.ofi_tracker.on_quote("OFI", 10.01, 300, 10.02, 100, mono_t=now - 100)  # +200 (100s ago)
+    mgr.ofi_tracker.on_quote("OFI", 10.01, 400, 10.02, 100, mono_t=now)  # +100 (now)
+
+    snap = mgr.indicator_snapshot("ofi", max_age_sec=60.0)
+    assert (snap.ofi_10s, snap.ofi_60s, snap.ofi_300s) == (100.0, 100.0, 300.0)
+    assert snap.close == 10.5 and snap.ema == mgr.price_cache.indicator_snapshot("OFI").ema
+    assert mgr.indicator_snapshots(["OFI", "NONE"]) == {"OFI": snap}
+    assert mgr.indicator_snapshot("NONE") is None
+
+
+def test_session_vwap_follows_eastern_open_not_utc_midnight():
+    c = PriceCache()
+    _stream_bars(c, "ET", [10.0, 30.0], start="2026-04-07T23:59:00Z")  # 19:59 -> 20:00 ET, same session
+    assert c.indicator_snapshot("ET").vwap == pytest.approx((10.0 * 1000 + 30.0 * 1001) / 2001)
+
+    _stream_bars(c, "ET", [50.0], start="2026-04-08T13:29:00Z")  # 09:29 ET: new day, pre-open session
+    assert c.indicator_snapshot("ET").vwap == pytest.approx(50.0)
+    _stream_bars(c, "ET", [70.0], start="2026-04-08T13:30:00Z")  # 09:30 ET: regular session opens
+    assert c.indicator_snapshot("ET").vwap == pytest.approx(70.0)
+    _stream_bars(c, "ET", [90.0], start="2026-04-08T13:31:00Z")
+    assert c.indicator_snapshot("ET").vwap == pytest.approx((70.0 * 1000 + 90.0 * 1000) / 2000)
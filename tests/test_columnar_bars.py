@@ -0,0 +1,85 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.data import alpaca_bars_cache as abc
+from src.data import columnar_bars
+
+
+def _day_bars(day: str, n: int = 5, base: float = 100.0):
+    start = datetime.fromisoformat(day).replace(hour=14, minute=30, tzinfo=timezone.utc)
+    return [
+        {
+            "t": (start + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "o": base + i,
+            "h": base + i + 0.5,
+            "l": base + i - 0.5,
+            "c": base + i + 0.25,
+            "v": 1000 + i,
+            "n": 10 + i,
+            "vw": base + i + 0.1,
+        }
+        for i in range(n)
+    ]
+
+
+def test_set_get_round_trip_and_empty_day_is_cached(tmp_path: Path) -> None:
+    bars = _day_bars("2025-03-03")
+    abc.set_cached_bars("aapl", "2025-03-03", "1Min", bars, tmp_path)
+    abc.set_cached_bars("AAPL", "2025-03-04", "1Min", [], tmp_path)
+
+    assert (tmp_path / "_columnar" / "1Min" / "AAPL" / "2025-03.arrow").exists()
+    assert abc.get_cached_bars("AAPL", "2025-03-03", "1Min", tmp_path) == bars
+    assert abc.get_cached_bars("AAPL", "2025-03-04", "1Min", tmp_path) == []
+    assert abc.get_cached_bars("AAPL", "2025-03-05", "1Min", tmp_path) is None
+
+    # Re-writing a day replaces it instead of duplicating rows.
+    abc.set_cached_bars("AAPL", "2025-03-03", "1Min", bars[:2], tmp_path)
+    assert abc.get_cached_bars("AAPL", "2025-03-03", "1Min", tmp_path) == bars[:2]
+
+
+def test_legacy_json_is_migrated_on_read(tmp_path: Path) -> None:
+    for day in ("2025-01-30", "2025-01-31"):
+        p = abc.cache_path("MSFT", day, "1Min", tmp_path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(_day_bars(day)), encoding="utf-8")
+
+    assert abc.get_cached_bars("MSFT", "2025-01-30", "1Min", tmp_path) == _day_bars("2025-01-30")
+    _, days = columnar_bars.read_month(columnar_bars.month_path(tmp_path, "MSFT", "2025-01", "1Min"))
+    assert days == ["2025-01-30", "2025-01-31"]
+
+
+def test_range_query_spans_months_and_symbols(tmp_path: Path) -> None:
+    abc.set_cached_bars("SPY", "2025-02-28", "1Min", _day_bars("2025-02-28", base=500), tmp_path)
+    abc.set_cached_bars("SPY", "2025-03-03", "1Min", _day_bars("2025-03-03", base=510), tmp_path)
+    abc.set_cached_bars("QQQ", "2025-03-03", "1Min", _day_bars("2025-03-03", base=400), tmp_path)
+
+    start = datetime(2025, 2, 28, 14, 32, tzinfo=timezone.utc)
+    end = datetime(2025, 3, 3, 14, 31, tzinfo=timezone.utc)
+    arrays = abc.load_bar_arrays(["SPY", "QQQ", "NONE"], start, end, cache_dir=tmp_path)
+
+    assert set(arrays) == {"SPY", "QQQ"}
+    np.testing.assert_allclose(arrays["SPY"]["c"], [502.25, 503.25, 504.25, 510.25, 511.25])
+    assert np.all(np.diff(arrays["SPY"]["t"]) > 0)
+    assert len(arrays["QQQ"]["c"]) == 2
+
+    df = abc.load_bars_df(["SPY", "QQQ"], start, end, cache_dir=tmp_path)
+    assert len(df) == 7 and set(df["symbol"]) == {"SPY", "QQQ"}
+    assert str(df.index.tz) == "UTC"
+
+
+def test_kill_switch_and_json_write_toggle(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BARS_CACHE_WRITE_JSON", "0")
+    abc.set_cached_bars("IWM", "2025-03-03", "1Min", _day_bars("2025-03-03"), tmp_path)
+    assert not abc.cache_path("IWM", "2025-03-03", "1Min", tmp_path).exists()
+
+    monkeypatch.setenv("BARS_CACHE_COLUMNAR", "0")
+    assert abc.get_cached_bars("IWM", "2025-03-03", "1Min", tmp_path) is None
+    abc.set_cached_bars("DIA", "2025-03-03", "1Min", _day_bars("2025-03-03"), tmp_path)
+    assert abc.cache_path("DIA", "2025-03-03", "1Min", tmp_path).exists()
+    assert not (tmp_path / "_columnar" / "1Min" / "DIA").exists()
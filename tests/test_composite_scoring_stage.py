@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from src.engine.composite_scoring_stage import StageTimings, run_scoring_stage, scoring_stage_workers
+
+
+def test_results_are_sorted_regardless_of_completion_order() -> None:
+    delays = {"AAPL": 0.03, "MSFT": 0.0, "NVDA": 0.01, "AMD": 0.02}
+
+    def fn(t):
+        time.sleep(delays[t])
+        return t.lower()
+
+    out = run_scoring_stage(set(delays), fn, workers=4)
+
+    assert [t for t, _ in out] == ["AAPL", "AMD", "MSFT", "NVDA"]
+    assert [r for _, r in out] == ["aapl", "amd", "msft", "nvda"]
+
+
+def test_fans_out_over_bounded_pool() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fn(t):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return t
+
+    run_scoring_stage([f"T{i:02d}" for i in range(13)], fn, workers=3)
+
+    assert 1 < peak <= 3
+
+
+def test_exceptions_are_returned_for_the_merge_phase() -> None:
+    def fn(t):
+        if t == "BAD":
+            raise KeyError("missing")
+        return 1
+
+    out = dict(run_scoring_stage(["OK", "BAD"], fn, workers=2))
+
+    assert out["OK"] == 1
+    assert isinstance(out["BAD"], KeyError)
+
+
+def test_timings_summary_per_step() -> None:
+    timings = StageTimings()
+
+    def fn(t):
+        with timings.step("composite_v2"):
+            time.sleep(0.001)
+        return t
+
+    run_scoring_stage(["A", "B", "C"], fn, workers=2, timings=timings)
+    summary = timings.summary()
+
+    assert summary["composite_v2"]["count"] == 3
+    assert summary["composite_v2"]["total_ms"] >= summary["composite_v2"]["max_ms"] > 0
+    assert summary["compute_wall"]["count"] == 1
+
+
+def test_worker_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("COMPOSITE_SCORING_WORKERS", "4")
+    assert scoring_stage_workers() == 4
+    monkeypatch.setenv("COMPOSITE_SCORING_WORKERS", "500")
+    assert scoring_stage_workers() == 32
+    monkeypatch.setenv("COMPOSITE_SCORING_PARALLEL", "0")
+    assert scoring_stage_workers() == 1
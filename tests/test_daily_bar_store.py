@@ -0,0 +1,157 @@
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import daily_bar_store
+from src.data.daily_bar_store import DailyBarStore
+from structural_intelligence import symbol_risk_features as srf
+
+
+def _series(seed: int, n: int = 50):
+    rng = np.random.default_rng(seed)
+    return list(100 * np.cumprod(1 + rng.normal(0, 0.02, n)))
+
+
+class _FakeAPI:
+    """Multi-symbol daily bars; each symbol has one close per calendar day up to today."""
+
+    def __init__(self, closes_by_symbol):
+        self.closes = closes_by_symbol
+        self.calls = []
+
+    def get_bars(self, symbols, timeframe, start=None, end=None):
+        self.calls.append((tuple(symbols), start[:10]))
+        start_day = datetime.fromisoformat(start).date()
+        today = datetime.now(timezone.utc).date()
+        rows = []
+        for sym in symbols:
+            vals = self.closes.get(sym, [])
+            for i, c in enumerate(vals):
+                day = today - timedelta(days=len(vals) - 1 - i)
+                if day >= start_day:
+                    rows.append({"timestamp": pd.Timestamp(day, tz="UTC"), "symbol": sym, "close": c})
+        df = pd.DataFrame(rows).set_index("timestamp") if rows else pd.DataFrame()
+        return SimpleNamespace(df=df)
+
+
+def test_chunked_cold_fetch_then_incremental(tmp_path: Path) -> None:
+    api = _FakeAPI({f"S{i}": _series(i) for i in range(5)})
+    store = DailyBarStore(tmp_path / "daily.json", chunk_size=2, refresh_sec=0)
+
+    assert store.ensure(api, [f"S{i}" for i in range(5)]) == 3
+    assert len(store.closes("S3")) == 50
+
+    api.calls.clear()
+    api.closes["S3"] = api.closes["S3"][1:] + [123.0]  # today's bar revised
+    store.ensure(api, ["S3"])
+    today = datetime.now(timezone.utc).date().isoformat()
+    assert api.calls == [(("S3",), today)]
+    assert store.closes("S3", 1) == [123.0]
+
+    reloaded = DailyBarStore(tmp_path / "daily.json")
+    assert reloaded.closes("S3") == store.closes("S3")
+
+
+def test_refresh_interval_skips_requests(tmp_path: Path) -> None:
+    api = _FakeAPI({"A": _series(1)})
+    store = DailyBarStore(tmp_path / "daily.json", refresh_sec=3600)
+    store.ensure(api, ["A"])
+    assert store.ensure(api, ["A"]) == 0
+    assert len(api.calls) == 1
+
+
+def _scalar_returns(closes):
+    return [(b - a) / a for a, b in zip(closes, closes[1:]) if a > 0 and b > 0]
+
+
+def _scalar_vol(rets):
+    return float(np.std(rets, ddof=1)) * math.sqrt(252.0)
+
+
+def _scalar_beta(asset, bench):
+    n = min(len(asset), len(bench))
+    if n < 5:
+        return 0.0
+    x, y = np.array(bench[-n:]), np.array(asset[-n:])
+    var = float(np.var(x, ddof=1))
+    return float(np.cov(x, y, ddof=1)[0, 1]) / var if var > 0 else 0.0
+
+
+def test_vectorized_features_match_scalar_reference() -> None:
+    series = {"SPY": _series(0), "AAA": _series(1), "BBB": _series(2)[:15], "CCC": _series(3)}
+    series["CCC"][30] = 0.0  # bad print: pair dropped
+    rows = list(series)
+    width = 45
+    mat = np.full((len(rows), width), np.nan)
+    for i, s in enumerate(rows):
+        vals = series[s][-width:]
+        mat[i, width - len(vals):] = vals
+
+    feats = srf._vectorized_risk_features(mat, 0, min_returns_20d=18)
+
+    bench_rets = _scalar_returns(series["SPY"][-width:])
+    for i, s in enumerate(rows):
+        rets = _scalar_returns(series[s][-width:])
+        vol5 = _scalar_vol(rets[-5:]) if len(rets) >= 5 else 0.0
+        vol20 = _scalar_vol(rets[-20:]) if len(rets) >= 20 else 0.0
+        beta = _scalar_beta(rets[-20:], bench_rets[-20:]) if len(rets) >= 18 else 0.0
+        assert feats["vol_5d"][i] == pytest.approx(vol5)
+        assert feats["vol_20d"][i] == pytest.approx(vol20)
+        assert feats["beta"][i] == pytest.approx(beta)
+
+
+def test_update_and_rsi_share_the_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from src import options_engine
+
+    api = _FakeAPI({"SPY": _series(0), "AAPL": _series(5), "MSFT": _series(6)})
+    monkeypatch.setattr(daily_bar_store, "_STORE", DailyBarStore(tmp_path / "daily.json", refresh_sec=3600))
+    monkeypatch.setattr(srf, "read_symbol_risk_features", lambda default=None: {})
+    monkeypatch.setattr(srf, "atomic_write_json", None)
+
+    out = srf.update_symbol_risk_features(api, symbols=["AAPL", "MSFT", "SPY"])
+    assert len(api.calls) == 1
+    today = datetime.now(timezone.utc).date().isoformat()
+    assert out["symbols"]["AAPL"]["last_bar_ts"] == pd.Timestamp(today, tz="UTC").isoformat()
+    assert out["symbols"]["SPY"]["beta_vs_spy"] == pytest.approx(1.0)
+    assert out["symbols"]["AAPL"]["realized_vol_20d"] > 0
+
+    rsi, why = options_engine.rsi_from_alpaca_daily(api, "AAPL")
+    assert why == "ok" and rsi == pytest.approx(options_engine.compute_rsi_wilder(_series(5)[-44:]))
+    assert len(api.calls) == 1
+
+
+def test_bar_timestamp_kept_and_fetch_errors_logged(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    class _API(_FakeAPI):
+        def get_bars(self, symbols, timeframe, start=None, end=None):
+            if "BAD" in symbols:
+                raise RuntimeError("boom")
+            resp = super().get_bars(symbols, timeframe, start=start, end=end)
+            resp.df.index = resp.df.index + pd.Timedelta(hours=4)  # 04:00 UTC session-date stamps
+            return resp
+
+    store = DailyBarStore(tmp_path / "daily.json", chunk_size=1, refresh_sec=0)
+    with caplog.at_level(logging.WARNING, logger=daily_bar_store.__name__):
+        assert store.ensure(_API({"A": _series(1)}), ["A", "BAD"]) == 1
+    assert "daily bar fetch failed" in caplog.text and "BAD" in caplog.text
+    today = datetime.now(timezone.utc).date().isoformat()
+    assert store.last_bar_ts("A") == f"{today}T04:00:00+00:00"
+    assert DailyBarStore(tmp_path / "daily.json").last_bar_ts("A") == store.last_bar_ts("A")
+
+
+def test_wheel_prefetch_refreshes_store_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from src import options_engine
+
+    api = _FakeAPI({"AAPL": _series(5), "MSFT": _series(6)})
+    monkeypatch.setattr(daily_bar_store, "_STORE", DailyBarStore(tmp_path / "daily.json", refresh_sec=0))
+
+    assert options_engine.prefetch_daily_closes(api, ["aapl", "MSFT"]) == 1
+    for sym in ("AAPL", "MSFT"):
+        veto, why = options_engine.should_veto_csp_rsi_overbought(api, sym, 101.0, refresh=False)
+        assert (veto, why) == (False, "ok")
+    assert len(api.calls) == 1
@@ -0,0 +1,111 @@
+import base64
+import threading
+import time
+
+import pytest
+
+import dashboard
+from src.dashboard.ttl_cache import DashTtlCache, parse_ttl_overrides
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 1000.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_expired_key_is_built_once_for_concurrent_callers() -> None:
+    cache = DashTtlCache(default_ttl_sec=5, stale_sec=0, max_entries=8, ttl_overrides={})
+    calls = []
+
+    def build() -> dict:
+        calls.append(1)
+        time.sleep(0.2)
+        return {"n": len(calls)}
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker() -> None:
+        barrier.wait()
+        results.append(cache.get("closed_trades", build))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and results == [{"n": 1}] * 8
+    st = cache.stats()["keys"]["closed_trades"]
+    assert st["misses"] == 1 and st["coalesced"] == 7 and st["builds"] == 1 and st["build_ms_max"] >= 150
+
+
+def test_stale_value_is_served_while_one_background_refresh_runs() -> None:
+    clock = _Clock()
+    cache = DashTtlCache(default_ttl_sec=5, stale_sec=60, max_entries=8, ttl_overrides={}, clock=clock)
+    release = threading.Event()
+    calls = []
+
+    def build() -> int:
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return len(calls)
+
+    assert cache.get("k", build) == 1
+    clock.t += 10  # past TTL, inside the stale window
+    assert [cache.get("k", build) for _ in range(5)] == [1] * 5
+    release.set()
+    for _ in range(100):
+        if cache.stats()["inflight"] == 0:
+            break
+        time.sleep(0.01)
+    assert len(calls) == 2 and cache.get("k", build) == 2
+    st = cache.stats()["keys"]["k"]
+    assert st["stale_hits"] == 5 and st["refreshes"] == 1 and st["hits"] == 1
+
+    clock.t += 500  # beyond the stale window: synchronous rebuild
+    assert cache.get("k", build) == 3
+
+
+def test_lru_bound_and_per_key_ttl_overrides() -> None:
+    clock = _Clock()
+    cache = DashTtlCache(default_ttl_sec=5, stale_sec=0, max_entries=2, ttl_overrides=parse_ttl_overrides("a=100, bad, b=x"), clock=clock)
+    cache.get("a", lambda: "a1")
+    cache.get("b", lambda: "b1")
+    cache.get("a", lambda: "unused")
+    cache.get("c", lambda: "c1")  # evicts "b", the least recently used
+    assert cache.stats()["entries"] == 2 and cache.evictions == 1
+    assert set(cache.stats()["keys"]) == {"a", "c"}
+
+    clock.t += 50  # "a" has a 100s override; default keys expire after 5s
+    assert cache.ttl_for("a", 15.0) == 100 and cache.ttl_for("c", 15.0) == 15.0
+    assert cache.get("a", lambda: "a2") == "a1"
+    assert cache.get("c", lambda: "c2") == "c2"
+
+
+def test_builder_errors_propagate_and_are_counted() -> None:
+    cache = DashTtlCache(default_ttl_sec=5, stale_sec=0, max_entries=8, ttl_overrides={})
+
+    def boom() -> None:
+        raise RuntimeError("log unreadable")
+
+    with pytest.raises(RuntimeError):
+        cache.get("x", boom)
+    assert cache.get("x", lambda: 1) == 1
+    assert cache.stats()["keys"]["x"]["errors"] == 1
+
+
+def test_metrics_endpoint_reports_cache_counters(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DASHBOARD_USER", "u")
+    monkeypatch.setenv("DASHBOARD_PASS", "p")
+    monkeypatch.setattr(dashboard, "_dash_ttl_cache", DashTtlCache(default_ttl_sec=5, stale_sec=0, ttl_overrides={}))
+    monkeypatch.setattr(dashboard, "_metrics_payload", lambda: {"ok": True})
+    auth = {"Authorization": "Basic " + base64.b64encode(b"u:p").decode()}
+    client = dashboard.app.test_client()
+    client.get("/metrics", headers=auth)
+    body = client.get("/metrics", headers=auth).get_json()
+    assert body["ok"] is True
+    assert body["dash_cache"]["keys"]["metrics_bundle_v1"]["hits"] == 1
@@ -0,0 +1,116 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+import dashboard
+from src.dashboard.read_models import ClosedTradesModel, RollingPnlModel, SignalFlowModel
+
+
+def _append(path: Path, *recs: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        for rec in recs:
+            f.write(json.dumps(rec) + "\n")
+
+
+def _iso(minutes_ago: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)).isoformat()
+
+
+def test_signal_flow_counts_appends_incrementally_and_rebuilds_on_truncation(tmp_path: Path) -> None:
+    uw, gate, orders, attr = (tmp_path / n for n in ("uw.jsonl", "gate.jsonl", "orders.jsonl", "attribution.jsonl"))
+    m = SignalFlowModel(uw_logs=[uw], gate_logs=[gate, attr], order_logs=[attr, orders], attribution_log=attr)
+    assert m.current(max_age_sec=0)["alerts"] == 0  # missing files are fine
+
+    _append(uw, {"ts": _iso(1)}, {"ts": _iso(45)}, {"ts": _iso(2)})
+    _append(gate, {"ts": _iso(1), "score": 3.5}, {"ts": _iso(1), "score": 1.0})
+    _append(orders, {"ts": _iso(1), "action": "submit_entry"}, {"ts": _iso(1), "action": "cancel"})
+    _append(attr, {"ts": _iso(3), "type": "attribution", "trade_id": "open_AAPL_1"})
+    assert m.current(max_age_sec=0) == {
+        "alerts": 2, "parsed": 3, "scored_above_3": 1, "orders_sent": 1, "trades_executed": 0,
+    }
+
+    applied = m.records_applied
+    _append(attr, {"ts": _iso(1), "type": "attribution", "trade_id": "close_AAPL_1", "pnl_usd": 4.2})
+    view = m.current(max_age_sec=0)
+    assert m.records_applied == applied + 1  # only the new line was read
+    assert view["trades_executed"] == 1 and view["parsed"] == 4
+    assert view["orders_sent"] == 1  # attribution has no orders; the orders log still answers
+
+    uw.write_text(json.dumps({"ts": _iso(1)}) + "\n")  # rewritten shorter: full rebuild
+    view = m.current(max_age_sec=0)
+    assert m.resets == 1 and view["alerts"] == 1 and view["trades_executed"] == 1
+
+
+def test_closed_trades_model_matches_legacy_scan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    attr, exit_attr = tmp_path / "attribution.jsonl", tmp_path / "exit_attribution.jsonl"
+    monkeypatch.setattr(dashboard, "_closed_trades_log_paths", lambda: (attr, exit_attr))
+    _append(
+        attr,
+        {"type": "attribution", "symbol": "aapl", "ts": "2026-10-15T14:00:05+00:00", "pnl_usd": 12.345,
+         "context": {"close_reason": "tp", "entry_signal": "flow", "fees_usd": 0.1}},
+        {"type": "attribution", "symbol": "MSFT", "ts": "2026-10-15T15:00:00+00:00", "pnl_usd": 0},
+        {"type": "attribution", "symbol": "TESTX", "ts": "2026-10-15T15:00:00+00:00", "pnl_usd": 3},
+        {"type": "attribution", "symbol": "SPY", "ts": "2026-10-15T16:00:00+00:00", "pnl_usd": 1,
+         "strategy_id": "wheel"},
+        {"type": "attribution", "symbol": "OLD", "ts": "2020-01-01T00:00:00+00:00", "pnl_usd": 1},
+    )
+    _append(
+        exit_attr,
+        {"symbol": "AAPL", "timestamp": "2026-10-15T14:00:40+00:00", "pnl": 99, "exit_reason": "dup"},
+        {"symbol": "NVDA", "timestamp": "2026-10-15T13:00:00+00:00", "pnl": -2.5, "exit_reason": "stop"},
+    )
+    now = datetime(2026, 10, 16, tzinfo=timezone.utc).timestamp()
+    m = ClosedTradesModel(
+        attribution_log=attr,
+        exit_attribution_log=exit_attr,
+        attribution_row=dashboard._closed_trade_row_from_attribution,
+        exit_attribution_row=dashboard._closed_trade_row_from_exit_attribution,
+    )
+    m.refresh()
+    rows = m.view(now=now)
+
+    monkeypatch.setenv("DASHBOARD_READ_MODELS", "0")
+    assert rows == dashboard._load_stock_closed_trades()
+    assert [(r["symbol"], r["pnl_usd"]) for r in rows] == [("AAPL", 12.35), ("NVDA", -2.5)]
+
+    rows[0]["strict_alpaca_chain"] = "COMPLETE"  # callers annotate rows in place
+    assert "strict_alpaca_chain" not in m.view(now=now)[0]
+
+
+def test_closed_trades_windows_use_model_up_to_its_max_days(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from src.dashboard.read_models import ReadModelMaterializer
+
+    attr, exit_attr = tmp_path / "attribution.jsonl", tmp_path / "exit_attribution.jsonl"
+    monkeypatch.setattr(dashboard, "_closed_trades_log_paths", lambda: (attr, exit_attr))
+    _append(attr, *({"type": "attribution", "symbol": sym, "ts": _iso(days * 1440), "pnl_usd": 1}
+                    for sym, days in (("NEW", 1), ("MID", 10), ("OLD", 100))))
+    _append(exit_attr)
+    rm = ReadModelMaterializer(interval_sec=0)
+    rm.register(ClosedTradesModel(
+        attribution_log=attr,
+        exit_attribution_log=exit_attr,
+        attribution_row=dashboard._closed_trade_row_from_attribution,
+        exit_attribution_row=dashboard._closed_trade_row_from_exit_attribution,
+    ))
+    monkeypatch.setattr(dashboard, "_dashboard_read_models", lambda: rm)
+    served = {d: [r["symbol"] for r in dashboard._load_stock_closed_trades(max_days=d)] for d in (5, 30, 90, 120)}
+    assert rm.model("closed_trades").records_applied == 3  # read once, shared by every window
+
+    monkeypatch.setattr(dashboard, "_dashboard_read_models", lambda: None)
+    scanned = {d: [r["symbol"] for r in dashboard._load_stock_closed_trades(max_days=d)] for d in (5, 30, 90, 120)}
+    assert served == scanned == {5: ["NEW"], 30: ["NEW", "MID"], 90: ["NEW", "MID"], 120: ["NEW", "MID", "OLD"]}
+
+
+def test_rolling_pnl_keeps_last_points_and_total(tmp_path: Path) -> None:
+    path = tmp_path / "rolling_pnl_5d.jsonl"
+    m = RollingPnlModel(path, max_points=3)
+    _append(path, *({"equity": 100 + i} for i in range(4)))
+    m.refresh()
+    _append(path, {"equity": 200, "equity_shadow": 201})
+    m.refresh()
+    view = m.view()
+    assert [p["equity"] for p in view["points"]] == [102, 103, 200]
+    assert view["points_total_before_cap"] == 5 and view["shadow_value"] == [201]
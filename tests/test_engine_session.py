@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import pytest
+
+from src.engine.engine_session import EngineSession, file_signature
+
+
+class _Engine:
+    def __init__(self) -> None:
+        self.refreshed = 0
+
+
+def _session(**kw):
+    built = []
+
+    def factory():
+        e = _Engine()
+        built.append(e)
+        return e
+
+    kw.setdefault("enabled", lambda: True)
+    return EngineSession(factory, **kw), built
+
+
+def test_reuses_instance_and_runs_refresh_hook() -> None:
+    sess, built = _session(on_reuse=lambda e: setattr(e, "refreshed", e.refreshed + 1))
+
+    a = sess.get()
+    b = sess.get()
+
+    assert a is b and len(built) == 1
+    assert a.refreshed == 1
+    assert sess.stats()["reuses"] == 1
+
+
+def test_rebuilds_on_signature_change(tmp_path: Path) -> None:
+    weights = tmp_path / "weights.json"
+    weights.write_text("{}")
+    sess, built = _session(signature=lambda: file_signature([weights]))
+
+    first = sess.get()
+    assert sess.get() is first
+    weights.write_text('{"AAPL|bullish|unknown": 1.2}')
+
+    assert sess.get() is not first
+    assert len(built) == 2
+
+
+def test_invalidate_and_rebuild_on_error() -> None:
+    events = []
+    sess, built = _session(on_event=lambda ev, kw: events.append((ev, kw.get("reason"))))
+
+    first = sess.get()
+    sess.rebuild_on_error(RuntimeError("broker down"))
+    assert sess.peek() is first  # still usable until the next cycle asks for it
+    second = sess.get()
+    sess.invalidate("weights_updated")
+    third = sess.get()
+
+    assert len({id(first), id(second), id(third)}) == 3
+    assert ("engine_rebuilt", "error:RuntimeError") in events
+    assert ("engine_rebuilt", "weights_updated") in events
+
+
+def test_failed_refresh_and_max_age_rebuild() -> None:
+    now = [0.0]
+
+    def refresh(e):
+        if getattr(e, "boom", False):
+            raise OSError("cache unreadable")
+
+    sess, built = _session(on_reuse=refresh, max_age_sec=60, clock=lambda: now[0])
+    first = sess.get()
+    now[0] = 61.0
+    second = sess.get()
+    second.boom = True
+    third = sess.get()
+
+    assert len(built) == 3 and second is not first and third is not second
+
+
+def test_kill_switch_builds_every_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PERSISTENT_ENGINE", "0")
+    built = []
+    sess = EngineSession(lambda: built.append(1) or object())
+
+    assert sess.get() is not sess.get()
+    assert len(built) == 2 and sess.peek() is None
+
+
+def test_factory_error_propagates_and_next_get_retries() -> None:
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("alpaca")
+        return _Engine()
+
+    sess = EngineSession(factory, enabled=lambda: True)
+    with pytest.raises(ConnectionError):
+        sess.get()
+    assert isinstance(sess.get(), _Engine)
+
+
+def test_reused_executor_reconciles_once_per_cycle(monkeypatch: pytest.MonkeyPatch) -> None:
+    import main
+
+    class _Executor:
+        def __init__(self, ok: bool) -> None:
+            self.ok = ok
+            self.calls = 0
+
+        def _safe_reconcile(self) -> bool:
+            self.calls += 1
+            return self.ok
+
+    class _Eng:
+        def __init__(self, ok: bool) -> None:
+            self.executor = _Executor(ok)
+
+    reasons = []
+    monkeypatch.setattr(main, "invalidate_engine", lambda reason="manual": reasons.append(reason))
+    monkeypatch.setattr(main.Config, "RUN_INTERVAL_SEC", 60)
+
+    eng = _Eng(ok=True)
+    main._reconcile_engine_for_cycle(eng)
+    main._reconcile_engine_for_cycle(eng)  # second acquire in the same cycle
+    assert eng.executor.calls == 1
+    eng.executor._cycle_reconcile_mono -= 60
+    main._reconcile_engine_for_cycle(eng)
+    assert eng.executor.calls == 2 and reasons == []
+
+    bad = _Eng(ok=False)
+    main._reconcile_engine_for_cycle(bad)
+    assert reasons == ["reconcile_failed"]
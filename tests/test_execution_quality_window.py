@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+
+from src.telemetry.execution_quality_window import ExecutionQualityWindow
+
+
+def _full_scan_averages(path: Path):
+    rows = []
+    if path.exists():
+        for line in path.read_text().splitlines():
+            try:
+                rows.append(json.loads(line))
+            except Exception:
+                pass
+    recent = rows[-20:]
+    if not recent:
+        return 1.0, 500
+    return (sum(e.get("slippage_bps", 0) for e in recent) / len(recent) / 10000,
+            sum(e.get("latency_ms", 500) for e in recent) / len(recent))
+
+
+def test_matches_full_scan_across_appends_and_foreign_writes(tmp_path: Path) -> None:
+    path = tmp_path / "execution_quality.jsonl"
+    win = ExecutionQualityWindow(path)
+    assert win.averages() == (1.0, 500)
+
+    for i in range(30):
+        win.append({"slippage_bps": i * 1.5, "latency_ms": 100 + i})
+    assert win.averages() == _full_scan_averages(path)
+
+    with path.open("a") as f:  # another process appending, plus a junk line
+        f.write(json.dumps({"slippage_bps": 99.0}) + "\n")
+        f.write("not json\n")
+    win.append({"slippage_bps": -3.0, "latency_ms": 42})
+
+    assert win.averages() == _full_scan_averages(path)
+    assert win.recent()[-2:] == [{"slippage_bps": 99.0}, {"slippage_bps": -3.0, "latency_ms": 42}]
+
+
+def test_cold_start_reads_bounded_tail(tmp_path: Path) -> None:
+    path = tmp_path / "execution_quality.jsonl"
+    with path.open("w") as f:
+        for i in range(5000):
+            f.write(json.dumps({"slippage_bps": float(i % 17), "latency_ms": float(i)}) + "\n")
+
+    win = ExecutionQualityWindow(path, tail_bytes=4096)
+
+    assert win.averages() == _full_scan_averages(path)
+
+
+def test_truncation_and_partial_line(tmp_path: Path) -> None:
+    path = tmp_path / "execution_quality.jsonl"
+    win = ExecutionQualityWindow(path)
+    for i in range(5):
+        win.append({"slippage_bps": 10.0, "latency_ms": 200})
+
+    path.write_text(json.dumps({"slippage_bps": 20.0, "latency_ms": 300}) + "\n" + '{"slippage_bps": 5')
+    assert win.averages() == (20.0 / 10000, 300)
+
+    with path.open("a") as f:
+        f.write('.0, "latency_ms": 100}\n')
+    assert win.averages() == (12.5 / 10000, 200)
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from src.alpaca.stream_manager import PriceCache
+from src.exit.exit_market_snapshot import MarketSnapshot, build_exit_snapshots
+
+
+def _bars_frame(symbols, n, end=None):
+    end = end or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    rows = []
+    for sym in symbols:
+        for i in range(n):
+            ts = end - timedelta(minutes=n - 1 - i)
+            rows.append({"timestamp": ts, "symbol": sym, "open": 10.0 + i, "high": 11.0 + i, "low": 9.0 + i, "close": 10.5 + i, "volume": 100})
+    return pd.DataFrame(rows).set_index("timestamp")
+
+
+class _FakeAPI:
+    def __init__(self, n_bars=100):
+        self.calls = []
+        self.n_bars = n_bars
+
+    def get_latest_trades(self, symbols):
+        self.calls.append(("trades", tuple(symbols)))
+        return {s: SimpleNamespace(price=100.0 + i) for i, s in enumerate(symbols)}
+
+    def get_latest_quotes(self, symbols):
+        self.calls.append(("quotes", tuple(symbols)))
+        return {s: SimpleNamespace(bid_price=99.0, ask_price=101.0) for s in symbols}
+
+    def get_bars(self, symbols, timeframe, start=None):
+        self.calls.append(("bars", tuple(symbols)))
+        return SimpleNamespace(df=_bars_frame(symbols, self.n_bars))
+
+
+def test_one_request_per_data_type_regardless_of_position_count() -> None:
+    api = _FakeAPI()
+    symbols = [f"S{i}" for i in range(50)]
+
+    snaps = build_exit_snapshots(api, symbols, bar_limit=80)
+
+    assert [kind for kind, _ in api.calls] == ["trades", "quotes", "bars"]
+    assert len(snaps) == 50
+    bars = snaps["S7"].bars(80)
+    assert len(bars.df) == 80 and "symbol" not in bars.df.columns
+    assert snaps["S7"].bars_source == "rest"
+    assert snaps["S7"].price == 107.0
+
+
+def test_fresh_stream_cache_skips_rest() -> None:
+    cache = PriceCache()
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    for i in range(90):
+        ts = (now - timedelta(minutes=89 - i)).isoformat()
+        cache.record_minute_bar("AAPL", o=1, h=2, l=0.5, c=1.5, v=10, vw=1.2, n=3, t_iso=ts)
+    cache.record_trade("AAPL", 187.25)
+    api = _FakeAPI()
+
+    snaps = build_exit_snapshots(api, ["AAPL", "MSFT"], bar_limit=80, price_cache=cache)
+
+    assert ("trades", ("MSFT",)) in api.calls and ("bars", ("MSFT",)) in api.calls
+    assert snaps["AAPL"].bars_source == "stream" and snaps["AAPL"].price == 187.25
+
+
+def test_snapshot_is_immutable_and_rejects_short_or_stale_bars() -> None:
+    stale = _bars_frame(["X"], 20, end=datetime.now(timezone.utc) - timedelta(hours=1)).drop(columns=["symbol"])
+    snap = MarketSnapshot(symbol="X", bid=9.0, ask=11.0, bars_df=stale)
+
+    with pytest.raises(Exception):
+        snap.last_trade = 1.0  # type: ignore[misc]
+    assert snap.price == 10.0
+    assert snap.bars(30) is None
+    assert snap.bars(10) is None
+    assert snap.bars(10, max_age_minutes=120) is not None
+
+
+def test_batch_failure_is_reported_and_leaves_fields_empty() -> None:
+    class Broken(_FakeAPI):
+        def get_bars(self, symbols, timeframe, start=None):
+            raise RuntimeError("429")
+
+    errors = []
+    snaps = build_exit_snapshots(Broken(), ["A"], on_error=lambda kind, e: errors.append(kind))
+
+    assert errors == ["bars"]
+    assert snaps["A"].bars(1) is None and snaps["A"].price == 100.0
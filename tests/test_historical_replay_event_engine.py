@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from config.registry import Thresholds
+from historical_replay_engine import HistoricalReplayEngine
+from src.data.alpaca_bars_cache import set_cached_bars
+
+T0 = datetime(2026, 3, 3, 15, 0, tzinfo=timezone.utc)  # 10:00 ET
+
+
+def _write_bars(cache: Path, symbol: str, start: datetime, ohlc: List[Tuple[float, float, float, float]]) -> None:
+    bars = [
+        {"t": (start + timedelta(minutes=i)).isoformat().replace("+00:00", "Z"), "o": o, "h": h, "l": l, "c": c, "v": 100}
+        for i, (o, h, l, c) in enumerate(ohlc)
+    ]
+    set_cached_bars(symbol, start.strftime("%Y-%m-%d"), "1Min", bars, cache)
+
+
+def _flat(n: int, px: float = 100.0):
+    return [(px, px, px, px)] * n
+
+
+def _signal(symbol: str, ts: datetime, direction: str = "bullish"):
+    return {"symbol": symbol, "timestamp": ts, "score": 5.0, "direction": direction, "components": {}}
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> HistoricalReplayEngine:
+    return HistoricalReplayEngine(
+        attribution_log_path=tmp_path / "attribution.jsonl",
+        uw_attribution_log_path=tmp_path / "uw_attribution.jsonl",
+        bars_cache_dir=tmp_path / "bars",
+        fetch_missing_bars=False,
+    )
+
+
+def test_long_trailing_stop_uses_true_high_water(engine: HistoricalReplayEngine) -> None:
+    # 5 warm-up bars, entry at the 14:59 bar close (100), run up to 101.5, then gap lower.
+    rising = [(100 + 0.3 * i, 100 + 0.3 * (i + 1), 100 + 0.3 * i, 100 + 0.3 * (i + 1)) for i in range(5)]
+    _write_bars(engine.bars_cache_dir, "AAA", T0 - timedelta(minutes=5), _flat(5) + rising + [(101.0, 101.0, 97.0, 97.5)] + _flat(5, 97.5))
+
+    (trade,) = engine.replay_signals([_signal("AAA", T0)], test_specialist=False)
+
+    stop = 101.5 * (1 - Thresholds.TRAILING_STOP_PCT)
+    assert trade.exit_reason == "trailing_stop"
+    assert trade.exit_price == pytest.approx(stop)
+    assert trade.exit_time == T0 + timedelta(minutes=6)
+    assert trade.mfe_pct == pytest.approx((101.5 - trade.entry_price) / trade.entry_price)
+    assert trade.mae_pct == pytest.approx((stop - trade.entry_price) / trade.entry_price)
+
+
+def test_short_trailing_stop_fills_at_gap_open(engine: HistoricalReplayEngine) -> None:
+    falling = [(100 - 0.2 * i, 100 - 0.2 * i, 100 - 0.2 * (i + 1), 100 - 0.2 * (i + 1)) for i in range(5)]
+    _write_bars(engine.bars_cache_dir, "BBB", T0 - timedelta(minutes=5), _flat(5) + falling + [(104.0, 105.0, 103.5, 104.5)])
+
+    (trade,) = engine.replay_signals([_signal("BBB", T0, "bearish")], test_specialist=False)
+
+    assert trade.exit_reason == "trailing_stop"
+    assert trade.exit_price == 104.0  # gapped through 99 * 1.035
+    assert trade.pnl_usd < 0
+    assert trade.mfe_pct == pytest.approx((trade.entry_price - 99.0) / trade.entry_price)
+
+
+def test_signal_only_sees_completed_bars(engine: HistoricalReplayEngine) -> None:
+    # The 15:00 bar is still forming at 15:00:30; its crash low predates the entry.
+    _write_bars(engine.bars_cache_dir, "CCC", T0 - timedelta(minutes=5),
+                _flat(5) + [(100.0, 100.0, 50.0, 100.5)] + [(100.5, 102.5, 100.5, 102.5)])
+
+    (trade,) = engine.replay_signals([_signal("CCC", T0 + timedelta(seconds=30))], test_specialist=False)
+
+    assert trade.entry_price == pytest.approx(100.0 * (1 + 0.5 / 10000))
+    assert trade.exit_reason == "profit_target_2pct"
+    assert trade.mae_pct == pytest.approx(0.0, abs=1e-3)
+
+
+def test_pending_entry_fills_at_next_open_and_stale_exit(engine: HistoricalReplayEngine) -> None:
+    # No bar before the signal: fill at the next bar's open, then go nowhere for 90+ minutes.
+    _write_bars(engine.bars_cache_dir, "DDD", T0 + timedelta(minutes=2), _flat(120, 50.0))
+    signals = [_signal("DDD", T0), _signal("DDD", T0 + timedelta(minutes=30)), _signal("ZZZ", T0)]
+
+    trades = engine.replay_signals(signals, test_specialist=False)
+
+    assert [t.entry_time for t in trades] == [T0 + timedelta(minutes=2), T0 + timedelta(minutes=30)]
+    assert {t.exit_reason for t in trades} == {"stale_exit_90min"}
+    assert trades[0].hold_minutes == 90
+    assert engine.calculate_metrics(trades).stale_exit_trades == 2
+
+
+def test_open_positions_close_at_last_bar(engine: HistoricalReplayEngine) -> None:
+    _write_bars(engine.bars_cache_dir, "EEE", T0 - timedelta(minutes=1), [(10.0, 10.0, 10.0, 10.0), (10.0, 10.1, 10.0, 10.1)])
+
+    (trade,) = engine.replay_signals([_signal("EEE", T0)], test_specialist=False, test_stale_exits=False)
+
+    assert trade.exit_reason == "backtest_end"
+    assert trade.exit_price == 10.1
+    assert trade.exit_time == T0 + timedelta(minutes=1)
@@ -0,0 +1,107 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import indicators as ind
+from src.exit.dynamic_trailing_stops import wilders_atr_last
+from src.signals.raw_signal_engine import _ema
+
+
+def _ohlc(seed: int, n: int = 80):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.003, n))
+    high = close * (1 + rng.uniform(0, 0.004, n))
+    low = close * (1 - rng.uniform(0, 0.004, n))
+    return high, low, close
+
+
+def _legacy_simple_atr(high, low, close):
+    """``compute_atr`` loop prior to vectorization."""
+    tr_list = []
+    for i in range(1, len(close)):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        if not (math.isnan(tr) or math.isinf(tr)):
+            tr_list.append(tr)
+    return (sum(tr_list) / len(tr_list)) if tr_list else 0.0
+
+
+def _legacy_wilder(highs, lows, closes, p):
+    """``wilders_atr_last`` loop prior to vectorization."""
+    trs = [
+        max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+        for i in range(1, len(closes))
+    ]
+    atr = sum(trs[:p]) / float(p)
+    for j in range(p, len(trs)):
+        atr = (atr * float(p - 1) + trs[j]) / float(p)
+    return atr
+
+
+@pytest.mark.parametrize("period", [1, 5, 14])
+def test_wilder_atr_matches_loop_single_and_batched(period: int) -> None:
+    rows = [_ohlc(s) for s in range(6)]
+    for h, l, c in rows:
+        assert wilders_atr_last(h, l, c, period=period) == pytest.approx(_legacy_wilder(h, l, c, period), rel=1e-12)
+    batched = ind.wilder_atr(*(np.stack([r[k] for r in rows]) for k in range(3)), period=period)
+    expected = [_legacy_wilder(h, l, c, period) for h, l, c in rows]
+    np.testing.assert_allclose(batched, expected, rtol=1e-12)
+
+
+def test_wilders_atr_last_validation_unchanged() -> None:
+    h, l, c = _ohlc(1, 20)
+    with pytest.raises(ValueError):
+        wilders_atr_last(h[:14], l[:14], c[:14], period=14)
+    h[7] = float("nan")
+    with pytest.raises(ValueError):
+        wilders_atr_last(h, l, c, period=14)
+    h[7] = 101.0
+    h[0] = float("nan")  # first high is never used by a true range
+    assert math.isfinite(wilders_atr_last(h, l, c, period=14))
+
+
+def test_simple_atr_matches_compute_atr_loop_including_bad_prints() -> None:
+    h, l, c = _ohlc(2, 40)
+    h[5], l[9], c[20], h[30] = np.nan, np.nan, np.nan, np.inf
+    assert ind.simple_atr(h, l, c) == pytest.approx(_legacy_simple_atr(h, l, c), rel=1e-12)
+    assert ind.simple_atr([1.0, np.nan], [0.5, 0.5], [1.0, 1.0]) == 0.0
+
+
+def test_compute_atr_uses_vectorized_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    import main
+
+    h, l, c = _ohlc(3, 31)
+    idx = pd.date_range(end=pd.Timestamp.now(tz="UTC"), periods=31, freq="1min")
+    df = pd.DataFrame({"high": h, "low": l, "close": c}, index=idx)
+    monkeypatch.setattr(main, "fetch_bars_safe", lambda api, sym, tf, limit=None: SimpleNamespace(df=df))
+    main._atr_cache.clear()
+    assert main.compute_atr(None, "PARITY", 30) == pytest.approx(_legacy_simple_atr(h, l, c), rel=1e-12)
+
+
+def test_ema_and_extremes() -> None:
+    _, _, c = _ohlc(4, 30)
+    assert ind.ema_last(c[-26:], 26) == pytest.approx(_ema(list(c), 26), rel=1e-12)
+    h = np.array([[1.0, 5.0, 2.0, 3.0], [4.0, 1.0, np.nan, 2.0]])
+    np.testing.assert_array_equal(ind.highest_since(h, [2, 1]), [3.0, 2.0])
+    np.testing.assert_array_equal(ind.lowest_since(h, 0), [1.0, 1.0])
+    assert math.isnan(ind.highest_since([np.nan, np.nan]))
+
+
+def test_streaming_matches_batch() -> None:
+    rows = [_ohlc(s, 50) for s in range(3)]
+    h, l, c = (np.stack([r[k] for r in rows]) for k in range(3))
+    s = ind.StreamingIndicators(3, period=14, ema_span=10)
+    for t in range(50):
+        s.update(h[:, t], l[:, t], c[:, t])
+        if t < 14:
+            assert np.isnan(s.atr).all()
+    np.testing.assert_allclose(s.atr, ind.wilder_atr(h, l, c, 14), rtol=1e-12)
+    np.testing.assert_allclose(s.ema, ind.ema_last(c, 10), rtol=1e-12)
+    np.testing.assert_array_equal(s.highest, h.max(axis=1))
+
+    # A symbol without a new bar keeps its state.
+    before = s.atr.copy()
+    s.update([np.nan, h[1, -1], h[2, -1]], [np.nan, l[1, -1], l[2, -1]], [np.nan, c[1, -1], c[2, -1]])
+    assert s.atr[0] == before[0] and s.atr[1] != before[1]
@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.jsonl_cursor import JsonlCursor, open_jsonl_cursor
+
+
+def _append(path: Path, *rows) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r) + "\n")
+
+
+def _drain(state, path: Path, stream: str = "s"):
+    with open_jsonl_cursor(state, stream, path) as cur:
+        rows = [json.loads(line) for line in cur]
+    return rows, cur
+
+
+def test_resumes_from_offset_and_skips_partial_line(tmp_path: Path) -> None:
+    log = tmp_path / "gate.jsonl"
+    _append(log, {"i": 0}, {"i": 1})
+    state = {}
+
+    rows, cur = _drain(state, log)
+    assert [r["i"] for r in rows] == [0, 1] and not cur.resumed
+
+    _append(log, {"i": 2})
+    with log.open("a") as f:
+        f.write('{"i": 3')  # writer mid-line
+    rows, cur = _drain(state, log)
+    assert cur.resumed and [r["i"] for r in rows] == [2]
+
+    with log.open("a") as f:
+        f.write("}\n")
+    rows, _ = _drain(state, log)
+    assert [r["i"] for r in rows] == [3]
+    assert _drain(state, log)[0] == []
+
+
+def test_follows_rotation_through_backups(tmp_path: Path) -> None:
+    from main import _rotate_jsonl_file
+
+    log = tmp_path / "orders.jsonl"
+    state = {}
+    _append(log, *({"i": i} for i in range(3)))
+    _drain(state, log)
+
+    n = 3
+    for _ in range(2):  # two rotations between learning runs
+        _append(log, {"i": n}, {"i": n + 1})
+        n += 2
+        _rotate_jsonl_file(str(log), 1, 5)
+    _append(log, {"i": n})
+
+    rows, cur = _drain(state, log)
+    assert cur.resumed
+    assert [r["i"] for r in rows] == list(range(3, n + 1))
+
+
+def test_rewritten_tail_falls_back_to_full_scan(tmp_path: Path) -> None:
+    log = tmp_path / "exit.jsonl"
+    _append(log, {"i": 0}, {"i": 1})
+    state = {}
+    _drain(state, log)
+
+    log.write_text(json.dumps({"i": 9}) + "\n" + json.dumps({"i": 8}) + "\n")  # same size, new content
+    rows, cur = _drain(state, log)
+    assert not cur.resumed and [r["i"] for r in rows] == [9, 8]
+
+
+def test_checkpoint_not_saved_when_consumer_fails(tmp_path: Path) -> None:
+    log = tmp_path / "a.jsonl"
+    _append(log, {"i": 0})
+    state = {}
+    with pytest.raises(RuntimeError):
+        with open_jsonl_cursor(state, "s", log) as cur:
+            for _ in cur:
+                raise RuntimeError("boom")
+    assert "log_cursors" not in state
+
+
+def test_orchestrator_reads_only_new_records(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import comprehensive_learning_orchestrator_v2 as clo
+
+    monkeypatch.setattr(clo, "LOG_DIR", tmp_path)
+    log = tmp_path / "orders.jsonl"
+    _append(log, *({"type": "order", "symbol": f"S{i}", "ts": i} for i in range(3)))
+    state = {}
+
+    assert clo.process_order_log(state) == 3
+
+    reads = []
+    real_iter = JsonlCursor.__iter__
+
+    def counting_iter(self):
+        for line in real_iter(self):
+            reads.append(line)
+            yield line
+
+    monkeypatch.setattr(JsonlCursor, "__iter__", counting_iter)
+    _append(log, {"type": "order", "symbol": "NEW", "ts": 99})
+    assert clo.process_order_log(state) == 1
+    assert len(reads) == 1
+    assert state["total_orders_processed"] == 4
@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.jsonl_cursor import JsonlCursor
+from src.infrastructure.jsonl_time_index import JsonlTimeIndex, get_jsonl_time_index, iter_jsonl_window
+
+T0 = 1_790_000_000.0
+
+
+def _append(path: Path, *rows) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r) + "\n")
+
+
+def _rows(n: int, start: int = 0) -> list:
+    return [{"ts": T0 + 60 * i, "i": i, "pad": "x" * 200} for i in range(start, start + n)]
+
+
+def test_window_reads_skip_older_blocks_and_stay_exact(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("JSONL_TIME_INDEX_BLOCK_BYTES", "4096")
+    log = tmp_path / "attribution.jsonl"
+    _append(log, *_rows(2000))
+    idx = get_jsonl_time_index(log)
+    size = idx.refresh()
+    assert len(idx) > 50
+
+    since, until = T0 + 60 * 1500, T0 + 60 * 1600
+    start = idx.offset_for(since)
+    assert size // 2 < start < size  # seeked past the older records
+    end = idx.end_offset_for(until)
+    assert end is not None and end < size
+
+    got = [json.loads(l)["i"] for l in iter_jsonl_window(log, since, until)]
+    assert [i for i in got if since <= T0 + 60 * i <= until] == list(range(1500, 1601))
+    assert len(got) < 200  # only the window plus a block of slack on each side
+    assert idx.offset_for(T0 - 1) == 0 and idx.end_offset_for(T0 + 60 * 5000) is None
+
+
+def test_index_extends_on_append_and_rebuilds_on_rewrite(tmp_path: Path) -> None:
+    log = tmp_path / "exit_attribution.jsonl"
+    _append(log, *_rows(500))
+    idx = JsonlTimeIndex(log, block_bytes=4096)
+    idx.refresh()
+    n = len(idx)
+    _append(log, *_rows(500, start=500))
+    idx.refresh()
+    assert len(idx) > n and idx.rebuilds == 0
+    assert idx.offset_for(T0 + 60 * 900) > idx.offset_for(T0 + 60 * 400)
+
+    log.write_text(json.dumps({"ts": T0, "i": 0}) + "\n")
+    idx.refresh()
+    assert idx.rebuilds == 1 and idx.offset_for(T0 + 60 * 900) == 0
+
+
+def test_checkpoint_at_seeds_a_resumable_cursor(tmp_path: Path) -> None:
+    log = tmp_path / "a.jsonl"
+    _append(log, *_rows(300))
+    idx = JsonlTimeIndex(log, block_bytes=4096)
+    cp = idx.checkpoint_at(idx.offset_for(T0 + 60 * 250))
+    cur = JsonlCursor(log, cp)
+    got = [json.loads(l)["i"] for l in cur]
+    assert cur.resumed and got[-1] == 299 and 200 < got[0] <= 250
+
+
+def test_kill_switch_scans_whole_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("JSONL_TIME_INDEX", "0")
+    log = tmp_path / "a.jsonl"
+    _append(log, *_rows(100))
+    assert len(list(iter_jsonl_window(log, T0 + 60 * 90))) == 100
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+from src.infrastructure.jsonl_writer import JsonlWriter, StreamPolicy
+
+
+def _rows(path: Path):
+    return [json.loads(x) for x in path.read_text().splitlines()]
+
+
+def test_async_stream_is_ordered_and_flushed(tmp_path: Path) -> None:
+    w = JsonlWriter(flush_interval=5.0)
+    path = str(tmp_path / "logs" / "gate.jsonl")
+    for i in range(1000):
+        w.write_line(path, json.dumps({"i": i}))
+
+    assert w.flush(timeout=5.0)
+    assert [r["i"] for r in _rows(Path(path))] == list(range(1000))
+    w.close()
+
+
+def test_durable_stream_written_before_return(tmp_path: Path) -> None:
+    orders = str(tmp_path / "orders.jsonl")
+    w = JsonlWriter(lambda p: StreamPolicy(mode="durable" if p.endswith("orders.jsonl") else "async"),
+                    flush_interval=60.0)
+    w.write_line(orders, '{"type": "order"}')
+
+    assert _rows(Path(orders)) == [{"type": "order"}]
+    w.close()
+
+
+def test_drop_policy_counts_overflow(tmp_path: Path) -> None:
+    w = JsonlWriter(lambda p: StreamPolicy(overflow="drop"), queue_max=5, flush_interval=60.0)
+    path = str(tmp_path / "noisy.jsonl")
+    stream = w._stream(path)
+    with stream.lock:  # stall the flusher on this stream
+        for i in range(50):
+            w.write_line(path, json.dumps({"i": i}))
+        dropped = w.dropped.get(path, 0)
+    w.close()
+
+    assert dropped > 0
+    assert len(_rows(Path(path))) == 50 - dropped
+
+
+def test_rotation_and_external_rename_reopen(tmp_path: Path, monkeypatch) -> None:
+    import src.infrastructure.jsonl_writer as jw
+
+    monkeypatch.setattr(jw, "REOPEN_CHECK_SEC", 0.0)
+    rotated = []
+
+    def rotate(p):
+        rotated.append(p)
+        Path(p).rename(f"{p}.{len(rotated)}")
+
+    run = str(tmp_path / "run.jsonl")
+    w = JsonlWriter(lambda p: StreamPolicy(mode="sync", rotate_max_bytes=200, rotate=rotate))
+    for i in range(20):
+        w.write_line(run, json.dumps({"i": i, "pad": "x" * 20}))
+    assert len(rotated) >= 2
+    parts = [Path(f"{run}.{n}") for n in range(1, len(rotated) + 1)] + [Path(run)]
+    assert [r["i"] for part in parts for r in _rows(part)] == list(range(20))
+    assert all(part.stat().st_size <= 200 + 60 for part in parts)
+
+    Path(run).rename(tmp_path / "moved.jsonl")  # logrotate-style move from outside
+    w.write_line(run, '{"after": true}')
+    assert _rows(Path(run)) == [{"after": True}]
+    w.close()
+
+
+def test_writes_after_close_fall_back_inline(tmp_path: Path) -> None:
+    w = JsonlWriter()
+    path = str(tmp_path / "late.jsonl")
+    w.close()
+    w.write_line(path, '{"late": 1}')
+    assert _rows(Path(path)) == [{"late": 1}]
+
+
+def test_main_log_readers_flush_async_queue_first(tmp_path: Path, monkeypatch) -> None:
+    import main
+
+    w = JsonlWriter(flush_interval=60.0)
+    monkeypatch.setattr(main, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "_JSONL_WRITER", w)
+    main.jsonl_write("regime", {"regime": "RISK_ON"})
+
+    assert [r["regime"] for r in main._read_jsonl(str(tmp_path / "regime.jsonl"))] == ["RISK_ON"]
+    w.close()
@@ -0,0 +1,60 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from src.market_intelligence import ofi_tracker
+from src.market_intelligence.ofi_tracker import CompactOFITracker, OFITracker, make_ofi_tracker
+
+
+def _feed(trackers, times, seed=3):
+    rng = np.random.default_rng(seed)
+    bid = 50.0
+    for t in times:
+        bid = round(bid + rng.choice([-0.01, 0.0, 0.01]), 2)
+        q = (bid, float(rng.integers(1, 20) * 100), round(bid + 0.01, 2), float(rng.integers(1, 20) * 100))
+        outs = [tr.on_quote("abc", *q, mono_t=t) for tr in trackers]
+        assert len(set(outs)) == 1
+
+
+def test_rolling_sums_match_tick_deque_tracker() -> None:
+    legacy, compact = OFITracker(), CompactOFITracker()
+    now_sec = math.floor(time.monotonic())
+    # Ticks on whole seconds, several per second, spanning more than the 300s window.
+    times = [float(now_sec - 400 + k // 3) for k in range(3 * 401)]
+    _feed([legacy, compact], times)
+
+    assert compact.rolling_sums("ABC") == pytest.approx(legacy.rolling_sums("ABC"))
+    snap = compact.snapshot("ABC")
+    assert set(legacy.snapshot("ABC")) <= set(snap)
+    assert snap["ofi_l1_roll_10s_sum"] == pytest.approx(compact.window_sums("ABC")[10])
+    legacy_sums, compact_sums = legacy.window_sums("abc", now=now_sec), compact.window_sums("ABC", now=now_sec)
+    assert list(legacy_sums) == list(compact_sums)
+    assert list(legacy_sums.values()) == pytest.approx(list(compact_sums.values()))
+
+
+def test_window_sums_with_gaps_late_ticks_and_unknown_symbol() -> None:
+    tr = CompactOFITracker()
+    tr.on_quote("X", 10.0, 100, 10.01, 100, mono_t=1000.2)  # warm-up, increment 0
+    tr.on_quote("X", 10.01, 300, 10.02, 100, mono_t=1000.7)  # bid up +300, ask up -100
+    tr.on_quote("X", 10.01, 200, 10.02, 100, mono_t=1250.5)  # -100, after a long gap
+    tr.on_quote("X", 10.01, 250, 10.02, 100, mono_t=1249.0)  # late: booked in second 1250, +50
+
+    assert tr.window_sums("X", now=1255.0) == {10: -50.0, 60: -50.0, 300: 150.0}
+    assert tr.window_sums("X", now=1301.0)[300] == pytest.approx(-50.0)
+    assert tr.window_sums("X", now=2000.0) == {10: 0.0, 60: 0.0, 300: 0.0}
+    assert tr.window_sums("NOPE") == {10: 0.0, 60: 0.0, 300: 0.0}
+    assert tr.on_quote("X", 10.05, 1, 10.0, 1) == 0.0  # crossed book ignored
+
+
+def test_memory_is_fixed_per_symbol() -> None:
+    tr = CompactOFITracker()
+    _feed([tr], [1000.0 + k * 0.01 for k in range(20_000)])
+    assert tr._sym["ABC"].cum.nbytes == 301 * 8
+
+
+def test_factory_kill_switch(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert isinstance(make_ofi_tracker(), CompactOFITracker)
+    monkeypatch.setenv("OFI_TRACKER_COMPACT", "0")
+    assert type(make_ofi_tracker()) is ofi_tracker.OFITracker
@@ -0,0 +1,85 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.exit import parallel_exit_executor as pex
+
+
+def test_run_per_symbol_overlaps_closes_and_keeps_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("EXIT_PARALLEL", raising=False)
+    monkeypatch.setenv("EXIT_PARALLEL_WORKERS", "8")
+    calls = []
+
+    def close(sym: str) -> str:
+        calls.append(sym)
+        time.sleep(0.2)
+        if sym == "BAD":
+            raise RuntimeError("broker said no")
+        return sym.lower()
+
+    t0 = time.perf_counter()
+    out = pex.run_per_symbol(["AAA", "BBB", "BAD", "AAA", "CCC", "DDD"], close)
+    assert time.perf_counter() - t0 < 0.6  # ~one close, not five
+    assert list(out) == ["AAA", "BBB", "BAD", "CCC", "DDD"]
+    assert sorted(calls) == ["AAA", "BAD", "BBB", "CCC", "DDD"]  # duplicates collapsed
+    assert out["AAA"] == "aaa" and isinstance(out["BAD"], RuntimeError)
+
+
+def test_kill_switch_runs_sequentially_in_caller(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("EXIT_PARALLEL", "0")
+    assert pex.exit_parallel_workers() == 1
+    out = pex.run_per_symbol(["X", "Y"], lambda s: threading.current_thread().name)
+    assert set(out.values()) == {threading.current_thread().name}
+
+
+def test_close_position_confirmed_keeps_retry_sequence(monkeypatch: pytest.MonkeyPatch) -> None:
+    import main
+
+    events = []
+    monkeypatch.setattr(main, "log_event", lambda kind, msg, **kw: events.append(msg))
+    monkeypatch.setattr(time, "sleep", lambda s: events.append(f"sleep{s:g}"))
+    ex = main.AlpacaExecutor.__new__(main.AlpacaExecutor)
+    attempts = iter([RuntimeError("timeout"), SimpleNamespace(id="ord-2")])
+
+    def close_once(sym):
+        r = next(attempts)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    ex.close_position_api_once = close_once
+    ex.check_order_filled = lambda oid, max_wait_sec=2.0: (True, 10, 101.5)
+    ex._confirm_position_flat = lambda sym, oid=None, context="exit": True
+
+    assert ex._close_position_confirmed("ABC") == (True, 2, "ord-2", 10, 101.5)
+    assert events == ["close_position_failed", "close_position_retry", "sleep2", "close_position_api_called"]
+
+
+def test_eod_flatten_closes_positions_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    import main
+
+    monkeypatch.setenv("EOD_FLATTEN_ET_ENABLED", "1")
+    monkeypatch.delenv("EXIT_PARALLEL", raising=False)
+    monkeypatch.setattr(main, "is_eod_flatten_window_et", lambda: True)
+    monkeypatch.setattr(main, "is_market_open_now", lambda: True)
+    events = []
+    monkeypatch.setattr(main, "log_event", lambda kind, msg, **kw: events.append((msg, kw.get("symbol"))))
+    closed = []
+
+    def close_with_retries(sym, *, max_attempts, close_reason_tag):
+        time.sleep(0.2)
+        if sym == "FAIL":
+            raise RuntimeError("rejected")
+        closed.append((sym, max_attempts, close_reason_tag))
+
+    positions = [SimpleNamespace(symbol=s, qty=q) for s, q in [("AAA", 5), ("BBB", -3), ("ZERO", 0), ("FAIL", 1), ("CCC", 2)]]
+    ex = SimpleNamespace(api=SimpleNamespace(list_positions=lambda: positions), close_position_with_retries=close_with_retries)
+
+    t0 = time.perf_counter()
+    main.maybe_run_eod_flatten_book(SimpleNamespace(executor=ex))
+    assert time.perf_counter() - t0 < 0.6
+    assert sorted(closed) == [(s, 3, "eod_flatten_et") for s in ("AAA", "BBB", "CCC")]
+    assert ("close_failed", "FAIL") in events
+    assert [sym for msg, sym in events if msg == "closing_position"] == ["AAA", "BBB", "FAIL", "CCC"]
@@ -0,0 +1,82 @@
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+import signal_history_storage as shs
+
+
+@pytest.fixture
+def history(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "state" / "signal_history.jsonl"
+    monkeypatch.setattr(shs, "SIGNAL_HISTORY_FILE", path)
+    monkeypatch.setattr(shs, "_head_state", {"path": None, "ino": None, "size": None, "lines": 0})
+    return path
+
+
+def test_ring_keeps_newest_first_across_segments(history: Path) -> None:
+    for i in range(130):
+        shs.append_signal_history({"symbol": f"S{i}", "i": i})
+
+    out = shs.get_signal_history(limit=50)
+    assert [s["i"] for s in out] == list(range(129, 79, -1))
+    assert [s["i"] for s in shs.get_signal_history(limit=3)] == [129, 128, 127]
+    assert len(shs.get_signal_history(limit=500)) == shs.MAX_SIGNALS
+    # Two bounded segments, both plain JSONL.
+    assert len(history.read_text().splitlines()) == 30
+    assert len(history.with_name(history.name + ".1").read_text().splitlines()) == shs.MAX_SIGNALS
+    assert shs.get_last_signal_timestamp() == out[0]["timestamp"]
+
+
+def test_append_does_not_read_history(history: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    shs.append_signal_history({"symbol": "A"})
+    opened = []
+    real_open = Path.open
+
+    def spy(self, mode="r", *a, **kw):
+        opened.append(mode)
+        return real_open(self, mode, *a, **kw)
+
+    monkeypatch.setattr(Path, "open", spy)
+    for _ in range(10):
+        shs.append_signal_history({"symbol": "A"})
+    assert opened == ["a"] * 10
+
+
+def test_head_recounted_after_external_replace(history: Path) -> None:
+    for i in range(10):
+        shs.append_signal_history({"i": i})
+    history.write_text("".join(json.dumps({"i": 100 + i}) + "\n" for i in range(shs.MAX_SIGNALS)))
+
+    shs.append_signal_history({"i": 999})
+
+    assert len(history.read_text().splitlines()) == 1
+    assert [s["i"] for s in shs.get_signal_history(limit=2)] == [999, 100 + shs.MAX_SIGNALS - 1]
+
+
+def test_malformed_lines_are_counted(history: Path) -> None:
+    shs.append_signal_history({"i": 1})
+    with history.open("a") as f:
+        f.write("{not json\n")
+    shs.append_signal_history({"i": 2})
+
+    signals, malformed, last_ts = shs.get_signal_history_with_meta(limit=10)
+    assert [s["i"] for s in signals] == [2, 1]
+    assert malformed == 1 and last_ts
+
+
+def test_persistence_tracker_warm_start(history: Path) -> None:
+    import persistence_tracker
+
+    now = time.time()
+    for age in (3600, 600, 300, 120, 60, 30):
+        ts = datetime.fromtimestamp(now - age, tz=timezone.utc).isoformat()
+        shs.append_signal_history({"symbol": "NVDA", "timestamp": ts})
+
+    tracker = persistence_tracker.PersistenceTracker()
+    window = list(tracker.appearance_windows["NVDA"])
+    assert len(window) == 5 and window == sorted(window)
+    assert tracker.check_persistence("NVDA", now)["active"] is True
+    assert tracker.get_appearance_count("NVDA", now + 601) == 3
@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.alpaca import trade_updates
+from src.alpaca.trade_updates import OrderStateBook, TradeUpdatesStream, trading_stream_url
+
+
+def _update(event, oid, sym="AAPL", status=None, qty=0, price=None, position_qty=None):
+    data = {
+        "event": event,
+        "order": {"id": oid, "symbol": sym, "status": status or event, "filled_qty": str(qty), "filled_avg_price": price},
+    }
+    if position_qty is not None:
+        data["position_qty"] = str(position_qty)
+    return data
+
+
+def test_fill_and_flat_futures_resolve_from_stream_thread() -> None:
+    book = OrderStateBook()
+    fill = book.fill_future("o1")
+    flat = book.flat_future("AAPL", order_id="o1")
+
+    def _broker():
+        time.sleep(0.05)
+        book.on_trade_update(_update("new", "o1", status="new"))
+        book.on_trade_update(_update("partial_fill", "o1", status="partially_filled", qty=5, price="10.5", position_qty=5))
+        book.on_trade_update(_update("fill", "o1", status="filled", qty=10, price="10.4", position_qty=0))
+
+    threading.Thread(target=_broker).start()
+    assert fill.result(timeout=2) == (True, 5, 10.5)  # same contract as check_order_filled
+    assert flat.result(timeout=2) is True
+    assert book.position_qty("aapl") == 0
+    # Already-filled order confirms immediately.
+    assert book.wait_flat("AAPL", 0.0, order_id="o1") is True
+    assert book.wait_fill("o1", 0.0) == (True, 10, 10.4)
+
+
+def test_rejections_and_timeouts() -> None:
+    book = OrderStateBook()
+    book.on_trade_update(_update("rejected", "o2"))
+    assert book.wait_fill("o2", 1.0) == (False, 0, 0.0)
+    assert book.wait_fill("o3", 0.01) is None
+    assert book.wait_flat("MSFT", 0.01) is False
+    assert not book._fill_waiters and not book._flat_waiters
+    book.on_trade_update(_update("fill", "o4", sym="MSFT", status="filled", qty=1, price="5", position_qty=3))
+    assert book.wait_flat("MSFT", 0.01, order_id="o4") is False
+
+
+def test_stream_dispatch_and_url() -> None:
+    if trade_updates.websockets is None:
+        pytest.skip("websockets not installed")
+    s = TradeUpdatesStream("k", "s", "https://paper-api.alpaca.markets/v2")
+    assert s.url == "wss://paper-api.alpaca.markets/stream"
+    s.dispatch(json.dumps({"stream": "trade_updates", "data": _update("fill", "o9", status="filled", qty=2, price="3")}).encode())
+    assert s.book.order("o9").filled_qty == 2
+    assert trading_stream_url("https://api.alpaca.markets") == "wss://api.alpaca.markets/stream"
+
+
+@pytest.fixture
+def main_tmp_logs(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """``main`` with log_event output redirected to ``tmp_path`` (never the repo's logs/)."""
+    import main
+
+    monkeypatch.setattr(main, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "_jsonl_writer", lambda: None)
+    monkeypatch.setattr(main, "log_system_event", lambda *a, **k: None)
+    return main
+
+
+def test_check_order_filled_uses_book_then_single_rest_check(monkeypatch: pytest.MonkeyPatch, main_tmp_logs, tmp_path) -> None:
+    main = main_tmp_logs
+
+    book = OrderStateBook()
+    book.on_trade_update(_update("fill", "o1", status="filled", qty=3, price="7.25", position_qty=0))
+    monkeypatch.setattr(trade_updates, "get_live_order_book", lambda: book)
+
+    calls = []
+
+    class _API:
+        def get_order(self, oid):
+            calls.append(oid)
+            return SimpleNamespace(status="new", filled_qty=0, filled_avg_price=0)
+
+    ex = main.AlpacaExecutor.__new__(main.AlpacaExecutor)
+    ex.api = _API()
+    assert ex.check_order_filled("o1", max_wait_sec=5.0) == (True, 3, 7.25)
+    assert calls == []
+
+    t0 = time.time()
+    assert ex.check_order_filled("o-missing", max_wait_sec=0.1) == (False, 0, 0.0)
+    assert calls == ["o-missing"] and time.time() - t0 < 1.0
+    assert ex._confirm_position_flat("AAPL", "o1") is True
+    assert (tmp_path / "exit.jsonl").exists()
+
+
+def test_close_verification_plan_and_stream_fill_fields(monkeypatch: pytest.MonkeyPatch, main_tmp_logs) -> None:
+    main = main_tmp_logs
+    monkeypatch.setenv("ORDER_STATE_FLAT_TIMEOUT_SEC", "0.01")
+    book = OrderStateBook()
+    book.on_trade_update(_update("fill", "c1", status="filled", qty=4, price="12.5", position_qty=0))
+    monkeypatch.setattr(trade_updates, "get_live_order_book", lambda: book)
+    ex = main.AlpacaExecutor.__new__(main.AlpacaExecutor)
+
+    assert ex._confirm_close_or_plan_rest("AAPL", "c1") == (True, 0)
+    assert ex._stream_fill_fields("c1") == (4, 12.5)
+    # Stream up but no flat confirmation: a single REST check, no 2s settle sleep.
+    t0 = time.time()
+    assert ex._confirm_close_or_plan_rest("MSFT", "c2") == (False, 1)
+    assert time.time() - t0 < 1.0
+    assert ex._stream_fill_fields("c2") == (0, 0.0)
+
+    monkeypatch.setattr(trade_updates, "get_live_order_book", lambda: None)
+    monkeypatch.setattr(main.time, "sleep", lambda _s: None)
+    assert ex._confirm_close_or_plan_rest("AAPL", "c1") == (False, 5)
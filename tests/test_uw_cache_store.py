@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.uw.uw_cache_store import UWCacheShardStore
+
+
+def test_write_ticker_touches_only_its_shard(tmp_path: Path) -> None:
+    store = UWCacheShardStore(tmp_path)
+    store.write_ticker("AAPL", {"sentiment": "BULLISH", "_last_update": 1})
+    store.write_ticker("MSFT", {"sentiment": "BEARISH", "_last_update": 1})
+    before = (tmp_path / "tickers" / "MSFT.json").stat().st_mtime_ns
+
+    store.merge_ticker("AAPL", {"conviction": 0.7})
+
+    assert (tmp_path / "tickers" / "MSFT.json").stat().st_mtime_ns == before
+    row = json.loads((tmp_path / "tickers" / "AAPL.json").read_text())
+    assert row == {"sentiment": "BULLISH", "_last_update": 1, "conviction": 0.7, "_shard_gen": 3}
+    assert store.read_ticker("AAPL") == {"sentiment": "BULLISH", "_last_update": 1, "conviction": 0.7}
+    assert store.generation() == 3
+    # The manifest stays constant-size: no per-ticker entries rewritten on each write.
+    assert "tickers" not in json.loads((tmp_path / "manifest.json").read_text())
+
+
+def test_load_all_matches_monolith_layout_and_materializes_tide(tmp_path: Path) -> None:
+    store = UWCacheShardStore(tmp_path)
+    store.write_ticker("AAPL", {"sentiment": "BULLISH"})
+    store.write_ticker("SPY", {"sentiment": "NEUTRAL"})
+    store.write_global("_market_tide", {"data": {"net_premium": 5}, "last_update": 10})
+
+    cache = store.load_all()
+
+    assert set(k for k in cache if not k.startswith("_")) == {"AAPL", "SPY"}
+    assert cache["AAPL"]["market_tide"] == {"net_premium": 5}
+    assert cache["_market_tide"]["last_update"] == 10
+    assert cache["_metadata"]["ticker_count"] == 2
+    assert cache["_metadata"]["generation"] == store.generation()
+    # Tide is stored once, not copied into shards.
+    assert "market_tide" not in json.loads((tmp_path / "tickers" / "AAPL.json").read_text())
+
+
+def test_load_changed_returns_only_newer_tickers(tmp_path: Path) -> None:
+    store = UWCacheShardStore(tmp_path)
+    store.write_ticker("AAPL", {"v": 1})
+    store.write_ticker("MSFT", {"v": 1})
+    gen = store.generation()
+    store.write_ticker("MSFT", {"v": 2})
+
+    new_gen, changed = store.load_changed(gen)
+
+    assert new_gen == gen + 1
+    assert [k for k in changed if not k.startswith("_")] == ["MSFT"]
+    assert changed["MSFT"]["v"] == 2
+    assert changed["_metadata"]["changed_only"] is True
+    assert changed["_metadata"]["global_changed"] is False
+
+    store.write_global("_top_net_impact", {"data": []})
+    _, changed = store.load_changed(new_gen)
+    assert changed["_metadata"]["global_changed"] is True
+
+
+def test_load_changed_reads_schema1_manifest_generations(tmp_path: Path) -> None:
+    (tmp_path / "tickers").mkdir()
+    (tmp_path / "tickers" / "AAPL.json").write_text('{"v": 1}')
+    (tmp_path / "tickers" / "MSFT.json").write_text('{"v": 1}')
+    (tmp_path / "manifest.json").write_text(json.dumps({
+        "schema": 1, "generation": 5, "tickers": {"AAPL": {"gen": 2}, "MSFT": {"gen": 5}},
+    }))
+    store = UWCacheShardStore(tmp_path)
+
+    assert [k for k in store.load_changed(3)[1] if not k.startswith("_")] == ["MSFT"]
+    store.write_ticker("AAPL", {"v": 2})
+    _, changed = store.load_changed(5)
+    assert [k for k in changed if not k.startswith("_")] == ["AAPL"]
+    assert changed["AAPL"] == {"v": 2}
+
+
+def test_import_monolith_drops_per_ticker_tide_and_exports_back(tmp_path: Path) -> None:
+    store = UWCacheShardStore(tmp_path / "shards")
+    mono = {
+        "AAPL": {"sentiment": "BULLISH", "market_tide": {"x": 1}},
+        "_market_tide": {"data": {"x": 1}},
+        "_metadata": {"ticker_count": 1},
+    }
+    assert store.import_monolith(mono) == 1
+    assert store.read_ticker("AAPL") == {"sentiment": "BULLISH"}
+
+    out = tmp_path / "uw_flow_cache.json"
+    assert store.export_monolith(out) == 1
+    exported = json.loads(out.read_text())
+    assert exported["AAPL"]["market_tide"] == {"x": 1}
+    assert exported["_metadata"]["source"] == "uw_cache_shards"
+
+
+def test_write_ticker_rejects_global_keys(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        UWCacheShardStore(tmp_path).write_ticker("_metadata", {})
+
+
+def test_read_uw_cache_uses_shards_when_enabled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import main
+
+    monkeypatch.setenv("UW_CACHE_SHARDED", "1")
+    monkeypatch.setenv("UW_CACHE_SHARD_DIR", str(tmp_path))
+    store = UWCacheShardStore(tmp_path)
+    store.write_ticker("NVDA", {"sentiment": "BULLISH"})
+    gen = store.generation()
+    store.write_ticker("AMD", {"sentiment": "BEARISH"})
+
+    full = main.read_uw_cache()
+    assert {"NVDA", "AMD"} <= set(full)
+
+    delta = main.read_uw_cache(since_generation=gen)
+    assert "AMD" in delta and "NVDA" not in delta
@@ -0,0 +1,152 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from src.uw.uw_cache_store import UWCacheShardStore
+from src.uw.uw_cache_view import UWCacheView
+
+
+def _write_monolith(path: Path, cache: dict, mtime: float) -> None:
+    path.write_text(json.dumps(cache))
+    os.utime(path, (mtime, mtime))
+
+
+def _loader_for(path: Path):
+    calls = []
+
+    def load(since_generation=None):
+        calls.append(since_generation)
+        return json.loads(path.read_text())
+
+    return load, calls
+
+
+def test_monolith_unchanged_file_is_not_reparsed(tmp_path: Path) -> None:
+    p = tmp_path / "uw_flow_cache.json"
+    now = time.time()
+    _write_monolith(p, {"AAPL": {"_last_update": int(now) - 100, "flow_trades": [{"x": 1}]}}, now)
+    view = UWCacheView(p)
+    load, calls = _loader_for(p)
+
+    first = view.refresh(load)
+    second = view.refresh(load)
+
+    assert first == second and first is not second
+    assert first["AAPL"] is second["AAPL"]
+    assert len(calls) == 1
+    assert view.last_stats["reparsed"] is False
+
+
+def test_refresh_returns_copy_so_caller_edits_do_not_leak(tmp_path: Path) -> None:
+    p = tmp_path / "uw_flow_cache.json"
+    now = time.time()
+    _write_monolith(p, {"AAPL": {"_last_update": int(now) - 100}}, now)
+    view = UWCacheView(p)
+    load, _calls = _loader_for(p)
+
+    cache = view.refresh(load)
+    cache["AAPL"] = {**cache["AAPL"], "iv_term_skew": 0.3}
+    cache["GHOST"] = {"sentiment": "BULLISH"}
+
+    again = view.refresh(load)
+    assert "iv_term_skew" not in again["AAPL"]
+    assert "GHOST" not in again
+
+
+def test_monolith_reuses_normalized_trades_for_unchanged_tickers(tmp_path: Path) -> None:
+    p = tmp_path / "uw_flow_cache.json"
+    now = time.time()
+    old = int(now) - 100
+    cache = {
+        "AAPL": {"_last_update": old, "flow_trades": [{"id": "a"}]},
+        "MSFT": {"_last_update": old, "flow_trades": [{"id": "m"}]},
+    }
+    _write_monolith(p, cache, now)
+    view = UWCacheView(p)
+    load, _ = _loader_for(p)
+    normalized = []
+
+    def norm(t):
+        normalized.append(t["id"])
+        return {"id": t["id"].upper()}
+
+    view.refresh(load)
+    view.normalized_flow_trades("AAPL", norm)
+    view.normalized_flow_trades("MSFT", norm)
+
+    cache["MSFT"] = {"_last_update": old + 50, "flow_trades": [{"id": "m2"}]}
+    _write_monolith(p, cache, now + 5)
+    view.refresh(load)
+
+    assert view.changed == {"MSFT"}
+    assert view.normalized_flow_trades("AAPL", norm) == ([{"id": "A"}], 0)
+    assert view.normalized_flow_trades("MSFT", norm) == ([{"id": "M2"}], 0)
+    assert normalized == ["a", "m", "m2"]
+
+
+def test_same_second_write_is_not_carried_across_snapshots(tmp_path: Path) -> None:
+    p = tmp_path / "uw_flow_cache.json"
+    now = int(time.time())
+    _write_monolith(p, {"AAPL": {"_last_update": now, "flow_trades": [{"id": "a"}]}}, now + 0.5)
+    view = UWCacheView(p)
+    load, _ = _loader_for(p)
+    view.refresh(load)
+
+    # Daemon writes again within the same second without moving _last_update.
+    _write_monolith(p, {"AAPL": {"_last_update": now, "flow_trades": [{"id": "b"}]}}, now + 0.9)
+    view.refresh(load)
+
+    assert view.changed == {"AAPL"}
+    assert view.normalized_flow_trades("AAPL", lambda t: t) == ([{"id": "b"}], 0)
+
+
+def test_enriched_memo_refreshes_freshness_and_returns_copies(tmp_path: Path) -> None:
+    p = tmp_path / "uw_flow_cache.json"
+    now = time.time()
+    _write_monolith(p, {"AAPL": {"_last_update": int(now) - 3600, "sentiment": "BULLISH"}}, now)
+    view = UWCacheView(p)
+    load, _ = _loader_for(p)
+    view.refresh(load)
+    calls = []
+
+    def enrich(sym, cache, regime):
+        calls.append(regime)
+        return {"symbol": sym, "freshness": -1.0}
+
+    a = view.enriched("AAPL", "mixed", enrich)
+    b = view.enriched("AAPL", "mixed", enrich)
+    assert calls == ["mixed"]
+    assert a is not b
+    assert 0.0 < b["freshness"] <= 1.0
+
+    view.enriched("AAPL", "RISK_OFF", enrich)
+    assert calls == ["mixed", "RISK_OFF"]
+
+
+def test_sharded_refresh_loads_only_changed_tickers(tmp_path: Path) -> None:
+    store = UWCacheShardStore(tmp_path / "shards")
+    store.write_ticker("AAPL", {"v": 1})
+    store.write_ticker("MSFT", {"v": 1})
+    calls = []
+
+    def load(since_generation=None):
+        calls.append(since_generation)
+        if since_generation is None:
+            return store.load_all()
+        return store.load_changed(since_generation)[1]
+
+    view = UWCacheView(tmp_path / "missing.json")
+    cache = view.refresh(load)
+    assert cache["AAPL"]["v"] == 1
+    gen = store.generation()
+
+    store.write_ticker("MSFT", {"v": 2})
+    store.write_global("_market_tide", {"data": {"tide": 1}})
+    cache = view.refresh(load)
+
+    assert calls == [None, gen]
+    assert view.changed == {"MSFT"}
+    assert cache["MSFT"]["v"] == 2
+    assert cache["AAPL"]["market_tide"] == {"tide": 1}
+    assert cache["_metadata"]["ticker_count"] == 2
@@ -0,0 +1,145 @@
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from uw_composite_v2 import compute_composite_score_v2, compute_composite_scores_v2_batch
+from uw_composite_v2_batch import COMPONENT_COLUMNS
+
+
+def _random_row(rng: random.Random, now: int) -> Dict[str, Any]:
+    pick = rng.choice
+    row: Dict[str, Any] = {
+        "sentiment": pick(["BULLISH", "BEARISH", "NEUTRAL", None]),
+        "trade_count": pick([0, 1, 12, 40]),
+        "iv_term_skew": rng.uniform(-0.3, 0.3),
+        "smile_slope": rng.uniform(-0.2, 0.2),
+        "toxicity": rng.uniform(0.0, 1.0),
+        "event_alignment": rng.uniform(0.0, 1.0),
+        "freshness": rng.uniform(0.2, 1.0),
+        "realized_vol_20d": rng.uniform(0.05, 0.9),
+        "beta_vs_spy": rng.uniform(0.2, 2.5),
+        "dark_pool": {
+            "sentiment": pick(["BULLISH", "BEARISH", "NEUTRAL"]),
+            "total_notional_1h": pick([0.0, 2e6, 9e6, 6e7]),
+            "total_notional": rng.uniform(0, 2e7),
+        },
+        "insider": pick([
+            {},
+            {"sentiment": pick(["BULLISH", "BEARISH", "NEUTRAL"]), "conviction_modifier": rng.uniform(-0.2, 0.2),
+             "net_buys": rng.randint(0, 15), "net_sells": rng.randint(0, 15), "total_usd": pick([0.0, 5e5, 3e7])},
+        ]),
+    }
+    if rng.random() < 0.8:
+        row["conviction"] = rng.uniform(0.0, 1.0)
+    if rng.random() < 0.5:
+        row["flow_trades"] = [
+            {"has_sweep": True, "premium": pick([50_000, 150_000, 400_000]), "timestamp": now - pick([60, 20_000])}
+            for _ in range(rng.randint(0, 5))
+        ]
+    if rng.random() < 0.4:
+        row["motif_whale"] = {"detected": True, "avg_conviction": rng.uniform(0, 1)}
+    if rng.random() < 0.3:
+        row["motif_staircase"] = {"detected": True, "slope": rng.uniform(0, 0.5), "steps": 3}
+    if rng.random() < 0.3:
+        row["motif_burst"] = {"detected": True, "intensity": rng.uniform(0, 4), "count": 5}
+    if rng.random() < 0.2:
+        row["motif_sweep_block"] = {"detected": True}
+    if rng.random() < 0.6:
+        row["congress"] = {"recent_count": rng.randint(0, 15), "buys": rng.randint(0, 8), "sells": rng.randint(0, 8),
+                           "conviction_boost": rng.uniform(0, 0.3)}
+    if rng.random() < 0.6:
+        row["shorts"] = {"interest_pct": rng.uniform(0, 40), "days_to_cover": rng.uniform(0, 15),
+                         "ftd_count": pick([0, 60_000, 150_000, 3_000_000]), "squeeze_risk": rng.random() < 0.3}
+    if rng.random() < 0.5:
+        row["institutional"] = {"recent_count": rng.randint(0, 40), "top_holder_pct": rng.uniform(0, 12),
+                                "top5_holder_pct": rng.uniform(0, 30)}
+    if rng.random() < 0.6:
+        row["market_tide"] = pick([
+            {"has_data": True, "data": [{"net_call_premium": str(rng.uniform(-5e6, 9e6)),
+                                          "net_put_premium": str(rng.uniform(-9e6, 5e6))} for _ in range(7)]},
+            {"call_premium": rng.uniform(0, 5e6), "put_premium": rng.uniform(0, 5e6)},
+        ])
+    if rng.random() < 0.5:
+        row["calendar"] = {"has_earnings": rng.random() < 0.6, "days_to_earnings": rng.randint(0, 12),
+                           "has_fda": rng.random() < 0.2, "economic_events": [1] * rng.randint(0, 4)}
+    if rng.random() < 0.7:
+        row["greeks"] = pick([
+            {"gamma_exposure": rng.uniform(-9e5, 9e5)},
+            {"call_gamma": rng.uniform(0, 6e5), "put_gamma": rng.uniform(0, 6e5)},
+            {"gamma_squeeze_setup": True},
+        ])
+    if rng.random() < 0.5:
+        row["ftd"] = {"ftd_count": pick([0, 20_000, 70_000, 150_000, 300_000]), "squeeze_pressure": rng.random() < 0.2}
+    if rng.random() < 0.7:
+        row["iv"] = {"iv_rank": rng.uniform(0, 100)}
+    if rng.random() < 0.6:
+        row["oi_change"] = {"net_oi_change": pick([0, 5_000, 15_000, 30_000, 80_000, -25_000]),
+                            "oi_sentiment": pick(["BULLISH", "BEARISH", "NEUTRAL"]), "volume": 20_000}
+    if rng.random() < 0.6:
+        row["etf_flow"] = {"overall_sentiment": pick(["BULLISH", "BEARISH", "NEUTRAL"]), "market_risk_on": rng.random() < 0.5}
+    if rng.random() < 0.6:
+        row["squeeze_score"] = {"signals": rng.randint(0, 3), "high_squeeze_potential": rng.random() < 0.2}
+    return row
+
+
+def _universe(n: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    now = int(time.time())
+    return [_random_row(rng, now) for _ in range(n)]
+
+
+@pytest.mark.parametrize("regime", ["NEUTRAL", "mixed", "RISK_ON", "RISK_OFF"])
+def test_batch_matches_scalar_path(regime: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    rows = _universe(120, seed=len(regime))
+    symbols = [f"S{i:03d}" for i in range(len(rows))]
+
+    frame = compute_composite_scores_v2_batch(symbols, rows, regime, expanded_intel={})
+
+    assert list(frame["symbol"]) == symbols
+    for i, (sym, row) in enumerate(zip(symbols, rows)):
+        scalar = compute_composite_score_v2(sym, row, regime, expanded_intel={})
+        got = frame.iloc[i]
+        assert got["score"] == pytest.approx(scalar["score"], abs=1e-9), sym
+        assert got["base_score"] == pytest.approx(scalar["base_score"], abs=1e-9), sym
+        assert bool(got["uw_toxicity_veto"]) == scalar["uw_toxicity_veto"], sym
+        assert got["composite_pre_clamp"] == pytest.approx(scalar["composite_pre_clamp"], abs=1e-9), sym
+        for name in COMPONENT_COLUMNS:
+            assert got[name] == pytest.approx(scalar["components"][name], abs=1e-9), (sym, name)
+
+
+def test_batch_uses_premarket_intel_like_scalar(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "state").mkdir()
+    (tmp_path / "state" / "premarket_intel.json").write_text(json.dumps({
+        "symbols": {"S000": {"flow_strength": 0.9, "darkpool_bias": -0.5, "earnings_proximity": 1, "sector_alignment": 0.7}},
+    }))
+    rows = _universe(6, seed=7)
+    symbols = [f"S{i:03d}" for i in range(len(rows))]
+    ctx = {"volatility_regime": "high", "spy_overnight_ret": 0.01}
+    posture = {"posture": "long", "regime_confidence": 0.8}
+
+    frame = compute_composite_scores_v2_batch(symbols, rows, "mixed", expanded_intel={}, market_context=ctx, posture_state=posture)
+
+    for i, (sym, row) in enumerate(zip(symbols, rows)):
+        scalar = compute_composite_score_v2(sym, row, "mixed", expanded_intel={}, market_context=ctx, posture_state=posture)
+        assert frame.iloc[i]["score"] == pytest.approx(scalar["score"], abs=1e-9), sym
+        expected_uw = (scalar.get("v2_uw_adjustments") or {}).get("total", 0.0)
+        assert frame.iloc[i]["uw_adj_total"] == pytest.approx(expected_uw, abs=1e-9), sym
+
+
+def test_batch_accepts_symbol_mapping_and_dataframe(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import pandas as pd
+
+    monkeypatch.chdir(tmp_path)
+    rows = _universe(4, seed=3)
+    symbols = ["AAPL", "MSFT", "NVDA", "AMD"]
+    by_map = compute_composite_scores_v2_batch(symbols, dict(zip(symbols, rows)), expanded_intel={})
+    by_frame = compute_composite_scores_v2_batch(symbols, pd.DataFrame(rows), expanded_intel={})
+
+    assert list(by_map["score"]) == list(by_frame["score"])
+    assert compute_composite_scores_v2_batch([], [], expanded_intel={}).empty
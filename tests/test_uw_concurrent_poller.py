@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from src.uw.uw_concurrent_poller import ConcurrentTickerPoller, TokenBucket, prioritize_tickers, uw_quota_bucket
+
+
+class _FakeUW:
+    """Local stand-in for the UW REST API: fixed latency, records every request path."""
+
+    def __init__(self, latency: float = 0.05) -> None:
+        self.paths = []
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                with fake.lock:
+                    fake.paths.append(self.path.split("?", 1)[0])
+                time.sleep(latency)
+                body = json.dumps({"data": [{"ticker": self.path.split("/")[3]}]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def uw_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("UW_MOCK", raising=False)
+    monkeypatch.setenv("UW_RATE_LIMIT_PER_MIN", "100000")
+
+
+def _ticker_poll(base: str, bucket: TokenBucket):
+    from src.uw.uw_client import uw_http_get
+
+    def poll(ticker: str) -> None:
+        for ep in (f"/api/stock/{ticker}/flow-alerts", f"/api/darkpool/{ticker}"):
+            bucket.acquire()
+            status, data, _ = uw_http_get(base + ep, cache_policy={"ttl_seconds": 0})
+            assert status == 200 and data["data"][0]["ticker"] == ticker
+
+    return poll
+
+
+def test_full_sweep_against_fake_server_is_concurrent(uw_env: None) -> None:
+    tickers = [f"T{i:02d}" for i in range(40)]
+    with _FakeUW(latency=0.05) as uw:
+        poller = ConcurrentTickerPoller(_ticker_poll(uw.base, TokenBucket(10_000, 100)), workers=8)
+        stats = poller.sweep(tickers)
+        poller.close()
+
+    assert stats == {"polled": 40, "skipped": 0, "elapsed_sec": stats["elapsed_sec"]}
+    assert len(uw.paths) == 80
+    # Sequential would be >= 40 * 2 * 50ms = 4s.
+    assert stats["elapsed_sec"] < 2.0
+    from src.uw.uw_client import uw_usage_snapshot
+
+    assert uw_usage_snapshot()["calls_today"] == 80
+
+
+def test_sniper_tickers_go_first(uw_env: None) -> None:
+    tiers = {"R1": "radar", "R2": "radar", "S1": "sniper", "S2": "sniper"}
+    assert prioritize_tickers(["X", "R1", "S1", "R2", "S2", "S1"], tiers) == ["S1", "S2", "R1", "R2", "X"]
+
+    with _FakeUW(latency=0.0) as uw:
+        poller = ConcurrentTickerPoller(_ticker_poll(uw.base, TokenBucket(10_000, 100)), workers=1, tier_of=tiers)
+        poller.sweep(["R1", "R2", "S1", "S2"])
+        poller.close()
+
+    assert [p.split("/")[3] for p in uw.paths[::2]] == ["S1", "S2", "R1", "R2"]
+
+
+def test_stop_halts_submission() -> None:
+    seen = []
+    poller = ConcurrentTickerPoller(seen.append, workers=2, stop=lambda: len(seen) >= 3)
+    stats = poller.sweep([f"T{i}" for i in range(20)])
+    poller.close()
+
+    assert stats["polled"] + stats["skipped"] == 20
+    assert len(seen) <= 5 and stats["skipped"] >= 15
+
+
+def test_token_bucket_paces_to_rate() -> None:
+    now = [0.0]
+    bucket = TokenBucket(2.0, 5, clock=lambda: now[0], sleep=lambda s: now.__setitem__(0, now[0] + s))
+
+    for _ in range(25):
+        bucket.acquire()
+
+    # 5 burst tokens, then 20 more at 2/s.
+    assert now[0] == pytest.approx(10.0)
+    assert not bucket.try_acquire()
+    assert bucket.acquire(timeout=0.1) is False
+
+
+def test_quota_bucket_fits_minute_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("UW_RATE_LIMIT_PER_MIN", "120")
+    monkeypatch.setenv("UW_POLL_BURST", "10")
+    b = uw_quota_bucket()
+    assert b.capacity + b.rate * 60 == pytest.approx(120)
@@ -0,0 +1,61 @@
+import json
+import os
+import signal
+from pathlib import Path
+
+import pytest
+
+from src.uw import uw_payload_ring
+from src.uw.uw_payload_ring import PayloadRing, endpoint_key
+
+
+def test_endpoint_key_collapses_tickers() -> None:
+    assert endpoint_key("https://api.unusualwhales.com/api/darkpool/AAPL") == "/api/darkpool/{ticker}"
+    assert endpoint_key("/api/stock/BRK.B/greek-exposure?x=1") == "/api/stock/{ticker}/greek-exposure"
+    assert endpoint_key("https://h/api/option-trades/flow-alerts") == "/api/option-trades/flow-alerts"
+
+
+def test_ring_keeps_last_n_per_endpoint_without_disk_io(tmp_path: Path) -> None:
+    capture = tmp_path / "uw_raw_payloads.jsonl"
+    ring = PayloadRing(3, capture_path=capture)
+    for i in range(10):
+        ring.record(f"https://h/api/darkpool/T{i}", 200, {"data": [i]})
+    ring.record("https://h/api/market/market-tide", 200, {"data": ["tide"]})
+
+    snap = ring.snapshot()
+    assert [e["payload"]["data"][0] for e in snap["/api/darkpool/{ticker}"]] == [7, 8, 9]
+    assert len(snap["/api/market/market-tide"]) == 1
+    assert not capture.exists()
+
+
+def test_sampled_capture_rotates(tmp_path: Path) -> None:
+    capture = tmp_path / "uw_raw_payloads.jsonl"
+    ring = PayloadRing(2, sample_rate=1.0, capture_path=capture, capture_max_bytes=300, rng=lambda: 0.0)
+    for i in range(10):
+        ring.record("https://h/api/darkpool/AAPL", 200, {"data": ["x" * 50, i]})
+
+    assert ring.captured == 10
+    assert capture.with_name(capture.name + ".1").exists()
+    assert json.loads(capture.read_text().splitlines()[-1])["payload"]["data"][1] == 9
+
+
+def test_sigusr1_defers_dump_to_poll_loop(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not hasattr(signal, "SIGUSR1"):
+        pytest.skip("no SIGUSR1")
+    monkeypatch.setattr(uw_payload_ring, "_RING", PayloadRing(2))
+    uw_payload_ring.get_payload_ring().record("https://h/api/darkpool/MSFT", 200, {"data": [1]})
+    out = tmp_path / "snap.json"
+    previous = signal.getsignal(signal.SIGUSR1)
+    try:
+        assert uw_payload_ring.install_dump_signal(out)
+        os.kill(os.getpid(), signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+    # The handler only flags the request; nothing touches the ring lock in signal context.
+    assert not out.exists()
+    assert uw_payload_ring.dump_if_requested() == out
+    assert uw_payload_ring.dump_if_requested() is None
+    data = json.loads(out.read_text())
+    assert data["pid"] == os.getpid()
+    assert data["endpoints"]["/api/darkpool/{ticker}"][0]["payload"] == {"data": [1]}
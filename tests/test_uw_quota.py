@@ -0,0 +1,85 @@
+import json
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from src.uw import uw_client
+from src.uw.uw_quota import UwQuotaStore
+
+
+def test_caps_are_checked_in_legacy_order(tmp_path: Path) -> None:
+    q = UwQuotaStore(tmp_path / "q.sqlite3")
+    t = 1_800_000_000.0
+    assert q.try_acquire("flow", now=t, per_min=2, daily_cap=10, endpoint_cap=5) == (True, "", None)
+    assert q.try_acquire("flow", now=t + 20, per_min=2, daily_cap=10) == (True, "", None)
+    ok, reason, wait_s = q.try_acquire("flow", now=t + 30, per_min=2, daily_cap=10)
+    assert (ok, reason) == (False, "per_minute_cap") and wait_s == pytest.approx(30.0)
+    # Window slides: the first call ages out after 60s.
+    assert q.try_acquire("flow", now=t + 61, per_min=2, daily_cap=10, endpoint_cap=3)[0]
+    assert q.try_acquire("flow", now=t + 200, per_min=2, daily_cap=10, endpoint_cap=3)[1] == "endpoint_cap"
+    q.record("probe", now=t + 201, n=6)
+    assert q.try_acquire("dp", now=t + 300, per_min=2, daily_cap=9)[1] == "daily_cap"
+
+    u = q.usage(now=t + 300)
+    assert u["calls_today"] == 9 and u["by_endpoint"] == {"flow": 3, "probe": 6}
+    assert q.usage(now=t + 86_400)["calls_today"] == 0  # new UTC day
+
+
+def test_new_db_is_seeded_from_legacy_json(tmp_path: Path) -> None:
+    now = time.time()
+    legacy = tmp_path / "uw_usage_state.json"
+    legacy.write_text(json.dumps({
+        "date": time.strftime("%Y-%m-%d", time.gmtime(now)),
+        "calls_today": 40,
+        "by_endpoint": {"flow": 25, "dp": 15},
+        "minute_window": [now - 120, now - 5],
+    }))
+    q = UwQuotaStore(tmp_path / "q.sqlite3", seed_from=legacy)
+    u = q.usage()
+    assert u["calls_today"] == 40 and u["by_endpoint"] == {"flow": 25, "dp": 15}
+    assert u["minute_window"] == [pytest.approx(now - 5)]
+    assert q.try_acquire("flow", per_min=100, daily_cap=41)[0]
+    assert q.try_acquire("flow", per_min=100, daily_cap=41)[1] == "daily_cap"
+
+    # Only on creation: an existing DB is never re-seeded (or double-counted).
+    assert UwQuotaStore(tmp_path / "q.sqlite3", seed_from=legacy).usage()["calls_today"] == 41
+    legacy.write_text(json.dumps({"date": "2000-01-01", "calls_today": 99}))
+    assert UwQuotaStore(tmp_path / "stale.sqlite3", seed_from=legacy).usage()["calls_today"] == 0
+
+
+def _hammer(path: str, n: int) -> int:
+    q = UwQuotaStore(path)
+    return sum(q.try_acquire("x", per_min=100_000, daily_cap=150)[0] for _ in range(n))
+
+
+def test_processes_share_one_count_and_never_overshoot(tmp_path: Path) -> None:
+    path = str(tmp_path / "q.sqlite3")
+    UwQuotaStore(path)
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        granted = pool.starmap(_hammer, [(path, 60)] * 4)
+    assert sum(granted) == 150
+    assert UwQuotaStore(path).usage()["calls_today"] == 150
+
+
+def test_uw_http_get_gates_on_store_and_mirrors_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("UW_QUOTA_SQLITE", raising=False)
+    monkeypatch.delenv("UW_QUOTA_DB", raising=False)
+    monkeypatch.setenv("UW_MOCK", "1")
+    monkeypatch.setenv("UW_MOCK_ENFORCE_LIMITS", "1")
+    monkeypatch.setenv("UW_RATE_LIMIT_PER_MIN", "3")
+    monkeypatch.setenv("UW_DAILY_LIMIT", "100")
+    monkeypatch.setenv("UW_SAFETY_BUFFER", "1.0")
+
+    statuses = [uw_client.uw_http_get("/api/darkpool/AAPL")[0] for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+    assert uw_client.uw_usage_snapshot()["calls_today"] == 3
+    assert uw_client.uw_daily_usage_ratio() == pytest.approx(0.03)
+    assert Path("state/uw_quota.sqlite3").exists()
+    mirror = json.loads(Path("state/uw_usage_state.json").read_text())
+    assert mirror["calls_today"] == 1 and isinstance(mirror["minute_window"], list)  # throttled mirror
+
+    uw_client.uw_record_call("probe")
+    assert uw_client.uw_usage_snapshot()["by_endpoint"]["probe"] == 1
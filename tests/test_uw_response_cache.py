@@ -0,0 +1,114 @@
+import copy
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.uw import uw_client
+from src.uw.uw_response_cache import UwResponseCache, reset_uw_response_cache
+
+
+def _rec(now: float, ttl: float, payload: str = "x") -> dict:
+    return {"ts": now, "expires_at": now + ttl, "data": {"data": [payload]}}
+
+
+def test_memory_tier_serves_hits_and_evicts_by_bytes(tmp_path: Path) -> None:
+    now = time.time()
+    c = UwResponseCache(tmp_path, mem_max_bytes=450, mem_max_entries=100, gc_interval_sec=0)
+    c.put("a", _rec(now, 60, "a" * 100))
+    c.path("a").unlink()  # memory tier answers without touching disk
+    rec, tier = c.get("a")
+    assert tier == "memory" and rec["data"] == {"data": ["a" * 100]}
+    rec["data"]["data"].append("mutated")
+    assert c.get("a")[0]["data"] == {"data": ["a" * 100]}
+
+    c.put("b", _rec(now, 60, "b" * 100))
+    c.put("c", _rec(now, 60, "c" * 100))  # > 450 bytes: "a" is least recently used
+    assert c.get("a") == (None, "")
+    assert c.get("b")[1] == "memory" and c.stats()["mem_evictions"] >= 1
+
+    c.clear_memory()
+    assert c.get("c")[1] == "disk" and c.get("c")[1] == "memory"  # promoted
+    assert c.get("c", now=now + 61) == (None, "")
+
+
+def test_gc_drops_stale_then_earliest_expiring(tmp_path: Path) -> None:
+    now = time.time()
+    c = UwResponseCache(tmp_path, disk_max_bytes=400, disk_stale_sec=600, gc_interval_sec=0)
+    for key, ttl in [("stale", -700), ("soon", 30), ("later", 300), ("latest", 3000)]:
+        c.put(key, _rec(now, ttl, key * 20))
+    (tmp_path / "orphan.json.123.tmp").write_text("{")
+    os.utime(tmp_path / "orphan.json.123.tmp", (now - 3600, now - 3600))
+    (tmp_path / "keep.bak").write_text("not a cache entry")
+
+    out = c.gc_disk(now=now)
+    left = sorted(p.name for p in tmp_path.iterdir())
+    assert left == ["keep.bak", "later.json", "latest.json"]
+    assert out["deleted"] == 3 and out["bytes"] <= 400
+
+
+def test_single_flight_clone_isolates_leader_from_followers(tmp_path: Path) -> None:
+    c = UwResponseCache(tmp_path, gc_interval_sec=0)
+    payload = {"data": [1, 2, 3]}
+    started, follower_waiting = threading.Event(), threading.Event()
+    got = []
+
+    def fn():
+        started.set()
+        follower_waiting.wait(2)
+        time.sleep(0.05)  # follower is parked on the in-flight future
+        return payload
+
+    def follower() -> None:
+        started.wait(2)
+        follower_waiting.set()
+        got.append(c.single_flight("k", lambda: {"data": ["ran"]}, clone=copy.deepcopy))
+
+    t = threading.Thread(target=follower)
+    t.start()
+    res, leader = c.single_flight("k", fn, clone=copy.deepcopy)
+    res["data"].clear()  # the leader's caller mutates its copy straight away
+    t.join()
+
+    assert leader and res is not payload and payload == {"data": [1, 2, 3]}
+    assert got == [({"data": [1, 2, 3]}, False)]
+
+
+def test_concurrent_identical_requests_are_coalesced(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("UW_MOCK", raising=False)
+    monkeypatch.delenv("UW_CACHE_TWO_TIER", raising=False)
+    monkeypatch.setenv("UW_RATE_LIMIT_PER_MIN", "100000")
+    reset_uw_response_cache()
+    calls = []
+
+    def fake_get(endpoint, params, url, headers, timeout_s, max_attempts=3):
+        calls.append(url)
+        time.sleep(0.2)
+        return 200, {"data": [{"ticker": "AAPL"}]}, {}
+
+    monkeypatch.setattr(uw_client, "_uw_retry_with_backoff", fake_get)
+    results = []
+    barrier = threading.Barrier(8)
+
+    def worker() -> None:
+        barrier.wait()
+        results.append(uw_client.uw_http_get("/api/darkpool/AAPL", cache_policy={"ttl_seconds": 60}))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert [r[0] for r in results] == [200] * 8
+    assert len({id(r[1]) for r in results}) == 8  # no shared mutable payloads
+    stats = uw_client.uw_response_cache_stats()
+    assert stats["coalesced"] == 7
+
+    assert uw_client.uw_http_get("/api/darkpool/AAPL", cache_policy={"ttl_seconds": 60})[2] == {"_cache": "hit"}
+    assert len(calls) == 1
+    reset_uw_response_cache()
@@ -1597,20 +1597,22 @@ def _log_uw_v2_intel_failure(symbol: str, stage: str, exc: BaseException) -> Non
         pass
 
 
-def _load_uw_flow_row_for_intel(symbol: str, enriched_data: Any) -> Dict[str, Any]:
+def _load_uw_flow_row_for_intel(symbol: str, enriched_data: Any, cache: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Merge per-symbol UW flow cache row with enriched_data (same source as live entry).
-    Reads data/uw_flow_cache.json when enriched_data is empty or missing keys.
+    Reads data/uw_flow_cache.json when enriched_data is empty or missing keys
+    (pass ``cache`` to reuse an already-loaded copy, e.g. for batch scoring).
     """
     sym = str(symbol).upper()
     row: Dict[str, Any] = {}
     if isinstance(enriched_data, dict) and enriched_data:
         row = dict(enriched_data)
     try:
-        from utils.state_io import read_json_self_heal
-        from config.registry import CacheFiles
+        if cache is None:
+            from utils.state_io import read_json_self_heal
+            from config.registry import CacheFiles
 
-        cache = read_json_self_heal(str(CacheFiles.UW_FLOW_CACHE), default={}, heal=True, mkdir=True)
+            cache = read_json_self_heal(str(CacheFiles.UW_FLOW_CACHE), default={}, heal=True, mkdir=True)
         if isinstance(cache, dict):
             file_row = cache.get(sym)
             if not isinstance(file_row, dict):
@@ -2200,6 +2202,13 @@ def compute_composite_score_v2(
 compute_composite_score_v3 = compute_composite_score_v2
 
 
+def compute_composite_scores_v2_batch(symbols, enriched_frame, regime: str = "NEUTRAL", **kwargs):
+    """Vectorized ``compute_composite_score_v2`` over many rows (see ``uw_composite_v2_batch``)."""
+    from uw_composite_v2_batch import compute_composite_scores_v2_batch as _batch
+
+    return _batch(symbols, enriched_frame, regime, **kwargs)
+
+
 def _compute_composite_score_legacy_v2(symbol: str, enriched_data: Dict, regime: str = "NEUTRAL") -> Dict[str, Any]:
     """
     Legacy composite scoring implementation (deprecated).
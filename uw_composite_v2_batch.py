@@ -0,0 +1,800 @@
+#!/usr/bin/env python3
+"""
+Vectorized batch scorer for the v2 composite (``uw_composite_v2``).
+
+``compute_composite_score_v2`` scores one enriched dict at a time. Backtests, replays and the
+live loop all need the same score for many symbols (or symbol-timestamps). This module does:
+
+1. one Python pass over the rows that pulls every input the scorer reads into flat columns
+   (including the walks over ``flow_trades`` and ``market_tide.data``);
+2. every component (core flow/dark pool/insider/..., congress, shorts, institutional, tide,
+   calendar, greeks, FTD, IV rank, OI, ETF, squeeze), the toxicity lane, freshness decay and
+   clamp, plus the v2 vol/beta/UW/premarket/regime adjustments, as NumPy array math;
+3. the UW-intel layer, with state files (premarket/postmarket intel, regime, UW flow cache)
+   read once per batch instead of once per symbol.
+
+Weights come from ``uw_composite_v2.get_weight`` once per component for the batch regime.
+The arithmetic follows the scalar code operation-for-operation (including its intermediate
+``round`` calls) so results match ``compute_composite_score_v2``; see
+``tests/test_uw_composite_v2_batch.py``.
+
+Output is a ``pandas.DataFrame`` with one row per input row (same order): ``symbol``, ``score``,
+``base_score``, ``composite_pre_clamp``, ``uw_toxicity_veto``, ``toxicity_correlation_penalty``,
+``v2_adj_total``, ``uw_adj_total`` and one column per entry of the scalar ``components`` dict.
+Notes, motifs and other descriptive fields are not produced; use the scalar path for those.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+import uw_composite_v2 as _v2
+from uw_composite_v2 import _to_num
+
+COMPONENT_COLUMNS = (
+    "flow",
+    "dark_pool",
+    "insider",
+    "iv_skew",
+    "smile",
+    "whale",
+    "event",
+    "motif_bonus",
+    "toxicity_penalty",
+    "regime",
+    "congress",
+    "shorts_squeeze",
+    "institutional",
+    "market_tide",
+    "calendar",
+    "greeks_gamma",
+    "ftd_pressure",
+    "iv_rank",
+    "oi_change",
+    "etf_flow",
+    "squeeze_score",
+    "freshness_factor",
+    "toxicity_correlation_penalty",
+)
+
+
+def _sent_code(s: Any) -> int:
+    if s == "BULLISH":
+        return 1
+    if s == "BEARISH":
+        return -1
+    return 0
+
+
+def _d(x: Any) -> Dict[str, Any]:
+    return x if isinstance(x, dict) else {}
+
+
+def _pyround(a: np.ndarray, nd: int) -> np.ndarray:
+    """Element-wise builtin ``round`` (matches the scalar path exactly, unlike ``np.round``)."""
+    return np.fromiter((round(float(v), nd) for v in a), dtype=float, count=len(a))
+
+
+def _env_bool(key: str, default: str = "1") -> bool:
+    return os.environ.get(key, default).strip().lower() in ("1", "true", "yes")
+
+
+def _env_float(key: str, default: str) -> float:
+    try:
+        return float(os.environ.get(key, default))
+    except Exception:
+        return float(default)
+
+
+def _rows_from_frame(symbols: Sequence[str], enriched_frame: Any) -> List[Dict[str, Any]]:
+    """Accept ``{symbol: row}``, a row sequence aligned with ``symbols``, or a DataFrame of rows."""
+    if isinstance(enriched_frame, Mapping):
+        return [enriched_frame.get(s) or {} for s in symbols]
+    if hasattr(enriched_frame, "to_dict") and hasattr(enriched_frame, "columns"):
+        rows = []
+        for rec in enriched_frame.to_dict("records"):
+            # Missing cells come back as NaN; the scalar scorer sees those keys as absent.
+            rows.append({k: v for k, v in rec.items() if not (isinstance(v, float) and math.isnan(v))})
+        return rows
+    rows = list(enriched_frame or [])
+    if len(rows) != len(symbols):
+        raise ValueError(f"enriched_frame has {len(rows)} rows for {len(symbols)} symbols")
+    return [r if isinstance(r, dict) else {} for r in rows]
+
+
+class _Columns:
+    """Growable per-row feature columns (one Python pass, then ``np.asarray``)."""
+
+    def __init__(self) -> None:
+        self._cols: Dict[str, list] = {}
+
+    def put(self, name: str, value: Any) -> None:
+        self._cols.setdefault(name, []).append(value)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {k: np.asarray(v, dtype=float) for k, v in self._cols.items()}
+
+
+def _extract(symbol: str, row: Dict[str, Any], symbol_intel: Dict[str, Any], now_ts: int, c: _Columns) -> None:
+    """Pull every scalar the core + v2 scorer reads for one row into ``c``."""
+    put = c.put
+    flow_sent = row.get("sentiment") or "NEUTRAL"
+    fs = _sent_code(flow_sent)
+    put("flow_sign", fs)
+    conv_raw = row.get("conviction", None)
+    put("flow_conv", _to_num(conv_raw) if conv_raw is not None else 0.0)
+    put("trade_count", int(_to_num(row.get("trade_count", 0)) or 0))
+
+    sweeps_hi = 0
+    try:
+        for tr in (row.get("flow_trades") or []):
+            if not isinstance(tr, dict) or not _v2._is_sweep_trade(tr):
+                continue
+            if _v2._trade_premium_usd(tr) < 100_000:
+                continue
+            tts = _v2._parse_trade_ts(tr)
+            if tts is not None and (now_ts - tts) > 3600:
+                continue
+            sweeps_hi += 1
+    except Exception:
+        sweeps_hi = 0
+    put("sweeps_hi", sweeps_hi)
+
+    dp = row.get("dark_pool", {}) or {}
+    put("dp_sent", _sent_code(dp.get("sentiment", "NEUTRAL")))
+    dp_1h = _to_num(dp.get("total_notional_1h", 0.0) or dp.get("notional_1h", 0.0) or 0.0)
+    dp_total = _to_num(dp.get("total_notional", 0.0) or dp.get("total_premium", 0.0) or 0.0)
+    put("dp_prem", dp_1h if dp_1h > 0 else dp_total)
+
+    ins = row.get("insider", {}) or {}
+    put("ins_sent", _sent_code(ins.get("sentiment", "NEUTRAL")))
+    put("ins_mod", _to_num(ins.get("conviction_modifier", 0.0)))
+
+    put("iv_skew", _to_num(row.get("iv_term_skew", 0.0)))
+    put("smile_slope", _to_num(row.get("smile_slope", 0.0)))
+    put("toxicity", _to_num(row.get("toxicity", 0.0)))
+    put("event_align", _to_num(row.get("event_alignment", 0.0)))
+    put("freshness", _to_num(row.get("freshness", 1.0)))
+
+    mw = _d(row.get("motif_whale", {}))
+    whale = bool(mw.get("detected", False))
+    put("whale_detected", whale)
+    put("whale_conv", _to_num(mw.get("avg_conviction", 0.0)) if whale else 0.0)
+    ms = _d(row.get("motif_staircase", {}))
+    put("stair_detected", bool(ms.get("detected")))
+    put("stair_slope", float(ms.get("slope", 0.0) or 0.0) if ms.get("detected") else 0.0)
+    mb = _d(row.get("motif_burst", {}))
+    put("burst_detected", bool(mb.get("detected")))
+    put("burst_intensity", float(mb.get("intensity", 0.0) or 0.0) if mb.get("detected") else 0.0)
+    put("sweep_motif", bool(_d(row.get("motif_sweep_block", {})).get("detected", False)))
+
+    # Congress
+    cd = row.get("congress", {}) or symbol_intel.get("congress", {})
+    recent = cd.get("recent_count", 0) if cd else 0
+    put("cg_active", bool(cd) and recent != 0)
+    put("cg_recent", float(recent or 0))
+    put("cg_net", float((cd.get("buys", 0) or 0) - (cd.get("sells", 0) or 0)) if cd else 0.0)
+    put("cg_boost", _to_num(cd.get("conviction_boost", 0.0)) if cd else 0.0)
+
+    # Shorts
+    sd = row.get("shorts", {}) or symbol_intel.get("shorts", {})
+    put("sh_active", bool(sd))
+    put("sh_ftd", int(_to_num(sd.get("ftd_count", 0))) if sd else 0)
+    put("sh_squeeze", bool(sd.get("squeeze_risk", False)) if sd else False)
+    put("sh_si", _to_num(sd.get("interest_pct", 0)) if sd else 0.0)
+    put("sh_dtc", _to_num(sd.get("days_to_cover", 0)) if sd else 0.0)
+
+    # Institutional (+ insider fallback)
+    inst = row.get("institutional", {}) or symbol_intel.get("institutional", {})
+    inst_ok = bool(inst) and isinstance(inst, dict)
+    put("in_active", inst_ok)
+    put("in_recent", int(_to_num(inst.get("recent_count", inst.get("holders_count", 0))) or 0) if inst_ok else 0)
+    put("in_top1", _to_num(inst.get("top_holder_pct", 0.0)) if inst_ok else 0.0)
+    put("in_top5", _to_num(inst.get("top5_holder_pct", 0.0)) if inst_ok else 0.0)
+    put("ins_present", bool(ins))
+    put("ins_buys", float(ins.get("net_buys", 0) or 0) if ins else 0.0)
+    put("ins_sells", float(ins.get("net_sells", 0) or 0) if ins else 0.0)
+    put("ins_usd", _to_num(ins.get("total_usd", 0)) if ins else 0.0)
+
+    # Market tide
+    td = row.get("market_tide", {}) or symbol_intel.get("market_tide", {})
+    call_prem = 0.0
+    put_prem = 0.0
+    if td:
+        if "data" in td and isinstance(td["data"], list) and td.get("has_data"):
+            for entry in td["data"][:5]:
+                call_prem += _to_num(entry.get("net_call_premium", 0))
+                put_prem += abs(_to_num(entry.get("net_put_premium", 0)))
+        else:
+            call_prem = _to_num(td.get("call_premium", 0) or td.get("net_call_premium", 0))
+            put_prem = abs(_to_num(td.get("put_premium", 0) or td.get("net_put_premium", 0)))
+    put("td_active", bool(td))
+    put("td_call", call_prem)
+    put("td_put", put_prem)
+
+    # Calendar
+    cal = row.get("calendar", {}) or symbol_intel.get("calendar", {})
+    put("cal_active", bool(cal))
+    put("cal_earn", bool(cal.get("has_earnings")) if cal else False)
+    put("cal_days", float(cal.get("days_to_earnings", 999)) if cal and cal.get("has_earnings") else 999.0)
+    put("cal_fda", bool(cal.get("has_fda")) if cal else False)
+    econ = cal.get("economic_events", []) if cal else []
+    n_econ = 0
+    if econ:
+        n_econ = len(econ) if isinstance(econ, (list, tuple)) else int(econ)
+    put("cal_econ", n_econ)
+
+    # Greeks
+    gd = row.get("greeks", {}) or {}
+    gamma_exp = 0.0
+    gamma_sq = False
+    if gd:
+        gamma_exp = _to_num(gd.get("gamma_exposure", 0))
+        if gamma_exp == 0:
+            gamma_exp = _to_num(gd.get("call_gamma", 0)) - _to_num(gd.get("put_gamma", 0))
+        gamma_sq = bool(gd.get("gamma_squeeze_setup", False))
+    put("gk_active", bool(gd))
+    put("gk_exp", float(gamma_exp))
+    put("gk_squeeze", gamma_sq)
+
+    # FTD
+    fd = row.get("ftd", {}) or row.get("shorts", {})
+    put("ftd_active", bool(fd))
+    put("ftd_count", _to_num(fd.get("ftd_count", 0)) if fd else 0.0)
+    put("ftd_squeeze", bool(fd.get("squeeze_pressure", False) or fd.get("squeeze_risk", False)) if fd else False)
+
+    # IV rank
+    ivd = row.get("iv", {}) or row.get("iv_rank", {})
+    put("iv_rank", _to_num(ivd.get("iv_rank", ivd.get("iv_rank_1y", 50))))
+
+    # OI change
+    od = row.get("oi_change", {}) or row.get("oi", {})
+    net_oi = 0.0
+    oi_sent = 0
+    if od:
+        net_oi = _to_num(od.get("net_oi_change", 0))
+        if net_oi == 0 and _to_num(od.get("curr_oi", 0)) == 0:
+            volume = _to_num(od.get("volume", 0))
+            if volume > 0:
+                net_oi = volume * 0.1
+        s = od.get("oi_sentiment", "NEUTRAL")
+        if s == "NEUTRAL" and net_oi != 0:
+            s = "BULLISH" if net_oi > 0 else "BEARISH"
+        oi_sent = _sent_code(s)
+    put("oi_active", bool(od))
+    put("oi_net", net_oi)
+    put("oi_sent", oi_sent)
+
+    # ETF flow
+    ed = row.get("etf_flow", {})
+    put("etf_active", bool(ed))
+    put("etf_sent", _sent_code(ed.get("overall_sentiment", "NEUTRAL")) if ed else 0)
+    put("etf_risk_on", bool(ed.get("market_risk_on", False)) if ed else False)
+
+    # Squeeze score
+    qd = row.get("squeeze_score", {})
+    put("sq_active", bool(qd))
+    put("sq_signals", _to_num(qd.get("signals", 0)) if qd else 0.0)
+    put("sq_high", bool(qd.get("high_squeeze_potential", False)) if qd else False)
+
+    # v2 layer inputs
+    put("vol_20d", _to_num(row.get("realized_vol_20d", 0.0)))
+    put("beta", _to_num(row.get("beta_vs_spy", 0.0)))
+    put("v2_conv", _to_num(row.get("conviction", row.get("flow_conv", 0.0))))
+
+
+def _where_chain(default: np.ndarray, *pairs: Any) -> np.ndarray:
+    """``np.select`` with first-match semantics of an if/elif chain."""
+    conds = [p[0] for p in pairs]
+    vals = [p[1] for p in pairs]
+    return np.select(conds, vals, default=default)
+
+
+def _core_scores(f: Dict[str, np.ndarray], regime: str) -> Dict[str, np.ndarray]:
+    """Vectorized ``_compute_composite_score_core`` numeric outputs."""
+    w = lambda name, reg=regime: float(_v2.get_weight(name, reg))  # noqa: E731
+    n = len(f["flow_sign"])
+    zero = np.zeros(n)
+    fs = f["flow_sign"]
+
+    # 1. Options flow (+ stealth boost, sweep urgency)
+    stealth = np.where((f["trade_count"] > 0) & (f["flow_conv"] < 0.3), 0.2, 0.0)
+    flow = w("options_flow") * np.minimum(1.0, f["flow_conv"] + stealth)
+    flow = np.where(f["sweeps_hi"] >= 3, flow * 1.2, flow)
+
+    # 2. Dark pool
+    dp_strength = 0.2 + 0.8 * np.minimum(1.0, np.maximum(0.0, f["dp_prem"]) / 50_000_000.0)
+    base_dp = w("dark_pool") * dp_strength
+    dp_adverse = ((fs > 0) & (f["dp_sent"] == -1)) | ((fs < 0) & (f["dp_sent"] == 1))
+    dp = _where_chain(base_dp, ((fs == 0) | (f["dp_sent"] == 0), 0.15 * base_dp), (dp_adverse, -base_dp))
+
+    # 3. Insider
+    wi = w("insider")
+    insider = _where_chain(
+        np.full(n, wi * 0.25),
+        (f["ins_sent"] == 1, wi * (0.50 + f["ins_mod"])),
+        (f["ins_sent"] == -1, wi * (0.50 - np.abs(f["ins_mod"]))),
+    )
+
+    # 4-8. IV skew, smile, whale, event, temporal motif
+    iv_skew = f["iv_skew"]
+    iv_aligned = ((iv_skew > 0) & (fs == 1)) | ((iv_skew < 0) & (fs == -1))
+    iv = w("iv_term_skew") * np.abs(iv_skew) * np.where(iv_aligned, 1.3, 0.7)
+    smile = w("smile_slope") * np.abs(f["smile_slope"])
+    whale_det = f["whale_detected"] > 0
+    whale = np.where(whale_det, w("whale_persistence") * f["whale_conv"], 0.0)
+    event = w("event_alignment") * f["event_align"]
+    wm = w("temporal_motif")
+    motif = zero + np.where(f["stair_detected"] > 0, wm * f["stair_slope"] * 3.0, 0.0)
+    motif = motif + np.where(f["burst_detected"] > 0, wm * np.minimum(1.0, f["burst_intensity"] / 2.0), 0.0)
+
+    # 9. Toxicity
+    raw_tw = w("toxicity_penalty")
+    tw = raw_tw if raw_tw < 0 else -abs(raw_tw)
+    tox = f["toxicity"]
+    toxicity = _where_chain(zero, (tox > 0.5, tw * (tox - 0.5) * 1.5), (tox > 0.3, tw * (tox - 0.3) * 0.5))
+
+    # 10. Regime modifier (batch-wide regime)
+    if regime == "RISK_ON":
+        factor = np.where(fs == 1, 1.15, 0.95)
+    elif regime == "RISK_OFF":
+        factor = np.where(fs == 1, 1.10, 0.90)
+    elif regime in ("mixed", "NEUTRAL"):
+        factor = np.full(n, 1.02)
+    else:
+        factor = np.full(n, 1.0)
+    regime_c = w("regime_modifier") * (factor - 1.0) * 2.0
+
+    # 11. Congress
+    wc = w("congress", "neutral")
+    cs = np.sign(f["cg_net"])
+    act = np.minimum(1.0, f["cg_recent"] / 10.0)
+    congress = _where_chain(
+        wc * 0.2 * act,
+        ((cs == fs) & (cs != 0), wc * (0.6 + act * 0.4) * (1.0 + f["cg_boost"])),
+        ((cs != 0) & (fs != 0) & (cs != fs), -wc * 0.4 * act),
+    )
+    congress = _pyround(np.where(f["cg_active"] > 0, congress, 0.0), 4)
+
+    # 12. Shorts
+    wsq = w("shorts_squeeze")
+    si, dtc, ftd = f["sh_si"], f["sh_dtc"], f["sh_ftd"]
+    shorts = zero + np.where((si > 15) & (fs == 1), wsq * 0.5 * np.minimum(1.0, (si - 15) / 25), 0.0)
+    shorts = shorts + np.where((dtc > 5) & (fs == 1), wsq * 0.3 * np.minimum(1.0, (dtc - 5) / 10), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ftd_log = np.log10(np.where(ftd > 0, ftd, 1.0))
+    shorts = shorts + np.where(ftd > 100000, wsq * 0.2 * np.minimum(1.0, ftd_log / 7), 0.0)
+    shorts = shorts + np.where(f["sh_squeeze"] > 0, wsq * 0.3, 0.0)
+    shorts = shorts - np.where((si > 20) & (fs == -1), wsq * 0.2, 0.0)
+    shorts = _pyround(np.where(f["sh_active"] > 0, shorts, 0.0), 4)
+
+    # 13. Institutional (ownership summary, else directional insider proxy)
+    win = w("institutional")
+    strength = zero + np.where(f["in_recent"] > 0, np.minimum(1.0, f["in_recent"] / 25.0) * 0.6, 0.0)
+    strength = strength + np.where(f["in_top1"] > 0, np.minimum(1.0, f["in_top1"] / 10.0) * 0.25, 0.0)
+    strength = strength + np.where(f["in_top5"] > 0, np.minimum(1.0, f["in_top5"] / 25.0) * 0.15, 0.0)
+    own = (f["in_active"] > 0) & (strength > 0)
+    own_c = win * (0.2 + 0.8 * np.minimum(1.0, strength)) * 0.6
+    nb, ns, usd = f["ins_buys"], f["ins_sells"], f["ins_usd"]
+    inst_sign = np.sign(nb - ns)
+    ins_act = np.minimum(1.0, (nb + ns) / 20)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        usd_log = np.log10(np.where(usd > 1_000_000, usd / 1_000_000, 1.0))
+    usd_bonus = np.where(usd > 1_000_000, np.minimum(0.3, usd_log * 0.15), 0.0)
+    ins_c = _where_chain(
+        win * 0.15 * ins_act,
+        ((inst_sign == fs) & (inst_sign != 0), win * (0.5 + ins_act * 0.5 + usd_bonus)),
+        ((inst_sign != 0) & (fs != 0) & (inst_sign != fs), -win * 0.3 * ins_act),
+    )
+    ins_ok = (f["ins_present"] > 0) & ~((nb == 0) & (ns == 0))
+    institutional = _pyround(np.where(own, own_c, np.where(ins_ok, ins_c, 0.0)), 4)
+
+    # 14. Market tide
+    wt = w("market_tide")
+    total = f["td_call"] + f["td_put"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        call_ratio = np.where(total != 0, f["td_call"] / np.where(total != 0, total, 1.0), 0.5)
+    tide_sign = np.where(call_ratio > 0.55, 1, np.where(call_ratio < 0.45, -1, 0))
+    imb = np.abs(call_ratio - 0.5) * 2
+    tide = _where_chain(
+        np.where(imb > 0.3, wt * 0.1, 0.0),
+        ((tide_sign == fs) & (tide_sign != 0), wt * (0.4 + imb * 0.6)),
+        ((tide_sign != 0) & (fs != 0) & (tide_sign != fs), -wt * 0.25 * imb),
+    )
+    tide = _pyround(np.where((f["td_active"] > 0) & (total != 0), tide, 0.0), 4)
+
+    # 15. Calendar
+    wcal = w("calendar_catalyst")
+    days = f["cal_days"]
+    cal = zero + np.where((f["cal_earn"] > 0) & (days <= 7), wcal * 0.4 * (1 - days / 7), 0.0)
+    cal = cal + np.where(f["cal_fda"] > 0, wcal * 0.5, 0.0)
+    cal = cal + np.where(f["cal_econ"] > 0, wcal * 0.2 * np.minimum(1.0, f["cal_econ"] / 3), 0.0)
+    calendar = _pyround(np.where(f["cal_active"] > 0, cal, 0.0), 4)
+
+    # 16. Greeks gamma
+    wg = w("greeks_gamma")
+    gx = np.abs(f["gk_exp"])
+    greeks = _where_chain(
+        np.full(n, wg * 0.2),
+        (f["gk_squeeze"] > 0, np.full(n, wg * 1.0)),
+        (gx > 500000, np.full(n, wg * 0.5)),
+        (gx > 100000, np.full(n, wg * 0.25)),
+        (gx > 10000, np.full(n, wg * 0.1)),
+    )
+    greeks = np.where(f["gk_active"] > 0, greeks, 0.0)
+
+    # 17. FTD pressure
+    wf = w("ftd_pressure")
+    fc = f["ftd_count"]
+    ftd_c = _where_chain(
+        np.full(n, wf * 0.2),
+        ((f["ftd_squeeze"] > 0) | (fc > 200000), np.full(n, wf * 1.0)),
+        (fc > 100000, np.full(n, wf * 0.67)),
+        (fc > 50000, np.full(n, wf * 0.33)),
+        (fc > 10000, np.full(n, wf * 0.1)),
+    )
+    ftd_c = np.where(f["ftd_active"] > 0, ftd_c, wf * 0.2)
+
+    # 18. IV rank
+    wr = w("iv_rank")
+    ivr = f["iv_rank"]
+    iv_rank = _where_chain(
+        zero,
+        (ivr < 20, np.full(n, wr * 1.0)),
+        (ivr < 30, np.full(n, wr * 0.5)),
+        (ivr > 80, np.full(n, -wr * 1.0)),
+        (ivr > 70, np.full(n, -wr * 0.5)),
+        ((ivr >= 30) & (ivr <= 70), np.full(n, wr * 0.15)),
+    )
+
+    # 19. OI change
+    wo = w("oi_change")
+    noi = f["oi_net"]
+    oi = _where_chain(
+        np.full(n, wo * 0.2),
+        ((noi > 50000) & (f["oi_sent"] == 1) & (fs > 0), np.full(n, wo * 1.0)),
+        ((noi > 20000) & (f["oi_sent"] == 1), np.full(n, wo * 0.57)),
+        (np.abs(noi) > 10000, np.full(n, wo * 0.29)),
+        (np.abs(noi) > 1000, np.full(n, wo * 0.1)),
+    )
+    oi = np.where(f["oi_active"] > 0, oi, wo * 0.2)
+
+    # 20. ETF flow
+    we = w("etf_flow")
+    etf = _where_chain(
+        np.full(n, we * 0.2),
+        ((f["etf_sent"] == 1) & (f["etf_risk_on"] > 0), np.full(n, we * 1.0)),
+        (f["etf_sent"] == 1, np.full(n, we * 0.5)),
+        (f["etf_sent"] == -1, np.full(n, -we * 0.3)),
+    )
+    etf = np.where(f["etf_active"] > 0, etf, we * 0.2)
+
+    # 21. Squeeze score
+    wq = w("squeeze_score")
+    squeeze = _where_chain(
+        np.full(n, wq * 0.2),
+        (f["sq_high"] > 0, np.full(n, wq * 1.0)),
+        (f["sq_signals"] >= 1, np.full(n, wq * 0.5)),
+    )
+    squeeze = np.where(f["sq_active"] > 0, squeeze, wq * 0.2)
+
+    # Correlation-matrix toxicity lane + alpha emphasis
+    if _env_bool("UW_TOXICITY_ALPHA_BOOST_ENABLED", "1"):
+        tide = tide * _env_float("UW_MARKET_TIDE_ALPHA_MULT", "1.15")
+        regime_c = regime_c * _env_float("UW_REGIME_COMPONENT_ALPHA_MULT", "1.12")
+    pen = zero.copy()
+    veto = np.zeros(n, dtype=bool)
+    if _env_bool("UW_TOXICITY_VETO_ENABLED", "1"):
+        dp_prem = f["dp_prem"]
+        veto_n = _env_float("UW_DP_VETO_NOTIONAL_USD", "8000000")
+        hard = _env_float("UW_DP_HARD_VETO_SCORE_PENALTY", "6.5")
+        veto_long = (fs > 0) & (f["dp_sent"] == -1) & (dp_prem >= veto_n)
+        veto_short = ~veto_long & (fs < 0) & (f["dp_sent"] == 1) & (dp_prem >= veto_n)
+        soft = ~veto_long & ~veto_short & dp_adverse & (dp_prem >= _env_float("UW_DP_SOFT_PENALTY_NOTIONAL_USD", "1e6"))
+        veto = veto_long | veto_short
+        pen = pen - np.where(veto, hard, 0.0)
+        pen = pen - np.where(soft, _env_float("UW_DP_ADVERSITY_SCORE_PENALTY", "1.15"), 0.0)
+        iv_tox = ~iv_aligned & (np.abs(iv_skew) >= _env_float("UW_IV_SKEW_TOX_THRESHOLD", "0.10"))
+        pen = pen - np.where(iv_tox, _env_float("UW_IV_SKEW_TOX_PENALTY", "0.65"), 0.0)
+        gnet = np.where(f["gk_active"] > 0, f["gk_exp"], 0.0)
+        g_conf = (
+            ~((f["gk_active"] > 0) & (f["gk_squeeze"] > 0))
+            & (np.abs(gnet) > _env_float("UW_GREEKS_GAMMA_TOX_THRESHOLD", "250000"))
+            & (fs != 0)
+            & (gnet * fs < 0)
+        )
+        pen = pen - np.where(g_conf, _env_float("UW_GREEKS_TOX_PENALTY", "0.45"), 0.0)
+
+    raw = (
+        flow + dp + insider + iv + smile + whale + event + motif + toxicity + regime_c
+        + congress + shorts + institutional + tide + calendar
+        + greeks + ftd_c + iv_rank + oi + etf + squeeze
+    ) + pen
+    score = raw * f["freshness"]
+    score = score + np.where(whale_det | (f["sweep_motif"] > 0), 0.5, 0.0)
+    pre_clamp = score
+    score = np.maximum(0.0, np.minimum(8.0, score))
+    score = np.where(veto, np.minimum(score, _env_float("UW_TOXICITY_VETO_SCORE_CAP", "0.35")), score)
+
+    return {
+        "score": score,
+        "composite_pre_clamp": pre_clamp,
+        "uw_toxicity_veto": veto,
+        "components": {
+            "flow": flow,
+            "dark_pool": dp,
+            "insider": insider,
+            "iv_skew": iv,
+            "smile": smile,
+            "whale": whale,
+            "event": event,
+            "motif_bonus": motif,
+            "toxicity_penalty": toxicity,
+            "regime": regime_c,
+            "congress": congress,
+            "shorts_squeeze": shorts,
+            "institutional": institutional,
+            "market_tide": tide,
+            "calendar": calendar,
+            "greeks_gamma": greeks,
+            "ftd_pressure": ftd_c,
+            "iv_rank": iv_rank,
+            "oi_change": oi,
+            "etf_flow": etf,
+            "squeeze_score": squeeze,
+            "freshness_factor": f["freshness"],
+            "toxicity_correlation_penalty": pen,
+        },
+    }
+
+
+def _default_v2_params() -> Dict[str, Any]:
+    try:
+        from config.registry import COMPOSITE_WEIGHTS_V2 as _CWV2  # type: ignore
+
+        return dict(_CWV2) if isinstance(_CWV2, dict) else {}
+    except Exception:
+        return {}
+
+
+def _uw_intel_deltas(
+    symbols: Sequence[str],
+    rows: Sequence[Dict[str, Any]],
+    directions: Sequence[str],
+    align_mult: np.ndarray,
+    uw_cfg: Dict[str, Any],
+) -> np.ndarray:
+    """UW-intel layer of ``compute_composite_score_v2`` with shared state read once per batch."""
+    n = len(symbols)
+    if not (isinstance(uw_cfg, dict) and uw_cfg):
+        return np.zeros(n)
+    from utils.state_io import read_json_self_heal
+    from config.registry import CacheFiles
+
+    try:
+        from src.intel.regime_detector import read_regime_state, regime_alignment_score
+
+        r_label = str(read_regime_state().get("regime_label", "NEUTRAL") or "NEUTRAL")
+        r_align_by_dir = {d: float(regime_alignment_score(r_label, d)) for d in ("bullish", "bearish", "neutral")}
+    except Exception:
+        r_align_by_dir = {"bullish": 0.0, "bearish": 0.0, "neutral": 0.0}
+    try:
+        from src.intel.sector_intel import _load_profiles, get_sector_multipliers
+
+        profiles = _load_profiles()
+    except Exception:
+        get_sector_multipliers, profiles = None, None  # type: ignore
+    pm = read_json_self_heal("state/premarket_intel.json", default={}, heal=True, mkdir=True)
+    post = read_json_self_heal("state/postmarket_intel.json", default={}, heal=True, mkdir=True)
+    flow_cache = read_json_self_heal(str(CacheFiles.UW_FLOW_CACHE), default={}, heal=True, mkdir=True)
+    if not isinstance(flow_cache, dict):
+        flow_cache = {}
+    pm_syms = pm.get("symbols", {}) if isinstance(pm, dict) else {}
+    post_syms = post.get("symbols", {}) if isinstance(post, dict) else {}
+
+    sm_memo: Dict[str, Dict[str, float]] = {}
+    default_sm = {"flow_weight": 1.0, "darkpool_weight": 1.0, "earnings_weight": 1.0, "short_interest_weight": 1.0}
+    c = _Columns()
+    ok = np.ones(n, dtype=bool)
+    for i, (symbol, row, direction) in enumerate(zip(symbols, rows, directions)):
+        sym = str(symbol).upper()
+        try:
+            if sym not in sm_memo:
+                try:
+                    sm_memo[sym] = get_sector_multipliers(symbol, profiles)[1] if get_sector_multipliers else default_sm
+                except Exception:
+                    sm_memo[sym] = default_sm
+            sm = sm_memo[sym]
+            if isinstance(flow_cache.get(sym), dict) or isinstance(flow_cache.get(symbol), dict) or not row:
+                merged = _v2._load_uw_flow_row_for_intel(symbol, row, cache=flow_cache)
+            else:
+                merged = row  # already armored; nothing to merge from the flow cache
+            synthetic = _v2._synthetic_uw_intel_from_flow_row(merged)
+            pm_rec = pm_syms.get(sym) if isinstance(pm_syms, dict) else None
+            post_rec = post_syms.get(sym) if isinstance(post_syms, dict) else None
+            partial = pm_rec if isinstance(pm_rec, dict) and pm_rec else (post_rec if isinstance(post_rec, dict) and post_rec else {})
+            srec = _v2._merge_uw_intel_record(partial, synthetic) if partial else synthetic
+            fs_ = _v2._clamp(_to_num(srec.get("flow_strength", 0.0)), 0.0, 1.0)
+            dpb = _v2._clamp(_to_num(srec.get("darkpool_bias", 0.0)), -1.0, 1.0)
+            sec = _v2._clamp(_to_num(srec.get("sector_alignment", 0.0)), -1.0, 1.0)
+            sent = str(srec.get("sentiment", "NEUTRAL") or "NEUTRAL").upper()
+            ep = srec.get("earnings_proximity")
+            try:
+                edays = int(ep) if ep is not None else int(_v2.UW_EARNINGS_NO_DATA_SENTINEL)
+            except (TypeError, ValueError):
+                edays = int(_v2.UW_EARNINGS_NO_DATA_SENTINEL)
+        except Exception as ex:
+            _v2._log_uw_v2_intel_failure(symbol, "v2_uw_intel_batch", ex)
+            ok[i] = False
+            sm, fs_, dpb, sec, sent, edays = default_sm, 0.0, 0.0, 0.0, "NEUTRAL", int(_v2.UW_EARNINGS_NO_DATA_SENTINEL)
+        c.put("flow_strength", fs_)
+        c.put("darkpool_bias", abs(dpb))
+        c.put("sector_alignment", max(0.0, sec))
+        c.put("sent_match", (sent == "BULLISH" and direction == "bullish") or (sent == "BEARISH" and direction == "bearish"))
+        c.put("earnings_days", edays)
+        c.put("r_align", max(0.0, r_align_by_dir.get(direction, 0.0)))
+        c.put("sm_flow", float(sm.get("flow_weight", 1.0)))
+        c.put("sm_dp", float(sm.get("darkpool_weight", 1.0)))
+        c.put("sm_earn", float(sm.get("earnings_weight", 1.0)))
+    u = c.arrays()
+    am = align_mult
+    w_flow = float(uw_cfg.get("flow_strength_weight", 1.0))
+    w_dp = float(uw_cfg.get("darkpool_bias_weight", 1.0))
+    w_sent = float(uw_cfg.get("sentiment_weight", 1.0))
+    w_earn = float(uw_cfg.get("earnings_proximity_weight", 1.0))
+    w_sector = float(uw_cfg.get("sector_alignment_weight", 1.0))
+    w_regime = float(uw_cfg.get("regime_alignment_weight", 1.0))
+    pen_days = int(uw_cfg.get("earnings_penalty_days", 3) or 3)
+    a_flow = float(uw_cfg.get("flow_strength_bonus_max", 0.20)) * u["flow_strength"] * am * u["sm_flow"] * w_flow
+    a_dp = float(uw_cfg.get("darkpool_bias_bonus_max", 0.12)) * u["darkpool_bias"] * am * u["sm_dp"] * w_dp
+    a_sent = np.where(u["sent_match"] > 0, float(uw_cfg.get("sentiment_bonus_max", 0.10)) * am * w_sent, 0.0)
+    a_earn = np.where(
+        u["earnings_days"] <= pen_days,
+        float(uw_cfg.get("earnings_proximity_penalty_max", -0.12)) * am * u["sm_earn"] * w_earn,
+        0.0,
+    )
+    a_sector = float(uw_cfg.get("sector_alignment_bonus_max", 0.12)) * u["sector_alignment"] * am * w_sector
+    a_regime = float(uw_cfg.get("regime_alignment_bonus_max", 0.08)) * u["r_align"] * am * w_regime
+    total = 0.0 + a_flow + a_dp + a_sent + a_earn + a_sector + a_regime
+    return np.where(ok, total, 0.0)
+
+
+def compute_composite_scores_v2_batch(
+    symbols: Sequence[str],
+    enriched_frame: Any,
+    regime: str = "NEUTRAL",
+    *,
+    market_context: Optional[Dict[str, Any]] = None,
+    posture_state: Optional[Dict[str, Any]] = None,
+    expanded_intel: Optional[Dict[str, Any]] = None,
+    v2_params: Optional[Dict[str, Any]] = None,
+    now_ts: Optional[int] = None,
+):
+    """
+    Score many rows at once; see the module docstring for the output columns.
+
+    ``enriched_frame`` is ``{symbol: enriched_row}``, a sequence of rows aligned with
+    ``symbols`` (symbols may repeat, e.g. one row per symbol-timestamp), or a DataFrame whose
+    records are rows. ``now_ts`` pins the sweep-urgency lookback for replays (default: now).
+    """
+    import pandas as pd
+    from src.infrastructure.uw_input_armor import armor_uw_enriched_row_for_composite
+
+    symbols = [str(s) for s in symbols]
+    rows = [armor_uw_enriched_row_for_composite(r, symbol=s) for s, r in zip(symbols, _rows_from_frame(symbols, enriched_frame))]
+    market_context = market_context or {}
+    posture_state = posture_state or {}
+    if v2_params is None:
+        v2_params = _default_v2_params() or {}
+    if expanded_intel is None:
+        expanded_intel = _v2._load_expanded_intel()
+    now_ts = int(now_ts if now_ts is not None else time.time())
+
+    cols = _Columns()
+    for s, r in zip(symbols, rows):
+        _extract(s, r, _d(expanded_intel.get(s, {})), now_ts, cols)
+    n = len(symbols)
+    if n == 0:
+        return pd.DataFrame(columns=["symbol", "score", "base_score"] + list(COMPONENT_COLUMNS))
+    f = cols.arrays()
+
+    core = _core_scores(f, regime)
+    base_score = _pyround(core["score"], 3)
+
+    # ---- v2 adjustments (vol / beta / UW strength / premarket / regime posture) ----
+    p = v2_params
+    vol_regime = str(market_context.get("volatility_regime", "mid") or "mid").lower()
+    posture = str(posture_state.get("posture", "neutral") or "neutral").lower()
+    posture_conf = _to_num(posture_state.get("regime_confidence", 0.0))
+    if vol_regime == "high":
+        vol_mult = float(p.get("high_vol_multiplier", 1.30))
+    elif vol_regime == "low":
+        vol_mult = float(p.get("low_vol_multiplier", 0.85))
+    else:
+        vol_mult = float(p.get("mid_vol_multiplier", 1.00))
+    fs = f["flow_sign"]
+    directions = ["bullish" if x == 1 else ("bearish" if x == -1 else "neutral") for x in fs]
+    bull, bear = fs == 1, fs == -1
+    align = ((posture == "long") & bull) | ((posture == "short") & bear)
+    misalign = ((posture == "long") & bear) | ((posture == "short") & bull)
+    neutral = (fs == 0) | (posture == "neutral")
+    align_mult = _where_chain(
+        np.ones(n),
+        (misalign, np.full(n, float(p.get("misalign_dampen", 0.25)))),
+        (neutral, np.full(n, float(p.get("neutral_dampen", 0.60)))),
+    )
+    vol_scale = float(p.get("vol_scale", 0.25)) or 0.25
+    vol_strength = np.clip((f["vol_20d"] - float(p.get("vol_center", 0.20))) / vol_scale, 0.0, 1.0)
+    vol_bonus = float(p.get("vol_bonus_max", 0.6)) * vol_strength * vol_mult * align_mult
+    low_vol_pen = np.zeros(n)
+    if vol_regime == "high":
+        low_center = float(p.get("low_vol_penalty_center", 0.15))
+        low_strength = np.clip((low_center - f["vol_20d"]) / max(1e-9, low_center), 0.0, 1.0)
+        low_vol_pen = float(p.get("low_vol_penalty_max", -0.10)) * low_strength * align_mult
+    beta_scale = float(p.get("beta_scale", 1.0)) or 1.0
+    beta_strength = np.clip((f["beta"] - float(p.get("beta_center", 1.0))) / beta_scale, 0.0, 1.0)
+    beta_bonus = float(p.get("beta_bonus_max", 0.4)) * beta_strength * vol_mult * align_mult
+    uw_strength = np.where(f["trade_count"] > 0, np.clip(f["v2_conv"], 0.0, 1.0), 0.0)
+    uw_scale = float(p.get("uw_scale", 0.45)) or 0.45
+    uw_norm = np.clip((uw_strength - float(p.get("uw_center", 0.55))) / uw_scale, 0.0, 1.0)
+    uw_bonus = float(p.get("uw_bonus_max", 0.2)) * uw_norm * align_mult
+
+    ov = _to_num(market_context.get("spy_overnight_ret", 0.0)) + _to_num(market_context.get("qqq_overnight_ret", 0.0))
+    fut_dir = "up" if ov > 0.005 else ("down" if ov < -0.005 else "flat")
+    pre_aligned = (bull & (fut_dir == "up")) | (bear & (fut_dir == "down"))
+    pre_bonus = _where_chain(
+        np.zeros(n),
+        ((bull | bear) & pre_aligned, float(p.get("premarket_align_bonus", 0.10)) * align_mult),
+        ((bull | bear) & (fut_dir in ("up", "down")), float(p.get("premarket_misalign_penalty", -0.10)) * align_mult),
+    )
+    conf_mult = 1.0 if posture_conf >= float(p.get("posture_conf_strong", 0.65)) else 0.6
+    regime_bonus = float(p.get("regime_align_bonus", 0.5)) * np.where(align, conf_mult, 0.0)
+    regime_pen = float(p.get("regime_misalign_penalty", -0.25)) * np.where(misalign, conf_mult, 0.0)
+
+    shaping = np.zeros(n)
+    if str(os.getenv("V2_SHAPING_ENABLED", "") or "").strip().lower() in ("1", "true", "yes", "on"):
+        try:
+            gamma = float(p.get("shape_vol_gamma", 1.8))
+            shaping = shaping + float(p.get("shape_vol_bonus_max", 0.15)) * (vol_strength ** max(0.5, gamma)) * vol_mult * align_mult
+            shaping = shaping + float(p.get("shape_regime_align_bonus", 0.10)) * np.where(align, conf_mult, 0.0)
+            weak = (f["trade_count"] >= int(p.get("shape_trade_count_strong", 15))) & (
+                uw_strength <= float(p.get("shape_uw_weak_threshold", 0.35))
+            )
+            shaping = shaping + np.where(weak, float(p.get("shape_uw_weak_penalty_max", -0.10)) * align_mult, 0.0)
+        except Exception:
+            shaping = np.zeros(n)
+
+    total_adj = vol_bonus + low_vol_pen + beta_bonus + uw_bonus + pre_bonus + regime_bonus + regime_pen + shaping
+    score_v2 = np.clip(base_score + total_adj, 0.0, 8.0)
+
+    uw_cfg = p.get("uw", {}) if isinstance(p, dict) else {}
+    uw_delta = np.zeros(n)
+    try:
+        uw_delta = _uw_intel_deltas(symbols, rows, directions, align_mult, uw_cfg)
+        if isinstance(uw_cfg, dict) and uw_cfg:
+            score_v2 = np.clip(score_v2 + uw_delta, 0.0, 8.0)
+    except Exception as ex:
+        _v2._log_uw_v2_intel_failure("BATCH", "v2_uw_intel_batch", ex)
+
+    veto = core["uw_toxicity_veto"]
+    if str(os.environ.get("UW_TOXICITY_VETO_STICKY", "1")).strip().lower() in ("1", "true", "yes"):
+        score_v2 = np.where(veto, np.minimum(score_v2, _env_float("UW_TOXICITY_VETO_SCORE_CAP", "0.35")), score_v2)
+
+    out: Dict[str, Any] = {
+        "symbol": symbols,
+        "score": _pyround(score_v2, 3),
+        "base_score": base_score,
+        "composite_pre_clamp": _pyround(core["composite_pre_clamp"], 4),
+        "uw_toxicity_veto": veto.astype(bool),
+        "v2_adj_total": _pyround(total_adj, 4),
+        "uw_adj_total": _pyround(uw_delta, 4),
+    }
+    for name in COMPONENT_COLUMNS:
+        nd = 4 if name == "toxicity_correlation_penalty" else 3
+        out[name] = _pyround(core["components"][name], nd)
+    return pd.DataFrame(out)
@@ -68,21 +68,47 @@ def _acquire_single_instance_lock() -> bool:
             pass
         return False
 
-# Signal-safe print function to avoid reentrant call issues
-_print_lock = False
+# Signal-safe print function to avoid reentrant call issues.
+# Poller threads serialize on the lock; a signal handler that interrupts a print on the
+# same thread drops its message instead of blocking on a lock it already holds.
+_print_lock = threading.Lock()
+_print_owner: Optional[int] = None
 def safe_print(*args, **kwargs):
-    """Print that's safe to call from signal handlers and avoids reentrant calls."""
-    global _print_lock
-    if _print_lock:
+    """Print that's safe to call from signal handlers and from several poller threads."""
+    global _print_owner
+    me = threading.get_ident()
+    if _print_owner == me:
         return  # Prevent reentrant calls
-    _print_lock = True
+    if not _print_lock.acquire(timeout=1.0):
+        return
     try:
+        _print_owner = me
         msg = ' '.join(str(a) for a in args) + '\n'
         os.write(1, msg.encode())  # stdout file descriptor is 1
     except:
         pass  # If print fails, just continue
     finally:
-        _print_lock = False
+        _print_owner = None
+        _print_lock.release()
+
+def _service_payload_dump() -> None:
+    """Write the raw-payload ring snapshot if SIGUSR1 requested one (never called from the handler)."""
+    try:
+        from src.uw.uw_payload_ring import dump_if_requested
+
+        dump_if_requested()
+    except Exception:
+        pass
+
+
+def _sleep_servicing_payload_dumps(seconds: float) -> None:
+    """Inter-cycle sleep that still answers SIGUSR1 dump requests within ~1s."""
+    try:
+        from src.uw.uw_payload_ring import sleep_servicing_dumps
+    except Exception:
+        time.sleep(seconds)
+        return
+    sleep_servicing_dumps(seconds)
 
 # #region agent log
 DEBUG_LOG_PATH = Path(__file__).parent / ".cursor" / "debug.log"
@@ -304,6 +330,8 @@ class UWClient:
         self.api_key = api_key or os.getenv("UW_API_KEY")
         self.base = APIConfig.UW_BASE_URL
         self.headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        # Shared TokenBucket (src/uw/uw_concurrent_poller.py) when tickers are polled concurrently.
+        self.rate_bucket = None
     
     @global_failure_wrapper("uw_poll")
     def _get(self, path_or_url: str, params: dict = None) -> dict:
@@ -336,6 +364,8 @@ class UWClient:
             # - still inspects UW headers when available
             # - still returns {"data": [], "_rate_limited": True} on 429
             from src.uw.uw_client import uw_http_get
+            if self.rate_bucket is not None:
+                self.rate_bucket.acquire()
             status_code, response_data, resp_headers = uw_http_get(
                 url,
                 params=params or {},
@@ -428,29 +458,13 @@ class UWClient:
             r.raise_for_status()
             response_data = safe_requests_json(r, url_hint=url, default={"data": []})
             
-            # DIAGNOSTIC: Store last 5 raw payloads for debugging
+            # DIAGNOSTIC: Keep last N raw payloads per endpoint in memory (src/uw/uw_payload_ring.py).
+            # Dump: SIGUSR1 / `python -m src.uw.uw_payload_ring`; sampled disk capture via
+            # UW_RAW_PAYLOAD_SAMPLE_RATE.
             try:
-                raw_payload_log = Path("logs/uw_raw_payloads.jsonl")
-                raw_payload_log.parent.mkdir(exist_ok=True)
-                payload_entry = {
-                    "ts": int(time.time()),
-                    "dt": datetime.now(timezone.utc).isoformat(),
-                    "url": url,
-                    "status": r.status_code,
-                    "payload": response_data
-                }
-                with raw_payload_log.open("a") as f:
-                    f.write(json.dumps(payload_entry) + "\n")
-                
-                # Keep only last 5 entries (simple rotation)
-                try:
-                    with raw_payload_log.open("r") as f:
-                        lines = f.readlines()
-                    if len(lines) > 5:
-                        with raw_payload_log.open("w") as f:
-                            f.writelines(lines[-5:])
-                except:
-                    pass
+                from src.uw.uw_payload_ring import get_payload_ring
+
+                get_payload_ring().record(url, r.status_code, response_data)
                 
                 # Print last payload summary to console
                 safe_print(f"[UW-DAEMON] ✅ RAW PAYLOAD RECEIVED: {url} | Status: {r.status_code} | Data keys: {list(response_data.keys()) if isinstance(response_data, dict) else 'N/A'}")
@@ -535,6 +549,12 @@ class UWClient:
                     }) + "\n")
             except Exception:
                 pass
+            try:
+                from src.uw.uw_client import uw_record_call
+
+                uw_record_call("probe")
+            except Exception:
+                pass
 
             r = requests.get(url, headers=self.headers, params=params or {}, timeout=10)
             data = None
@@ -829,6 +849,8 @@ class SmartPoller:
         # Endpoints that should NOT be slowed down 3x outside market hours.
         self._offhours_exempt = {"calendar", "institutional_ownership"}
         self.last_call = self._load_state()
+        # Tickers may be polled from several worker threads (check-and-stamp must be atomic).
+        self._lock = threading.RLock()
     
     def _load_state(self) -> dict:
         """Load persisted polling timestamps."""
@@ -852,6 +874,11 @@ class SmartPoller:
             pass
     
     def should_poll(self, endpoint: str, force_first: bool = False, interval_override_sec: Optional[int] = None) -> bool:
+        """Thread-safe wrapper around ``_should_poll_locked``."""
+        with self._lock:
+            return self._should_poll_locked(endpoint, force_first=force_first, interval_override_sec=interval_override_sec)
+
+    def _should_poll_locked(self, endpoint: str, force_first: bool = False, interval_override_sec: Optional[int] = None) -> bool:
         """Check if enough time has passed since last call.
         
         Contract:
@@ -988,9 +1015,45 @@ class UWFlowDaemon:
         self._ws_thread = None
         self._ws_stop: Optional[threading.Event] = None
         self._cache_lock = threading.Lock()
+        # Sharded cache (UW_CACHE_SHARDED=1): one file per ticker instead of rewriting the monolith.
+        self._shards = None
+        try:
+            from src.uw.uw_cache_store import get_shard_store, uw_cache_sharded_enabled
+
+            if uw_cache_sharded_enabled():
+                self._shards = get_shard_store()
+                if not self._shards.exists() and CACHE_FILE.exists():
+                    seeded = self._shards.import_monolith(read_json(CACHE_FILE, default={}))
+                    safe_print(f"[UW-DAEMON] Seeded {seeded} UW cache shards from {CACHE_FILE}")
+        except Exception as e:
+            safe_print(f"[UW-DAEMON] Sharded cache unavailable, using monolith: {e}")
+            self._shards = None
         self.poller = SmartPoller(rest_budget_mode=self._rest_budget_mode)
         self._rate_limited = False  # Track if we've hit rate limit
         self._rest_quota_tripped = False  # True when local usage >= 92% of effective daily REST cap
+        # Concurrent ticker sweeps (UW_DAEMON_CONCURRENT_POLL=0 keeps the sequential loop).
+        self._ticker_poller = None
+        try:
+            from src.uw.uw_concurrent_poller import (
+                ConcurrentTickerPoller,
+                uw_concurrent_poll_enabled,
+                uw_poll_workers,
+                uw_quota_bucket,
+            )
+
+            if uw_concurrent_poll_enabled():
+                self.client.rate_bucket = uw_quota_bucket()
+                self._ticker_poller = ConcurrentTickerPoller(
+                    self._poll_ticker,
+                    workers=uw_poll_workers(),
+                    tier_of=self.ticker_tier,
+                    stop=lambda: (not self.running) or self._rate_limited or self._rest_quota_tripped,
+                    on_error=lambda t, e: safe_print(f"[UW-DAEMON] Error polling {t}: {e}"),
+                )
+        except Exception as e:
+            safe_print(f"[UW-DAEMON] Concurrent polling unavailable, using sequential loop: {e}")
+            self._ticker_poller = None
+            self.client.rate_bucket = None
         if self._rest_budget_mode and merged:
             self.tickers = merged
         else:
@@ -1010,6 +1073,12 @@ class UWFlowDaemon:
         # Register signal handlers BEFORE any debug_log calls that might block
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
+        try:
+            from src.uw.uw_payload_ring import install_dump_signal
+
+            install_dump_signal()
+        except Exception:
+            pass
 
         # Load/refresh official OpenAPI catalog in the background of init.
         # This lets us discover the correct congress/institutional endpoints from UW docs
@@ -1232,13 +1301,47 @@ class UWFlowDaemon:
             "last_update": int(time.time())
         }
     
+    def _cache_row(self, ticker: str) -> Dict[str, Any]:
+        """Current cache row for ``ticker`` (one shard read when sharded, else the monolith)."""
+        if self._shards is not None:
+            return self._shards.read_ticker(ticker)
+        cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
+        row = cache.get(ticker, {}) if isinstance(cache, dict) else {}
+        return row if isinstance(row, dict) else {}
+
+    def _write_cache_global(self, key: str, value: Any) -> None:
+        """Store a market-wide ``_``-prefixed section (``_market_tide``, ``_top_net_impact``, ...)."""
+        with self._cache_lock:
+            if self._shards is not None:
+                self._shards.write_global(key, value)
+                return
+            cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
+            cache[key] = value
+            atomic_write_json(CACHE_FILE, cache)
+
+    def _export_monolith_if_sharded(self) -> None:
+        """Once per cycle: materialize ``uw_flow_cache.json`` from shards for legacy readers."""
+        if self._shards is None:
+            return
+        if str(os.getenv("UW_CACHE_MONOLITH_EXPORT", "1")).strip().lower() in ("0", "false", "no", "off"):
+            return
+        try:
+            with self._cache_lock:
+                n = self._shards.export_monolith(CACHE_FILE)
+            debug_log("uw_flow_daemon.py:_export_monolith_if_sharded", "Monolith exported", {"tickers": n}, "H4")
+        except Exception as e:
+            safe_print(f"[UW-DAEMON] Monolith export from shards failed: {e}")
+
     def _update_cache(self, ticker: str, data: Dict):
         """Update cache for a ticker (thread-safe for WebSocket + REST writers)."""
         with self._cache_lock:
             self._update_cache_nolock(ticker, data)
 
     def _update_cache_nolock(self, ticker: str, data: Dict):
-        """Merge ``data`` into ``uw_flow_cache.json`` (caller must hold ``_cache_lock``)."""
+        """Merge ``data`` into the ticker's cache row (caller must hold ``_cache_lock``).
+
+        Sharded mode rewrites only ``tickers/<ticker>.json``; otherwise the whole monolith.
+        """
         # #region agent log
         debug_log("uw_flow_daemon.py:_update_cache", "Cache update start", {
             "ticker": ticker,
@@ -1250,7 +1353,9 @@ class UWFlowDaemon:
         CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
 
         cache = {}
-        if CACHE_FILE.exists():
+        if self._shards is not None:
+            cache[ticker] = self._shards.read_ticker(ticker)
+        elif CACHE_FILE.exists():
             try:
                 cache = read_json(CACHE_FILE, default={})
             except Exception:
@@ -1278,6 +1383,14 @@ class UWFlowDaemon:
         cache[ticker].update(data)
         cache[ticker]["_last_update"] = int(time.time())
 
+        if self._shards is not None:
+            self._shards.write_ticker(ticker, cache[ticker])
+            debug_log("uw_flow_daemon.py:_update_cache", "Cache shard update complete", {
+                "ticker": ticker,
+                "ticker_data_keys": list(cache[ticker].keys())
+            }, "H4")
+            return
+
         cache["_metadata"] = {
             "last_update": int(time.time()),
             "updated_by": "uw_flow_daemon",
@@ -1309,8 +1422,7 @@ class UWFlowDaemon:
             cap = 200
         try:
             with self._cache_lock:
-                cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
-                row = cache.get(symbol, {}) if isinstance(cache, dict) else {}
+                row = self._cache_row(symbol)
                 trades = list(row.get("flow_trades") or [])
                 try:
                     from src.uw.uw_flow_trade_normalize import normalize_ws_flow_alert_to_rest_trade
@@ -1348,6 +1460,7 @@ class UWFlowDaemon:
     def _poll_ticker(self, ticker: str):
         """Poll all endpoints for a ticker."""
         try:
+            _service_payload_dump()
             # Check if we're rate limited
             # If rate limited, we skip NEW polling but keep existing cache data
             # This allows trading bot to use stale cache (graceful degradation)
@@ -1420,17 +1533,11 @@ class UWFlowDaemon:
                 # CRITICAL: ALWAYS store flow_trades, even if empty or normalization fails
                 # main.py needs to see the data (or lack thereof) to know what's happening
                 # BUT: If we have existing cache data and API returns empty, preserve old data for graceful degradation
-                existing_cache = {}
-                if CACHE_FILE.exists():
-                    try:
-                        existing_cache = read_json(CACHE_FILE, default={})
-                        existing_ticker_data = existing_cache.get(ticker, {})
-                        existing_flow_trades = existing_ticker_data.get("flow_trades", [])
-                        existing_last_update = existing_ticker_data.get("_last_update", 0)
-                    except:
-                        existing_flow_trades = []
-                        existing_last_update = 0
-                else:
+                try:
+                    existing_ticker_data = self._cache_row(ticker)
+                    existing_flow_trades = existing_ticker_data.get("flow_trades", [])
+                    existing_last_update = existing_ticker_data.get("_last_update", 0)
+                except:
                     existing_flow_trades = []
                     existing_last_update = 0
                 
@@ -1479,8 +1586,7 @@ class UWFlowDaemon:
                 self._update_cache(ticker, cache_update)
                 
                 # Check what was actually stored (may have preserved old data)
-                final_cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
-                final_trades = final_cache.get(ticker, {}).get("flow_trades", [])
+                final_trades = self._cache_row(ticker).get("flow_trades", [])
                 
                 if final_trades:
                     print(f"[UW-DAEMON] Cache for {ticker}: {len(final_trades)} trades stored", flush=True)
@@ -1518,8 +1624,7 @@ class UWFlowDaemon:
                     gex_data = self.client.get_greek_exposure(ticker)
                     if gex_data:
                         # Load existing cache to merge greeks data
-                        cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
-                        existing_greeks = cache.get(ticker, {}).get("greeks", {})
+                        existing_greeks = self._cache_row(ticker).get("greeks", {})
                         existing_greeks.update(gex_data)  # Merge with existing greeks data
                         # Passive ML: retain raw gamma-exposure snapshot alongside merged greeks
                         self._update_cache(
@@ -1561,8 +1666,7 @@ class UWFlowDaemon:
                     greeks_data = self.client.get_greeks(ticker)
                     if greeks_data:
                         # Load existing cache to merge greeks data
-                        cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
-                        existing_greeks = cache.get(ticker, {}).get("greeks", {})
+                        existing_greeks = self._cache_row(ticker).get("greeks", {})
                         existing_greeks.update(greeks_data)  # Merge with existing
                         self._update_cache(ticker, {"greeks": existing_greeks})
                         print(f"[UW-DAEMON] Updated greeks for {ticker}: {len(greeks_data)} fields", flush=True)
@@ -1695,8 +1799,7 @@ class UWFlowDaemon:
                     self._update_cache(ticker, {"max_pain": max_pain_data})
                     if max_pain_data:
                         # Max pain contributes to greeks_gamma signal
-                        cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
-                        existing_greeks = cache.get(ticker, {}).get("greeks", {})
+                        existing_greeks = self._cache_row(ticker).get("greeks", {})
                         max_pain_value = max_pain_data.get("max_pain") or max_pain_data.get("maxPain")
                         if max_pain_value:
                             existing_greeks["max_pain"] = max_pain_value
@@ -2094,9 +2197,7 @@ class UWFlowDaemon:
 
         # Store global metadata too
         try:
-            cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
-            cache["_congress_recent_trades"] = {"last_update": int(time.time()), "count": len(items)}
-            atomic_write_json(CACHE_FILE, cache)
+            self._write_cache_global("_congress_recent_trades", {"last_update": int(time.time()), "count": len(items)})
         except Exception:
             pass
 
@@ -2122,8 +2223,7 @@ class UWFlowDaemon:
         # Baseline: weekly
         baseline = 7 * 86400
         try:
-            cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
-            cal = (cache.get(ticker, {}) or {}).get("calendar", {}) or {}
+            cal = self._cache_row(ticker).get("calendar", {}) or {}
         except Exception:
             return baseline
 
@@ -2285,6 +2385,7 @@ class UWFlowDaemon:
                 try:
                     cycle += 1
                     self._rest_quota_tripped = False
+                    _service_payload_dump()
                     if cycle == 1:
                         safe_print(f"[UW-DAEMON] ✅ SUCCESS: Entered main loop! Cycle {cycle}")
                     elif cycle <= 3:
@@ -2316,12 +2417,10 @@ class UWFlowDaemon:
                             safe_print(f"[UW-DAEMON] Polling top_net_impact (first_poll={first_poll})...")
                             top_net = self.client.get_top_net_impact(limit=100)
                             # Store in cache metadata
-                            cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
-                            cache["_top_net_impact"] = {
+                            self._write_cache_global("_top_net_impact", {
                                 "data": top_net,
                                 "last_update": int(time.time())
-                            }
-                            atomic_write_json(CACHE_FILE, cache)
+                            })
                         except Exception as e:
                             safe_print(f"[UW-DAEMON] Error polling top_net_impact: {e}")
                     
@@ -2341,7 +2440,14 @@ class UWFlowDaemon:
                                 "data_str": str(tide_data)[:200] if tide_data else "empty"
                             }, "H3")
                             # #endregion
-                            if tide_data:
+                            if tide_data and self._shards is not None:
+                                # Sharded: stored once globally; readers materialize per-ticker market_tide.
+                                self._write_cache_global("_market_tide", {
+                                    "data": tide_data,
+                                    "last_update": int(time.time())
+                                })
+                                safe_print(f"[UW-DAEMON] Updated market_tide: {len(str(tide_data))} bytes (stored globally)")
+                            elif tide_data:
                                 # Store in cache metadata AND per-ticker (for scoring)
                                 cache = read_json(CACHE_FILE, default={}) if CACHE_FILE.exists() else {}
                                 cache["_market_tide"] = {
@@ -2364,16 +2470,28 @@ class UWFlowDaemon:
 
                     # Congress is Tier-1 static: refreshed by scripts/run_premarket_intel.py (not intraday daemon).
 
-                    # Poll each ticker (optimized delay for rate limit safety)
-                    _tick_sleep = float(os.getenv("UW_DAEMON_INTER_TICKER_SLEEP_SEC", "0.5") or 0.5)
-                    for ticker in self.tickers:
-                        if not self.running:
-                            break
-                        self._poll_ticker(ticker)
-                        if getattr(self, "_rest_quota_tripped", False):
-                            break
-                        time.sleep(max(0.05, _tick_sleep))
+                    # Poll each ticker: concurrent (token bucket paces HTTP calls) or sequential.
+                    if self._ticker_poller is not None:
+                        _sweep = self._ticker_poller.sweep(self.tickers)
+                        if cycle <= 3 or cycle % 10 == 0:
+                            safe_print(
+                                f"[UW-DAEMON] Ticker sweep: polled={_sweep['polled']} skipped={_sweep['skipped']} "
+                                f"elapsed={_sweep['elapsed_sec']}s workers={self._ticker_poller.workers}",
+                                flush=True,
+                            )
+                    else:
+                        # Optimized delay for rate limit safety
+                        _tick_sleep = float(os.getenv("UW_DAEMON_INTER_TICKER_SLEEP_SEC", "0.5") or 0.5)
+                        for ticker in self.tickers:
+                            if not self.running:
+                                break
+                            self._poll_ticker(ticker)
+                            if getattr(self, "_rest_quota_tripped", False):
+                                break
+                            time.sleep(max(0.05, _tick_sleep))
                     
+                    self._export_monolith_if_sharded()
+
                     # Clear first_poll flag after first cycle
                     if first_poll:
                         first_poll = False
@@ -2400,7 +2518,7 @@ class UWFlowDaemon:
                         # #region agent log
                         debug_log("uw_flow_daemon.py:run", "Rate limited - sleeping", {}, "H2")
                         # #endregion
-                        time.sleep(300)  # 5 minutes
+                        _sleep_servicing_payload_dumps(300)  # 5 minutes
                         # Check if it's past 8PM EST (limit reset time)
                         try:
                             import pytz
@@ -2433,7 +2551,7 @@ class UWFlowDaemon:
                                     )
                         except Exception:
                             pass
-                        time.sleep(max(300, _loop_sleep))
+                        _sleep_servicing_payload_dumps(max(300, _loop_sleep))
                 
                 except KeyboardInterrupt:
                     safe_print("[UW-DAEMON] Keyboard interrupt received")
@@ -2473,7 +2591,7 @@ class UWFlowDaemon:
                         safe_print(f"[UW-DAEMON] Running flag False after exception, breaking loop")
                         should_continue = False
                         break
-                    time.sleep(60)  # Wait longer on error
+                    _sleep_servicing_payload_dumps(60)  # Wait longer on error
         
         except Exception as e:
             safe_print(f"[UW-DAEMON] FATAL ERROR in run() method: {e}")